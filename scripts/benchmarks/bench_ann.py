@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Benchmark IVF approximate search against brute force.
+
+Builds an embedding matrix of ``--rows`` synthetic vectors (a Gaussian
+mixture of ``--clusters`` topics with noise of norm ``--spread`` around unit
+centres, L2-normalised like real sentence embeddings) directly in
+``embedding_index`` form, trains the IVF lists, and for each ``--nprobe``
+value reports the median query latency and recall@k (fraction of the exact
+top-k that the approximate top-k finds) over ``--queries`` queries drawn
+from the same mixture.
+
+The brute-force row is a single matrix-vector product over all rows, which
+is what semantic search does below ``mcp.graph.ann_min_rows`` (or with
+``ann_enabled = false``).
+
+Usage:
+    python scripts/benchmarks/bench_ann.py
+    python scripts/benchmarks/bench_ann.py --rows 300000 --dim 1024 --nprobe 4 8 12 24
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path for local dev
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from watercooler.baseline_graph import embedding_index  # noqa: E402
+
+
+def _mixture(rng: np.random.Generator, centers: np.ndarray, n: int, spread: float) -> np.ndarray:
+    picks = rng.integers(len(centers), size=n)
+    out = centers[picks] + rng.normal(0, spread, size=(n, centers.shape[1])).astype(np.float32)
+    return embedding_index._normalise(out)
+
+
+def _matrix(vectors: np.ndarray) -> embedding_index.EmbeddingMatrix:
+    n = len(vectors)
+    return embedding_index.EmbeddingMatrix(
+        Path("nodes.jsonl"), vectors, [f"entry:E{i}" for i in range(n)], ["entry"] * n, [(0, 0)] * n
+    )
+
+
+def _run(matrix: embedding_index.EmbeddingMatrix, queries: np.ndarray, k: int, exact: bool):
+    times, tops = [], []
+    for q in queries:
+        t0 = time.perf_counter()
+        scores = matrix.scores(q, exact=exact)
+        hits = embedding_index.top_k(scores, k, -1.0)
+        times.append(time.perf_counter() - t0)
+        tops.append({row for row, _score in hits})
+    return statistics.median(times) * 1000, tops
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="IVF vs brute-force semantic search")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=2000)
+    parser.add_argument("--spread", type=float, default=0.8, help="noise norm relative to a topic centre")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 12, 24, 48])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    centers = rng.normal(0, 1 / np.sqrt(args.dim), size=(args.clusters, args.dim)).astype(np.float32)
+    vectors = _mixture(rng, centers, args.rows, args.spread / np.sqrt(args.dim))
+    queries = _mixture(rng, centers, args.queries, args.spread / np.sqrt(args.dim))
+    matrix = _matrix(vectors)
+
+    t0 = time.perf_counter()
+    matrix.ivf = embedding_index._train(vectors, np.ones(len(vectors), dtype=bool))
+    print(f"{args.rows} x {args.dim}: trained {len(matrix.ivf.centroids)} lists in {time.perf_counter() - t0:.1f}s")
+
+    brute_ms, truth = _run(matrix, queries, args.k, exact=True)
+    print(f"\n{'mode':<12} {'ms (median)':>12} {'recall@' + str(args.k):>10}")
+    print(f"{'brute':<12} {brute_ms:>12.2f} {1.0:>10.3f}")
+    for nprobe in args.nprobe:
+        embedding_index.configure_ann(min_rows=1, nprobe=nprobe)
+        ms, found = _run(matrix, queries, args.k, exact=False)
+        recall = statistics.mean(len(a & b) / args.k for a, b in zip(found, truth))
+        print(f"{'nprobe=' + str(nprobe):<12} {ms:>12.2f} {recall:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
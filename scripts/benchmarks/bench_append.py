@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Benchmark append_entry latency as a thread grows.
+
+Appends entries to a fresh thread and reports the mean latency per bucket of
+entries. With the in-place header patch + file append path the per-append
+cost should stay flat; ``--legacy`` forces the old read/rewrite path for
+comparison.
+
+Usage:
+    python scripts/benchmarks/bench_append.py
+    python scripts/benchmarks/bench_append.py --entries 2000 --body-bytes 4096
+    python scripts/benchmarks/bench_append.py --legacy
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path for local dev
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from watercooler import commands  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="append_entry latency vs thread size")
+    parser.add_argument("--entries", type=int, default=1000)
+    parser.add_argument("--body-bytes", type=int, default=2048)
+    parser.add_argument("--buckets", type=int, default=10)
+    parser.add_argument("--legacy", action="store_true", help="Disable the in-place append path")
+    args = parser.parse_args()
+
+    if args.legacy:
+        # Patching never succeeds, so every append takes the full rewrite
+        commands.patch_header_in_place = lambda *a, **kw: False  # type: ignore[assignment]
+
+    body = ("lorem ipsum " * (args.body_bytes // 12 + 1))[: args.body_bytes]
+    with tempfile.TemporaryDirectory() as tmp:
+        threads_dir = Path(tmp)
+        commands.init_thread("bench", threads_dir=threads_dir)
+        timings: list[float] = []
+        for i in range(args.entries):
+            start = time.perf_counter()
+            commands.append_entry(
+                "bench",
+                threads_dir=threads_dir,
+                agent="Claude" if i % 2 else "Codex",
+                role="implementer",
+                title=f"entry {i}",
+                body=body,
+            )
+            timings.append(time.perf_counter() - start)
+        size = (threads_dir / "bench.md").stat().st_size
+
+    mode = "legacy rewrite" if args.legacy else "in-place append"
+    print(f"mode={mode} entries={args.entries} final_size={size / 1e6:.1f} MB")
+    per_bucket = max(1, args.entries // args.buckets)
+    print(f"{'entries':>14}  {'mean ms':>8}  {'p95 ms':>8}")
+    for b in range(0, args.entries, per_bucket):
+        chunk = sorted(timings[b : b + per_bucket])
+        p95 = chunk[min(len(chunk) - 1, int(len(chunk) * 0.95))]
+        print(f"{b:>6}-{b + len(chunk) - 1:<7}  {statistics.mean(chunk) * 1e3:8.2f}  {p95 * 1e3:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Count git subprocesses per tool invocation, with and without git sessions.
+
+Builds a code repo and a threads repo, each cloned from a local bare
+remote, with the threads branch ``--ahead`` commits ahead and ``--behind``
+commits behind origin. Then it runs the git work of one tool invocation
+``--iterations`` times:
+
+- config: ``discover_git_info`` and ``_branch_has_upstream`` (every call)
+- read: ``ensure_readable`` (list/read tools)
+- write: ``run_preflight`` with its result cache cleared (say/ack/...)
+
+and reports git processes spawned and wall time per invocation, first with
+``WCOOLER_GIT_SESSION=0`` (every query a ``git`` subprocess) and then with
+sessions (queries answered by long-lived ``cat-file`` processes). Fetches
+and ``ls-remote`` probes talk to the remote and spawn in both modes; they
+are listed separately.
+
+Usage:
+    python scripts/benchmarks/bench_git_calls.py
+    python scripts/benchmarks/bench_git_calls.py --iterations 50 --ahead 3 --behind 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+# Add src to path for local dev
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from git import Actor, Repo  # noqa: E402
+
+from watercooler import git_session  # noqa: E402
+from watercooler.path_resolver import discover_git_info  # noqa: E402
+from watercooler_mcp import branch_parity  # noqa: E402
+from watercooler_mcp.config import _branch_has_upstream  # noqa: E402
+
+_AUTHOR = Actor("Bench", "bench@example.com")
+_NETWORK = {"fetch", "ls-remote", "push", "pull"}
+
+_spawned: Counter = Counter()
+_popen_init = subprocess.Popen.__init__
+
+
+def _counting_init(self, args, *a, **kw):  # type: ignore[no-untyped-def]
+    argv = [str(x) for x in (args if isinstance(args, (list, tuple)) else [args])]
+    if argv and Path(argv[0]).name.startswith("git"):
+        command = next((x for x in argv[1:] if not x.startswith("-")), "?")
+        if command == "cat-file" and any(x.startswith("--git-dir=") for x in argv):
+            command = "cat-file(session)"
+        _spawned[command] += 1
+    _popen_init(self, args, *a, **kw)
+
+
+def _commit(repo: Repo, name: str) -> None:
+    path = Path(repo.working_tree_dir) / name
+    path.write_text(name + "\n", encoding="utf-8")
+    repo.index.add([name])
+    repo.index.commit(name, author=_AUTHOR, committer=_AUTHOR)
+
+
+def _setup(root: Path, ahead: int, behind: int) -> tuple[Path, Path]:
+    paths = []
+    for name in ("code", "threads"):
+        bare = root / f"{name}.git"
+        Repo.init(bare, bare=True, initial_branch="main")
+        repo = Repo.clone_from(str(bare), str(root / name))
+        repo.git.checkout("-b", "main")
+        _commit(repo, "README.md")
+        repo.git.push("-u", "origin", "main")
+        paths.append(root / name)
+
+    threads = Repo(paths[1])
+    if behind:
+        other = Repo.clone_from(str(root / "threads.git"), str(root / "threads-other"), branch="main")
+        for i in range(behind):
+            _commit(other, f"remote-{i}.md")
+        other.git.push("origin", "main")
+        threads.git.fetch("origin")
+    for i in range(ahead):
+        _commit(threads, f"local-{i}.md")
+    return paths[0], paths[1]
+
+
+def _invocation(code: Path, threads: Path) -> None:
+    info = discover_git_info(code)
+    _branch_has_upstream(info.root, info.branch)
+    branch_parity.ensure_readable(threads, code)
+    branch_parity.clear_preflight_cache()
+    # auto_fix=False so the repos keep their ahead/behind shape across iterations
+    branch_parity.run_preflight(code, threads, auto_fix=False)
+
+
+def _run(label: str, code: Path, threads: Path, iterations: int) -> None:
+    git_session.close_sessions()
+    _spawned.clear()
+    start = time.perf_counter()
+    _invocation(code, threads)
+    first = sum(_spawned.values())
+    for _ in range(iterations - 1):
+        _invocation(code, threads)
+    elapsed = time.perf_counter() - start
+
+    total = sum(_spawned.values())
+    network = sum(n for cmd, n in _spawned.items() if cmd in _NETWORK)
+    local = {cmd: n for cmd, n in _spawned.items() if cmd not in _NETWORK}
+    print(f"\n[{label}] {iterations} invocations, {elapsed / iterations * 1000:.1f} ms each")
+    print(f"  git processes per invocation: {total / iterations:.2f} (first {first})")
+    print(f"    network (fetch/ls-remote): {network / iterations:.2f}")
+    print(f"    local: {sum(local.values()) / iterations:.2f}  "
+          + ", ".join(f"{cmd}={n}" for cmd, n in sorted(local.items())))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="git subprocesses per tool invocation")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--ahead", type=int, default=2, help="Local threads commits not on origin")
+    parser.add_argument("--behind", type=int, default=0, help="Origin threads commits not local")
+    args = parser.parse_args()
+
+    subprocess.Popen.__init__ = _counting_init  # type: ignore[method-assign]
+    with tempfile.TemporaryDirectory() as tmp:
+        code, threads = _setup(Path(tmp), args.ahead, args.behind)
+        os.environ["WCOOLER_GIT_SESSION"] = "0"
+        _run("subprocess per query", code, threads, args.iterations)
+        os.environ["WCOOLER_GIT_SESSION"] = "1"
+        _run("git sessions", code, threads, args.iterations)
+        git_session.close_sessions()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Benchmark graph reader lookups: JSONL scan vs the SQLite graph store.
+
+Writes a synthetic ``nodes.jsonl`` of ``--threads`` threads with
+``--entries`` entries each (optionally with ``--dim``-dimensional
+embeddings, which make every line larger to decode), builds the graph store,
+and reports the median latency of each reader operation served by the store
+and by the JSONL scan fallback.
+
+Usage:
+    python scripts/benchmarks/bench_graph_store.py
+    python scripts/benchmarks/bench_graph_store.py --threads 1000 --entries 50 --dim 384
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path for local dev
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from watercooler.baseline_graph import graph_store, reader  # noqa: E402
+
+
+def _write_graph(nodes_file: Path, threads: int, entries: int, dim: int, rng: random.Random) -> None:
+    with open(nodes_file, "w", encoding="utf-8") as f:
+        for t in range(threads):
+            topic = f"topic-{t}"
+            f.write(json.dumps({"id": f"thread:{topic}", "type": "thread", "topic": topic, "title": topic,
+                                "status": "OPEN", "entry_count": entries}) + "\n")
+            for i in range(entries):
+                node = {"id": f"entry:{topic}-{i}", "type": "entry", "entry_id": f"{topic}-{i}",
+                        "thread_topic": topic, "index": i, "title": f"Entry {i}", "body": "lorem ipsum " * 40}
+                if dim:
+                    node["embedding"] = [rng.uniform(-1, 1) for _ in range(dim)]
+                f.write(json.dumps(node) + "\n")
+
+
+def _median_ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="JSONL scan vs SQLite graph store lookups")
+    parser.add_argument("--threads", type=int, default=500)
+    parser.add_argument("--entries", type=int, default=100)
+    parser.add_argument("--dim", type=int, default=0, help="embedding size per entry (0 = none)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        threads_dir = Path(tmp)
+        nodes_file = reader.get_graph_dir(threads_dir) / "nodes.jsonl"
+        nodes_file.parent.mkdir(parents=True)
+        _write_graph(nodes_file, args.threads, args.entries, args.dim, rng)
+        nodes = args.threads * (args.entries + 1)
+        print(f"{nodes} nodes, {nodes_file.stat().st_size / 1e6:.1f} MB")
+
+        t0 = time.perf_counter()
+        graph_store.build(threads_dir, nodes_file)
+        print(f"store built in {time.perf_counter() - t0:.2f}s\n")
+
+        topic = f"topic-{args.threads // 2}"
+        ops = {
+            "list_threads": lambda: reader.list_threads_from_graph(threads_dir),
+            "read_thread": lambda: reader.read_thread_from_graph(threads_dir, topic),
+            "get_entry": lambda: reader.get_entry_from_graph(threads_dir, topic, entry_id=f"{topic}-7"),
+            "entries_range": lambda: reader.get_entries_range_from_graph(threads_dir, topic, 10, 19),
+        }
+        stored = {name: _median_ms(fn, args.repeat) for name, fn in ops.items()}
+        select = graph_store._select
+        graph_store._select = lambda *a: None
+        scanned = {name: _median_ms(fn, args.repeat) for name, fn in ops.items()}
+        graph_store._select = select
+
+        print(f"{'operation':<16} {'scan ms':>10} {'store ms':>10} {'speedup':>9}")
+        for name in ops:
+            print(f"{name:<16} {scanned[name]:>10.2f} {stored[name]:>10.2f} {scanned[name] / stored[name]:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Benchmark graph sync node writes against graph size.
+
+For each ``--sizes`` value, writes a synthetic ``nodes.jsonl`` of that many
+entry nodes (with ``--dim``-dimensional embeddings, like a graph built with
+embeddings enabled), then times ``--writes`` calls of ``sync._write_nodes``
+upserting a thread node and one new entry node, which is what
+``watercooler_say`` does. Writes append to the log, so the median should stay
+flat as the graph grows; the max includes the occasional compaction.
+
+Usage:
+    python scripts/benchmarks/bench_graph_sync.py
+    python scripts/benchmarks/bench_graph_sync.py --sizes 1000 10000 100000 --writes 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path for local dev
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from watercooler.baseline_graph import sync  # noqa: E402
+
+
+def _entry(i: int, rng: random.Random, dim: int) -> dict:
+    return {
+        "id": f"entry:E{i}",
+        "type": "entry",
+        "entry_id": f"E{i}",
+        "thread_topic": "bench",
+        "title": f"Entry {i}",
+        "body": "lorem ipsum " * 40,
+        "embedding": [rng.uniform(-1, 1) for _ in range(dim)],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Graph sync write cost vs graph size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--writes", type=int, default=100)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'nodes':>8} {'MB':>8} {'ms (median)':>12} {'ms (max)':>10}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            threads_dir = Path(tmp)
+            nodes_file = threads_dir / "graph" / "baseline" / "nodes.jsonl"
+            nodes_file.parent.mkdir(parents=True)
+            with open(nodes_file, "w", encoding="utf-8") as f:
+                for i in range(size):
+                    f.write(json.dumps(_entry(i, rng, args.dim)) + "\n")
+            mb = nodes_file.stat().st_size / 1e6
+
+            times = []
+            for n in range(args.writes):
+                thread = {"id": "thread:bench", "type": "thread", "topic": "bench", "entry_count": size + n + 1}
+                t0 = time.perf_counter()
+                sync._write_nodes(threads_dir, nodes_file, [thread, _entry(size + n, rng, args.dim)])
+                times.append(time.perf_counter() - t0)
+            print(f"{size:>8} {mb:>8.1f} {statistics.median(times) * 1000:>12.2f} {max(times) * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
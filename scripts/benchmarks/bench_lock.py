@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Benchmark per-thread lock contention: flock vs the lock-file fallback.
+
+Starts ``--workers`` processes that each take the lock ``--iterations``
+times, hold it for ``--hold-ms`` and release it. Reports total throughput
+and the distribution of wait times (time from requesting the lock to
+holding it). The lock-file backend polls every ``WCOOLER_LOCK_POLL``
+seconds, so its waits are quantised to the poll interval; flock waiters
+are woken by the kernel as soon as the holder releases.
+
+``--readers`` adds processes that take the lock in shared mode (flock
+only; the fallback does not lock reads).
+
+Usage:
+    python scripts/benchmarks/bench_lock.py
+    python scripts/benchmarks/bench_lock.py --workers 8 --iterations 50 --hold-ms 2
+    python scripts/benchmarks/bench_lock.py --backend flock --readers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing as mp
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path for local dev
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from watercooler.lock import thread_lock  # noqa: E402
+
+
+def _worker(backend: str, threads_dir: str, iterations: int, hold: float, shared: bool, start_evt, out) -> None:
+    os.environ["WCOOLER_LOCK_BACKEND"] = backend
+    waits: list[float] = []
+    start_evt.wait()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        with thread_lock("bench", Path(threads_dir), shared=shared, timeout=60):
+            waits.append(time.perf_counter() - t0)
+            time.sleep(hold)
+    out.put(("reader" if shared else "writer", waits))
+
+
+def _run(backend: str, args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        ctx = mp.get_context("spawn")
+        start_evt = ctx.Event()
+        out = ctx.Queue()
+        roles = [False] * args.workers + ([True] * args.readers if backend == "flock" else [])
+        procs = [
+            ctx.Process(
+                target=_worker,
+                args=(backend, tmp, args.iterations, args.hold_ms / 1000, shared, start_evt, out),
+            )
+            for shared in roles
+        ]
+        for p in procs:
+            p.start()
+        time.sleep(0.5)  # let every worker finish importing
+        t0 = time.perf_counter()
+        start_evt.set()
+        results = [out.get() for _ in procs]
+        elapsed = time.perf_counter() - t0
+        for p in procs:
+            p.join()
+
+    print(f"\n[{backend}] {args.workers} writers, {args.readers if backend == 'flock' else 0} readers, "
+          f"{args.iterations} iterations, hold {args.hold_ms} ms")
+    total = sum(len(w) for _, w in results)
+    print(f"  total {elapsed:.2f}s, {total / elapsed:.0f} acquisitions/s")
+    for role in ("writer", "reader"):
+        waits = sorted(x * 1000 for r, w in results if r == role for x in w)
+        if not waits:
+            continue
+        p99 = waits[min(len(waits) - 1, int(len(waits) * 0.99))]
+        print(
+            f"  {role} wait ms: mean {statistics.mean(waits):.2f}  "
+            f"p50 {statistics.median(waits):.2f}  p99 {p99:.2f}  max {waits[-1]:.2f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Lock contention: flock vs lock file")
+    parser.add_argument("--workers", type=int, default=4, help="Writer processes")
+    parser.add_argument("--readers", type=int, default=0, help="Shared-mode reader processes (flock only)")
+    parser.add_argument("--iterations", type=int, default=25)
+    parser.add_argument("--hold-ms", type=float, default=5.0)
+    parser.add_argument("--backend", choices=("both", "flock", "file"), default="both")
+    args = parser.parse_args()
+
+    backends = ("flock", "file") if args.backend == "both" else (args.backend,)
+    for backend in backends:
+        _run(backend, args)
+
+
+if __name__ == "__main__":
+    main()
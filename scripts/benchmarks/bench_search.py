@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Benchmark keyword search_graph: BM25F index vs full scan.
+
+Writes a synthetic ``graph/baseline/nodes.jsonl`` with ``--nodes`` entry
+nodes (Zipf-distributed vocabulary, a few planted rare terms) and times
+``search_graph`` keyword queries two ways:
+
+- index: candidates and BM25F scores from ``.wc-cache/search.sqlite``
+- scan:  the pre-index path that JSON-decodes every node
+
+The first indexed query builds the index; its time is reported separately.
+
+Usage:
+    python scripts/benchmarks/bench_search.py
+    python scripts/benchmarks/bench_search.py --nodes 100000 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path for local dev
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from watercooler import search_index  # noqa: E402
+from watercooler.baseline_graph.search import SearchQuery, search_graph  # noqa: E402
+
+QUERIES = ["kubernetes", "rate limiter", "auth", "flaky test", "zzzunused"]
+PLANTED = {"kubernetes": 0.001, "rate limiter": 0.005, "flaky test": 0.02}
+
+
+def _write_graph(threads_dir: Path, n: int, seed: int) -> None:
+    rng = random.Random(seed)
+    vocab = [f"w{i}" for i in range(20000)] + ["auth", "authentication", "oauth", "author"]
+    cum, total = [], 0.0
+    for i in range(len(vocab)):
+        total += 1 / (i + 1)
+        cum.append(total)
+    graph_dir = threads_dir / "graph" / "baseline"
+    graph_dir.mkdir(parents=True)
+    with open(graph_dir / "nodes.jsonl", "w", encoding="utf-8") as f:
+        for i in range(n):
+            words = rng.choices(vocab, cum_weights=cum, k=rng.randint(20, 120))
+            for phrase, rate in PLANTED.items():
+                if rng.random() < rate:
+                    words.insert(rng.randrange(len(words) + 1), phrase)
+            node = {
+                "id": f"entry:E{i:07d}",
+                "type": "entry",
+                "entry_id": f"E{i:07d}",
+                "thread_topic": f"topic-{i % 500}",
+                "title": " ".join(rng.choices(vocab, cum_weights=cum, k=5)),
+                "body": " ".join(words),
+                "summary": " ".join(words[:15]),
+            }
+            f.write(json.dumps(node) + "\n")
+
+
+def _time(threads_dir: Path, query: str, repeat: int) -> tuple[float, int, int]:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        results = search_graph(threads_dir, SearchQuery(query=query, limit=10))
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1000, results.count, results.total_scanned
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="search_graph keyword latency: index vs scan")
+    parser.add_argument("--nodes", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        threads_dir = Path(tmp)
+        t0 = time.perf_counter()
+        _write_graph(threads_dir, args.nodes, args.seed)
+        print(f"{args.nodes} nodes written in {time.perf_counter() - t0:.1f}s")
+
+        t0 = time.perf_counter()
+        search_graph(threads_dir, SearchQuery(query="warmup", limit=10))
+        print(f"index build: {time.perf_counter() - t0:.1f}s")
+
+        rows = []
+        for q in QUERIES:
+            rows.append((q, "index", *_time(threads_dir, q, args.repeat)))
+        scan = search_index.graph_keyword_candidates
+        search_index.graph_keyword_candidates = lambda *a: None
+        try:
+            for q in QUERIES:
+                rows.append((q, "scan", *_time(threads_dir, q, args.repeat)))
+        finally:
+            search_index.graph_keyword_candidates = scan
+
+    print(f"\n{'query':<14} {'mode':<6} {'ms (median)':>12} {'results':>8} {'scanned':>8}")
+    for q, mode, ms, count, scanned in sorted(rows, key=lambda r: (r[0], r[1])):
+        print(f"{q:<14} {mode:<6} {ms:>12.1f} {count:>8} {scanned:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,12 +7,13 @@ try:
 except PackageNotFoundError:
     __version__ = "0.0.0-dev"  # Fallback for editable installs without metadata
 
-from .lock import AdvisoryLock  # noqa: F401
+from .lock import AdvisoryLock, FlockLock  # noqa: F401
 from .fs import read, write, thread_path  # noqa: F401
 from .header import bump_header  # noqa: F401
 
 __all__ = [
     "AdvisoryLock",
+    "FlockLock",
     "read",
     "write",
     "thread_path",
@@ -52,6 +52,7 @@ from .reader import (
 
 from .sync import (
     sync_entry_to_graph,
+    sync_entries_to_graph,
     sync_thread_to_graph,
     record_graph_sync_error,
     check_graph_health,
@@ -106,6 +107,7 @@ __all__ = [
     "get_most_accessed",
     # Sync
     "sync_entry_to_graph",
+    "sync_entries_to_graph",
     "sync_thread_to_graph",
     "record_graph_sync_error",
     "check_graph_health",
@@ -0,0 +1,117 @@
+"""Compact encodings for node embeddings in ``nodes.jsonl``.
+
+Embeddings written as JSON float lists make ``nodes.jsonl`` several times
+larger than the content it describes: every reader decodes them with each
+line, and every re-embedded entry bloats the git history. A node's
+``embedding`` may instead hold a base64 string:
+
+    ``"f16:<base64>"``          little-endian float16 values
+    ``"i8:<scale>:<base64>"``   int8 values; value = int8 * scale
+
+float16 keeps about three significant digits, int8 about two (with one
+scale per vector); both are well inside the noise of cosine ranking.
+Readers only decode an embedding with :func:`decode` where a semantic
+search actually needs the vector; a plain list is still accepted, so
+graphs may mix encodings.
+
+The encoding used for new nodes is set process-wide with
+:func:`set_encoding` (the MCP server does so from
+``mcp.graph.embedding_encoding``) and defaults to ``json``, which older
+readers understand. ``watercooler baseline-graph migrate-embeddings``
+re-encodes an existing graph.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import struct
+from typing import Any, Dict, List, Optional, Sequence
+
+ENCODINGS = ("json", "f16", "i8")
+DEFAULT_ENCODING = "json"
+
+_F16_MAX = 65504.0
+
+_encoding = DEFAULT_ENCODING
+
+
+def set_encoding(encoding: str) -> None:
+    """Encode embeddings of nodes written from now on with ``encoding``.
+
+    Raises:
+        ValueError: If ``encoding`` is not one of ``ENCODINGS``
+    """
+    global _encoding
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unknown embedding encoding: {encoding} (expected one of {', '.join(ENCODINGS)})")
+    _encoding = encoding
+
+
+def get_encoding() -> str:
+    return _encoding
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+def encode(vector: Sequence[float], encoding: Optional[str] = None) -> Any:
+    """``vector`` as stored in a node (``encoding`` defaults to the process setting)."""
+    encoding = encoding or _encoding
+    values = decode(vector) if isinstance(vector, str) else list(vector)
+    if values is None or encoding == "json":
+        return values
+    if encoding == "f16":
+        clamped = [min(_F16_MAX, max(-_F16_MAX, v)) for v in values]
+        return "f16:" + _b64(struct.pack(f"<{len(clamped)}e", *clamped))
+    if encoding == "i8":
+        peak = max((abs(v) for v in values), default=0.0)
+        scale = peak / 127 if peak else 1.0
+        quantized = [max(-127, min(127, round(v / scale))) for v in values]
+        return f"i8:{scale!r}:" + _b64(struct.pack(f"<{len(quantized)}b", *quantized))
+    raise ValueError(f"Unknown embedding encoding: {encoding}")
+
+
+def decode(value: Any) -> Optional[List[float]]:
+    """The vector of a node's ``embedding`` field (None if absent or malformed)."""
+    if not value:
+        return None
+    if isinstance(value, list):
+        return value
+    if not isinstance(value, str):
+        return None
+    try:
+        kind, _, payload = value.partition(":")
+        if kind == "f16":
+            data = base64.b64decode(payload, validate=True)
+            return list(struct.unpack(f"<{len(data) // 2}e", data))
+        if kind == "i8":
+            scale, _, payload = payload.partition(":")
+            factor = float(scale)
+            data = base64.b64decode(payload, validate=True)
+            return [v * factor for v in struct.unpack(f"<{len(data)}b", data)]
+    except (binascii.Error, struct.error, ValueError):
+        pass
+    return None
+
+
+def encoding_of(value: Any) -> Optional[str]:
+    """The encoding of a node's ``embedding`` field (None if absent or unknown)."""
+    if isinstance(value, list):
+        return "json" if value else None
+    if isinstance(value, str):
+        kind = value.partition(":")[0]
+        return kind if kind in ENCODINGS else None
+    return None
+
+
+def reencode_node(node: Dict[str, Any], encoding: str) -> Dict[str, Any]:
+    """``node`` with its embedding in ``encoding`` (the node itself if already)."""
+    value = node.get("embedding")
+    if not value or encoding_of(value) == encoding:
+        return node
+    vector = decode(value)
+    if vector is None:
+        return node
+    return {**node, "embedding": encode(vector, encoding)}
@@ -0,0 +1,525 @@
+"""Memory-mapped embedding matrix for semantic graph search.
+
+Semantic ``search_graph`` and ``find_similar_entries`` compare a query vector
+against every embedded node. Doing that with a Python loop over JSON-decoded
+``nodes.jsonl`` lines costs O(N*D) interpreted work plus parsing every
+embedding list, so this module keeps the embeddings as one contiguous float32
+matrix in ``.wc-cache/embeddings.npy`` whose rows are L2-normalised. Scores for
+all nodes are then a single matrix-vector product, and only the nodes that
+make the top-k are read back from ``nodes.jsonl``.
+
+``.wc-cache/embeddings.json`` maps rows to nodes: the node ``id``, its type
+and the byte range of its line in ``nodes.jsonl``, tagged with the stat of
+``nodes.jsonl`` the map describes. The ``.npy`` file is allocated with spare
+rows so graph sync can append a new entry's embedding (or overwrite a changed
+one) in place; see :func:`note_graph_write`. Any other change to
+``nodes.jsonl`` shows up as a stat mismatch and the matrix is rebuilt at the
+next query.
+
+Once a graph holds ``min_rows`` (default ``ANN_MIN_ROWS``) embedded nodes,
+brute force is replaced by an IVF-flat index (inverted file over exact
+vectors): spherical k-means splits the rows into about sqrt(N) lists, the
+centroids are kept in ``.wc-cache/embeddings_ivf.npy`` and each row's list
+number in the row map. A query scores only the rows of the ``nprobe``
+(default ``ANN_NPROBE``) lists whose centroids are closest to it, so results
+are approximate unless the caller asks for ``exact`` scores;
+``scripts/benchmarks/bench_ann.py`` measures recall against brute force.
+Graph sync assigns new rows to their nearest list and the lists are
+retrained from the matrix once the row count has doubled since training.
+
+The IVF settings are process-wide, set with :func:`configure_ann` (the MCP
+server does so from ``mcp.graph.ann_enabled``, ``ann_min_rows`` and
+``ann_nprobe``). With the index disabled every query is brute force.
+
+NumPy is optional. Without it :func:`load` returns None and callers fall back
+to the pure-Python cosine loop. Like the other ``.wc-cache`` indexes this is a
+pure cache: every failure degrades to that fallback.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import math
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..fs import atomic_write_bytes, cache_dir, CACHE_DIR_NAME
+from ..search_index import StatTag, stat_tag
+from . import embedding_codec
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional extra
+    np = None  # type: ignore[assignment]
+
+
+EMBEDDINGS_NAME = "embeddings.npy"
+EMBEDDING_IDS_NAME = "embeddings.json"
+CENTROIDS_NAME = "embeddings_ivf.npy"
+_INDEX_VERSION = 2
+# Spare rows allocated on rebuild/growth so appends rarely reallocate
+_MIN_SPARE = 64
+
+# IVF parameters: index size at which approximate search kicks in, and the
+# number of lists probed per query (see scripts/benchmarks/bench_ann.py)
+ANN_MIN_ROWS = 20000
+ANN_NPROBE = 12
+_KMEANS_ITERS = 10
+_KMEANS_SAMPLE_PER_LIST = 64
+_RETRAIN_GROWTH = 2.0
+_ASSIGN_CHUNK = 8192
+
+_ann_enabled = True
+_ann_min_rows = ANN_MIN_ROWS
+_ann_nprobe = ANN_NPROBE
+
+
+def configure_ann(enabled: bool = True, min_rows: int = ANN_MIN_ROWS, nprobe: int = ANN_NPROBE) -> None:
+    """Set the IVF index settings for this process.
+
+    Raises:
+        ValueError: If ``min_rows`` or ``nprobe`` is less than 1
+    """
+    global _ann_enabled, _ann_min_rows, _ann_nprobe
+    if min_rows < 1 or nprobe < 1:
+        raise ValueError(f"ANN min_rows and nprobe must be >= 1 (got {min_rows}, {nprobe})")
+    _ann_enabled, _ann_min_rows, _ann_nprobe = enabled, min_rows, nprobe
+
+
+def matrix_path(threads_dir: Path) -> Path:
+    return threads_dir / CACHE_DIR_NAME / EMBEDDINGS_NAME
+
+
+def ids_path(threads_dir: Path) -> Path:
+    return threads_dir / CACHE_DIR_NAME / EMBEDDING_IDS_NAME
+
+
+def centroids_path(threads_dir: Path) -> Path:
+    return threads_dir / CACHE_DIR_NAME / CENTROIDS_NAME
+
+
+class _Ivf:
+    """IVF lists over the rows of an :class:`EmbeddingMatrix`.
+
+    ``lists[i]`` is the list of row ``i`` (-1 for rows without a node) and
+    ``trained`` the number of live rows the centroids were trained on.
+    """
+
+    def __init__(self, centroids: Any, lists: Any, trained: int) -> None:
+        self.centroids = centroids
+        self.lists = lists
+        self.trained = trained
+        order = np.argsort(lists, kind="stable")
+        self._order = order
+        self._bounds = np.searchsorted(lists[order], np.arange(len(centroids) + 1))
+
+    def probe(self, q: Any, nprobe: int) -> Any:
+        """Rows of the ``nprobe`` lists closest to the unit vector ``q``, ascending."""
+        near = self.centroids @ q
+        if nprobe < len(near):
+            near_lists = np.argpartition(near, len(near) - nprobe)[len(near) - nprobe:]
+        else:
+            near_lists = np.arange(len(near))
+        rows = [self._order[self._bounds[c]:self._bounds[c + 1]] for c in near_lists]
+        return np.sort(np.concatenate(rows)) if rows else np.zeros(0, dtype=np.int64)
+
+
+class EmbeddingMatrix:
+    """Normalised node embeddings of one ``nodes.jsonl`` state.
+
+    Row ``i`` of ``vectors`` belongs to the node ``ids[i]`` of type
+    ``types[i]`` whose line spans ``spans[i]`` (offset, length). Rows of
+    nodes that lost their embedding have id None and a zero vector.
+    """
+
+    def __init__(
+        self,
+        nodes_file: Path,
+        vectors: Any,
+        ids: List[Optional[str]],
+        types: List[str],
+        spans: List[Tuple[int, int]],
+        ivf: Optional[_Ivf] = None,
+    ) -> None:
+        self.nodes_file = nodes_file
+        self.vectors = vectors
+        self.ids = ids
+        self.types = types
+        self.spans = spans
+        self.ivf = ivf
+        self._rows = {node_id: i for i, node_id in enumerate(ids) if node_id is not None}
+        self._types = np.asarray(types, dtype=object)
+        self._live = np.asarray([node_id is not None for node_id in ids], dtype=bool)
+        self._live_count = int(self._live.sum())
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self.vectors.shape[1] if self.vectors is not None else None
+
+    def row(self, node_id: str) -> Optional[int]:
+        return self._rows.get(node_id)
+
+    def scores(
+        self,
+        query: Sequence[float],
+        types: Optional[Iterable[str]] = None,
+        exact: bool = False,
+    ) -> Optional[Any]:
+        """Cosine similarity of every row to ``query`` (None on dimension mismatch).
+
+        Rows without a node, or whose type is not in ``types`` (if given),
+        score ``-inf``. With an IVF index (enabled, and at least
+        ``min_rows`` live rows) and ``exact`` False only the rows of the
+        probed lists are scored; the others score ``-inf`` as well.
+        """
+        if self.vectors is None:
+            return np.zeros(0, dtype=np.float32)
+        q = np.asarray(query, dtype=np.float32)
+        if q.shape != (self.vectors.shape[1],):
+            return None
+        norm = float(np.linalg.norm(q))
+        if norm == 0.0:
+            out = np.zeros(len(self.ids), dtype=np.float32)
+        elif self.ivf is not None and not exact and _ann_enabled and self._live_count >= _ann_min_rows:
+            rows = self.ivf.probe(q / norm, _ann_nprobe)
+            out = np.full(len(self.ids), -np.inf, dtype=np.float32)
+            out[rows] = self.vectors[rows] @ (q / norm)
+        else:
+            out = self.vectors @ (q / norm)
+        keep = self._live
+        if types is not None:
+            keep = keep & np.isin(self._types, list(types))
+        out[~keep] = -np.inf
+        return out
+
+    def read_nodes(self, rows: Sequence[int]) -> List[Dict[str, Any]]:
+        """Read the nodes of ``rows`` from ``nodes.jsonl``, in the given order.
+
+        Rows whose line no longer holds the expected node are skipped.
+        """
+        out: List[Dict[str, Any]] = []
+        with open(self.nodes_file, "rb") as f:
+            for row in rows:
+                offset, length = self.spans[row]
+                f.seek(offset)
+                try:
+                    node = json.loads(f.read(length))
+                except ValueError:
+                    continue
+                if isinstance(node, dict) and node.get("id") == self.ids[row]:
+                    out.append(node)
+        return out
+
+
+def top_k(scores: Any, k: int, threshold: float, exclude: Optional[int] = None) -> List[Tuple[int, float]]:
+    """Best ``k`` (row, score) pairs with score >= ``threshold``, best first."""
+    if exclude is not None:
+        scores = scores.copy()
+        scores[exclude] = -np.inf
+    eligible = np.flatnonzero(scores >= threshold)
+    if len(eligible) > k:
+        part = np.argpartition(scores[eligible], len(eligible) - k)[len(eligible) - k:]
+        eligible = eligible[part]
+    order = eligible[np.argsort(-scores[eligible], kind="stable")]
+    return [(int(row), float(scores[row])) for row in order]
+
+
+# ============================================================================
+# Persistence
+# ============================================================================
+
+
+def _normalise(vectors: Any) -> Any:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _assign(vectors: Any, centroids: Any) -> Any:
+    """Nearest centroid (by dot product) of each row of ``vectors``."""
+    out = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), _ASSIGN_CHUNK):
+        block = np.asarray(vectors[start:start + _ASSIGN_CHUNK])
+        out[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return out
+
+
+def _train(vectors: Any, live: Any) -> _Ivf:
+    """Spherical k-means over the live rows of ``vectors``."""
+    rows = np.flatnonzero(live)
+    nlist = max(1, int(math.sqrt(len(rows))))
+    rng = np.random.default_rng(0)
+    size = min(len(rows), nlist * _KMEANS_SAMPLE_PER_LIST)
+    sample = np.asarray(vectors[np.sort(rng.choice(rows, size=size, replace=False))])
+    centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+    for _ in range(_KMEANS_ITERS):
+        assign = np.argmax(sample @ centroids.T, axis=1)
+        onehot = np.zeros((len(sample), nlist), dtype=np.float32)
+        onehot[np.arange(len(sample)), assign] = 1.0
+        sums = onehot.T @ sample
+        filled = onehot.sum(axis=0) > 0
+        centroids[filled] = _normalise(sums[filled])
+    lists = np.full(len(vectors), -1, dtype=np.int32)
+    lists[rows] = _assign(vectors[rows], centroids)
+    return _Ivf(centroids, lists, len(rows))
+
+
+def _write_centroids(threads_dir: Path, centroids: Any) -> None:
+    buf = io.BytesIO()
+    np.save(buf, centroids)
+    atomic_write_bytes(centroids_path(threads_dir), buf.getvalue())
+
+
+def _write_matrix(threads_dir: Path, vectors: Any, capacity: int) -> None:
+    """Replace ``embeddings.npy`` with ``vectors`` padded to ``capacity`` rows."""
+    target = matrix_path(threads_dir)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        out = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.float32, shape=(capacity, vectors.shape[1]))
+        out[: len(vectors)] = vectors
+        out.flush()
+        del out
+        os.replace(tmp, target)
+    except Exception:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _save_ids(
+    threads_dir: Path,
+    tag: StatTag,
+    ids: List[Optional[str]],
+    types: List[str],
+    spans: List[Tuple[int, int]],
+    ivf: Optional[_Ivf],
+) -> None:
+    payload = {
+        "version": _INDEX_VERSION,
+        "tag": list(tag),
+        "ids": ids,
+        "types": types,
+        "spans": [v for span in spans for v in span],
+        "ivf": None if ivf is None else {
+            "nlist": len(ivf.centroids),
+            "trained": ivf.trained,
+            "lists": ivf.lists.tolist(),
+        },
+    }
+    atomic_write_bytes(ids_path(threads_dir), json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+
+_Ids = Tuple[StatTag, List[Optional[str]], List[str], List[Tuple[int, int]], Optional[_Ivf]]
+
+
+def _load_ids(threads_dir: Path) -> Optional[_Ids]:
+    try:
+        data = json.loads(ids_path(threads_dir).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != _INDEX_VERSION:
+        return None
+    flat = data["spans"]
+    spans = list(zip(flat[::2], flat[1::2]))
+    ivf: Optional[_Ivf] = None
+    meta = data.get("ivf")
+    if meta:
+        try:
+            centroids = np.load(centroids_path(threads_dir))
+        except (OSError, ValueError):
+            centroids = None
+        # Centroids from another training run: fall back to brute force
+        if centroids is not None and len(centroids) == meta["nlist"]:
+            ivf = _Ivf(centroids, np.asarray(meta["lists"], dtype=np.int32), meta["trained"])
+    return tuple(data["tag"]), data["ids"], data["types"], spans, ivf  # type: ignore[return-value]
+
+
+def _open_matrix(threads_dir: Path, count: int, mode: str = "r") -> Any:
+    if not count:
+        return None
+    return np.load(matrix_path(threads_dir), mmap_mode=mode)
+
+
+def _rebuild(threads_dir: Path, nodes_file: Path) -> EmbeddingMatrix:
+    # nodes.jsonl is an append log: only the last line of each node id counts
+    latest: Dict[Any, Tuple[Dict[str, Any], int, int]] = {}
+    with open(nodes_file, "rb") as f:
+        tag = stat_tag(os.fstat(f.fileno()))
+        offset = 0
+        for raw in f:
+            if raw.strip():
+                try:
+                    node = json.loads(raw)
+                except ValueError:
+                    node = None
+                if isinstance(node, dict):
+                    key = node.get("id") or offset
+                    latest.pop(key, None)
+                    latest[key] = (node, offset, len(raw))
+            offset += len(raw)
+    ids: List[Optional[str]] = []
+    types: List[str] = []
+    spans: List[Tuple[int, int]] = []
+    vectors: List[List[float]] = []
+    for node, offset, length in latest.values():
+        embedding = embedding_codec.decode(node.get("embedding"))
+        if embedding and (not vectors or len(embedding) == len(vectors[0])):
+            ids.append(node.get("id"))
+            types.append(node.get("type") or "")
+            spans.append((offset, length))
+            vectors.append(embedding)
+    cache_dir(threads_dir)
+    ivf: Optional[_Ivf] = None
+    if vectors:
+        matrix = _normalise(np.asarray(vectors, dtype=np.float32))
+        _write_matrix(threads_dir, matrix, len(matrix) + max(_MIN_SPARE, len(matrix) // 4))
+        if _ann_enabled and len(matrix) >= _ann_min_rows:
+            ivf = _train(matrix, np.asarray([i is not None for i in ids], dtype=bool))
+            _write_centroids(threads_dir, ivf.centroids)
+    _save_ids(threads_dir, tag, ids, types, spans, ivf)
+    opened = _open_matrix(threads_dir, len(ids))
+    return EmbeddingMatrix(nodes_file, opened[: len(ids)] if opened is not None else None, ids, types, spans, ivf)
+
+
+def build(threads_dir: Path, nodes_file: Path) -> bool:
+    """Rebuild the matrix (and IVF index, if large enough) for ``nodes_file`` now.
+
+    Used after bulk graph builds so the first query does not pay for it.
+    Returns False if NumPy is not installed or the build failed.
+    """
+    if np is None:
+        return False
+    try:
+        _rebuild(threads_dir, nodes_file)
+        return True
+    except (OSError, ValueError, KeyError, TypeError, IndexError):
+        return False
+
+
+def load(threads_dir: Path, nodes_file: Path) -> Optional[EmbeddingMatrix]:
+    """Return the embedding matrix for ``nodes_file``, rebuilding it if stale.
+
+    Returns None if NumPy is not installed or the index is unavailable.
+    """
+    if np is None:
+        return None
+    try:
+        tag = stat_tag(nodes_file.stat())
+        loaded = _load_ids(threads_dir)
+        if loaded is None or loaded[0] != tag:
+            return _rebuild(threads_dir, nodes_file)
+        _tag, ids, types, spans, ivf = loaded
+        vectors = _open_matrix(threads_dir, len(ids))
+        if vectors is not None:
+            if vectors.ndim != 2 or len(vectors) < len(ids):
+                return _rebuild(threads_dir, nodes_file)
+            vectors = vectors[: len(ids)]
+        if ivf is not None and (vectors is None or len(ivf.lists) != len(ids) or ivf.centroids.shape[1] != vectors.shape[1]):
+            ivf = None
+        return EmbeddingMatrix(nodes_file, vectors, ids, types, spans, ivf)
+    except (OSError, ValueError, KeyError, TypeError, IndexError):
+        return None
+
+
+def note_graph_write(
+    threads_dir: Path,
+    before: Optional[os.stat_result],
+    nodes_file: Path,
+    layout: List[Tuple[str, int, int]],
+    changed: List[Dict[str, Any]],
+    appended: bool = False,
+) -> None:
+    """Update the matrix after ``nodes_file`` was rewritten or appended to.
+
+    ``layout`` lists (id, offset, length) for every line of the new file and
+    ``changed`` the nodes that were upserted. Changed embeddings are written
+    into their row (or a spare row) in place and assigned to their nearest
+    IVF list; the other rows only get new spans. With ``appended``,
+    ``layout`` only lists the lines appended for ``changed`` and the other
+    rows keep their spans. Skipped if the matrix was not fresh for
+    ``before``.
+    """
+    if np is None or before is None:
+        return
+    loaded = _load_ids(threads_dir)
+    if loaded is None or loaded[0] != stat_tag(before):
+        return
+    _tag, ids, types, spans, ivf = loaded
+    try:
+        tag = stat_tag(nodes_file.stat())
+        where = {node_id: (offset, length) for node_id, offset, length in layout}
+        rows = {node_id: i for i, node_id in enumerate(ids) if node_id is not None}
+        for i, node_id in enumerate(ids):
+            if node_id is not None:
+                if node_id in where:
+                    spans[i] = where[node_id]
+                elif not appended:
+                    ids[i] = None
+
+        updates: Dict[int, List[float]] = {}
+        cleared: List[int] = []
+        matrix = _open_matrix(threads_dir, len(ids), "r+")
+        dim = matrix.shape[1] if matrix is not None else None
+        for node in changed:
+            node_id = node.get("id")
+            if node_id not in where:
+                continue
+            row = rows.get(node_id)
+            embedding = embedding_codec.decode(node.get("embedding"))
+            if embedding and (dim is None or len(embedding) == dim):
+                dim = len(embedding)
+                if row is None:
+                    row = len(ids)
+                    ids.append(node_id)
+                    types.append(node.get("type") or "")
+                    spans.append(where[node_id])
+                updates[row] = embedding
+            elif row is not None:
+                ids[row] = None
+                cleared.append(row)
+
+        if updates or cleared:
+            capacity = matrix.shape[0] if matrix is not None else 0
+            if len(ids) > capacity:
+                # Out of spare rows: reallocate with room to grow
+                grown = np.zeros((len(ids), dim), dtype=np.float32)
+                if matrix is not None:
+                    grown[: capacity] = matrix[: capacity]
+                del matrix
+                _write_matrix(threads_dir, grown, len(ids) + max(_MIN_SPARE, len(ids) // 4))
+                matrix = _open_matrix(threads_dir, len(ids), "r+")
+            for row in cleared:
+                matrix[row] = 0.0
+            if updates:
+                block = _normalise(np.asarray(list(updates.values()), dtype=np.float32))
+                matrix[list(updates)] = block
+            matrix.flush()
+
+            live = np.asarray([i is not None for i in ids], dtype=bool)
+            if not _ann_enabled or (ivf is not None and ivf.centroids.shape[1] != dim):
+                ivf = None
+            if _ann_enabled and int(live.sum()) >= max(_ann_min_rows, _RETRAIN_GROWTH * (ivf.trained if ivf else 0)):
+                # No index yet, or the lists have drifted since training
+                ivf = _train(matrix[: len(ids)], live)
+                _write_centroids(threads_dir, ivf.centroids)
+            elif ivf is not None:
+                lists = np.full(len(ids), -1, dtype=np.int32)
+                lists[: len(ivf.lists)] = ivf.lists
+                lists[cleared] = -1
+                if updates:
+                    lists[list(updates)] = _assign(block, ivf.centroids)
+                ivf = _Ivf(ivf.centroids, lists, ivf.trained)
+        del matrix
+        _save_ids(threads_dir, tag, ids, types, spans, ivf)
+    except (OSError, ValueError, KeyError, TypeError, IndexError):
+        # Leave the ids file tagged with the old state: rebuilt at next query
+        pass
@@ -11,6 +11,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+from . import embedding_codec
+from .jsonl_log import latest
 from .parser import ParsedThread, ParsedEntry, iter_threads
 from .summarizer import SummarizerConfig
 
@@ -118,49 +120,55 @@ def _extract_entry_refs(text: str) -> List[str]:
     return list(set(ENTRY_ID_RE.findall(text)))
 
 
-def generate_cross_references(
-    threads: List[ParsedThread],
-) -> Iterator[Dict[str, Any]]:
-    """Generate cross-reference edges between threads and entries.
+def _thread_ref_candidates(text: str) -> List[str]:
+    """Every topic that _extract_thread_refs() could match in ``text``,
+    depending on the known topics."""
+    refs = set(THREAD_REF_EXPLICIT_RE.findall(text))
+    refs.update(topic for _, topic in THREAD_MD_LINK_RE.findall(text))
+    refs.update(match for match in THREAD_BACKTICK_RE.findall(text) if len(match) >= 10)
+    return list(refs)
 
-    Detects when entries reference other threads or entries and creates
-    'references' edges for the knowledge graph.
 
-    Args:
-        threads: List of all parsed threads
+class CrossReferenceCollector:
+    """Collects cross-references thread by thread, resolving them at the end.
 
-    Yields:
-        Edge dicts for cross-references
+    Whether a reference is an edge depends on all exported topics and entry
+    IDs, so threads streamed out one at a time keep only their candidate
+    references here (not their bodies) until every thread has been seen.
     """
-    # Build lookup maps
-    known_topics = {t.topic for t in threads}
-    entry_to_thread = {}  # entry_id -> topic
 
-    for thread in threads:
-        for entry in thread.entries:
-            entry_to_thread[entry.entry_id] = thread.topic
+    def __init__(self) -> None:
+        self._topics: set = set()
+        self._entry_ids: set = set()
+        # (entry_id, thread topic, candidate topics, referenced entry IDs)
+        self._candidates: List[Tuple[str, str, List[str], List[str]]] = []
 
-    # Scan all entries for cross-references
-    for thread in threads:
+    def add(self, thread: ParsedThread) -> None:
+        self._topics.add(thread.topic)
         for entry in thread.entries:
-            entry_id = f"entry:{entry.entry_id}"
+            self._entry_ids.add(entry.entry_id)
+            topics = _thread_ref_candidates(entry.body)
+            entry_refs = _extract_entry_refs(entry.body)
+            if topics or entry_refs:
+                self._candidates.append((entry.entry_id, thread.topic, topics, entry_refs))
 
-            # Thread references
-            thread_refs = _extract_thread_refs(entry.body, known_topics)
-            for ref_topic in thread_refs:
-                # Don't create self-references to own thread
-                if ref_topic != thread.topic:
+    def edges(self) -> Iterator[Dict[str, Any]]:
+        """Cross-reference edges between the threads added so far."""
+        for source_id, topic, topics, entry_refs in self._candidates:
+            entry_id = f"entry:{source_id}"
+
+            # Thread references (no self-references to own thread)
+            for ref_topic in topics:
+                if ref_topic in self._topics and ref_topic != topic:
                     yield {
                         "source": entry_id,
                         "target": f"thread:{ref_topic}",
                         "type": "references",
                     }
 
-            # Entry references
-            entry_refs = _extract_entry_refs(entry.body)
+            # Entry references (no self-references)
             for ref_entry_id in entry_refs:
-                # Don't create self-references
-                if ref_entry_id != entry.entry_id and ref_entry_id in entry_to_thread:
+                if ref_entry_id != source_id and ref_entry_id in self._entry_ids:
                     yield {
                         "source": entry_id,
                         "target": f"entry:{ref_entry_id}",
@@ -168,6 +176,26 @@ def generate_cross_references(
                     }
 
 
+def generate_cross_references(
+    threads: List[ParsedThread],
+) -> Iterator[Dict[str, Any]]:
+    """Generate cross-reference edges between threads and entries.
+
+    Detects when entries reference other threads or entries and creates
+    'references' edges for the knowledge graph.
+
+    Args:
+        threads: List of all parsed threads
+
+    Yields:
+        Edge dicts for cross-references
+    """
+    collector = CrossReferenceCollector()
+    for thread in threads:
+        collector.add(thread)
+    yield from collector.edges()
+
+
 def thread_to_node(thread: ParsedThread) -> Dict[str, Any]:
     """Convert ParsedThread to graph node.
 
@@ -190,7 +218,7 @@ def thread_to_node(thread: ParsedThread) -> Dict[str, Any]:
     }
     # Include embedding if present (added by pipeline runner)
     if hasattr(thread, "embedding") and thread.embedding:
-        node["embedding"] = thread.embedding
+        node["embedding"] = embedding_codec.encode(thread.embedding)
     return node
 
 
@@ -223,7 +251,7 @@ def entry_to_node(entry: ParsedEntry, topic: str) -> Dict[str, Any]:
     }
     # Include embedding if present (added by pipeline runner)
     if hasattr(entry, "embedding") and entry.embedding:
-        node["embedding"] = entry.embedding
+        node["embedding"] = embedding_codec.encode(entry.embedding)
     return node
 
 
@@ -402,22 +430,25 @@ def load_nodes(nodes_file: Path) -> Iterator[Dict[str, Any]]:
         nodes_file: Path to nodes.jsonl
 
     Yields:
-        Node dicts
+        Node dicts, the last record per key of the append log (see
+        ``jsonl_log``)
 
     Raises:
         json.JSONDecodeError: If a line contains invalid JSON (with line number context)
     """
+    records: List[Dict[str, Any]] = []
     with open(nodes_file, "r", encoding="utf-8") as f:
         for line_num, line in enumerate(f, 1):
             if line.strip():
                 try:
-                    yield json.loads(line)
+                    records.append(json.loads(line))
                 except json.JSONDecodeError as e:
                     raise json.JSONDecodeError(
                         f"Invalid JSON at line {line_num} in {nodes_file}: {e.msg}",
                         e.doc,
                         e.pos,
                     ) from e
+    yield from latest(records)
 
 
 def load_edges(edges_file: Path) -> Iterator[Dict[str, Any]]:
@@ -427,22 +458,25 @@ def load_edges(edges_file: Path) -> Iterator[Dict[str, Any]]:
         edges_file: Path to edges.jsonl
 
     Yields:
-        Edge dicts
+        Edge dicts, the last record per key of the append log (see
+        ``jsonl_log``)
 
     Raises:
         json.JSONDecodeError: If a line contains invalid JSON (with line number context)
     """
+    records: List[Dict[str, Any]] = []
     with open(edges_file, "r", encoding="utf-8") as f:
         for line_num, line in enumerate(f, 1):
             if line.strip():
                 try:
-                    yield json.loads(line)
+                    records.append(json.loads(line))
                 except json.JSONDecodeError as e:
                     raise json.JSONDecodeError(
                         f"Invalid JSON at line {line_num} in {edges_file}: {e.msg}",
                         e.doc,
                         e.pos,
                     ) from e
+    yield from latest(records)
 
 
 def load_graph(graph_dir: Path) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
@@ -0,0 +1,350 @@
+"""Process-wide in-memory snapshot of the baseline graph.
+
+A long-running MCP server answers many read tools against the same graph.
+Instead of going to the SQLite store (see ``graph_store``) on every call, it
+can hold a parsed snapshot of ``nodes.jsonl``: node metadata by id, thread
+nodes by topic, entry nodes by entry_id and each thread's entries sorted by
+index. A lookup then costs one ``stat`` of ``nodes.jsonl`` plus dict and
+bisect lookups.
+
+A snapshot is tagged with the stat of ``nodes.jsonl`` it was read from.
+Graph sync in this process patches it after each write (see
+:func:`note_graph_write`); any other change shows up as a stat mismatch and
+the snapshot is re-read at the next lookup.
+
+Snapshots hold node metadata only. Entry bodies share one LRU across all
+snapshots, capped at ``max_body_bytes`` (counted in characters); evicted
+bodies are re-read from the node's line of ``nodes.jsonl`` on demand.
+Embeddings are never cached, so lookups return nodes without them.
+
+The cache is off until :func:`enable` is called, which the MCP server does
+at startup (``mcp.graph.memory_cache``); one-shot CLI processes would only
+pay for building a snapshot. Lookups return None while the cache is disabled
+or the graph cannot be read, and callers fall back to the store.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from ..search_index import StatTag, stat_tag
+from .jsonl_log import SEQ_FIELD
+
+
+DEFAULT_MAX_BODY_BYTES = 256 << 20
+
+# Kept out of the snapshot's node metadata
+_HEAVY_FIELDS = ("body", "embedding", SEQ_FIELD)
+
+_lock = threading.RLock()
+_enabled = False
+_max_body_bytes = DEFAULT_MAX_BODY_BYTES
+_snapshots: Dict[str, "_Snapshot"] = {}
+# (nodes file, node id) -> body, least recently used first
+_bodies: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+_body_bytes = 0
+
+
+class _OutOfStep(Exception):
+    """The snapshot cannot be patched incrementally."""
+
+
+def enable(max_body_bytes: int = DEFAULT_MAX_BODY_BYTES) -> None:
+    """Serve graph lookups from memory, caching at most ``max_body_bytes`` of bodies."""
+    global _enabled, _max_body_bytes
+    with _lock:
+        _enabled = True
+        _max_body_bytes = max_body_bytes
+        _evict()
+
+
+def disable() -> None:
+    """Stop serving lookups from memory and drop all snapshots."""
+    global _enabled, _body_bytes
+    with _lock:
+        _enabled = False
+        _snapshots.clear()
+        _bodies.clear()
+        _body_bytes = 0
+
+
+def _put_body(key: Tuple[str, str], body: str) -> None:
+    global _body_bytes
+    _drop_body(key)
+    _bodies[key] = body
+    _body_bytes += len(body)
+    _evict()
+
+
+def _drop_body(key: Tuple[str, str]) -> None:
+    global _body_bytes
+    body = _bodies.pop(key, None)
+    if body is not None:
+        _body_bytes -= len(body)
+
+
+def _evict() -> None:
+    global _body_bytes
+    while _bodies and _body_bytes > _max_body_bytes:
+        _key, body = _bodies.popitem(last=False)
+        _body_bytes -= len(body)
+
+
+class _Snapshot:
+    """Indexed node metadata of one version of ``nodes.jsonl``."""
+
+    def __init__(self, nodes_file: Path, tag: StatTag) -> None:
+        self.nodes_file = nodes_file
+        self.tag = tag
+        self.name = str(nodes_file)
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.spans: Dict[str, Tuple[int, int]] = {}
+        self.threads: Dict[str, str] = {}
+        self.entry_ids: Dict[str, str] = {}
+        self.with_body: Set[str] = set()
+        self.topic_entries: Dict[str, Dict[str, None]] = {}
+        # topic -> (indexes, node ids) sorted by index, built lazily
+        self.sorted: Dict[str, Tuple[List[int], List[str]]] = {}
+
+    def add(self, node_id: str, node: Dict[str, Any], offset: int, length: int) -> None:
+        """Index ``node`` as the current version of ``node_id``."""
+        self.remove(node_id)
+        meta = {k: v for k, v in node.items() if k not in _HEAVY_FIELDS}
+        self.nodes[node_id] = meta
+        self.spans[node_id] = (offset, length)
+        if meta.get("type") == "thread":
+            self.threads[meta.get("topic")] = node_id
+        elif meta.get("type") == "entry":
+            topic = meta.get("thread_topic")
+            self.topic_entries.setdefault(topic, {})[node_id] = None
+            self.sorted.pop(topic, None)
+            if meta.get("entry_id"):
+                self.entry_ids[meta["entry_id"]] = node_id
+        if isinstance(node.get("body"), str):
+            self.with_body.add(node_id)
+            _put_body((self.name, node_id), node["body"])
+
+    def remove(self, node_id: str) -> None:
+        meta = self.nodes.pop(node_id, None)
+        if meta is None:
+            return
+        del self.spans[node_id]
+        self.with_body.discard(node_id)
+        _drop_body((self.name, node_id))
+        if meta.get("type") == "thread":
+            if self.threads.get(meta.get("topic")) == node_id:
+                del self.threads[meta.get("topic")]
+        elif meta.get("type") == "entry":
+            topic = meta.get("thread_topic")
+            self.topic_entries.get(topic, {}).pop(node_id, None)
+            self.sorted.pop(topic, None)
+            if self.entry_ids.get(meta.get("entry_id")) == node_id:
+                del self.entry_ids[meta["entry_id"]]
+
+    def entries(self, topic: str) -> Tuple[List[int], List[str]]:
+        order = self.sorted.get(topic)
+        if order is None:
+            ids = [node_id for node_id in self.topic_entries.get(topic, {})
+                   if isinstance(self.nodes[node_id].get("index"), int)]
+            ids.sort(key=lambda node_id: self.nodes[node_id]["index"])
+            order = self.sorted[topic] = ([self.nodes[i]["index"] for i in ids], ids)
+        return order
+
+    def materialize(self, ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """Copies of the nodes ``ids`` with their bodies, in file order."""
+        out = []
+        f: Optional[BinaryIO] = None
+        try:
+            for node_id in sorted(set(ids), key=lambda node_id: self.spans[node_id][0]):
+                node = dict(self.nodes[node_id])
+                key = (self.name, node_id)
+                if key in _bodies:
+                    _bodies.move_to_end(key)
+                    node["body"] = _bodies[key]
+                elif node_id in self.with_body:
+                    if f is None:
+                        f = open(self.nodes_file, "rb")
+                    node["body"] = self._read_body(f, node_id)
+                out.append(node)
+        finally:
+            if f is not None:
+                f.close()
+        return out
+
+    def _read_body(self, f: BinaryIO, node_id: str) -> str:
+        offset, length = self.spans[node_id]
+        f.seek(offset)
+        line = json.loads(f.read(length))
+        body = line.get("body")
+        if line.get("id") != node_id or not isinstance(body, str):
+            raise _OutOfStep(node_id)
+        _put_body((self.name, node_id), body)
+        return body
+
+
+def _read(nodes_file: Path) -> _Snapshot:
+    with open(nodes_file, "rb") as f:
+        snap = _Snapshot(nodes_file, stat_tag(os.fstat(f.fileno())))
+        offset = 0
+        for raw in f:
+            if raw.strip():
+                try:
+                    node = json.loads(raw)
+                except ValueError:
+                    node = None
+                if isinstance(node, dict) and node.get("id"):
+                    snap.add(node["id"], node, offset, len(raw))
+            offset += len(raw)
+    return snap
+
+
+def _snapshot(nodes_file: Path) -> _Snapshot:
+    snap = _snapshots.get(str(nodes_file))
+    if snap is None or snap.tag != stat_tag(nodes_file.stat()):
+        _snapshots.pop(str(nodes_file), None)
+        if snap is not None:
+            for key in [k for k in _bodies if k[0] == snap.name]:
+                _drop_body(key)
+        snap = _snapshots[str(nodes_file)] = _read(nodes_file)
+    return snap
+
+
+def find_nodes(
+    threads_dir: Path,
+    nodes_file: Path,
+    *,
+    node_type: Optional[str] = None,
+    topic: Optional[str] = None,
+    thread_topic: Optional[str] = None,
+    entry_id: Optional[str] = None,
+    index: Optional[int] = None,
+    min_index: Optional[int] = None,
+    max_index: Optional[int] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """In-memory ``graph_store.find_nodes``; nodes come without embeddings.
+
+    Returns None if the cache is disabled or the graph cannot be read.
+    """
+    if not _enabled:
+        return None
+    filters = {"type": node_type, "topic": topic, "thread_topic": thread_topic,
+               "entry_id": entry_id, "index": index}
+    with _lock:
+        try:
+            snap = _snapshot(nodes_file)
+            if entry_id is not None:
+                ids: Iterable[str] = [snap.entry_ids[entry_id]] if entry_id in snap.entry_ids else []
+            elif node_type == "thread" and topic is not None:
+                ids = [snap.threads[topic]] if topic in snap.threads else []
+            elif node_type == "entry" and thread_topic is not None:
+                indexes, ids = snap.entries(thread_topic)
+                lo, hi = min_index, max_index
+                if index is not None:
+                    lo = hi = index
+                ids = ids[bisect.bisect_left(indexes, lo) if lo is not None else 0:
+                          bisect.bisect_right(indexes, hi) if hi is not None else len(ids)]
+            elif node_type == "thread":
+                ids = list(snap.threads.values())
+            else:
+                ids = list(snap.nodes)
+            matched = []
+            for node_id in ids:
+                meta = snap.nodes[node_id]
+                node_index = meta.get("index")
+                if any(v is not None and meta.get(k) != v for k, v in filters.items()):
+                    continue
+                if min_index is not None and not (isinstance(node_index, int) and node_index >= min_index):
+                    continue
+                if max_index is not None and not (isinstance(node_index, int) and node_index <= max_index):
+                    continue
+                matched.append(node_id)
+            return snap.materialize(matched)
+        except (OSError, ValueError, _OutOfStep):
+            _snapshots.pop(str(nodes_file), None)
+            return None
+
+
+def search_candidates(
+    threads_dir: Path,
+    nodes_file: Path,
+    types: Sequence[str],
+    thread_topic: Optional[str] = None,
+    thread_status: Optional[str] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """In-memory ``graph_store.search_candidates``; nodes come without embeddings.
+
+    Returns None if the cache is disabled or the graph cannot be read.
+    """
+    if not _enabled:
+        return None
+    with _lock:
+        try:
+            snap = _snapshot(nodes_file)
+            ids: List[str] = []
+            if "thread" in types:
+                if thread_topic is not None:
+                    threads = [snap.threads[thread_topic]] if thread_topic in snap.threads else []
+                else:
+                    threads = list(snap.threads.values())
+                if thread_status is not None:
+                    status = thread_status.upper()
+                    threads = [t for t in threads if str(snap.nodes[t].get("status") or "").upper() == status]
+                ids += threads
+            if "entry" in types:
+                if thread_topic is not None:
+                    ids += snap.topic_entries.get(thread_topic, {})
+                else:
+                    ids += [e for entries in snap.topic_entries.values() for e in entries]
+            return snap.materialize(ids)
+        except (OSError, ValueError, _OutOfStep):
+            _snapshots.pop(str(nodes_file), None)
+            return None
+
+
+def note_graph_write(
+    threads_dir: Path,
+    before: Optional[os.stat_result],
+    nodes_file: Path,
+    layout: List[Tuple[str, int, int]],
+    changed: List[Dict[str, Any]],
+    appended: bool = False,
+) -> None:
+    """Patch the snapshot of ``nodes_file`` after it was rewritten or appended to.
+
+    Same arguments as ``graph_store.note_graph_write``. Skipped if the
+    snapshot was not fresh for ``before``; it is then re-read at the next
+    lookup.
+    """
+    with _lock:
+        snap = _snapshots.get(str(nodes_file))
+        if snap is None or before is None or snap.tag != stat_tag(before):
+            return
+        try:
+            tag = stat_tag(nodes_file.stat())
+            if appended:
+                # One appended line per changed node, in order; the last wins
+                for node, (_key, offset, length) in zip(changed, layout):
+                    if node.get("id"):
+                        snap.add(node["id"], node, offset, length)
+            else:
+                fresh = {node.get("id"): node for node in changed if node.get("id")}
+                gone = set(snap.nodes)
+                for node_id, offset, length in layout:
+                    if node_id in fresh:
+                        snap.add(node_id, fresh[node_id], offset, length)
+                    elif node_id in gone:
+                        snap.spans[node_id] = (offset, length)
+                    else:
+                        raise _OutOfStep(node_id)
+                    gone.discard(node_id)
+                for node_id in gone:
+                    snap.remove(node_id)
+            snap.tag = tag
+        except (OSError, _OutOfStep):
+            _snapshots.pop(str(nodes_file), None)
@@ -0,0 +1,306 @@
+"""SQLite store for indexed lookups over the baseline graph.
+
+The graph reader answers questions like "the entries of thread X" or "entry
+Y" by decoding every line of ``nodes.jsonl``, so reading one thread costs
+O(graph). This module keeps ``.wc-cache/graph.sqlite`` with one row per
+current node (the last record of its id in the log, see ``jsonl_log``): the
+columns the reader and search filter on (type, topic, thread_topic,
+entry_id, index, timestamp, status) are indexed, and each row holds the byte
+range of the node's line so only matching nodes are read and decoded.
+
+``nodes.jsonl`` stays the git-tracked source of truth; the store lives in
+the git-ignored cache and is regenerable from it at any time. It is tagged
+with the stat of ``nodes.jsonl`` it describes, updated by graph sync after
+each write (see :func:`note_graph_write`) and rebuilt at the next query on
+any other change. Like the other ``.wc-cache`` indexes this is a pure cache:
+lookups return None when the store is unavailable and callers fall back to
+scanning ``nodes.jsonl``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ..fs import cache_dir
+from ..search_index import StatTag, stat_tag
+from .jsonl_log import SEQ_FIELD
+
+
+STORE_NAME = "graph.sqlite"
+_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS nodes (
+    id INTEGER PRIMARY KEY,
+    node_id TEXT,
+    type TEXT,
+    topic TEXT,
+    thread_topic TEXT,
+    entry_id TEXT,
+    entry_index INTEGER,
+    timestamp TEXT,
+    status TEXT,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS nodes_node ON nodes (node_id);
+CREATE INDEX IF NOT EXISTS nodes_topic ON nodes (type, topic);
+CREATE INDEX IF NOT EXISTS nodes_thread ON nodes (thread_topic, entry_index);
+CREATE INDEX IF NOT EXISTS nodes_entry ON nodes (entry_id);
+CREATE INDEX IF NOT EXISTS nodes_status ON nodes (type, status);
+CREATE INDEX IF NOT EXISTS nodes_timestamp ON nodes (timestamp);
+"""
+
+_SQL_CHUNK = 500
+_COLUMNS = ("node_id", "type", "topic", "thread_topic", "entry_id", "entry_index", "timestamp", "status")
+
+
+class _OutOfStep(Exception):
+    """The store cannot be updated incrementally."""
+
+
+def store_path(threads_dir: Path) -> Path:
+    return cache_dir(threads_dir) / STORE_NAME
+
+
+def _connect(threads_dir: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(store_path(threads_dir)), timeout=10, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != _SCHEMA_VERSION:
+            with _transaction(conn):
+                conn.execute("DROP TABLE IF EXISTS nodes")
+                conn.execute("DROP TABLE IF EXISTS meta")
+                for stmt in _SCHEMA.split(";"):
+                    if stmt.strip():
+                        conn.execute(stmt)
+                conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+    except Exception:
+        conn.close()
+        raise
+    return conn
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection) -> Iterator[None]:
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _row(node: Dict[str, Any], offset: int, length: int) -> Tuple[Any, ...]:
+    index = node.get("index")
+    status = node.get("status")
+    return (
+        node.get("id") or None,
+        node.get("type"),
+        node.get("topic"),
+        node.get("thread_topic"),
+        node.get("entry_id"),
+        index if isinstance(index, int) else None,
+        node.get("timestamp") or node.get("last_updated"),
+        status.upper() if isinstance(status, str) else None,
+        offset,
+        length,
+    )
+
+
+def _insert(conn: sqlite3.Connection, nodes: List[Tuple[Dict[str, Any], int, int]]) -> None:
+    conn.executemany(
+        f"INSERT OR REPLACE INTO nodes ({', '.join(_COLUMNS)}, offset, length) "
+        f"VALUES ({', '.join('?' * (len(_COLUMNS) + 2))})",
+        (_row(node, offset, length) for node, offset, length in nodes),
+    )
+
+
+def _store_tag(conn: sqlite3.Connection) -> Optional[StatTag]:
+    row = conn.execute("SELECT value FROM meta WHERE key = 'tag'").fetchone()
+    return tuple(json.loads(row[0])) if row else None  # type: ignore[return-value]
+
+
+def _set_tag(conn: sqlite3.Connection, tag: StatTag) -> None:
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('tag', ?)", (json.dumps(list(tag)),))
+
+
+def _rebuild(conn: sqlite3.Connection, f: BinaryIO, tag: StatTag) -> None:
+    # nodes.jsonl is an append log: store the last line of each node id
+    latest: Dict[Any, Tuple[Dict[str, Any], int, int]] = {}
+    f.seek(0)
+    offset = 0
+    for raw in f:
+        if raw.strip():
+            try:
+                node = json.loads(raw)
+            except ValueError:
+                node = None
+            if isinstance(node, dict):
+                key = node.get("id") or offset
+                latest.pop(key, None)
+                latest[key] = (node, offset, len(raw))
+        offset += len(raw)
+    with _transaction(conn):
+        conn.execute("DELETE FROM nodes")
+        _insert(conn, list(latest.values()))
+        _set_tag(conn, tag)
+
+
+def _select(
+    threads_dir: Path, nodes_file: Path, where: str, params: Sequence[Any]
+) -> Optional[List[Dict[str, Any]]]:
+    """Nodes of ``nodes_file`` matching the SQL condition ``where``, in file order."""
+    try:
+        with open(nodes_file, "rb") as f, closing(_connect(threads_dir)) as conn:
+            # Reading through the open handle keeps offsets consistent with
+            # the version we stored, even if sync replaces the file meanwhile
+            tag = stat_tag(os.fstat(f.fileno()))
+            if _store_tag(conn) != tag:
+                _rebuild(conn, f, tag)
+            spans = conn.execute(f"SELECT offset, length FROM nodes WHERE {where} ORDER BY offset", params).fetchall()
+            out: List[Dict[str, Any]] = []
+            for offset, length in spans:
+                f.seek(offset)
+                try:
+                    node = json.loads(f.read(length))
+                except ValueError:
+                    continue
+                node.pop(SEQ_FIELD, None)
+                out.append(node)
+            return out
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def find_nodes(
+    threads_dir: Path,
+    nodes_file: Path,
+    *,
+    node_type: Optional[str] = None,
+    topic: Optional[str] = None,
+    thread_topic: Optional[str] = None,
+    entry_id: Optional[str] = None,
+    index: Optional[int] = None,
+    min_index: Optional[int] = None,
+    max_index: Optional[int] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """Return the current nodes of ``nodes_file`` matching all given filters.
+
+    Nodes come in file order. Returns None if the store is unavailable.
+    """
+    conds: List[str] = []
+    params: List[Any] = []
+    for column, value in (
+        ("type", node_type),
+        ("topic", topic),
+        ("thread_topic", thread_topic),
+        ("entry_id", entry_id),
+        ("entry_index", index),
+    ):
+        if value is not None:
+            conds.append(f"{column} = ?")
+            params.append(value)
+    if min_index is not None:
+        conds.append("entry_index >= ?")
+        params.append(min_index)
+    if max_index is not None:
+        conds.append("entry_index <= ?")
+        params.append(max_index)
+    return _select(threads_dir, nodes_file, " AND ".join(conds) or "1", params)
+
+
+def search_candidates(
+    threads_dir: Path,
+    nodes_file: Path,
+    types: Sequence[str],
+    thread_topic: Optional[str] = None,
+    thread_status: Optional[str] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """Nodes that can pass ``search_graph``'s AND-mode type, topic and status filters.
+
+    Thread nodes are matched on ``topic`` and ``status``, entry nodes on
+    ``thread_topic``. Returns None if the store is unavailable.
+    """
+    conds = [f"type IN ({','.join('?' * len(types))})"]
+    params: List[Any] = list(types)
+    if thread_topic is not None:
+        conds.append("((type = 'thread' AND topic = ?) OR (type = 'entry' AND thread_topic = ?))")
+        params += [thread_topic, thread_topic]
+    if thread_status is not None:
+        conds.append("(type != 'thread' OR status = ?)")
+        params.append(thread_status.upper())
+    return _select(threads_dir, nodes_file, " AND ".join(conds), params)
+
+
+def build(threads_dir: Path, nodes_file: Path) -> bool:
+    """Rebuild the store for ``nodes_file`` now.
+
+    Used after bulk graph builds so the first lookup does not pay for it.
+    """
+    try:
+        with open(nodes_file, "rb") as f, closing(_connect(threads_dir)) as conn:
+            _rebuild(conn, f, stat_tag(os.fstat(f.fileno())))
+        return True
+    except (OSError, sqlite3.Error):
+        return False
+
+
+def note_graph_write(
+    threads_dir: Path,
+    before: Optional[os.stat_result],
+    nodes_file: Path,
+    layout: List[Tuple[str, int, int]],
+    changed: List[Dict[str, Any]],
+    appended: bool = False,
+) -> None:
+    """Update the store after ``nodes_file`` was rewritten or appended to.
+
+    ``layout`` lists (id, offset, length) for every line of the new file and
+    ``changed`` the nodes that were upserted; the other nodes just move.
+    With ``appended``, ``layout`` only lists the lines appended for
+    ``changed``. Skipped if the store was not fresh for ``before``.
+    """
+    if before is None or not store_path(threads_dir).exists():
+        return
+    try:
+        with closing(_connect(threads_dir)) as conn, _transaction(conn):
+            if _store_tag(conn) != stat_tag(before):
+                return
+            tag = stat_tag(nodes_file.stat())
+            fresh = {node.get("id"): node for node in changed if node.get("id")}
+            if appended:
+                # One appended line per changed node, in order; the last wins
+                latest = {(key or offset): (node, offset, length) for node, (key, offset, length) in zip(changed, layout)}
+                _insert(conn, list(latest.values()))
+            else:
+                gone = {node_id for (node_id,) in conn.execute("SELECT node_id FROM nodes WHERE node_id IS NOT NULL")}
+                added: List[Tuple[Dict[str, Any], int, int]] = []
+                moves: List[Tuple[int, int, str]] = []
+                for node_id, offset, length in layout:
+                    if node_id in fresh:
+                        added.append((fresh[node_id], offset, length))
+                    elif node_id in gone:
+                        moves.append((offset, length, node_id))
+                    else:
+                        # Unknown to the store (or listed twice) and not upserted
+                        raise _OutOfStep(node_id)
+                    gone.discard(node_id)
+                stale = sorted(gone)
+                for i in range(0, len(stale), _SQL_CHUNK):
+                    chunk = stale[i:i + _SQL_CHUNK]
+                    conn.execute(f"DELETE FROM nodes WHERE node_id IN ({','.join('?' * len(chunk))})", chunk)
+                conn.executemany("UPDATE nodes SET offset = ?, length = ? WHERE node_id = ?", moves)
+                _insert(conn, added)
+            _set_tag(conn, tag)
+    except (OSError, sqlite3.Error, _OutOfStep):
+        pass
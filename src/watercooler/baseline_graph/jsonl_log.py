@@ -0,0 +1,240 @@
+"""Append-only log format for ``nodes.jsonl`` and ``edges.jsonl``.
+
+Graph sync used to load the whole file, upsert a couple of records and
+rewrite it through a tempfile, so every ``watercooler_say`` cost O(graph)
+I/O and produced a whole-file git diff. Instead, upserts are now appended
+as new lines carrying a ``_seq`` write number, and readers resolve the log:
+the last record per key wins and sits at the position of that last record.
+A record's key is its ``id`` (or ``uuid``), or ``source + target`` for edges
+(see :func:`record_key`).
+
+Superseded lines are dropped by :func:`compact`, which rewrites the file
+with only the live records. Sync triggers it once the file has grown to
+``COMPACT_GROWTH`` times its size after the previous compaction (and at
+least ``COMPACT_MIN_BYTES``); that base size is kept in
+``.wc-cache/graph_log.json``. Losing the sidecar only postpones compaction.
+
+Files written before this format (no ``_seq``, one line per key) are valid
+logs, and a compacted log is again a plain one-line-per-key JSONL file.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..fs import atomic_write_bytes, cache_dir, CACHE_DIR_NAME
+
+logger = logging.getLogger(__name__)
+
+
+SEQ_FIELD = "_seq"
+STATE_NAME = "graph_log.json"
+COMPACT_MIN_BYTES = 1 << 20
+COMPACT_GROWTH = 2.0
+# Bytes read from the end of the file per step when looking for the last seq
+_TAIL_BYTES = 64 * 1024
+
+
+def state_path(threads_dir: Path) -> Path:
+    return threads_dir / CACHE_DIR_NAME / STATE_NAME
+
+
+def record_key(item: Dict[str, Any]) -> str:
+    """The key upserts of ``item`` replace each other by ("" if it has none)."""
+    return item.get("id") or item.get("uuid") or item.get("source", "") + item.get("target", "")
+
+
+def latest(records: Iterable[Dict[str, Any]], keep_seq: bool = False) -> List[Dict[str, Any]]:
+    """Resolve a log: the last record per key, at the position of that record.
+
+    ``_seq`` is removed from the returned records unless ``keep_seq``.
+    Records without a key are all kept.
+    """
+    out: Dict[Any, Dict[str, Any]] = {}
+    for i, item in enumerate(records):
+        key: Any = record_key(item) or i
+        out.pop(key, None)
+        if not keep_seq:
+            item.pop(SEQ_FIELD, None)
+        out[key] = item
+    return list(out.values())
+
+
+def iter_records(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield the raw records of ``path`` in file order, skipping invalid lines."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                try:
+                    item = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(item, dict):
+                    yield item
+
+
+def read_latest(path: Path) -> List[Dict[str, Any]]:
+    """The live records of the log at ``path`` (empty if it does not exist)."""
+    if not path.exists():
+        return []
+    return latest(iter_records(path))
+
+
+def _last_seq(f: Any, size: int) -> int:
+    """The ``_seq`` of the last valid line of the file open as ``f``.
+
+    Returns 0 for empty files and logs whose tail has no ``_seq`` yet.
+    """
+    end = size
+    partial = b""
+    while end > 0:
+        start = max(0, end - _TAIL_BYTES)
+        f.seek(start)
+        lines = (f.read(end - start) + partial).split(b"\n")
+        # The first piece may be cut mid-line unless we reached the start
+        partial = lines.pop(0) if start else b""
+        for raw in reversed(lines):
+            if raw.strip():
+                try:
+                    item = json.loads(raw)
+                except ValueError:
+                    continue
+                if isinstance(item, dict):
+                    seq = item.get(SEQ_FIELD)
+                    return seq if isinstance(seq, int) else 0
+        end = start
+    return 0
+
+
+def append(path: Path, items: List[Dict[str, Any]]) -> List[Tuple[str, int, int]]:
+    """Append ``items`` as the newest records of the log at ``path``.
+
+    The records are written with one ``write`` on a file opened for
+    appending, so concurrent writers do not interleave lines.
+
+    Returns:
+        (key, byte offset, byte length) of every appended line
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "ab+") as f:
+        size = f.seek(0, os.SEEK_END)
+        seq = _last_seq(f, size)
+        data = bytearray()
+        if size:
+            f.seek(size - 1)
+            if f.read(1) != b"\n":
+                # Terminate a torn last line so it cannot swallow ours
+                data += b"\n"
+        layout: List[Tuple[str, int, int]] = []
+        for item in items:
+            seq += 1
+            line = (json.dumps({**item, SEQ_FIELD: seq}) + "\n").encode("utf-8")
+            layout.append((record_key(item), size + len(data), len(line)))
+            data += line
+        os.write(f.fileno(), bytes(data))
+    return layout
+
+
+def _state_key(path: Path) -> str:
+    return str(path.resolve())
+
+
+def _load_state(threads_dir: Path) -> Dict[str, int]:
+    try:
+        data = json.loads(state_path(threads_dir).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _set_base(threads_dir: Path, path: Path, size: int) -> None:
+    try:
+        state = _load_state(threads_dir)
+        state[_state_key(path)] = size
+        cache_dir(threads_dir)
+        atomic_write_bytes(state_path(threads_dir), json.dumps(state).encode("utf-8"))
+    except OSError:
+        pass
+
+
+def needs_compaction(threads_dir: Path, path: Path) -> bool:
+    """Whether the log at ``path`` has grown enough since its last compaction.
+
+    A log without a recorded base size (or one smaller than it, e.g. after a
+    checkout or a full export) starts a new base at its current size.
+    """
+    try:
+        size = path.stat().st_size
+    except OSError:
+        return False
+    base = _load_state(threads_dir).get(_state_key(path))
+    if not isinstance(base, int) or size < base:
+        _set_base(threads_dir, path, size)
+        return False
+    return size >= max(COMPACT_MIN_BYTES, COMPACT_GROWTH * base)
+
+
+def compact(
+    path: Path,
+    threads_dir: Optional[Path] = None,
+    transform: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+) -> List[Tuple[str, int, int]]:
+    """Rewrite the log at ``path`` with only its live records.
+
+    Live records keep their ``_seq`` and their order, and are passed
+    through ``transform`` if given. Lines appended while the rewrite ran
+    are carried over verbatim before the file is replaced.
+
+    Returns:
+        (key, byte offset, byte length) of every line of the compacted file
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp_", suffix=".jsonl")
+    try:
+        with open(path, "rb") as src, os.fdopen(fd, "wb") as out:
+            records: List[Dict[str, Any]] = []
+            for raw in src:
+                if raw.strip():
+                    try:
+                        item = json.loads(raw)
+                    except ValueError:
+                        continue
+                    if isinstance(item, dict):
+                        records.append(item)
+            read = src.tell()
+            layout: List[Tuple[str, int, int]] = []
+            offset = 0
+            for item in latest(records, keep_seq=True):
+                if transform is not None:
+                    item = transform(item)
+                line = (json.dumps(item) + "\n").encode("utf-8")
+                out.write(line)
+                layout.append((record_key(item), offset, len(line)))
+                offset += len(line)
+            # Concurrent appends: copy the complete lines written meanwhile
+            src.seek(read)
+            for raw in src:
+                if not raw.endswith(b"\n"):
+                    break
+                try:
+                    item = json.loads(raw)
+                except ValueError:
+                    continue
+                out.write(raw)
+                layout.append((record_key(item) if isinstance(item, dict) else "", offset, len(raw)))
+                offset += len(raw)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    if threads_dir is not None:
+        _set_base(threads_dir, path, offset)
+    logger.debug(f"Compacted {path}: {len(records)} records -> {len(layout)}")
+    return layout
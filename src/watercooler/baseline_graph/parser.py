@@ -9,6 +9,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Iterator, Tuple
 
+from watercooler.entry_index import open_entry_index
 from watercooler.metadata import thread_meta
 from watercooler.thread_entries import parse_thread_entries, ThreadEntry
 
@@ -49,9 +50,13 @@ class ParsedThread:
     last_updated: str
     summary: str
     entries: List[ParsedEntry] = field(default_factory=list)
+    # Set when only some entries were parsed (see parse_thread_entry)
+    total_entries: Optional[int] = None
 
     @property
     def entry_count(self) -> int:
+        if self.total_entries is not None:
+            return self.total_entries
         return len(self.entries)
 
 
@@ -155,6 +160,67 @@ def parse_thread_file(
     )
 
 
+def _to_parsed_entry(topic: str, entry: ThreadEntry) -> ParsedEntry:
+    return ParsedEntry(
+        entry_id=_generate_entry_id(topic, entry.index, entry),
+        index=entry.index,
+        agent=entry.agent,
+        role=entry.role,
+        entry_type=entry.entry_type,
+        title=entry.title,
+        timestamp=entry.timestamp,
+        body=entry.body,
+        summary="",
+    )
+
+
+def parse_thread_entry(
+    thread_path: Path,
+    entry_id: Optional[str] = None,
+) -> Optional[Tuple[ParsedThread, ParsedEntry, Optional[ParsedEntry]]]:
+    """Parse a single entry and its predecessor without parsing the whole thread.
+
+    Uses the entry offset index (see ``watercooler.entry_index``). The
+    returned thread carries metadata and ``entry_count`` but no entries.
+
+    Args:
+        thread_path: Path to thread markdown file
+        entry_id: Entry to parse (or None for the latest entry)
+
+    Returns:
+        (thread, entry, previous_entry) or None if the index is unavailable
+        or the entry is not in the thread; callers fall back to
+        ``parse_thread_file``.
+    """
+    topic = thread_path.stem
+    try:
+        idx = open_entry_index(thread_path)
+    except Exception as e:
+        logger.debug(f"Entry index unavailable for {topic}: {e}")
+        return None
+    if idx is None:
+        return None
+    with idx:
+        position = idx.find(entry_id) if entry_id else idx.count - 1
+        if position is None or position < 0:
+            return None
+        entry = _to_parsed_entry(topic, idx.entry(position))
+        prev_entry = _to_parsed_entry(topic, idx.entry(position - 1)) if position > 0 else None
+        count = idx.count
+
+    title, status, ball, last_updated = thread_meta(thread_path)
+    thread = ParsedThread(
+        topic=topic,
+        title=title,
+        status=status,
+        ball=ball,
+        last_updated=last_updated,
+        summary="",
+        total_entries=count,
+    )
+    return thread, entry, prev_entry
+
+
 def iter_threads(
     threads_dir: Path,
     config: Optional[SummarizerConfig] = None,
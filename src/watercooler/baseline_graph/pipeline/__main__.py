@@ -34,6 +34,12 @@ Examples:
 
   # Skip embeddings (summaries only)
   python -m watercooler.baseline_graph.pipeline run --threads /path/to/threads --skip-embeddings
+
+  # Stream threads through concurrent stages (memory bounded by queue depth)
+  python -m watercooler.baseline_graph.pipeline run --threads /path/to/threads --streaming
+
+  # Store embeddings in nodes.jsonl as base64 float16 instead of JSON lists
+  python -m watercooler.baseline_graph.pipeline run --threads /path/to/threads --embedding-encoding f16
         """,
     )
 
@@ -49,6 +55,14 @@ Examples:
     run_parser.add_argument("--extractive", action="store_true", help="Use extractive summarization (no LLM)")
     run_parser.add_argument("--skip-embeddings", action="store_true", help="Skip embedding generation")
     run_parser.add_argument("--skip-closed", action="store_true", help="Skip closed threads")
+    run_parser.add_argument(
+        "--streaming", action="store_true", help="Run stages concurrently (bounded memory)"
+    )
+    run_parser.add_argument(
+        "--embedding-encoding",
+        choices=["json", "f16", "i8"],
+        help="Encoding of embeddings in nodes.jsonl (default: json)",
+    )
     run_parser.add_argument("--no-auto-server", action="store_true", help="Don't auto-start servers")
     run_parser.add_argument("--stop-servers", action="store_true", help="Stop servers when complete")
     run_parser.add_argument("-y", "--yes", action="store_true", help="Auto-approve all prompts")
@@ -92,6 +106,8 @@ Examples:
             auto_server=not args.no_auto_server,
             stop_servers=args.stop_servers,
             auto_approve=args.yes,
+            streaming=args.streaming,
+            embedding_encoding=args.embedding_encoding,
         )
 
         print()
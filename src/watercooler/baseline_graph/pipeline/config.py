@@ -57,6 +57,10 @@ class EmbeddingConfig:
     model: str = "bge-m3"
     timeout: float = 60.0
     embedding_dim: int = 1024
+    batch_size: int = 32  # Inputs per /embeddings request
+    max_batch_tokens: int = 8192  # Estimated tokens per request
+    max_concurrent: int = 4  # Requests in flight
+    cache_dtype: str = "float32"  # Row type of the cached embeddings store (float32 or float16)
 
     @classmethod
     def from_env(cls) -> "EmbeddingConfig":
@@ -72,6 +76,12 @@ class EmbeddingConfig:
             api_base=config.get("api_base", cls.api_base),
             model=config.get("model", cls.model),
             timeout=config.get("timeout", cls.timeout),
+            batch_size=max(1, int(config.get("batch_size", cls.batch_size))),
+            max_batch_tokens=max(1, int(config.get("max_batch_tokens", cls.max_batch_tokens))),
+            max_concurrent=max(1, int(config.get("max_concurrent", cls.max_concurrent))),
+            cache_dtype=config.get("cache_dtype", cls.cache_dtype)
+            if config.get("cache_dtype") in ("float32", "float16")
+            else cls.cache_dtype,
         )
 
 
@@ -96,6 +106,15 @@ class PipelineConfig:
     extractive_only: bool = False  # Use extractive summarization (no LLM)
     skip_embeddings: bool = False  # Skip embedding generation
 
+    # Streaming mode: threads flow through bounded queues between the
+    # parse, summarize, embed and export stages instead of phase by phase
+    streaming: bool = False
+    queue_depth: int = 8  # Threads buffered between streaming stages
+
+    # Encoding of embeddings in nodes.jsonl: json, f16 or i8 (None: the
+    # process setting, see baseline_graph.embedding_codec)
+    embedding_encoding: Optional[str] = None
+
     def __post_init__(self):
         if self.output_dir is None:
             self.output_dir = self.threads_dir / "graph" / "baseline"
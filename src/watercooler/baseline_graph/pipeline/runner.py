@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 import json
+import os
+import re
 import shutil
 import time
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, Iterator, List, Optional
@@ -13,6 +16,77 @@ from .config import PipelineConfig
 from .state import PipelineState
 
 
+# Leading "id" of a node line as written by json.dumps(node)
+_NODE_ID_RE = re.compile(rb'^\{"id": "([^"\\]*)"')
+
+
+class _PreviousNodes:
+    """Line index of the previous export's nodes.jsonl, to copy nodes from."""
+
+    def __init__(self, path: Path) -> None:
+        self._file = open(path, "rb")
+        self._spans: Dict[str, tuple[int, int]] = {}
+        offset = 0
+        for raw in self._file:
+            match = _NODE_ID_RE.match(raw)
+            # Nodes waiting for enrichment by graph sync are regenerated
+            if match and raw.endswith(b"\n") and b'"enrichment": ' not in raw:
+                # The last line of an appended-to log wins
+                self._spans[match.group(1).decode("utf-8")] = (offset, len(raw))
+            offset += len(raw)
+
+    def line(self, node_id: str, encoding: str) -> Optional[str]:
+        """The node's line, with its embedding in ``encoding``.
+
+        Lines are copied verbatim unless they carry a graph-sync log sequence
+        number or an embedding in another encoding; those are re-serialized.
+        """
+        from .. import embedding_codec
+        from ..jsonl_log import SEQ_FIELD
+
+        span = self._spans.get(node_id)
+        if span is None:
+            return None
+        self._file.seek(span[0])
+        line = self._file.read(span[1]).decode("utf-8")
+        marker = '"embedding": [' if encoding == "json" else f'"embedding": "{encoding}:'
+        if f'"{SEQ_FIELD}": ' not in line and (marker in line or '"embedding": ' not in line):
+            return line
+        node = json.loads(line)
+        node.pop(SEQ_FIELD, None)
+        return json.dumps(embedding_codec.reencode_node(node, encoding)) + "\n"
+
+    def close(self) -> None:
+        self._file.close()
+
+
+# End-of-stream marker between streaming pipeline stages
+_STAGE_DONE = object()
+
+
+def _estimate_tokens(text: str) -> int:
+    # Rough estimate: ~4 chars per token
+    return len(text) // 4 + 1
+
+
+def _embedding_batches(entries: List[Any], max_items: int, max_tokens: int) -> Iterator[List[Any]]:
+    """Split entries into /embeddings requests of at most ``max_items``
+    inputs and (estimated) ``max_tokens`` tokens; an oversized entry gets
+    a request of its own."""
+    batch: List[Any] = []
+    tokens = 0
+    for entry in entries:
+        text = getattr(entry, 'summary', None) or entry.body[:500]
+        cost = _estimate_tokens(text)
+        if batch and (len(batch) >= max_items or tokens + cost > max_tokens):
+            yield batch
+            batch, tokens = [], 0
+        batch.append(entry)
+        tokens += cost
+    if batch:
+        yield batch
+
+
 @dataclass
 class PipelineResult:
     """Result of pipeline execution."""
@@ -47,6 +121,8 @@ class BaselineGraphRunner:
         self._server_manager = None
         self._state = None
         self._changed_topics = set()  # Topics that need reprocessing
+        self._unchanged_nodes: set = set()  # Entry node IDs to copy from the previous export
+        self._previous_nodes: Optional[Any] = None  # _PreviousNodes during export
 
     def _log(self, msg: str) -> None:
         """Log a message."""
@@ -128,11 +204,12 @@ class BaselineGraphRunner:
 
         if self.config.fresh:
             self._log("Fresh mode: ignoring cached state")
-            self._state = PipelineState()
+            self._state = PipelineState(embedding_dtype=self.config.embedding.cache_dtype)
             return
 
         state_path = self._state_path()
         self._state = PipelineState.load(state_path)
+        self._state.embedding_dtype = self.config.embedding.cache_dtype
         if self._state.last_run:
             self._log(f"Loaded state from {self._state.last_run}")
         else:
@@ -144,34 +221,47 @@ class BaselineGraphRunner:
             return
 
         # Update state for all processed threads
-        current_topics = set()
         for thread in threads:
-            topic = thread.topic
-            current_topics.add(topic)
-
-            # Get thread file mtime
-            thread_path = self.config.threads_dir / f"{topic}.md"
-            mtime = thread_path.stat().st_mtime if thread_path.exists() else 0
-
-            # Collect entry summaries and embeddings
-            entry_summaries = {}
-            entry_embeddings = {}
-            for entry in thread.entries:
-                entry_id = entry.entry_id
-                if hasattr(entry, 'summary') and entry.summary:
-                    entry_summaries[entry_id] = entry.summary
-                if hasattr(entry, 'embedding') and entry.embedding:
-                    entry_embeddings[entry_id] = entry.embedding
-
-            self._state.update_thread(
-                topic=topic,
-                mtime=mtime,
-                entry_count=len(thread.entries),
-                summary=thread.summary or "",
-                entry_summaries=entry_summaries,
-                entry_embeddings=entry_embeddings,
-            )
+            self._update_thread_state(thread)
+        self._finish_state({thread.topic for thread in threads})
+
+    def _update_thread_state(self, thread: Any) -> None:
+        """Record a processed thread in the pipeline state."""
+        topic = thread.topic
+
+        # Get thread file mtime
+        thread_path = self.config.threads_dir / f"{topic}.md"
+        mtime = thread_path.stat().st_mtime if thread_path.exists() else 0
+
+        from .state import entry_content_hash, entry_node_hash
+
+        # Collect entry summaries, embeddings and content hashes
+        entry_summaries = {}
+        entry_embeddings = {}
+        entry_hashes = {}
+        node_hashes = {}
+        for entry in thread.entries:
+            entry_id = entry.entry_id
+            if hasattr(entry, 'summary') and entry.summary:
+                entry_summaries[entry_id] = entry.summary
+            if hasattr(entry, 'embedding') and entry.embedding:
+                entry_embeddings[entry_id] = entry.embedding
+            entry_hashes[entry_id] = entry_content_hash(entry)
+            node_hashes[entry_id] = entry_node_hash(entry, topic)
+
+        self._state.update_thread(
+            topic=topic,
+            mtime=mtime,
+            entry_count=len(thread.entries),
+            summary=thread.summary or "",
+            entry_summaries=entry_summaries,
+            entry_embeddings=entry_embeddings,
+            entry_hashes=entry_hashes,
+            node_hashes=node_hashes,
+        )
 
+    def _finish_state(self, current_topics: set) -> None:
+        """Drop deleted threads from the pipeline state and save it."""
         # Remove deleted threads from state
         removed = self._state.remove_deleted_threads(current_topics)
         if removed:
@@ -187,15 +277,33 @@ class BaselineGraphRunner:
         In incremental mode, detects changed threads and applies cached
         summaries/embeddings for unchanged ones.
         """
-        from ..parser import iter_threads
-
         self._log(f"Parsing threads from: {self.config.threads_dir}")
 
-        # Use iter_threads with generate_summaries=False since we handle that separately
-        threads = []
-        changed_count = 0
-        cached_count = 0
+        threads = list(self._iter_parsed_threads())
+        changed_count = sum(1 for thread in threads if thread.topic in self._changed_topics)
+        cached_count = len(threads) - changed_count
 
+        if self.config.test_limit:
+            self._log(f"  Limited to {len(threads)} threads (test mode)")
+        elif self.config.incremental:
+            self._log(f"  Found {len(threads)} threads ({changed_count} changed, {cached_count} cached)")
+        else:
+            self._log(f"  Found {len(threads)} threads")
+
+        return threads
+
+    def _iter_parsed_threads(self) -> Iterator[Any]:
+        """Parse threads one at a time, marking changed ones in _changed_topics.
+
+        In incremental mode, unchanged entries (same content hash) get their
+        cached summaries and embeddings applied, and a thread only counts
+        as changed if one of its entries did. Its cached thread summary is
+        kept unless the changed entries change the thread's arc.
+        """
+        from ..parser import iter_threads
+
+        # Use iter_threads with generate_summaries=False since we handle that separately
+        parsed = 0
         for thread in iter_threads(
             self.config.threads_dir,
             config=None,
@@ -207,47 +315,77 @@ class BaselineGraphRunner:
                 thread_path = self.config.threads_dir / f"{thread.topic}.md"
                 mtime = thread_path.stat().st_mtime if thread_path.exists() else 0
 
-                if self._state.is_thread_changed(thread.topic, mtime, len(thread.entries)):
+                touched = self._state.is_thread_changed(thread.topic, mtime, len(thread.entries))
+                changed_entries = self._apply_cached_entries(thread, verify=touched)
+                cached_summary = self._state.get_cached_summary(thread.topic)
+                if changed_entries or thread.topic not in self._state.threads:
                     # Thread changed, mark for reprocessing
                     self._changed_topics.add(thread.topic)
-                    changed_count += 1
-                    self._log_verbose(f"Thread changed: {thread.topic}")
-                else:
-                    # Apply cached data
-                    cached_count += 1
-                    cached_summary = self._state.get_cached_summary(thread.topic)
-                    if cached_summary:
+                    self._log_verbose(
+                        f"Thread changed: {thread.topic} ({len(changed_entries)} changed entries)"
+                    )
+                    if cached_summary and not self._arc_changed(thread, changed_entries):
                         thread.summary = cached_summary
-
-                    # Apply cached entry data
-                    for entry in thread.entries:
-                        cached_entry_summary = self._state.get_cached_entry_summary(
-                            thread.topic, entry.entry_id
-                        )
-                        if cached_entry_summary:
-                            entry.summary = cached_entry_summary
-
-                        cached_embedding = self._state.get_cached_entry_embedding(
-                            thread.topic, entry.entry_id
-                        )
-                        if cached_embedding:
-                            entry.embedding = cached_embedding
+                elif cached_summary:
+                    # Unchanged (or only touched): apply cached data
+                    thread.summary = cached_summary
             else:
                 # Non-incremental mode: all threads need processing
                 self._changed_topics.add(thread.topic)
 
-            threads.append(thread)
-            if self.config.test_limit and len(threads) >= self.config.test_limit:
+            yield thread
+            parsed += 1
+            if self.config.test_limit and parsed >= self.config.test_limit:
                 break
 
-        if self.config.test_limit:
-            self._log(f"  Limited to {len(threads)} threads (test mode)")
-        elif self.config.incremental:
-            self._log(f"  Found {len(threads)} threads ({changed_count} changed, {cached_count} cached)")
-        else:
-            self._log(f"  Found {len(threads)} threads")
+    def _apply_cached_entries(self, thread: Any, verify: bool) -> List[Any]:
+        """Apply cached summaries/embeddings to the unchanged entries of a thread.
 
-        return threads
+        With ``verify`` (the thread file changed), an entry is unchanged if
+        its content hash matches the cached one; otherwise every entry is.
+        Entries whose node is unchanged too are marked for copying from the
+        previous export.
+
+        Returns:
+            The changed entries
+        """
+        from .state import entry_content_hash, entry_node_hash
+
+        cached = self._state.threads.get(thread.topic)
+        changed = []
+        for entry in thread.entries:
+            node_unchanged = True
+            if verify:
+                content_hash = entry_content_hash(entry)
+                if cached is None or cached.entry_hashes.get(entry.entry_id) != content_hash:
+                    changed.append(entry)
+                    continue
+                node_unchanged = cached.node_hashes.get(entry.entry_id) == entry_node_hash(entry, thread.topic)
+
+            cached_entry_summary = self._state.get_cached_entry_summary(
+                thread.topic, entry.entry_id
+            )
+            if cached_entry_summary:
+                entry.summary = cached_entry_summary
+
+            cached_embedding = self._state.get_cached_entry_embedding(
+                thread.topic, entry.entry_id
+            )
+            if cached_embedding:
+                entry.embedding = cached_embedding
+
+            if node_unchanged:
+                self._unchanged_nodes.add(f"entry:{entry.entry_id}")
+        return changed
+
+    def _arc_changed(self, thread: Any, changed_entries: List[Any]) -> bool:
+        """Whether the changed entries call for a new thread summary."""
+        from ..sync import should_update_thread_summary
+
+        previous_count = self._state.threads[thread.topic].entry_count
+        return any(
+            should_update_thread_summary(thread, entry, previous_count) for entry in changed_entries
+        )
 
     def _summarize_entries(self, threads: List[Any]) -> None:
         """Generate summaries for entries.
@@ -270,31 +408,18 @@ class BaselineGraphRunner:
             return
 
         if self.config.extractive_only:
-            from ..summarizer import extractive_summary
-
             self._log(f"Generating extractive summaries for {total_to_process} entries...")
 
             for i, (thread, entry) in enumerate(entries_needing_summary, 1):
                 if i % 10 == 0 or i == total_to_process:
                     self._log_verbose(f"Summarizing entry {i}/{total_to_process}")
 
-                entry.summary = extractive_summary(
-                    entry.body,
-                    max_chars=200,
-                    include_headers=True,
-                )
+                entry.summary = self._entry_summary(entry, None)
             return
 
         from concurrent.futures import ThreadPoolExecutor, as_completed
-        from ..summarizer import summarize_entry, SummarizerConfig
 
-        summarizer_config = SummarizerConfig(
-            api_base=self.config.llm.api_base,
-            model=self.config.llm.model,
-            api_key=self.config.llm.api_key,
-            timeout=self.config.llm.timeout,
-            max_tokens=self.config.llm.max_tokens,
-        )
+        summarizer_config = self._summarizer_config()
 
         self._log(f"Generating LLM summaries for {total_to_process} entries...")
 
@@ -302,12 +427,7 @@ class BaselineGraphRunner:
         entries_to_summarize = [entry for _, entry in entries_needing_summary]
 
         def summarize_one(entry):
-            return entry, summarize_entry(
-                entry.body,
-                entry_title=entry.title,
-                entry_type=getattr(entry, 'entry_type', None),
-                config=summarizer_config,
-            )
+            return entry, self._entry_summary(entry, summarizer_config)
 
         # Parallelize with configurable workers (default 4)
         max_workers = getattr(self.config, 'llm_workers', 4)
@@ -343,54 +463,25 @@ class BaselineGraphRunner:
             return
 
         if self.config.extractive_only:
-            from ..summarizer import extractive_summary
-
             self._log(f"Generating extractive thread summaries for {total_to_process} threads...")
 
             for i, thread in enumerate(threads_needing_summary, 1):
                 if i % 10 == 0 or i == total_to_process:
                     self._log_verbose(f"Summarizing thread {i}/{total_to_process}")
 
-                # Concatenate entry summaries or titles for extractive summary
-                entry_texts = []
-                for entry in thread.entries[:10]:  # Limit to first 10 entries
-                    if hasattr(entry, 'summary') and entry.summary:
-                        entry_texts.append(f"- {entry.title}: {entry.summary[:100]}")
-                    else:
-                        entry_texts.append(f"- {entry.title}: {entry.body[:100]}")
-
-                if entry_texts:
-                    combined = "\n".join(entry_texts)
-                    thread.summary = extractive_summary(
-                        combined,
-                        max_chars=300,
-                        include_headers=False,
-                    )
+                summary = self._thread_summary(thread, None)
+                if summary:
+                    thread.summary = summary
             return
 
         from concurrent.futures import ThreadPoolExecutor, as_completed
-        from ..summarizer import summarize_thread, SummarizerConfig
 
-        summarizer_config = SummarizerConfig(
-            api_base=self.config.llm.api_base,
-            model=self.config.llm.model,
-            api_key=self.config.llm.api_key,
-            timeout=self.config.llm.timeout,
-            max_tokens=self.config.llm.max_tokens,
-        )
+        summarizer_config = self._summarizer_config()
 
         self._log(f"Generating LLM thread summaries for {total_to_process} threads...")
 
         def summarize_one(thread):
-            entry_dicts = [
-                {"body": e.body, "title": e.title, "type": e.entry_type}
-                for e in thread.entries
-            ]
-            return thread, summarize_thread(
-                entry_dicts,
-                thread_title=thread.title,
-                config=summarizer_config,
-            )
+            return thread, self._thread_summary(thread, summarizer_config)
 
         # Parallelize with configurable workers (default 4)
         max_workers = getattr(self.config, 'llm_workers', 4)
@@ -404,18 +495,81 @@ class BaselineGraphRunner:
                 thread, summary = future.result()
                 thread.summary = summary
 
+    def _summarizer_config(self) -> Any:
+        """SummarizerConfig for LLM summaries (None in extractive-only mode)."""
+        if self.config.extractive_only:
+            return None
+
+        from ..summarizer import SummarizerConfig
+
+        return SummarizerConfig(
+            api_base=self.config.llm.api_base,
+            model=self.config.llm.model,
+            api_key=self.config.llm.api_key,
+            timeout=self.config.llm.timeout,
+            max_tokens=self.config.llm.max_tokens,
+        )
+
+    def _entry_summary(self, entry: Any, summarizer_config: Any) -> str:
+        """Summary of an entry: LLM with ``summarizer_config``, else extractive."""
+        from ..summarizer import extractive_summary, summarize_entry
+
+        if summarizer_config is None:
+            return extractive_summary(
+                entry.body,
+                max_chars=200,
+                include_headers=True,
+            )
+        return summarize_entry(
+            entry.body,
+            entry_title=entry.title,
+            entry_type=getattr(entry, 'entry_type', None),
+            config=summarizer_config,
+        )
+
+    def _thread_summary(self, thread: Any, summarizer_config: Any) -> str:
+        """Summary of a thread: LLM with ``summarizer_config``, else extractive."""
+        from ..summarizer import extractive_summary, summarize_thread
+
+        if summarizer_config is None:
+            # Concatenate entry summaries or titles for extractive summary
+            entry_texts = []
+            for entry in thread.entries[:10]:  # Limit to first 10 entries
+                if hasattr(entry, 'summary') and entry.summary:
+                    entry_texts.append(f"- {entry.title}: {entry.summary[:100]}")
+                else:
+                    entry_texts.append(f"- {entry.title}: {entry.body[:100]}")
+
+            if not entry_texts:
+                return ""
+            return extractive_summary(
+                "\n".join(entry_texts),
+                max_chars=300,
+                include_headers=False,
+            )
+
+        entry_dicts = [
+            {"body": e.body, "title": e.title, "type": e.entry_type}
+            for e in thread.entries
+        ]
+        return summarize_thread(
+            entry_dicts,
+            thread_title=thread.title,
+            config=summarizer_config,
+        )
+
     def _generate_embeddings(self, threads: List[Any]) -> int:
         """Generate embeddings for entries.
 
         In incremental mode, only processes entries from changed threads
-        that don't already have embeddings.
+        that don't already have embeddings. Entries are sent in batches
+        (bounded by count and estimated tokens), several requests at a time;
+        only the entries of a failed batch are retried one by one.
         """
         if self.config.skip_embeddings:
             self._log("Skipping embedding generation")
             return 0
 
-        import httpx
-
         # Filter to entries needing embeddings
         entries_needing_embedding = []
         for thread in threads:
@@ -432,46 +586,65 @@ class BaselineGraphRunner:
             return 0
 
         self._log(f"Generating embeddings for {total_to_process} entries...")
+        return self._embed_entries(entries_needing_embedding)
 
-        url = f"{self.config.embedding.api_base.rstrip('/')}/embeddings"
-        generated = 0
-
-        with httpx.Client(timeout=30.0) as client:
-            for i, entry in enumerate(entries_needing_embedding, 1):
-                if i % 10 == 0 or i == total_to_process:
-                    self._log_verbose(f"Embedding entry {i}/{total_to_process}")
-
-                # Use summary if available, otherwise truncated body
-                text = getattr(entry, 'summary', None) or entry.body[:500]
+    def _embed_entries(self, entries: List[Any]) -> int:
+        """Set ``embedding`` on entries; returns how many were embedded."""
+        from concurrent.futures import ThreadPoolExecutor, as_completed
 
+        from watercooler import http_pool
+
+        total_to_process = len(entries)
+        embedding = self.config.embedding
+        url = f"{embedding.api_base.rstrip('/')}/embeddings"
+        client = http_pool.client(embedding.api_base)
+
+        def post(inputs: Any) -> List[Any]:
+            response = client.post(url, json={
+                "model": embedding.model,
+                "input": inputs,
+            }, timeout=embedding.timeout)
+            response.raise_for_status()
+            data = sorted(response.json()["data"], key=lambda item: item.get("index", 0))
+            return [item["embedding"] for item in data]
+
+        def embed_batch(batch: List[Any]) -> List[Any]:
+            # Use summary if available, otherwise truncated body
+            texts = [getattr(entry, 'summary', None) or entry.body[:500] for entry in batch]
+            try:
+                vectors = post(texts)
+                if len(vectors) == len(texts):
+                    return vectors
+                raise ValueError(f"expected {len(texts)} embeddings, got {len(vectors)}")
+            except Exception as e:
+                self._log_verbose(f"Warning: Batch of {len(texts)} failed ({e}), retrying per entry")
+            vectors = []
+            for text in texts:
                 try:
-                    response = client.post(url, json={
-                        "model": self.config.embedding.model,
-                        "input": text,
-                    })
-                    response.raise_for_status()
-                    data = response.json()
-                    entry.embedding = data["data"][0]["embedding"]
-                    generated += 1
+                    vectors.append(post(text)[0])
                 except Exception as e:
                     self._log_verbose(f"Warning: Failed to embed entry: {e}")
-                    entry.embedding = None
+                    vectors.append(None)
+            return vectors
+
+        batches = list(_embedding_batches(entries, embedding.batch_size, embedding.max_batch_tokens))
+        generated = 0
+        processed = 0
+        with ThreadPoolExecutor(max_workers=embedding.max_concurrent) as executor:
+            futures = {executor.submit(embed_batch, batch): batch for batch in batches}
+            for future in as_completed(futures):
+                batch = futures[future]
+                for entry, vector in zip(batch, future.result()):
+                    entry.embedding = vector
+                    generated += vector is not None
+                processed += len(batch)
+                self._log_verbose(f"Embedded {processed}/{total_to_process} entries")
 
         return generated
 
     def _export_graph(self, threads: List[Any]) -> tuple[int, int]:
         """Export threads to JSONL graph format."""
-        from ..export import (
-            thread_to_node,
-            entry_to_node,
-            generate_edges,
-            generate_cross_references,
-        )
-
-        self.config.output_dir.mkdir(parents=True, exist_ok=True)
-
-        nodes_path = self.config.output_dir / "nodes.jsonl"
-        edges_path = self.config.output_dir / "edges.jsonl"
+        from ..export import generate_cross_references
 
         self._log(f"Exporting graph to: {self.config.output_dir}")
 
@@ -479,29 +652,11 @@ class BaselineGraphRunner:
         edge_count = 0
         xref_count = 0
 
-        with open(nodes_path, "w") as nodes_file, open(edges_path, "w") as edges_file:
+        with self._open_export() as (nodes_file, edges_file):
             for thread in threads:
-                # Thread node
-                thread_node = thread_to_node(thread)
-                if hasattr(thread, 'embedding') and thread.embedding:
-                    thread_node["embedding"] = thread.embedding
-                nodes_file.write(json.dumps(thread_node) + "\n")
-                node_count += 1
-
-                # Entry nodes
-                for entry in thread.entries:
-                    entry_node = entry_to_node(entry, thread.topic)
-                    if hasattr(entry, 'summary') and entry.summary:
-                        entry_node["summary"] = entry.summary
-                    if hasattr(entry, 'embedding') and entry.embedding:
-                        entry_node["embedding"] = entry.embedding
-                    nodes_file.write(json.dumps(entry_node) + "\n")
-                    node_count += 1
-
-                # Edges (contains, followed_by)
-                for edge in generate_edges(thread):
-                    edges_file.write(json.dumps(edge) + "\n")
-                    edge_count += 1
+                nodes, edges = self._write_thread(thread, nodes_file, edges_file)
+                node_count += nodes
+                edge_count += edges
 
             # Cross-reference edges (need all threads for lookup)
             self._log_verbose("Detecting cross-references...")
@@ -510,18 +665,84 @@ class BaselineGraphRunner:
                 xref_count += 1
 
         self._log(f"  Wrote {node_count} nodes, {edge_count} edges, {xref_count} cross-references")
+        self._write_manifest(len(threads), sum(len(t.entries) for t in threads), node_count, edge_count, xref_count)
+        return node_count, edge_count + xref_count
+
+    @contextmanager
+    def _open_export(self) -> Iterator[tuple[Any, Any]]:
+        """Open nodes.jsonl and edges.jsonl for writing.
 
-        # Write manifest
+        In incremental mode the previous nodes.jsonl is set aside (as
+        nodes.jsonl.prev) while the export runs, so _write_thread() can
+        copy unchanged entry nodes from it instead of re-serializing them.
+        """
+        output_dir = self.config.output_dir
+        output_dir.mkdir(parents=True, exist_ok=True)
+        nodes_path = output_dir / "nodes.jsonl"
+        previous_path = output_dir / "nodes.jsonl.prev"
+
+        if self.config.incremental and self._state and self._state.threads and nodes_path.exists():
+            os.replace(nodes_path, previous_path)
+            self._previous_nodes = _PreviousNodes(previous_path)
+        try:
+            with open(nodes_path, "w") as nodes_file, open(output_dir / "edges.jsonl", "w") as edges_file:
+                yield nodes_file, edges_file
+        finally:
+            if self._previous_nodes is not None:
+                self._previous_nodes.close()
+                self._previous_nodes = None
+                previous_path.unlink(missing_ok=True)
+
+    def _write_thread(self, thread: Any, nodes_file: Any, edges_file: Any) -> tuple[int, int]:
+        """Write the nodes and edges of a thread; returns their counts."""
+        from .. import embedding_codec
+        from ..export import thread_to_node, entry_to_node, generate_edges
+
+        encoding = self.config.embedding_encoding or embedding_codec.get_encoding()
+
+        # Thread node
+        thread_node = thread_to_node(thread)
+        if hasattr(thread, 'embedding') and thread.embedding:
+            thread_node["embedding"] = embedding_codec.encode(thread.embedding, encoding)
+        nodes_file.write(json.dumps(thread_node) + "\n")
+        node_count = 1
+
+        # Entry nodes (unchanged ones copied from the previous export)
+        for entry in thread.entries:
+            node_id = f"entry:{entry.entry_id}"
+            line = None
+            if self._previous_nodes is not None and node_id in self._unchanged_nodes:
+                line = self._previous_nodes.line(node_id, encoding)
+            if line is None:
+                entry_node = entry_to_node(entry, thread.topic)
+                if hasattr(entry, 'summary') and entry.summary:
+                    entry_node["summary"] = entry.summary
+                if hasattr(entry, 'embedding') and entry.embedding:
+                    entry_node["embedding"] = embedding_codec.encode(entry.embedding, encoding)
+                line = json.dumps(entry_node) + "\n"
+            nodes_file.write(line)
+            node_count += 1
+
+        # Edges (contains, followed_by)
+        edge_count = 0
+        for edge in generate_edges(thread):
+            edges_file.write(json.dumps(edge) + "\n")
+            edge_count += 1
+        return node_count, edge_count
+
+    def _write_manifest(
+        self, threads: int, entries: int, node_count: int, edge_count: int, xref_count: int
+    ) -> None:
         from datetime import datetime, timezone
-        total_edges = edge_count + xref_count
+
         manifest = {
             "version": "1.0",
             "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
             "source_dir": str(self.config.threads_dir),
-            "threads_exported": len(threads),
-            "entries_exported": sum(len(t.entries) for t in threads),
+            "threads_exported": threads,
+            "entries_exported": entries,
             "nodes_written": node_count,
-            "edges_written": total_edges,
+            "edges_written": edge_count + xref_count,
             "cross_references": xref_count,
             "files": {
                 "nodes": "nodes.jsonl",
@@ -532,7 +753,185 @@ class BaselineGraphRunner:
         with open(manifest_path, "w", encoding="utf-8") as f:
             json.dump(manifest, f, indent=2)
 
-        return node_count, total_edges
+    def _run_streaming(self) -> tuple[int, int, int, int, int]:
+        """Run parse → summarize → embed → export as concurrent stages.
+
+        Threads flow through bounded queues: a parser, a pool of summarizer
+        workers, an embedding batcher (which batches entries across threads)
+        and the JSONL writer on the calling thread. The LLM and embedding
+        servers are busy at the same time, and only the threads in flight
+        are held in memory, not the corpus. Threads are written in the
+        order they finish, not in parse order.
+
+        Returns:
+            (threads, entries, nodes, edges, embeddings generated)
+        """
+        import queue
+        import threading
+
+        from ..export import CrossReferenceCollector
+
+        depth = max(1, self.config.queue_depth)
+        parsed_q: "queue.Queue[Any]" = queue.Queue(maxsize=depth)
+        summarized_q: "queue.Queue[Any]" = queue.Queue(maxsize=depth)
+        embedded_q: "queue.Queue[Any]" = queue.Queue(maxsize=depth)
+        stop = threading.Event()
+        errors: List[BaseException] = []
+        summarizer_config = self._summarizer_config()
+        summarizers = 1 if summarizer_config is None else max(1, getattr(self.config, 'llm_workers', 4))
+        embedded = [0]
+
+        def put(q: "queue.Queue[Any]", item: Any) -> None:
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def get(q: "queue.Queue[Any]", timeout: Optional[float] = None) -> Any:
+            # None on timeout, _STAGE_DONE once the pipeline stopped
+            waited = 0.0
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    waited += 0.1
+                    if timeout is not None and waited >= timeout:
+                        return None
+            return _STAGE_DONE
+
+        def stage(fn: Any) -> Any:
+            def run() -> None:
+                try:
+                    fn()
+                except BaseException as e:
+                    errors.append(e)
+                    stop.set()
+            return run
+
+        def parse() -> None:
+            try:
+                for thread in self._iter_parsed_threads():
+                    if stop.is_set():
+                        break
+                    put(parsed_q, thread)
+            finally:
+                for _ in range(summarizers):
+                    put(parsed_q, _STAGE_DONE)
+
+        def summarize() -> None:
+            try:
+                while (thread := get(parsed_q)) is not _STAGE_DONE:
+                    if thread.topic in self._changed_topics:
+                        for entry in thread.entries:
+                            if not getattr(entry, 'summary', None):
+                                entry.summary = self._entry_summary(entry, summarizer_config)
+                        summary = None if thread.summary else self._thread_summary(thread, summarizer_config)
+                        if summary:
+                            thread.summary = summary
+                    put(summarized_q, thread)
+            finally:
+                put(summarized_q, _STAGE_DONE)
+
+        def embed() -> None:
+            batch_entries = self.config.embedding.batch_size * self.config.embedding.max_concurrent
+            pending: List[Any] = []
+            entries: List[Any] = []
+            done = 0
+
+            def flush() -> None:
+                if stop.is_set():
+                    return
+                if entries:
+                    embedded[0] += self._embed_entries(entries)
+                for thread in pending:
+                    put(embedded_q, thread)
+                pending.clear()
+                entries.clear()
+
+            try:
+                while done < summarizers:
+                    # Batch entries across threads, but don't wait for more
+                    # once the summarizers fall behind
+                    thread = get(summarized_q, timeout=None if not pending else 0.1)
+                    if thread is None:
+                        flush()
+                        continue
+                    if thread is _STAGE_DONE:
+                        done += 1
+                        continue
+                    pending.append(thread)
+                    if not self.config.skip_embeddings and thread.topic in self._changed_topics:
+                        entries.extend(e for e in thread.entries if not getattr(e, 'embedding', None))
+                    if len(entries) >= batch_entries:
+                        flush()
+                flush()
+            finally:
+                put(embedded_q, _STAGE_DONE)
+
+        workers = [threading.Thread(target=stage(parse), name="pipeline-parse", daemon=True)]
+        workers += [
+            threading.Thread(target=stage(summarize), name=f"pipeline-summarize-{i}", daemon=True)
+            for i in range(summarizers)
+        ]
+        workers.append(threading.Thread(target=stage(embed), name="pipeline-embed", daemon=True))
+
+        self._log(f"Streaming graph to: {self.config.output_dir} ({summarizers} summarizer workers)")
+
+        xrefs = CrossReferenceCollector()
+        thread_count = entry_count = node_count = edge_count = xref_count = 0
+        topics = set()
+        try:
+            with self._open_export() as (nodes_file, edges_file):
+                for worker in workers:
+                    worker.start()
+                while (thread := get(embedded_q)) is not _STAGE_DONE:
+                    nodes, edges = self._write_thread(thread, nodes_file, edges_file)
+                    node_count += nodes
+                    edge_count += edges
+                    thread_count += 1
+                    entry_count += len(thread.entries)
+                    topics.add(thread.topic)
+                    xrefs.add(thread)
+                    if self.config.incremental:
+                        self._update_thread_state(thread)
+                    self._log_verbose(f"Wrote {thread.topic} ({thread_count} threads)")
+
+                if errors:
+                    raise errors[0]
+                for edge in xrefs.edges():
+                    edges_file.write(json.dumps(edge) + "\n")
+                    xref_count += 1
+        finally:
+            stop.set()
+            for worker in workers:
+                worker.join()
+
+        self._log(f"  Wrote {node_count} nodes, {edge_count} edges, {xref_count} cross-references")
+        self._write_manifest(thread_count, entry_count, node_count, edge_count, xref_count)
+        if self.config.incremental:
+            self._finish_state(topics)
+        return thread_count, entry_count, node_count, edge_count + xref_count, embedded[0]
+
+    def _build_graph_indexes(self) -> None:
+        """Build the graph store and the embedding matrix (and ANN index).
+
+        Only done when exporting to the graph that the reader and search
+        read; otherwise the indexes are built on first use.
+        """
+        from .. import embedding_index, graph_store
+        from ..reader import get_graph_dir
+
+        graph_dir = get_graph_dir(self.config.threads_dir)
+        if self.config.output_dir.resolve() != graph_dir.resolve():
+            return
+        self._log_verbose("Building graph store...")
+        if not graph_store.build(self.config.threads_dir, graph_dir / "nodes.jsonl"):
+            self._log_verbose("Graph store not built")
+        self._log_verbose("Building embedding index...")
+        if not embedding_index.build(self.config.threads_dir, graph_dir / "nodes.jsonl"):
+            self._log_verbose("Embedding index not built (numpy not installed?)")
 
     def run(self) -> PipelineResult:
         """Run the full pipeline."""
@@ -574,6 +973,36 @@ class BaselineGraphRunner:
             # Load state for incremental builds
             self._load_state()
 
+            if self.config.streaming:
+                threads_processed, total_entries, nodes, edges, embeddings_generated = self._run_streaming()
+                if not threads_processed:
+                    return PipelineResult(
+                        success=False,
+                        threads_processed=0,
+                        entries_processed=0,
+                        nodes_created=0,
+                        edges_created=0,
+                        embeddings_generated=0,
+                        duration_seconds=time.time() - start_time,
+                        output_dir=self.config.output_dir,
+                        error="No threads found",
+                    )
+                self._build_graph_indexes()
+
+                duration = time.time() - start_time
+                self._log(f"\nPipeline completed in {duration:.1f}s")
+
+                return PipelineResult(
+                    success=True,
+                    threads_processed=threads_processed,
+                    entries_processed=total_entries,
+                    nodes_created=nodes,
+                    edges_created=edges,
+                    embeddings_generated=embeddings_generated,
+                    duration_seconds=duration,
+                    output_dir=self.config.output_dir,
+                )
+
             # Parse threads
             threads = self._parse_threads()
             if not threads:
@@ -600,6 +1029,7 @@ class BaselineGraphRunner:
 
             # Export graph
             nodes, edges = self._export_graph(threads)
+            self._build_graph_indexes()
 
             # Save state for incremental builds
             self._save_state(threads)
@@ -647,6 +1077,8 @@ def run_pipeline(
     auto_server: bool = True,
     stop_servers: bool = False,
     auto_approve: bool = False,
+    streaming: bool = False,
+    embedding_encoding: Optional[str] = None,
 ) -> PipelineResult:
     """Convenience function to run the pipeline.
 
@@ -663,6 +1095,9 @@ def run_pipeline(
         auto_server: Automatically start required servers
         stop_servers: Stop servers after completion
         auto_approve: Auto-approve server startup prompts
+        streaming: Run the stages concurrently over bounded queues
+        embedding_encoding: Encoding of node embeddings (json, f16 or i8;
+            default: the process setting, see embedding_codec)
 
     Returns:
         PipelineResult with success status and statistics
@@ -676,6 +1111,8 @@ def run_pipeline(
         extractive_only=extractive_only,
         skip_embeddings=skip_embeddings,
         skip_closed=skip_closed,
+        streaming=streaming,
+        embedding_encoding=embedding_encoding,
     )
 
     runner = BaselineGraphRunner(
@@ -2,15 +2,43 @@
 
 Tracks thread modification times and cached summaries/embeddings
 to enable efficient incremental updates.
+
+Entries also carry content hashes: a thread whose mtime changed (e.g. a
+``git pull``) only has the entries whose title, type or body changed
+re-summarized and re-embedded, and entry nodes whose fields are all
+unchanged are copied from the previous export.
+
+Embeddings are not kept in ``state.json``: as JSON lists they made it
+hundreds of MB, parsed in full on load and re-serialized on every save.
+They live in an append-only side file of fixed-size float32 (or float16)
+rows, ``state_embeddings.<generation>.bin``, which is memory-mapped on load
+and only read for the entries that are actually reused. ``state.json``
+keeps each entry's row number and the store's dim/dtype/row count. Saves
+append the new vectors only; the store is rewritten to a new generation
+when most of its rows are garbage or the dimension or dtype changes.
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
+import mmap
+import struct
+import threading
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from watercooler.fs import atomic_write_bytes
+
+EMBEDDINGS_PREFIX = "state_embeddings"
+EMBEDDING_DTYPES = {"float32": "f", "float16": "e"}
+DEFAULT_EMBEDDING_DTYPE = "float32"
+
+# Rewrite the store once it holds this many garbage rows and more garbage
+# than live rows
+COMPACT_MIN_ROWS = 1024
 
 
 @dataclass
@@ -22,16 +50,145 @@ class ThreadState:
     entry_count: int
     summary: str = ""
     entry_summaries: Dict[str, str] = field(default_factory=dict)  # entry_id -> summary
-    entry_embeddings: Dict[str, List[float]] = field(default_factory=dict)  # entry_id -> embedding
+    entry_embeddings: Dict[str, List[float]] = field(default_factory=dict)  # entry_id -> embedding not yet stored
+    entry_embedding_rows: Dict[str, int] = field(default_factory=dict)  # entry_id -> row in the embedding store
+    entry_hashes: Dict[str, str] = field(default_factory=dict)  # entry_id -> entry_content_hash()
+    node_hashes: Dict[str, str] = field(default_factory=dict)  # entry_id -> entry_node_hash()
+
+
+def _hash(*parts: Any) -> str:
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(str(part if part is not None else "").encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def entry_content_hash(entry: Any) -> str:
+    """Hash of what an entry's summary and embedding are generated from.
+
+    A trailing entry separator is ignored: the previous last entry of a
+    thread gains one when an entry is appended.
+    """
+    body = (entry.body or "").rstrip()
+    if body.endswith("---"):
+        body = body[:-3].rstrip()
+    return _hash(entry.title, entry.entry_type, body)
+
+
+def entry_node_hash(entry: Any, topic: str) -> str:
+    """Hash of every field of an entry's node other than summary and embedding."""
+    return _hash(
+        topic, entry.index, entry.agent, entry.role, entry.entry_type, entry.title, entry.timestamp, entry.body
+    )
+
+
+class CachedEmbedding(list):
+    """An embedding read from an ``EmbeddingStore``.
+
+    Remembers its row, so saving it back does not append it again.
+    """
+
+    __slots__ = ("store", "row")
+
+    def __init__(self, values: Any, store: "EmbeddingStore", row: int) -> None:
+        super().__init__(values)
+        self.store = store
+        self.row = row
+
+
+class EmbeddingStore:
+    """Append-only file of fixed-size embedding rows, memory-mapped for reads.
+
+    Only the first ``rows`` rows are valid; anything past them is the tail
+    of an append whose ``state.json`` was never written, and is overwritten
+    by the next append.
+    """
+
+    def __init__(self, path: Path, dim: int, dtype: str = DEFAULT_EMBEDDING_DTYPE, rows: int = 0, generation: int = 0):
+        if dtype not in EMBEDDING_DTYPES:
+            raise ValueError(f"Unsupported embedding dtype: {dtype}")
+        self.path = path
+        self.dim = dim
+        self.dtype = dtype
+        self.rows = rows
+        self.generation = generation
+        self._row_format = struct.Struct(f"<{dim}{EMBEDDING_DTYPES[dtype]}")
+        self._map: Optional[mmap.mmap] = None
+        self._lock = threading.Lock()
+
+    @property
+    def row_bytes(self) -> int:
+        return self._row_format.size
+
+    def metadata(self) -> Dict[str, Any]:
+        return {
+            "file": self.path.name,
+            "dim": self.dim,
+            "dtype": self.dtype,
+            "rows": self.rows,
+            "generation": self.generation,
+        }
+
+    def _remap_locked(self) -> None:
+        self._close_map()
+        try:
+            with open(self.path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            pass  # Missing or empty file
+
+    def get(self, row: int) -> Optional[CachedEmbedding]:
+        """Vector in ``row``, or None if the row is not in the store."""
+        if not 0 <= row < self.rows:
+            return None
+        offset = row * self.row_bytes
+        with self._lock:
+            if self._map is None or len(self._map) < offset + self.row_bytes:
+                self._remap_locked()
+                if self._map is None or len(self._map) < offset + self.row_bytes:
+                    return None  # File shorter than state.json says
+            values = self._row_format.unpack_from(self._map, offset)
+        return CachedEmbedding(values, self, row)
+
+    def append(self, vectors: List[List[float]]) -> List[int]:
+        """Write ``vectors`` after the valid rows; returns their row numbers."""
+        if not vectors:
+            return []
+        pack = self._row_format.pack
+        data = b"".join(pack(*vector) for vector in vectors)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            # The map is reopened on the next read; a mapped file cannot be
+            # truncated everywhere
+            self._close_map()
+            with open(self.path, "r+b" if self.path.exists() else "wb") as f:
+                f.truncate(self.rows * self.row_bytes)
+                f.seek(self.rows * self.row_bytes)
+                f.write(data)
+            first = self.rows
+            self.rows += len(vectors)
+        return list(range(first, self.rows))
+
+    def _close_map(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_map()
 
 
 @dataclass
 class PipelineState:
     """State for the entire pipeline."""
 
-    version: str = "1.0"
+    version: str = "1.1"
     last_run: str = ""
     threads: Dict[str, ThreadState] = field(default_factory=dict)  # topic -> ThreadState
+    embedding_dtype: str = DEFAULT_EMBEDDING_DTYPE  # Row type for newly written embedding stores
+    embeddings: Optional[EmbeddingStore] = field(default=None, repr=False, compare=False)
 
     @classmethod
     def load(cls, state_path: Path) -> "PipelineState":
@@ -58,15 +215,20 @@ class PipelineState:
                     entry_count=thread_data.get("entry_count", 0),
                     summary=thread_data.get("summary", ""),
                     entry_summaries=thread_data.get("entry_summaries", {}),
+                    # Inline embeddings of a 1.0 state move to the store on save
                     entry_embeddings=thread_data.get("entry_embeddings", {}),
+                    entry_embedding_rows=thread_data.get("entry_embedding_rows", {}),
+                    entry_hashes=thread_data.get("entry_hashes", {}),
+                    node_hashes=thread_data.get("node_hashes", {}),
                 )
 
             return cls(
                 version=data.get("version", "1.0"),
                 last_run=data.get("last_run", ""),
                 threads=threads,
+                embeddings=_open_store(state_path.parent, data.get("embeddings")),
             )
-        except (json.JSONDecodeError, KeyError):
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError):
             return cls()
 
     def save(self, state_path: Path) -> None:
@@ -77,17 +239,94 @@ class PipelineState:
         """
         state_path.parent.mkdir(parents=True, exist_ok=True)
 
+        # The store is complete before state.json points into it, and a
+        # replaced store is only deleted once state.json no longer does
+        self._store_embeddings(state_path.parent)
+
         data = {
             "version": self.version,
             "last_run": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "embeddings": self.embeddings.metadata() if self.embeddings else None,
             "threads": {
                 topic: asdict(thread_state)
                 for topic, thread_state in self.threads.items()
             },
         }
+        atomic_write_bytes(state_path, json.dumps(data, indent=2).encode("utf-8"))
+
+        for path in state_path.parent.glob(f"{EMBEDDINGS_PREFIX}.*.bin"):
+            if self.embeddings is None or path != self.embeddings.path:
+                path.unlink(missing_ok=True)
+
+    def _store_embeddings(self, directory: Path) -> None:
+        """Move in-memory embeddings into the store, rewriting it if due."""
+        live: List[Tuple[ThreadState, str, int]] = [
+            (thread, entry_id, row)
+            for thread in self.threads.values()
+            for entry_id, row in thread.entry_embedding_rows.items()
+        ]
+        new: List[Tuple[ThreadState, str, List[float]]] = [
+            (thread, entry_id, vector)
+            for thread in self.threads.values()
+            for entry_id, vector in thread.entry_embeddings.items()
+            if vector
+        ]
+        store = self.embeddings
+        if store is None and not new:
+            for thread in self.threads.values():
+                thread.entry_embedding_rows = {}
+            return
 
-        with open(state_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        if store is not None and live:
+            dim = store.dim
+        elif new:
+            dim = len(new[0][2])
+        else:
+            dim = store.dim
+        garbage = store.rows - len(live) if store is not None else 0
+        if (
+            store is None
+            or store.dim != dim
+            or store.dtype != self.embedding_dtype
+            or (garbage >= COMPACT_MIN_ROWS and garbage > len(live))
+        ):
+            store = self._rewrite_store(directory, dim, live)
+
+        # Vectors of another dimension (model changed mid-run) are not cached
+        new = [item for item in new if len(item[2]) == dim]
+        rows = store.append([vector for _, _, vector in new])
+        for (thread, entry_id, _), row in zip(new, rows):
+            thread.entry_embedding_rows[entry_id] = row
+        for thread in self.threads.values():
+            thread.entry_embeddings = {}
+
+    def _rewrite_store(
+        self, directory: Path, dim: int, live: List[Tuple[ThreadState, str, int]]
+    ) -> EmbeddingStore:
+        """Copy the live rows into a new store generation and switch to it."""
+        old = self.embeddings
+        generation = old.generation + 1 if old is not None else 0
+        store = EmbeddingStore(
+            directory / f"{EMBEDDINGS_PREFIX}.{generation}.bin", dim, self.embedding_dtype, generation=generation
+        )
+        store.path.unlink(missing_ok=True)
+
+        kept: List[Tuple[ThreadState, str, List[float]]] = []
+        for thread, entry_id, row in live:
+            vector = old.get(row) if old is not None and old.dim == dim else None
+            if vector is not None:
+                kept.append((thread, entry_id, vector))
+            else:
+                del thread.entry_embedding_rows[entry_id]
+        rows = store.append([vector for _, _, vector in kept])
+        if not rows:
+            store.path.write_bytes(b"")
+        for (thread, entry_id, _), row in zip(kept, rows):
+            thread.entry_embedding_rows[entry_id] = row
+        if old is not None:
+            old.close()
+        self.embeddings = store
+        return store
 
     def is_thread_changed(self, topic: str, current_mtime: float, current_entry_count: int) -> bool:
         """Check if a thread has changed since last run.
@@ -123,9 +362,15 @@ class PipelineState:
 
     def get_cached_entry_embedding(self, topic: str, entry_id: str) -> Optional[List[float]]:
         """Get cached entry embedding if available."""
-        if topic in self.threads:
-            return self.threads[topic].entry_embeddings.get(entry_id)
-        return None
+        thread = self.threads.get(topic)
+        if thread is None:
+            return None
+        embedding = thread.entry_embeddings.get(entry_id)
+        if embedding is None and self.embeddings is not None:
+            row = thread.entry_embedding_rows.get(entry_id)
+            if row is not None:
+                embedding = self.embeddings.get(row)
+        return embedding
 
     def update_thread(
         self,
@@ -135,6 +380,8 @@ class PipelineState:
         summary: str = "",
         entry_summaries: Optional[Dict[str, str]] = None,
         entry_embeddings: Optional[Dict[str, List[float]]] = None,
+        entry_hashes: Optional[Dict[str, str]] = None,
+        node_hashes: Optional[Dict[str, str]] = None,
     ) -> None:
         """Update state for a thread.
 
@@ -144,15 +391,29 @@ class PipelineState:
             entry_count: Number of entries
             summary: Thread summary
             entry_summaries: Entry summaries (entry_id -> summary)
-            entry_embeddings: Entry embeddings (entry_id -> embedding)
+            entry_embeddings: Entry embeddings (entry_id -> embedding); ones
+                read from the store keep their row, the rest are appended
+                to it on save
+            entry_hashes: Entry content hashes (entry_id -> hash)
+            node_hashes: Entry node hashes (entry_id -> hash)
         """
+        pending: Dict[str, List[float]] = {}
+        rows: Dict[str, int] = {}
+        for entry_id, embedding in (entry_embeddings or {}).items():
+            if isinstance(embedding, CachedEmbedding) and embedding.store is self.embeddings:
+                rows[entry_id] = embedding.row
+            else:
+                pending[entry_id] = embedding
         self.threads[topic] = ThreadState(
             topic=topic,
             mtime=mtime,
             entry_count=entry_count,
             summary=summary,
             entry_summaries=entry_summaries or {},
-            entry_embeddings=entry_embeddings or {},
+            entry_embeddings=pending,
+            entry_embedding_rows=rows,
+            entry_hashes=entry_hashes or {},
+            node_hashes=node_hashes or {},
         )
 
     def remove_deleted_threads(self, current_topics: set) -> List[str]:
@@ -170,3 +431,19 @@ class PipelineState:
                 del self.threads[topic]
                 removed.append(topic)
         return removed
+
+
+def _open_store(directory: Path, metadata: Optional[Dict[str, Any]]) -> Optional[EmbeddingStore]:
+    """The embedding store described in ``state.json``, if its file exists."""
+    if not metadata:
+        return None
+    path = directory / Path(metadata["file"]).name
+    if not path.exists():
+        return None
+    return EmbeddingStore(
+        path,
+        int(metadata["dim"]),
+        metadata.get("dtype", DEFAULT_EMBEDDING_DTYPE),
+        rows=int(metadata.get("rows", 0)),
+        generation=int(metadata.get("generation", 0)),
+    )
@@ -18,7 +18,10 @@ import logging
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import graph_cache, graph_store
+from .jsonl_log import read_latest
 
 logger = logging.getLogger(__name__)
 
@@ -144,33 +147,21 @@ def get_graph_staleness(threads_dir: Path) -> Optional[float]:
 
 
 def _load_nodes(graph_dir: Path) -> Iterator[Dict[str, Any]]:
-    """Load nodes from JSONL file."""
-    nodes_file = graph_dir / "nodes.jsonl"
-    if not nodes_file.exists():
-        return
-
-    with open(nodes_file, "r", encoding="utf-8") as f:
-        for line in f:
-            if line.strip():
-                try:
-                    yield json.loads(line)
-                except json.JSONDecodeError:
-                    continue
+    """Load the current nodes from the JSONL log (last record per id)."""
+    yield from read_latest(graph_dir / "nodes.jsonl")
 
 
 def _load_edges(graph_dir: Path) -> Iterator[Dict[str, Any]]:
-    """Load edges from JSONL file."""
-    edges_file = graph_dir / "edges.jsonl"
-    if not edges_file.exists():
-        return
+    """Load the current edges from the JSONL log (last record per key)."""
+    yield from read_latest(graph_dir / "edges.jsonl")
+
 
-    with open(edges_file, "r", encoding="utf-8") as f:
-        for line in f:
-            if line.strip():
-                try:
-                    yield json.loads(line)
-                except json.JSONDecodeError:
-                    continue
+def _find_nodes(threads_dir: Path, nodes_file: Path, **filters: Any) -> Optional[List[Dict[str, Any]]]:
+    """Indexed lookup from the in-memory cache, else the graph store (None: scan)."""
+    nodes = graph_cache.find_nodes(threads_dir, nodes_file, **filters)
+    if nodes is None:
+        nodes = graph_store.find_nodes(threads_dir, nodes_file, **filters)
+    return nodes
 
 
 def _node_to_thread(node: Dict[str, Any]) -> GraphThread:
@@ -228,7 +219,8 @@ def list_threads_from_graph(
     graph_dir = get_graph_dir(threads_dir)
     threads = []
 
-    for node in _load_nodes(graph_dir):
+    nodes = _find_nodes(threads_dir, graph_dir / "nodes.jsonl", node_type="thread")
+    for node in nodes if nodes is not None else _load_nodes(graph_dir):
         if node.get("type") != "thread":
             continue
 
@@ -266,8 +258,16 @@ def read_thread_from_graph(
     thread: Optional[GraphThread] = None
     entries: List[GraphEntry] = []
 
-    # Single pass through nodes
-    for node in _load_nodes(graph_dir):
+    nodes_file = graph_dir / "nodes.jsonl"
+    threads = _find_nodes(threads_dir, nodes_file, node_type="thread", topic=topic)
+    thread_entries = _find_nodes(threads_dir, nodes_file, node_type="entry", thread_topic=topic)
+    if threads is not None and thread_entries is not None:
+        nodes: Iterable[Dict[str, Any]] = threads + thread_entries
+    else:
+        # Single pass through nodes
+        nodes = _load_nodes(graph_dir)
+
+    for node in nodes:
         node_type = node.get("type")
 
         if node_type == "thread" and node.get("topic") == topic:
@@ -306,7 +306,16 @@ def get_entry_from_graph(
 
     graph_dir = get_graph_dir(threads_dir)
 
-    for node in _load_nodes(graph_dir):
+    nodes = _find_nodes(
+        threads_dir, graph_dir / "nodes.jsonl", node_type="entry", thread_topic=topic,
+        entry_id=entry_id or None, index=None if entry_id else index,
+    )
+    if nodes is not None and not nodes and entry_id and index is not None:
+        nodes = _find_nodes(
+            threads_dir, graph_dir / "nodes.jsonl", node_type="entry", thread_topic=topic, index=index
+        )
+
+    for node in nodes if nodes is not None else _load_nodes(graph_dir):
         if node.get("type") != "entry":
             continue
         if node.get("thread_topic") != topic:
@@ -340,7 +349,11 @@ def get_entries_range_from_graph(
     graph_dir = get_graph_dir(threads_dir)
     entries = []
 
-    for node in _load_nodes(graph_dir):
+    nodes = _find_nodes(
+        threads_dir, graph_dir / "nodes.jsonl", node_type="entry", thread_topic=topic,
+        min_index=start_index, max_index=end_index,
+    )
+    for node in nodes if nodes is not None else _load_nodes(graph_dir):
         if node.get("type") != "entry":
             continue
         if node.get("thread_topic") != topic:
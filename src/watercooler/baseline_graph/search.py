@@ -14,14 +14,16 @@ Key capabilities:
 
 from __future__ import annotations
 
-import json
 import logging
 import math
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Iterator, List, Literal, Optional, Tuple
+from typing import Any, Iterable, Iterator, List, Literal, Optional, Tuple
 
+from .. import search_index
+from . import embedding_codec, embedding_index, graph_cache, graph_store
+from .jsonl_log import read_latest
 from .reader import get_graph_dir, GraphEntry, GraphThread, _node_to_entry, _node_to_thread
 
 logger = logging.getLogger(__name__)
@@ -52,6 +54,8 @@ class SearchQuery:
         combine: How to combine filters ("AND" or "OR")
         include_threads: Include thread nodes in results
         include_entries: Include entry nodes in results
+        exact: Score every embedded node in semantic search instead of only
+            the probed lists of the IVF index (large graphs)
     """
     query: Optional[str] = None
     semantic: bool = False
@@ -68,6 +72,7 @@ class SearchQuery:
     combine: Literal["AND", "OR"] = "AND"
     include_threads: bool = True
     include_entries: bool = True
+    exact: bool = False
 
 
 @dataclass
@@ -96,7 +101,8 @@ class SearchResults:
 
     Attributes:
         results: List of SearchResult objects
-        total_scanned: Total nodes scanned
+        total_scanned: Total nodes scanned (only index candidates when the
+            keyword index or the graph store could narrow the search)
         query: The original search query
     """
     results: List[SearchResult] = field(default_factory=list)
@@ -123,18 +129,8 @@ class SearchResults:
 
 
 def _load_nodes(graph_dir: Path) -> Iterator[dict[str, Any]]:
-    """Load all nodes from the graph JSONL file."""
-    nodes_file = graph_dir / "nodes.jsonl"
-    if not nodes_file.exists():
-        return
-
-    with open(nodes_file, "r", encoding="utf-8") as f:
-        for line in f:
-            if line.strip():
-                try:
-                    yield json.loads(line)
-                except json.JSONDecodeError:
-                    continue
+    """Load all current nodes from the graph JSONL log (last record per id)."""
+    yield from read_latest(graph_dir / "nodes.jsonl")
 
 
 # ============================================================================
@@ -323,6 +319,126 @@ def _matches_filters(
 # ============================================================================
 
 
+def _evaluate_node(
+    node: dict[str, Any],
+    search_query: SearchQuery,
+    semantic: bool,
+    similarity: Optional[float],
+    bm25: Optional[dict[tuple[str, str], float]],
+) -> Optional[SearchResult]:
+    """Apply the query's filters to ``node`` and build its result.
+
+    Args:
+        node: The node to check
+        search_query: Search query with filters
+        semantic: Whether this is a semantic search with a query embedding
+        similarity: Cosine similarity of the node's embedding to the query
+            embedding (None if the node has no embedding)
+        bm25: BM25F keyword scores by (node_type, node_id), if available
+
+    Returns:
+        SearchResult, or None if the node does not pass
+    """
+    node_type = node.get("type")
+
+    # Filter by node type
+    if node_type == "thread" and not search_query.include_threads:
+        return None
+    if node_type == "entry" and not search_query.include_entries:
+        return None
+    if node_type not in ("thread", "entry"):
+        return None
+
+    # Collect filter results
+    filter_results = []
+    matched_fields: List[str] = []
+    semantic_score: Optional[float] = None
+
+    # Semantic search with embeddings
+    if semantic:
+        if similarity is not None:
+            if similarity >= search_query.semantic_threshold:
+                filter_results.append(True)
+                matched_fields.append("embedding")
+                semantic_score = similarity
+                logger.debug(f"Semantic match: {node.get('entry_id', node.get('topic'))} score={similarity:.3f}")
+            else:
+                filter_results.append(False)
+        else:
+            # No embedding available - skip for pure semantic search
+            filter_results.append(False)
+    # Keyword match (fallback or primary)
+    elif search_query.query:
+        keyword_match, keyword_fields = _matches_keyword(node, search_query.query)
+        filter_results.append(keyword_match)
+        matched_fields.extend(keyword_fields)
+
+    # Time range
+    if search_query.start_time or search_query.end_time:
+        time_match = _matches_time_range(
+            node, search_query.start_time, search_query.end_time
+        )
+        filter_results.append(time_match)
+        if time_match and (search_query.start_time or search_query.end_time):
+            matched_fields.append("timestamp")
+
+    # Other filters (role, entry_type, agent, thread_status, thread_topic)
+    filters_match, filter_fields = _matches_filters(
+        node, search_query, search_query.combine
+    )
+    if filter_fields:
+        matched_fields.extend(filter_fields)
+
+    # Add filter results to the overall list
+    filter_results.append(filters_match)
+
+    # Combine results
+    if search_query.combine == "AND":
+        passes = all(filter_results) if filter_results else True
+    else:  # OR
+        passes = any(filter_results) if filter_results else True
+
+    if not passes:
+        return None
+
+    # Build result
+    node_id = node.get("topic") if node_type == "thread" else node.get("entry_id", "")
+
+    # Calculate score
+    if semantic_score is not None:
+        # Use cosine similarity as the score for semantic search
+        score = semantic_score
+    elif bm25 is not None:
+        # BM25F relevance; nodes that only passed other filters score 0
+        score = bm25.get((node_type, node_id or ""), 0.0)
+    else:
+        # Simple relevance scoring for keyword search
+        score = 1.0
+        if matched_fields:
+            # Boost for title matches
+            if "title" in matched_fields:
+                score += 0.5
+            # Boost for body matches
+            if "body" in matched_fields:
+                score += 0.3
+            score += len(matched_fields) * 0.1
+
+    result = SearchResult(
+        node_type=node_type,
+        node_id=node_id,
+        score=score,
+        matched_fields=matched_fields,
+    )
+
+    # Attach typed object
+    if node_type == "thread":
+        result.thread = _node_to_thread(node)
+    else:
+        result.entry = _node_to_entry(node)
+
+    return result
+
+
 def search_graph(
     threads_dir: Path,
     search_query: SearchQuery,
@@ -330,7 +446,8 @@ def search_graph(
     """Execute a search against the graph.
 
     Supports two search modes:
-    - Keyword search (default): text matching in title/body/summary
+    - Keyword search (default): text matching in title/body/summary, ranked
+      with BM25F (per-field weights, see ``search_index.BM25_FIELD_WEIGHTS``)
     - Semantic search (semantic=True): cosine similarity with embeddings
 
     Args:
@@ -354,107 +471,93 @@ def search_graph(
         if not query_embedding:
             logger.warning("Semantic search requested but failed to generate query embedding, falling back to keyword")
 
+    semantic = bool(search_query.semantic and query_embedding and search_query.query)
     matching_results: List[SearchResult] = []
 
-    for node in _load_nodes(graph_dir):
-        results.total_scanned += 1
-        node_type = node.get("type")
-
-        # Filter by node type
-        if node_type == "thread" and not search_query.include_threads:
-            continue
-        if node_type == "entry" and not search_query.include_entries:
-            continue
-        if node_type not in ("thread", "entry"):
-            continue
-
-        # Collect filter results
-        filter_results = []
-        matched_fields: List[str] = []
-        semantic_score: Optional[float] = None
-
-        # Semantic search with embeddings
-        if search_query.semantic and query_embedding and search_query.query:
-            node_embedding = node.get("embedding")
-            if node_embedding:
-                similarity = _cosine_similarity(query_embedding, node_embedding)
-                if similarity >= search_query.semantic_threshold:
-                    filter_results.append(True)
-                    matched_fields.append("embedding")
-                    semantic_score = similarity
-                    logger.debug(f"Semantic match: {node.get('entry_id', node.get('topic'))} score={similarity:.3f}")
-                else:
-                    filter_results.append(False)
-            else:
-                # No embedding available - skip for pure semantic search
-                filter_results.append(False)
-        # Keyword match (fallback or primary)
-        elif search_query.query:
-            keyword_match, keyword_fields = _matches_keyword(node, search_query.query)
-            filter_results.append(keyword_match)
-            matched_fields.extend(keyword_fields)
-
-        # Time range
-        if search_query.start_time or search_query.end_time:
-            time_match = _matches_time_range(
-                node, search_query.start_time, search_query.end_time
-            )
-            filter_results.append(time_match)
-            if time_match and (search_query.start_time or search_query.end_time):
-                matched_fields.append("timestamp")
-
-        # Other filters (role, entry_type, agent, thread_status, thread_topic)
-        filters_match, filter_fields = _matches_filters(
-            node, search_query, search_query.combine
+    # Semantic queries score embedded nodes with one matrix-vector product
+    # over the cached embedding matrix when NumPy is available (only the
+    # probed IVF lists on large graphs). In AND mode only nodes above the
+    # threshold can pass, so they are read best-first in growing top-k
+    # batches until ``limit`` results pass.
+    matrix: Optional[embedding_index.EmbeddingMatrix] = None
+    scores = None
+    if semantic:
+        matrix = embedding_index.load(threads_dir, graph_dir / "nodes.jsonl")
+    if matrix is not None and search_query.combine == "AND":
+        types = [t for t, wanted in (("thread", search_query.include_threads),
+                                     ("entry", search_query.include_entries)) if wanted]
+        scores = matrix.scores(query_embedding, types=types, exact=search_query.exact)
+        if scores is not None:
+            k = max(search_query.limit, 1)
+            done = 0
+            while True:
+                hits = embedding_index.top_k(scores, k, search_query.semantic_threshold)
+                for node in matrix.read_nodes([row for row, _score in hits[done:]]):
+                    results.total_scanned += 1
+                    row = matrix.row(node["id"])
+                    result = _evaluate_node(node, search_query, True, float(scores[row]), None)
+                    if result is not None:
+                        matching_results.append(result)
+                done = len(hits)
+                if len(matching_results) >= search_query.limit or len(hits) < k:
+                    break
+                k *= 4
+            matching_results.sort(key=lambda r: r.score, reverse=True)
+            results.results = matching_results[:search_query.limit]
+            return results
+    elif matrix is not None:
+        # OR mode looks at every node, so score them all exactly
+        scores = matrix.scores(query_embedding, exact=True)
+
+    # Keyword queries are ranked with BM25F from the inverted index. In AND
+    # mode the keyword must match, so only the nodes the index nominates can
+    # pass; OR mode still has to look at every node.
+    nodes: Optional[Iterable[dict[str, Any]]] = None
+    bm25: Optional[dict[tuple[str, str], float]] = None
+    if search_query.query and not query_embedding:
+        scored = search_index.graph_keyword_candidates(
+            threads_dir, graph_dir / "nodes.jsonl", search_query.query
         )
-        if filter_fields:
-            matched_fields.extend(filter_fields)
-
-        # Add filter results to the overall list
-        filter_results.append(filters_match)
-
-        # Combine results
-        if search_query.combine == "AND":
-            passes = all(filter_results) if filter_results else True
-        else:  # OR
-            passes = any(filter_results) if filter_results else True
-
-        if not passes:
-            continue
-
-        # Build result
-        node_id = node.get("topic") if node_type == "thread" else node.get("entry_id", "")
+        if scored is not None:
+            bm25 = {search_index.result_key(node): score for node, score in scored}
+            if search_query.combine == "AND":
+                nodes = [node for node, _score in scored]
+    # Topic-scoped and thread-only AND queries read just the nodes the graph
+    # store's indexed columns allow through. The in-memory cache serves them
+    # when no embeddings are needed (it does not hold them).
+    if nodes is None and search_query.combine == "AND" and (
+        search_query.thread_topic or not search_query.include_entries
+    ):
+        types = [t for t, wanted in (("thread", search_query.include_threads),
+                                     ("entry", search_query.include_entries)) if wanted]
+        if not semantic:
+            nodes = graph_cache.search_candidates(
+                threads_dir, graph_dir / "nodes.jsonl", types,
+                thread_topic=search_query.thread_topic, thread_status=search_query.thread_status,
+            )
+        if nodes is None:
+            nodes = graph_store.search_candidates(
+                threads_dir, graph_dir / "nodes.jsonl", types,
+                thread_topic=search_query.thread_topic, thread_status=search_query.thread_status,
+            )
+    if nodes is None:
+        nodes = _load_nodes(graph_dir)
 
-        # Calculate score
-        if semantic_score is not None:
-            # Use cosine similarity as the score for semantic search
-            score = semantic_score
-        else:
-            # Simple relevance scoring for keyword search
-            score = 1.0
-            if matched_fields:
-                # Boost for title matches
-                if "title" in matched_fields:
-                    score += 0.5
-                # Boost for body matches
-                if "body" in matched_fields:
-                    score += 0.3
-                score += len(matched_fields) * 0.1
-
-        result = SearchResult(
-            node_type=node_type,
-            node_id=node_id,
-            score=score,
-            matched_fields=matched_fields,
-        )
+    for node in nodes:
+        results.total_scanned += 1
 
-        # Attach typed object
-        if node_type == "thread":
-            result.thread = _node_to_thread(node)
-        else:
-            result.entry = _node_to_entry(node)
+        similarity: Optional[float] = None
+        if semantic:
+            if matrix is not None and scores is not None:
+                row = matrix.row(node.get("id"))
+                if row is not None:
+                    similarity = float(scores[row])
+            elif node.get("embedding"):
+                similarity = _cosine_similarity(query_embedding, embedding_codec.decode(node["embedding"]))
 
-        matching_results.append(result)
+        result = _evaluate_node(node, search_query, semantic, similarity, bm25)
+        if result is not None:
+            matching_results.append(result)
 
     # Sort by score descending
     matching_results.sort(key=lambda r: r.score, reverse=True)
@@ -582,6 +685,7 @@ def find_similar_entries(
     limit: int = 5,
     use_embeddings: bool = True,
     similarity_threshold: float = 0.5,
+    exact: bool = False,
 ) -> List[GraphEntry]:
     """Find entries similar to a given entry.
 
@@ -594,12 +698,25 @@ def find_similar_entries(
         limit: Maximum results
         use_embeddings: Try to use embedding similarity (default True)
         similarity_threshold: Minimum cosine similarity for embedding matches
+        exact: Score every embedded entry instead of only the probed lists
+            of the IVF index (large graphs)
 
     Returns:
         List of similar GraphEntry objects, sorted by similarity
     """
     graph_dir = get_graph_dir(threads_dir)
 
+    # Fast path: the source embedding is a row of the cached embedding matrix,
+    # so entries are scored with one matrix-vector product (approximate IVF
+    # search on large graphs)
+    if use_embeddings and (graph_dir / "nodes.jsonl").exists():
+        matrix = embedding_index.load(threads_dir, graph_dir / "nodes.jsonl")
+        row = matrix.row(f"entry:{entry_id}") if matrix is not None else None
+        if matrix is not None and row is not None:
+            scores = matrix.scores(matrix.vectors[row], types=("entry",), exact=exact)
+            hits = embedding_index.top_k(scores, limit, similarity_threshold, exclude=row)
+            return [_node_to_entry(node) for node in matrix.read_nodes([r for r, _score in hits])]
+
     # First, find the source entry
     source_entry = None
     for node in _load_nodes(graph_dir):
@@ -610,7 +727,7 @@ def find_similar_entries(
     if not source_entry:
         return []
 
-    source_embedding = source_entry.get("embedding") if use_embeddings else None
+    source_embedding = embedding_codec.decode(source_entry.get("embedding")) if use_embeddings else None
 
     # If we have an embedding, compute similarity against all entries
     if source_embedding:
@@ -622,7 +739,7 @@ def find_similar_entries(
             if node.get("entry_id") == entry_id:
                 continue  # Skip self
 
-            node_embedding = node.get("embedding")
+            node_embedding = embedding_codec.decode(node.get("embedding"))
             if not node_embedding:
                 continue
 
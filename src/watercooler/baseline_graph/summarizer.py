@@ -10,6 +10,8 @@ import re
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
+from watercooler import http_pool
+
 logger = logging.getLogger(__name__)
 
 
@@ -102,9 +104,8 @@ def is_llm_service_available(config: Optional[SummarizerConfig] = None) -> bool:
 
     try:
         url = f"{config.api_base.rstrip('/')}/models"
-        with httpx.Client(timeout=5.0) as client:
-            response = client.get(url)
-            return response.status_code == 200
+        response = http_pool.client(config.api_base).get(url, timeout=5.0)
+        return response.status_code == 200
     except Exception as e:
         logger.debug(f"LLM service not available at {config.api_base}: {e}")
         return False
@@ -292,11 +293,12 @@ def _call_llm(
         headers["Authorization"] = f"Bearer {config.api_key}"
 
     try:
-        with httpx.Client(timeout=config.timeout) as client:
-            response = client.post(url, json=payload, headers=headers)
-            response.raise_for_status()
-            data = response.json()
-            return data["choices"][0]["message"]["content"].strip()
+        response = http_pool.client(config.api_base).post(
+            url, json=payload, headers=headers, timeout=config.timeout
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data["choices"][0]["message"]["content"].strip()
     except httpx.ConnectError:
         logger.warning(f"Cannot connect to LLM at {config.api_base}")
         return None
@@ -6,9 +6,12 @@ to keep the graph in sync with markdown files.
 
 Key functions:
 - sync_entry_to_graph(): Upsert entry + thread nodes/edges after a write
+- sync_entries_to_graph(): The same for a batch of writes, in one graph write
+  (prepare_graph_sync() + apply_graph_sync())
 - sync_thread_to_graph(): Full thread sync (for rebuilds)
 - record_graph_sync_error(): Track sync failures for later reconciliation
 - get_graph_sync_state(): Check current sync state
+- migrate_embeddings(): Re-encode the embeddings of an existing graph
 
 Feature Configuration:
     The following features are configurable and may be disabled by default:
@@ -32,6 +35,18 @@ Feature Configuration:
         - Gracefully skips generation if services are unavailable
         - Config: mcp.graph.auto_detect_services (default: true)
 
+    Deferred Enrichment (deferred_enrichment):
+        - Stages entries with an extractive summary and no embedding, flagged
+          ``"enrichment": "pending"``, so the upsert is cheap enough to go
+          into the thread commit; a later sync replaces the node with the
+          enriched one (which clears the flag)
+        - Config: mcp.graph.single_commit (default: true)
+
+    Embedding Encoding (embedding_codec):
+        - Embeddings are stored as JSON float lists or, to keep nodes.jsonl
+          small, as base64 float16 / int8-quantized strings
+        - Config: mcp.graph.embedding_encoding (default: json)
+
     See config.example.toml for full configuration options.
 """
 
@@ -44,8 +59,10 @@ import tempfile
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from watercooler import http_pool, search_index
+from watercooler.baseline_graph import embedding_codec, embedding_index, graph_cache, graph_store, jsonl_log
 from watercooler.baseline_graph.export import (
     entry_to_node,
     generate_edges,
@@ -54,11 +71,13 @@ from watercooler.baseline_graph.export import (
 from watercooler.baseline_graph.parser import (
     ParsedEntry,
     ParsedThread,
+    parse_thread_entry,
     parse_thread_file,
 )
 from watercooler.baseline_graph.summarizer import (
     SummarizerConfig,
     create_summarizer_config,
+    extractive_summary,
     is_llm_service_available,
     summarize_entry,
     summarize_thread,
@@ -66,6 +85,10 @@ from watercooler.baseline_graph.summarizer import (
 
 logger = logging.getLogger(__name__)
 
+# Entry node field marking an upsert staged without LLM summary/embedding
+ENRICHMENT_FIELD = "enrichment"
+ENRICHMENT_PENDING = "pending"
+
 
 # ============================================================================
 # Embedding Configuration & Generation
@@ -104,11 +127,9 @@ def is_embedding_available(config: Optional[EmbeddingConfig] = None) -> bool:
     config = config or EmbeddingConfig.from_env()
 
     try:
-        import httpx
         url = f"{config.api_base.rstrip('/')}/models"
-        with httpx.Client(timeout=5.0) as client:
-            response = client.get(url)
-            return response.status_code == 200
+        response = http_pool.client(config.api_base).get(url, timeout=5.0)
+        return response.status_code == 200
     except Exception as e:
         logger.debug(f"Embedding service not available: {e}")
         return False
@@ -130,22 +151,56 @@ def generate_embedding(
     config = config or EmbeddingConfig.from_env()
 
     try:
-        import httpx
         url = f"{config.api_base.rstrip('/')}/embeddings"
 
-        with httpx.Client(timeout=config.timeout) as client:
-            response = client.post(url, json={
-                "model": config.model,
-                "input": text[:2000],
-            })
-            response.raise_for_status()
-            data = response.json()
-            return data["data"][0]["embedding"]
+        response = http_pool.client(config.api_base).post(url, json={
+            "model": config.model,
+            "input": text[:2000],
+        }, timeout=config.timeout)
+        response.raise_for_status()
+        data = response.json()
+        return data["data"][0]["embedding"]
     except Exception as e:
         logger.debug(f"Failed to generate embedding: {e}")
         return None
 
 
+def generate_embedding_batch(
+    texts: List[str],
+    config: Optional[EmbeddingConfig] = None,
+) -> List[Optional[List[float]]]:
+    """Generate embedding vectors for several texts in one request.
+
+    Falls back to one request per text if the batch request fails (not
+    every server accepts a list of inputs).
+
+    Args:
+        texts: Texts to embed
+        config: Embedding configuration
+
+    Returns:
+        One embedding vector (or None on failure) per text
+    """
+    if len(texts) <= 1:
+        return [generate_embedding(text, config) for text in texts]
+    config = config or EmbeddingConfig.from_env()
+
+    try:
+        url = f"{config.api_base.rstrip('/')}/embeddings"
+
+        response = http_pool.client(config.api_base).post(url, json={
+            "model": config.model,
+            "input": [text[:2000] for text in texts],
+        }, timeout=config.timeout)
+        response.raise_for_status()
+        data = sorted(response.json()["data"], key=lambda item: item.get("index", 0))
+        if len(data) == len(texts):
+            return [item["embedding"] for item in data]
+    except Exception as e:
+        logger.debug(f"Batch embedding request failed: {e}")
+    return [generate_embedding(text, config) for text in texts]
+
+
 def _should_auto_start_services() -> bool:
     """Check if auto-start services is enabled via env var.
 
@@ -223,7 +278,7 @@ def should_update_thread_summary(
         True if thread summary should be regenerated
     """
     # Always generate for first 3 entries
-    if len(parsed.entries) <= 3:
+    if parsed.entry_count <= 3:
         return True
 
     # Arc-changing entry types
@@ -233,12 +288,12 @@ def should_update_thread_summary(
 
     # Significant growth (50% more entries)
     if previous_entry_count > 0:
-        growth_ratio = len(parsed.entries) / previous_entry_count
+        growth_ratio = parsed.entry_count / previous_entry_count
         if growth_ratio >= 1.5:
             return True
 
     # Every 10th entry
-    if len(parsed.entries) % 10 == 0:
+    if parsed.entry_count % 10 == 0:
         return True
 
     return False
@@ -264,13 +319,13 @@ def get_previous_thread_state(
         return 0, None
 
     try:
-        with open(nodes_file, "r", encoding="utf-8") as f:
-            for line in f:
-                if not line.strip():
-                    continue
-                node = json.loads(line)
-                if node.get("type") == "thread" and node.get("topic") == topic:
-                    return node.get("entry_count", 0), node.get("summary")
+        # The log may hold several versions of the thread node: last one wins
+        previous: Optional[Dict[str, Any]] = None
+        for node in jsonl_log.iter_records(nodes_file):
+            if node.get("type") == "thread" and node.get("topic") == topic:
+                previous = node
+        if previous is not None:
+            return previous.get("entry_count", 0), previous.get("summary")
     except Exception as e:
         logger.debug(f"Failed to read previous thread state: {e}")
 
@@ -349,6 +404,19 @@ def _update_graph_sync_state(
         topic: Thread topic
         state: New state
     """
+    _update_graph_sync_states(threads_dir, {topic: state})
+
+
+def _update_graph_sync_states(
+    threads_dir: Path,
+    states: Dict[str, GraphSyncState],
+) -> None:
+    """Update graph sync state for several topics in one write.
+
+    Args:
+        threads_dir: Threads directory
+        states: New state per topic
+    """
     state_file = _get_state_file(threads_dir)
     state_file.parent.mkdir(parents=True, exist_ok=True)
 
@@ -360,17 +428,18 @@ def _update_graph_sync_state(
         except Exception:
             pass
 
-    # Update topic state
+    # Update topic states
     if "topics" not in data:
         data["topics"] = {}
 
-    data["topics"][topic] = {
-        "status": state.status,
-        "last_synced_entry_id": state.last_synced_entry_id,
-        "last_sync_at": state.last_sync_at,
-        "error_message": state.error_message,
-        "entries_synced": state.entries_synced,
-    }
+    for topic, state in states.items():
+        data["topics"][topic] = {
+            "status": state.status,
+            "last_synced_entry_id": state.last_synced_entry_id,
+            "last_sync_at": state.last_sync_at,
+            "error_message": state.error_message,
+            "entries_synced": state.entries_synced,
+        }
     data["last_updated"] = _now_iso()
 
     # Atomic write
@@ -436,56 +505,76 @@ def _atomic_write_json(path: Path, data: Any) -> None:
         raise
 
 
-def _atomic_append_jsonl(path: Path, items: List[Dict[str, Any]]) -> None:
-    """Append items to JSONL file atomically.
+def _write_nodes(threads_dir: Path, nodes_file: Path, nodes: List[Dict[str, Any]]) -> None:
+    """Upsert ``nodes`` and keep the keyword, embedding, store and memory indexes in step.
 
-    This reads existing content, appends new items, and writes atomically.
-    For incremental sync, we need to handle deduplication.
+    The nodes are appended to the log (see ``jsonl_log``), which is
+    compacted once enough superseded records have piled up.
+    """
+    try:
+        before: Optional[os.stat_result] = nodes_file.stat()
+    except OSError:
+        before = None
+    layout = jsonl_log.append(nodes_file, nodes)
+    search_index.note_graph_write(threads_dir, before, nodes_file, layout, nodes, appended=True)
+    embedding_index.note_graph_write(threads_dir, before, nodes_file, layout, nodes, appended=True)
+    graph_store.note_graph_write(threads_dir, before, nodes_file, layout, nodes, appended=True)
+    graph_cache.note_graph_write(threads_dir, before, nodes_file, layout, nodes, appended=True)
+    if jsonl_log.needs_compaction(threads_dir, nodes_file):
+        before = nodes_file.stat()
+        layout = jsonl_log.compact(nodes_file, threads_dir)
+        search_index.note_graph_write(threads_dir, before, nodes_file, layout, [])
+        embedding_index.note_graph_write(threads_dir, before, nodes_file, layout, [])
+        graph_store.note_graph_write(threads_dir, before, nodes_file, layout, [])
+        graph_cache.note_graph_write(threads_dir, before, nodes_file, layout, [])
+
+
+def migrate_embeddings(threads_dir: Path, encoding: str) -> int:
+    """Re-encode the node embeddings of the graph in ``threads_dir``.
+
+    Rewrites (and so compacts) ``nodes.jsonl`` with every embedding in
+    ``encoding`` (see ``embedding_codec``). The keyword index, store and
+    memory cache follow the new line layout; the embedding matrix is
+    rebuilt from the re-encoded vectors at the next semantic query.
 
     Args:
-        path: Target JSONL path
-        items: Items to append (will be deduplicated by 'id' field)
+        threads_dir: Threads directory
+        encoding: Target encoding (json, f16 or i8)
+
+    Returns:
+        Number of nodes whose embedding was re-encoded
+
+    Raises:
+        ValueError: If ``encoding`` is unknown
     """
-    path.parent.mkdir(parents=True, exist_ok=True)
+    if encoding not in embedding_codec.ENCODINGS:
+        raise ValueError(f"Unknown embedding encoding: {encoding}")
+    nodes_file = threads_dir / "graph" / "baseline" / "nodes.jsonl"
+    if not nodes_file.exists():
+        return 0
 
-    # Load existing items
-    existing: Dict[str, Dict[str, Any]] = {}
-    if path.exists():
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        item = json.loads(line)
-                        item_id = item.get("id") or item.get("source", "") + item.get("target", "")
-                        if item_id:
-                            existing[item_id] = item
-        except Exception as e:
-            logger.warning(f"Failed to read existing JSONL {path}: {e}")
+    converted = 0
 
-    # Merge new items (upsert)
-    for item in items:
-        item_id = item.get("id") or item.get("source", "") + item.get("target", "")
-        if item_id:
-            existing[item_id] = item
+    def reencode(node: Dict[str, Any]) -> Dict[str, Any]:
+        nonlocal converted
+        updated = embedding_codec.reencode_node(node, encoding)
+        if updated is not node:
+            converted += 1
+        return updated
+
+    before = nodes_file.stat()
+    layout = jsonl_log.compact(nodes_file, threads_dir, transform=reencode)
+    search_index.note_graph_write(threads_dir, before, nodes_file, layout, [])
+    graph_store.note_graph_write(threads_dir, before, nodes_file, layout, [])
+    graph_cache.note_graph_write(threads_dir, before, nodes_file, layout, [])
+    return converted
 
-    # Write atomically
-    fd, tmp_path = tempfile.mkstemp(
-        dir=path.parent,
-        prefix=".tmp_",
-        suffix=".jsonl",
-    )
-    try:
-        with os.fdopen(fd, "w", encoding="utf-8") as f:
-            for item in existing.values():
-                f.write(json.dumps(item) + "\n")
-        os.replace(tmp_path, path)
-    except Exception:
-        try:
-            os.unlink(tmp_path)
-        except OSError:
-            pass
-        raise
+
+def _write_edges(threads_dir: Path, edges_file: Path, edges: List[Dict[str, Any]]) -> None:
+    """Upsert ``edges`` (keyed by source + target) into the edge log."""
+    jsonl_log.append(edges_file, edges)
+    if jsonl_log.needs_compaction(threads_dir, edges_file):
+        jsonl_log.compact(edges_file, threads_dir)
 
 
 # ============================================================================
@@ -493,231 +582,399 @@ def _atomic_append_jsonl(path: Path, items: List[Dict[str, Any]]) -> None:
 # ============================================================================
 
 
-def sync_entry_to_graph(
-    threads_dir: Path,
-    topic: str,
-    entry_id: Optional[str] = None,
-    generate_summaries: bool = False,
-    generate_embeddings: bool = False,
-) -> bool:
-    """Sync a single entry to the graph after an MCP write.
+@dataclass
+class GraphSyncBatch:
+    """Graph upserts prepared for a batch of written entries.
 
-    This function:
-    1. Parses the thread file
-    2. Generates entry summary (if enabled)
-    3. Generates entry embedding (if enabled)
-    4. Optionally updates thread summary (if arc changed)
-    5. Upserts the entry node (and thread node)
-    6. Updates edges (contains, followed_by)
-    7. Updates sync state
+    Built by :func:`prepare_graph_sync` (parsing, summaries and embeddings,
+    i.e. the slow part) and written by :func:`apply_graph_sync` with one
+    append per graph log.
+    """
 
-    Args:
-        threads_dir: Threads directory
-        topic: Thread topic
-        entry_id: Specific entry ID to sync (or None for latest)
-        generate_summaries: Whether to generate LLM summaries
-        generate_embeddings: Whether to generate embedding vectors
+    nodes: List[Dict[str, Any]] = field(default_factory=list)
+    edges: List[Dict[str, Any]] = field(default_factory=list)
+    states: Dict[str, GraphSyncState] = field(default_factory=dict)
+    # Topics that could not be prepared: topic -> (entry_id, error)
+    errors: Dict[str, Tuple[Optional[str], Exception]] = field(default_factory=dict)
+    # Topics skipped without an error (e.g. no thread file)
+    skipped: List[str] = field(default_factory=list)
+    # Topics whose entries were not found: resynced in full when applied
+    full_sync: List[str] = field(default_factory=list)
+    generate_summaries: bool = False
+    generate_embeddings: bool = False
+    deferred_enrichment: bool = False
+
+
+class _NeedsFullSync(Exception):
+    """An entry to sync is not in its thread file."""
+
+
+def _available_summarizer() -> Optional[SummarizerConfig]:
+    """Summarizer config if the LLM service is (or can be started and is) up."""
+    summarizer_config = create_summarizer_config()
+    if is_llm_service_available(summarizer_config):
+        return summarizer_config
+    if _try_auto_start_service("llm", summarizer_config.api_base) and is_llm_service_available(summarizer_config):
+        return summarizer_config
+    logger.warning(
+        f"LLM service unavailable at {summarizer_config.api_base}. "
+        "Skipping summary generation. To enable summaries: "
+        "1) Start Ollama: 'ollama serve' "
+        "2) Or set WATERCOOLER_AUTO_START_SERVICES=true"
+    )
+    return None
 
-    Returns:
-        True if sync succeeded, False otherwise
-    """
-    thread_path = threads_dir / f"{topic}.md"
-    if not thread_path.exists():
-        logger.warning(f"Thread file not found for sync: {thread_path}")
-        return False
 
-    try:
-        # Get previous thread state for arc change detection
-        prev_entry_count, prev_thread_summary = get_previous_thread_state(threads_dir, topic)
+def _available_embedder() -> Optional[EmbeddingConfig]:
+    """Embedding config if the embedding service is (or can be started and is) up."""
+    embed_config = EmbeddingConfig.from_env()
+    if is_embedding_available(embed_config):
+        return embed_config
+    if _try_auto_start_service("embedding", embed_config.api_base) and is_embedding_available(embed_config):
+        return embed_config
+    logger.warning(
+        f"Embedding service unavailable at {embed_config.api_base}. "
+        "Skipping embedding generation. To enable embeddings: "
+        "1) Start llama.cpp server with embedding model "
+        "2) Or set WATERCOOLER_AUTO_START_SERVICES=true"
+    )
+    return None
 
-        # Parse thread (without generating summaries during parse - we do it here)
-        parsed = parse_thread_file(
-            thread_path,
-            config=None,
-            generate_summaries=False,  # Generate summaries in sync, not parse
-        )
-        if not parsed:
-            logger.warning(f"Failed to parse thread for sync: {topic}")
-            return False
 
-        # Find the entry to sync
+def _locate_entries(
+    thread_path: Path, topic: str, entry_ids: List[Optional[str]]
+) -> Optional[Tuple[ParsedThread, List[Tuple[ParsedEntry, Optional[ParsedEntry]]]]]:
+    """The thread and each (entry, previous entry) to sync (None: latest entry)."""
+    # Locate the entries via the entry offset index; fall back to a full
+    # parse (without summaries - we generate them in sync) if unavailable
+    located = [parse_thread_entry(thread_path, entry_id) for entry_id in entry_ids]
+    if all(located):
+        return located[-1][0], [(entry, prev_entry) for _parsed, entry, prev_entry in located]
+
+    parsed = parse_thread_file(
+        thread_path,
+        config=None,
+        generate_summaries=False,  # Generate summaries in sync, not parse
+    )
+    if not parsed:
+        logger.warning(f"Failed to parse thread for sync: {topic}")
+        return None
+
+    found: List[Tuple[ParsedEntry, Optional[ParsedEntry]]] = []
+    for entry_id in entry_ids:
         if entry_id:
             entry = next((e for e in parsed.entries if e.entry_id == entry_id), None)
             if not entry:
                 # Entry ID not found, sync full thread
                 logger.debug(f"Entry {entry_id} not found, syncing full thread")
-                return sync_thread_to_graph(
-                    threads_dir, topic, generate_summaries, generate_embeddings
-                )
+                raise _NeedsFullSync(entry_id)
         else:
             # Sync latest entry
             entry = parsed.entries[-1] if parsed.entries else None
-
         if not entry:
             logger.warning(f"No entries found in thread: {topic}")
-            return False
+            return None
+        found.append((entry, None))
+    return parsed, found
+
+
+def _entry_edges(
+    parsed: ParsedThread, entry: ParsedEntry, prev_entry: Optional[ParsedEntry], topic: str
+) -> List[Dict[str, Any]]:
+    """Edges of a synced entry: thread contains entry, previous followed_by entry."""
+    entry_node_id = f"entry:{entry.entry_id}"
+
+    # Thread contains entry
+    edges = [{
+        "source": f"thread:{topic}",
+        "target": entry_node_id,
+        "type": "contains",
+    }]
+
+    # Find previous entry for followed_by edge
+    # Note: entry.index is the position in the thread (0-based)
+    # We look for the entry at index-1 to create a followed_by edge
+    if entry.index > 0 and prev_entry is None:
+        prev_idx = entry.index - 1
+        # First try direct list access if entries are in order
+        if prev_idx < len(parsed.entries):
+            candidate = parsed.entries[prev_idx]
+            if candidate.index == prev_idx:
+                prev_entry = candidate
+        # Fallback: search by index attribute (handles sparse/reordered lists)
+        if prev_entry is None:
+            for e in parsed.entries:
+                if e.index == prev_idx:
+                    prev_entry = e
+                    break
+    if prev_entry and prev_entry.entry_id:
+        edges.append({
+            "source": f"entry:{prev_entry.entry_id}",
+            "target": entry_node_id,
+            "type": "followed_by",
+        })
+    return edges
 
-        # Generate entry summary if enabled
-        summarizer_config = None
-        llm_available = False
-        if generate_summaries and not entry.summary:
-            summarizer_config = create_summarizer_config()
-            llm_available = is_llm_service_available(summarizer_config)
-
-            # Try auto-start if unavailable and enabled
-            if not llm_available and _try_auto_start_service("llm", summarizer_config.api_base):
-                llm_available = is_llm_service_available(summarizer_config)
-
-            if llm_available:
-                entry.summary = summarize_entry(
-                    entry.body,
-                    entry_title=entry.title,
-                    entry_type=entry.entry_type,
-                    config=summarizer_config,
-                )
-                if entry.summary:
-                    logger.debug(f"Generated summary for entry {entry.entry_id}")
-            else:
-                logger.warning(
-                    f"LLM service unavailable at {summarizer_config.api_base}. "
-                    "Skipping summary generation. To enable summaries: "
-                    "1) Start Ollama: 'ollama serve' "
-                    "2) Or set WATERCOOLER_AUTO_START_SERVICES=true"
-                )
-
-        # Generate entry embedding if enabled
-        entry_embedding = None
-        if generate_embeddings:
-            embed_config = EmbeddingConfig.from_env()
-            embed_available = is_embedding_available(embed_config)
 
-            # Try auto-start if unavailable and enabled
-            if not embed_available and _try_auto_start_service("embedding", embed_config.api_base):
-                embed_available = is_embedding_available(embed_config)
+def _prepare_topic(
+    threads_dir: Path,
+    topic: str,
+    entry_ids: List[Optional[str]],
+    batch: GraphSyncBatch,
+    summarizer_config: Optional[SummarizerConfig],
+    embed_queue: List[Tuple[Dict[str, Any], str]],
+) -> bool:
+    """Add the upserts for ``entry_ids`` of ``topic`` to ``batch``.
 
-            if embed_available:
-                # Use summary for embedding if available, otherwise truncated body
-                embed_text = entry.summary if entry.summary else entry.body[:500]
-                entry_embedding = generate_embedding(embed_text)
-                if entry_embedding:
-                    logger.debug(f"Generated embedding for entry {entry.entry_id}")
-            else:
-                logger.warning(
-                    f"Embedding service unavailable at {embed_config.api_base}. "
-                    "Skipping embedding generation. To enable embeddings: "
-                    "1) Start llama.cpp server with embedding model "
-                    "2) Or set WATERCOOLER_AUTO_START_SERVICES=true"
-                )
-
-        # Check if thread summary needs update (arc change detection)
-        update_thread_summary = False
-        if generate_summaries:
-            # Ensure we have config and availability check
-            if summarizer_config is None:
-                summarizer_config = create_summarizer_config()
-                llm_available = is_llm_service_available(summarizer_config)
+    Returns False if there is nothing to sync. Entry nodes that want an
+    embedding are queued on ``embed_queue`` with their embedding text.
+    """
+    thread_path = threads_dir / f"{topic}.md"
+    if not thread_path.exists():
+        logger.warning(f"Thread file not found for sync: {thread_path}")
+        return False
 
-            update_thread_summary = should_update_thread_summary(
-                parsed, entry, prev_entry_count
-            )
-            if update_thread_summary and llm_available:
-                # Convert entries to dict format for summarize_thread
-                entries_for_summary = [
-                    {
-                        "title": e.title,
-                        "body": e.body,
-                        "entry_type": e.entry_type,
-                        "agent": e.agent,
-                    }
-                    for e in parsed.entries
-                ]
-                parsed.summary = summarize_thread(
-                    entries_for_summary,
-                    thread_title=parsed.title,
-                    config=summarizer_config,
-                )
-                if parsed.summary:
-                    logger.debug(f"Updated thread summary for {topic} (arc change)")
-            elif prev_thread_summary:
-                # Preserve existing thread summary
-                parsed.summary = prev_thread_summary
+    # Get previous thread state for arc change detection
+    prev_entry_count, prev_thread_summary = get_previous_thread_state(threads_dir, topic)
 
-        # Prepare graph output directory
-        graph_dir = threads_dir / "graph" / "baseline"
-        nodes_file = graph_dir / "nodes.jsonl"
-        edges_file = graph_dir / "edges.jsonl"
+    located = _locate_entries(thread_path, topic, entry_ids)
+    if not located:
+        return False
+    parsed, found = located
+
+    nodes: List[Dict[str, Any]] = []
+    edges: List[Dict[str, Any]] = []
+    for entry, prev_entry in found:
+        # Generate entry summary if enabled
+        if summarizer_config is not None and not entry.summary:
+            entry.summary = summarize_entry(
+                entry.body,
+                entry_title=entry.title,
+                entry_type=entry.entry_type,
+                config=summarizer_config,
+            )
+            if entry.summary:
+                logger.debug(f"Generated summary for entry {entry.entry_id}")
+        elif batch.deferred_enrichment and not entry.summary:
+            entry.summary = extractive_summary(entry.body)
 
-        # Build entry node with embedding if available
         entry_node = entry_to_node(entry, topic)
-        if entry_embedding:
-            entry_node["embedding"] = entry_embedding
+        if batch.deferred_enrichment:
+            entry_node[ENRICHMENT_FIELD] = ENRICHMENT_PENDING
+        nodes.append(entry_node)
+        if batch.generate_embeddings:
+            # Use summary for embedding if available, otherwise truncated body
+            embed_queue.append((entry_node, entry.summary if entry.summary else entry.body[:500]))
+        edges.extend(_entry_edges(parsed, entry, prev_entry, topic))
+
+    # Check if thread summary needs update (arc change detection); once per
+    # topic, for the latest entry of the batch
+    if batch.generate_summaries:
+        latest_entry = found[-1][0]
+        update_thread_summary = should_update_thread_summary(parsed, latest_entry, prev_entry_count)
+        if update_thread_summary and summarizer_config is not None:
+            if not parsed.entries:
+                # Index-located entry: the thread summary needs them all
+                full = parse_thread_file(thread_path, config=None, generate_summaries=False)
+                if full:
+                    parsed.entries = full.entries
+            # Convert entries to dict format for summarize_thread
+            entries_for_summary = [
+                {
+                    "title": e.title,
+                    "body": e.body,
+                    "entry_type": e.entry_type,
+                    "agent": e.agent,
+                }
+                for e in parsed.entries
+            ]
+            parsed.summary = summarize_thread(
+                entries_for_summary,
+                thread_title=parsed.title,
+                config=summarizer_config,
+            )
+            if parsed.summary:
+                logger.debug(f"Updated thread summary for {topic} (arc change)")
+        elif prev_thread_summary:
+            # Preserve existing thread summary
+            parsed.summary = prev_thread_summary
+    elif batch.deferred_enrichment and prev_thread_summary:
+        # Keep the enriched thread summary until the enrichment sync
+        parsed.summary = prev_thread_summary
+
+    batch.nodes.append(thread_to_node(parsed))
+    batch.nodes.extend(nodes)
+    batch.edges.extend(edges)
+    previous = get_graph_sync_state(threads_dir, topic) or GraphSyncState()
+    batch.states[topic] = GraphSyncState(
+        status="ok",
+        last_synced_entry_id=found[-1][0].entry_id,
+        last_sync_at=_now_iso(),
+        error_message=None,
+        entries_synced=previous.entries_synced + len(found),
+    )
+    return True
 
-        # Build nodes (thread + entry)
-        nodes = [
-            thread_to_node(parsed),
-            entry_node,
-        ]
 
-        # Build edges for this entry
-        edges = []
-        thread_id = f"thread:{topic}"
-        entry_node_id = f"entry:{entry.entry_id}"
+def prepare_graph_sync(
+    threads_dir: Path,
+    pending: Dict[str, List[Optional[str]]],
+    generate_summaries: bool = False,
+    generate_embeddings: bool = False,
+    deferred_enrichment: bool = False,
+) -> GraphSyncBatch:
+    """Prepare the graph upserts for a batch of writes, without writing them.
 
-        # Thread contains entry
-        edges.append({
-            "source": thread_id,
-            "target": entry_node_id,
-            "type": "contains",
-        })
+    This does the slow part of graph sync: locating the entries, generating
+    summaries and generating embeddings (in one request for the whole
+    batch). Service availability is checked once per batch.
 
-        # Find previous entry for followed_by edge
-        # Note: entry.index is the position in the thread (0-based)
-        # We look for the entry at index-1 to create a followed_by edge
-        if entry.index > 0:
-            prev_entry: Optional[ParsedEntry] = None
-            prev_idx = entry.index - 1
-            # First try direct list access if entries are in order
-            if prev_idx < len(parsed.entries):
-                candidate = parsed.entries[prev_idx]
-                if candidate.index == prev_idx:
-                    prev_entry = candidate
-            # Fallback: search by index attribute (handles sparse/reordered lists)
-            if prev_entry is None:
-                for e in parsed.entries:
-                    if e.index == prev_idx:
-                        prev_entry = e
-                        break
-            if prev_entry and prev_entry.entry_id:
-                edges.append({
-                    "source": f"entry:{prev_entry.entry_id}",
-                    "target": entry_node_id,
-                    "type": "followed_by",
-                })
-
-        # Atomic writes
-        _atomic_append_jsonl(nodes_file, nodes)
-        _atomic_append_jsonl(edges_file, edges)
+    Args:
+        threads_dir: Threads directory
+        pending: Entry IDs to sync per topic (None for the latest entry)
+        generate_summaries: Whether to generate LLM summaries
+        generate_embeddings: Whether to generate embedding vectors
+        deferred_enrichment: Stage entries without calling any service
+            (extractive summary, no embedding) and flag them for a later
+            enriching sync; overrides generate_summaries/generate_embeddings
 
-        # Update manifest
-        _update_manifest(graph_dir, topic, entry.entry_id)
+    Returns:
+        GraphSyncBatch to pass to apply_graph_sync()
+    """
+    if deferred_enrichment:
+        generate_summaries = generate_embeddings = False
+    batch = GraphSyncBatch(
+        generate_summaries=generate_summaries,
+        generate_embeddings=generate_embeddings,
+        deferred_enrichment=deferred_enrichment,
+    )
+    summarizer_config = _available_summarizer() if generate_summaries else None
+    embed_queue: List[Tuple[Dict[str, Any], str]] = []
 
-        # Update sync state
-        state = GraphSyncState(
-            status="ok",
-            last_synced_entry_id=entry.entry_id,
-            last_sync_at=_now_iso(),
-            error_message=None,
-            entries_synced=(get_graph_sync_state(threads_dir, topic) or GraphSyncState()).entries_synced + 1,
+    for topic, entry_ids in pending.items():
+        try:
+            if not _prepare_topic(threads_dir, topic, entry_ids or [None], batch, summarizer_config, embed_queue):
+                batch.skipped.append(topic)
+        except _NeedsFullSync:
+            batch.full_sync.append(topic)
+        except Exception as e:
+            logger.error(f"Graph sync failed for {topic}: {e}")
+            batch.errors[topic] = ((entry_ids or [None])[-1], e)
+
+    # Generate entry embeddings if enabled
+    if embed_queue:
+        embed_config = _available_embedder()
+        if embed_config is not None:
+            vectors = generate_embedding_batch([text for _node, text in embed_queue], embed_config)
+            for (entry_node, _text), vector in zip(embed_queue, vectors):
+                if vector:
+                    entry_node["embedding"] = embedding_codec.encode(vector)
+                    logger.debug(f"Generated embedding for {entry_node['id']}")
+
+    return batch
+
+
+def apply_graph_sync(threads_dir: Path, batch: GraphSyncBatch) -> Dict[str, bool]:
+    """Write a prepared batch: one append per graph log, one manifest and state update.
+
+    Returns:
+        Dict mapping each topic of the batch to success/failure
+    """
+    results: Dict[str, bool] = {topic: False for topic in batch.skipped}
+
+    for topic, (entry_id, error) in batch.errors.items():
+        record_graph_sync_error(threads_dir, topic, entry_id, error)
+        results[topic] = False
+
+    if batch.states:
+        graph_dir = threads_dir / "graph" / "baseline"
+        try:
+            # Upserts of the same node within the batch: the last one wins
+            nodes = list({node["id"]: node for node in batch.nodes}.values())
+            _write_nodes(threads_dir, graph_dir / "nodes.jsonl", nodes)
+            _write_edges(threads_dir, graph_dir / "edges.jsonl", batch.edges)
+            _update_manifest_topics(
+                graph_dir, {topic: state.last_synced_entry_id for topic, state in batch.states.items()}
+            )
+            _update_graph_sync_states(threads_dir, batch.states)
+            for topic, state in batch.states.items():
+                logger.debug(f"Graph sync complete for {topic}/{state.last_synced_entry_id}")
+                results[topic] = True
+        except Exception as e:
+            logger.error(f"Graph sync failed for {', '.join(batch.states)}: {e}")
+            for topic, state in batch.states.items():
+                record_graph_sync_error(threads_dir, topic, state.last_synced_entry_id, e)
+                results[topic] = False
+
+    for topic in batch.full_sync:
+        results[topic] = sync_thread_to_graph(
+            threads_dir, topic, batch.generate_summaries, batch.generate_embeddings
         )
-        _update_graph_sync_state(threads_dir, topic, state)
 
-        logger.debug(f"Graph sync complete for {topic}/{entry.entry_id}")
-        return True
+    return results
 
-    except Exception as e:
-        logger.error(f"Graph sync failed for {topic}: {e}")
-        record_graph_sync_error(threads_dir, topic, entry_id, e)
-        return False
+
+def sync_entries_to_graph(
+    threads_dir: Path,
+    pending: Dict[str, List[Optional[str]]],
+    generate_summaries: bool = False,
+    generate_embeddings: bool = False,
+    deferred_enrichment: bool = False,
+) -> Dict[str, bool]:
+    """Sync a batch of written entries to the graph in one write.
+
+    Args:
+        threads_dir: Threads directory
+        pending: Entry IDs to sync per topic (None for the latest entry)
+        generate_summaries: Whether to generate LLM summaries
+        generate_embeddings: Whether to generate embedding vectors
+        deferred_enrichment: Stage the entries for a later enriching sync
+            (see prepare_graph_sync())
+
+    Returns:
+        Dict mapping topic to success/failure
+    """
+    batch = prepare_graph_sync(threads_dir, pending, generate_summaries, generate_embeddings, deferred_enrichment)
+    return apply_graph_sync(threads_dir, batch)
+
+
+def sync_entry_to_graph(
+    threads_dir: Path,
+    topic: str,
+    entry_id: Optional[str] = None,
+    generate_summaries: bool = False,
+    generate_embeddings: bool = False,
+    deferred_enrichment: bool = False,
+) -> bool:
+    """Sync a single entry to the graph after an MCP write.
+
+    This function:
+    1. Parses the thread file
+    2. Generates entry summary (if enabled)
+    3. Generates entry embedding (if enabled)
+    4. Optionally updates thread summary (if arc changed)
+    5. Upserts the entry node (and thread node)
+    6. Updates edges (contains, followed_by)
+    7. Updates sync state
+
+    See sync_entries_to_graph() to sync several entries at once.
+
+    Args:
+        threads_dir: Threads directory
+        topic: Thread topic
+        entry_id: Specific entry ID to sync (or None for latest)
+        generate_summaries: Whether to generate LLM summaries
+        generate_embeddings: Whether to generate embedding vectors
+        deferred_enrichment: Stage the entry for a later enriching sync
+            (see prepare_graph_sync())
+
+    Returns:
+        True if sync succeeded, False otherwise
+    """
+    results = sync_entries_to_graph(
+        threads_dir, {topic: [entry_id]}, generate_summaries, generate_embeddings, deferred_enrichment
+    )
+    return results.get(topic, False)
 
 
 def sync_thread_to_graph(
@@ -800,7 +1057,7 @@ def sync_thread_to_graph(
                 embed_text = entry.summary if entry.summary else entry.body[:500]
                 embedding = generate_embedding(embed_text)
                 if embedding:
-                    entry_node["embedding"] = embedding
+                    entry_node["embedding"] = embedding_codec.encode(embedding)
 
             nodes.append(entry_node)
 
@@ -810,9 +1067,9 @@ def sync_thread_to_graph(
         # Build all edges
         edges = list(generate_edges(parsed))
 
-        # Atomic writes
-        _atomic_append_jsonl(nodes_file, nodes)
-        _atomic_append_jsonl(edges_file, edges)
+        # Append to the graph logs
+        _write_nodes(threads_dir, nodes_file, nodes)
+        _write_edges(threads_dir, edges_file, edges)
 
         # Update manifest
         last_entry_id = parsed.entries[-1].entry_id if parsed.entries else None
@@ -845,6 +1102,16 @@ def _update_manifest(graph_dir: Path, topic: str, entry_id: Optional[str]) -> No
         topic: Thread topic that was synced
         entry_id: Last synced entry ID
     """
+    _update_manifest_topics(graph_dir, {topic: entry_id})
+
+
+def _update_manifest_topics(graph_dir: Path, synced: Dict[str, Optional[str]]) -> None:
+    """Update the manifest file with sync metadata for several topics.
+
+    Args:
+        graph_dir: Graph output directory
+        synced: Last synced entry ID per synced topic
+    """
     manifest_path = graph_dir / "manifest.json"
 
     # Load existing manifest
@@ -864,10 +1131,11 @@ def _update_manifest(graph_dir: Path, topic: str, entry_id: Optional[str]) -> No
     manifest["last_updated"] = _now_iso()
     if "topics_synced" not in manifest:
         manifest["topics_synced"] = {}
-    manifest["topics_synced"][topic] = {
-        "last_entry_id": entry_id,
-        "synced_at": _now_iso(),
-    }
+    for topic, entry_id in synced.items():
+        manifest["topics_synced"][topic] = {
+            "last_entry_id": entry_id,
+            "synced_at": _now_iso(),
+        }
 
     # Atomic write
     _atomic_write_json(manifest_path, manifest)
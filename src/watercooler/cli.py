@@ -199,6 +199,17 @@ def main(argv: list[str] | None = None) -> None:
     p_baseline_stats = baseline_sub.add_parser("stats", help="Show threads statistics")
     p_baseline_stats.add_argument("--threads-dir", help="Threads directory")
 
+    p_baseline_migrate = baseline_sub.add_parser(
+        "migrate-embeddings", help="Re-encode the embeddings of an existing baseline graph"
+    )
+    p_baseline_migrate.add_argument("--threads-dir", help="Threads directory")
+    p_baseline_migrate.add_argument(
+        "--encoding",
+        choices=["json", "f16", "i8"],
+        default="f16",
+        help="Target encoding: JSON float lists, base64 float16 or base64 int8 (default: f16)",
+    )
+
     args = ap.parse_args(argv)
 
     if not args.cmd:
@@ -818,7 +829,7 @@ def main(argv: list[str] | None = None) -> None:
         from .config import resolve_threads_dir
 
         if not args.baseline_cmd:
-            print("Usage: watercooler baseline-graph {build|stats}")
+            print("Usage: watercooler baseline-graph {build|stats|migrate-embeddings}")
             sys.exit(0)
 
         if args.baseline_cmd == "build":
@@ -877,6 +888,21 @@ def main(argv: list[str] | None = None) -> None:
                 print(f"    {status}: {count}")
             sys.exit(0)
 
+        if args.baseline_cmd == "migrate-embeddings":
+            from .baseline_graph.sync import migrate_embeddings
+
+            threads_dir = resolve_threads_dir(args.threads_dir)
+            nodes_file = threads_dir / "graph" / "baseline" / "nodes.jsonl"
+            if not nodes_file.exists():
+                print(f"No baseline graph found: {nodes_file}", file=sys.stderr)
+                sys.exit(1)
+
+            size = nodes_file.stat().st_size
+            converted = migrate_embeddings(threads_dir, args.encoding)
+            print(f"Re-encoded {converted} embeddings as {args.encoding}")
+            print(f"  nodes.jsonl: {size:,} -> {nodes_file.stat().st_size:,} bytes")
+            sys.exit(0)
+
     # default: other commands not yet implemented in L1
     print(f"watercooler {args.cmd}: not yet implemented (L1 stub)")
     sys.exit(0)
@@ -4,9 +4,10 @@ from pathlib import Path
 from typing import Optional, List, Tuple, Dict, Any
 
 from .fs import write, thread_path, lock_path_for_topic, utcnow_iso, read_body
-from .lock import AdvisoryLock
-from .header import bump_header
-from .metadata import thread_meta, is_closed, last_entry_by
+from .lock import thread_lock
+from .header import bump_header, patch_header_in_place, append_text
+from .metadata import thread_meta, is_closed
+from . import entry_index, meta_index, search_index
 from .agents import _counterpart_of, _canonical_agent, _default_agent_and_role
 from .config import load_template, resolve_templates_dir
 from .templates import _fill_template
@@ -49,8 +50,7 @@ def init_thread(
     if tp.exists():
         return tp
 
-    lp = lock_path_for_topic(topic, threads_dir)
-    with AdvisoryLock(lp, timeout=2, ttl=10, force_break=False):
+    with thread_lock(topic, threads_dir):
         if tp.exists():
             return tp
 
@@ -70,7 +70,9 @@ def init_thread(
             )
             if body:
                 content += body
+            content = bump_header(content, fixed_width=True)
             write(tp, content)
+            meta_index.update_thread(tp, content)
             return tp
 
         # Fill template
@@ -93,7 +95,10 @@ def init_thread(
         if body:
             content = content.rstrip() + "\n\n" + body.rstrip() + "\n"
 
+        # Pad Status/Ball so later updates can patch the header in place
+        content = bump_header(content, fixed_width=True)
         write(tp, content)
+        meta_index.update_thread(tp, content)
     return tp
 
 
@@ -138,54 +143,58 @@ def append_entry(
     if not tp.exists():
         init_thread(topic, threads_dir=threads_dir)
     
-    lp = lock_path_for_topic(topic, threads_dir)
-    with AdvisoryLock(lp, timeout=2, ttl=10, force_break=False):
-        s = tp.read_text(encoding="utf-8")
+    with thread_lock(topic, threads_dir):
+        now = utcnow_iso()
+        canonical_agent = _canonical_agent(agent, registry, user_tag=user_tag)
 
         # Load entry template
         try:
             template = load_template("_TEMPLATE_entry_block.md", templates_dir)
         except FileNotFoundError:
             # Fallback to simple format
-            now = utcnow_iso()
-            canonical = _canonical_agent(agent, registry, user_tag=user_tag)
-            who = f" by {canonical}"
-            entry = f"\n\n---\n\n- Updated: {now}{who}\n\n{body}\n"
-            if entry_id:
-                entry = entry.rstrip() + f"\n<!-- Entry-ID: {entry_id} -->\n"
-            s = bump_header(s, status=status, ball=ball)
-            write(tp, s + entry)
-            return tp
-
-        # Fill entry template
-        now = utcnow_iso()
-        canonical_agent = _canonical_agent(agent, registry, user_tag=user_tag)
-
-        mapping = {
-            "UTC": now,
-            "AGENT": canonical_agent,
-            "TYPE": entry_type,
-            "ROLE": role,
-            "TITLE": title,
-            "BODY": body.rstrip() + "\n",
-        }
-        filled_entry = _fill_template(template, mapping)
-
-        # If template doesn't have BODY placeholder, append body after template
-        if ("{{BODY}}" not in template) and ("<BODY>" not in template) and body.strip():
-            filled_entry = filled_entry.rstrip() + "\n\n" + body.rstrip() + "\n"
+            filled_entry = f"---\n\n- Updated: {now} by {canonical_agent}\n\n{body}\n"
+            final_ball = ball
+        else:
+            # Fill entry template
+            mapping = {
+                "UTC": now,
+                "AGENT": canonical_agent,
+                "TYPE": entry_type,
+                "ROLE": role,
+                "TITLE": title,
+                "BODY": body.rstrip() + "\n",
+            }
+            filled_entry = _fill_template(template, mapping)
 
-        # Auto-flip ball if not explicitly provided
-        final_ball = ball if ball is not None else _counterpart_of(canonical_agent, registry)
+            # If template doesn't have BODY placeholder, append body after template
+            if ("{{BODY}}" not in template) and ("<BODY>" not in template) and body.strip():
+                filled_entry = filled_entry.rstrip() + "\n\n" + body.rstrip() + "\n"
 
-        # Update header
-        s = bump_header(s, status=status, ball=final_ball)
+            # Auto-flip ball if not explicitly provided
+            final_ball = ball if ball is not None else _counterpart_of(canonical_agent, registry)
 
         # Append entry (with optional idempotency marker)
         if entry_id:
             filled_entry = filled_entry.rstrip() + f"\n<!-- Entry-ID: {entry_id} -->\n"
+
+        # Fast path: patch the fixed-width header in place and append
+        before = tp.stat()
+        if patch_header_in_place(tp, status=status, ball=final_ball):
+            appended_at = append_text(tp, "\n\n" + filled_entry)
+            meta_index.update_thread_fields(
+                tp, before, status=status, ball=final_ball, appended=filled_entry
+            )
+            entry_index.note_append(tp, before)
+            search_index.note_thread_write(tp, before, appended_at=appended_at)
+            return tp
+
+        # Slow path (legacy header layout): rewrite once, migrating the
+        # header to the fixed-width layout so later appends take the fast path
+        s = tp.read_text(encoding="utf-8")
+        s = bump_header(s, status=status, ball=final_ball, fixed_width=True)
         new_text = s.rstrip() + "\n\n" + filled_entry
         write(tp, new_text)
+        meta_index.update_thread(tp, new_text)
         return tp
 
 
@@ -193,39 +202,56 @@ def set_status(topic: str, *, threads_dir: Path, status: str) -> Path:
     tp = thread_path(topic, threads_dir)
     if not tp.exists():
         raise FileNotFoundError(f"Thread '{topic}' not found")
-    lp = lock_path_for_topic(topic, threads_dir)
-    with AdvisoryLock(lp, timeout=2, ttl=10, force_break=False):
-        s = tp.read_text(encoding="utf-8")
+    with thread_lock(topic, threads_dir):
         # Normalize status to uppercase for consistency
-        s = bump_header(s, status=status.upper())
+        before = tp.stat()
+        if patch_header_in_place(tp, status=status.upper()):
+            meta_index.update_thread_fields(tp, before, status=status.upper())
+            entry_index.note_header_patch(tp, before)
+            search_index.note_thread_write(tp, before)
+            return tp
+        s = tp.read_text(encoding="utf-8")
+        s = bump_header(s, status=status.upper(), fixed_width=True)
         write(tp, s)
+        meta_index.update_thread(tp, s)
     return tp
 
 
 def set_ball(topic: str, *, threads_dir: Path, ball: str) -> Path:
     tp = thread_path(topic, threads_dir)
-    lp = lock_path_for_topic(topic, threads_dir)
-    with AdvisoryLock(lp, timeout=2, ttl=10, force_break=False):
-        if not tp.exists():
-            init_thread(topic, threads_dir=threads_dir)
+    if not tp.exists():
+        init_thread(topic, threads_dir=threads_dir)
+    with thread_lock(topic, threads_dir):
+        before = tp.stat()
+        if patch_header_in_place(tp, ball=ball):
+            meta_index.update_thread_fields(tp, before, ball=ball)
+            entry_index.note_header_patch(tp, before)
+            search_index.note_thread_write(tp, before)
+            return tp
         s = tp.read_text(encoding="utf-8")
-        s = bump_header(s, ball=ball)
+        s = bump_header(s, ball=ball, fixed_width=True)
         write(tp, s)
+        meta_index.update_thread(tp, s)
     return tp
 
 
 def list_threads(*, threads_dir: Path, open_only: bool | None = None) -> list[tuple[str, str, str, str, Path, bool]]:
-    """Return list of (title, status, ball, updated_iso, path, is_new)."""
+    """Return list of (title, status, ball, updated_iso, path, is_new).
+
+    Metadata comes from the sidecar index (see ``meta_index``), so only
+    threads that changed since the last listing are re-read.
+    """
     out: list[tuple[str, str, str, str, Path, bool]] = []
     if not threads_dir.exists():
         return out
-    for p in sorted(threads_dir.glob("*.md")):
-        title, status, ball, updated = thread_meta(p)
+    for p, rec in meta_index.scan_threads(threads_dir):
+        title, status, ball = rec.title, rec.status, rec.ball
+        updated = rec.last_ts or utcnow_iso()
         if open_only is True and is_closed(status):
             continue
         if open_only is False and not is_closed(status):
             continue
-        who = (last_entry_by(p) or "").strip().lower()
+        who = (rec.last_who or "").strip().lower()
         # NEW marker if last entry author differs from current ball owner
         is_new = bool(who and who != (ball or "").strip().lower()) and not is_closed(status)
         out.append((title, status, ball, updated, p, is_new))
@@ -427,7 +453,14 @@ def reindex(*, threads_dir: Path, out_file: Path | None = None, open_only: bool
 
 
 def search(*, threads_dir: Path, query: str) -> list[tuple[Path, int, str]]:
-    """Naive case-insensitive search; returns (path, line_no, line)."""
+    """Case-insensitive substring search; returns (path, line_no, line).
+
+    Candidate lines come from the inverted index (see ``search_index``);
+    queries it cannot answer fall back to scanning every thread.
+    """
+    indexed = search_index.search_threads(threads_dir, query)
+    if indexed is not None:
+        return indexed
     q = query.lower()
     hits: list[tuple[Path, int, str]] = []
     for p in sorted(threads_dir.glob("*.md")):
@@ -139,6 +139,12 @@ class SyncConfig(BaseModel):
         ge=0,
         description="Seconds before considering sync stale",
     )
+    fetch_ttl: float = Field(
+        default=10.0,
+        ge=0,
+        description="Seconds a successful fetch of a repo is reused by read tools and pulls "
+        "(writes always fetch; 0 fetches every time)",
+    )
 
     class Config:
         populate_by_name = True
@@ -214,6 +220,11 @@ class GraphConfig(BaseModel):
         default="bge-m3",
         description="Model for embeddings",
     )
+    embedding_encoding: Literal["json", "f16", "i8"] = Field(
+        default="json",
+        description="Encoding of embeddings in nodes.jsonl: JSON float lists, or base64 float16 / "
+        "int8-quantized vectors (much smaller graph files; older watercooler versions only read json)",
+    )
 
     # Behavior
     prefer_extractive: bool = Field(
@@ -229,6 +240,45 @@ class GraphConfig(BaseModel):
         description="Auto-start LLM/embedding services if unavailable (requires ServerManager)",
     )
 
+    background_sync: bool = Field(
+        default=True,
+        description="Sync writes to the graph from a background worker that batches bursts "
+        "(False: sync inline before the write returns)",
+    )
+    single_commit: bool = Field(
+        default=True,
+        description="Stage the graph upsert of a write (extractive summary, no embedding) in the "
+        "write's own commit; LLM summaries and embeddings follow in a later batched commit",
+    )
+
+    # Approximate semantic search
+    ann_enabled: bool = Field(
+        default=True,
+        description="Use an IVF index for semantic search on large graphs (approximate results; "
+        "False: always score every embedded node)",
+    )
+    ann_min_rows: int = Field(
+        default=20000,
+        ge=1,
+        description="Embedded nodes a graph needs before the IVF index is built and used",
+    )
+    ann_nprobe: int = Field(
+        default=12,
+        ge=1,
+        description="IVF lists scored per query (higher: better recall, slower)",
+    )
+
+    # Read caching
+    memory_cache: bool = Field(
+        default=True,
+        description="Serve MCP graph reads from an in-memory snapshot of the graph",
+    )
+    memory_cache_mb: int = Field(
+        default=256,
+        ge=0,
+        description="Memory cap for entry bodies held by the in-memory graph cache (MB)",
+    )
+
 
 class McpConfig(BaseModel):
     """MCP server configuration."""
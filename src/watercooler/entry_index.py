@@ -0,0 +1,363 @@
+"""Per-thread entry offset index.
+
+Fetching a single entry (``get_thread_entry`` by index or Entry-ID, graph sync
+of the entry just written) used to parse the whole thread. This module keeps a
+small binary index per thread under ``.wc-cache/entries/`` that maps entry
+positions and Entry-IDs to byte ranges of the markdown file, tagged with the
+file's (size, mtime_ns, inode) at the time it was built.
+
+Reads mmap the thread file and decode only the requested slices. Positions
+follow ``parse_thread_entries`` (duplicate Entry-IDs dropped, stable sort by
+timestamp), so indexes agree with the eager parser; offsets are byte offsets
+like the lazy parsers in ``thread_entries``. Entry-ID lookups bisect a sorted
+id table, so they touch O(log n) index pages.
+
+``append_entry`` extends the index from the previous last entry onwards after
+an in-place append and in-place header patches only refresh the stat tag, so
+the common write paths never re-parse the thread. Anything else (external
+edits, ``git pull``, full rewrites) shows up as a stat mismatch and the index
+is rebuilt on the next read. Like ``meta_index`` this is a pure cache: it is
+never committed and every failure degrades to parsing the markdown.
+
+File layout (little endian)::
+
+    header   magic "WCENTIDX", version, flags, count, id_count,
+             size, mtime_ns, inode
+    records  count x (start, end, start_line, timestamp[24])  # parse order
+    ids      id_count x (entry_id[32], position)               # sorted by id
+"""
+
+from __future__ import annotations
+
+import io
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from .fs import atomic_write_bytes, cache_dir, CACHE_DIR_NAME
+from .thread_entries import (
+    ThreadEntry,
+    _build_entry,
+    _decode_line,
+    _iter_entry_regions,
+    _timestamp_sort_key,
+)
+
+
+ENTRY_INDEX_DIR = "entries"
+
+_MAGIC = b"WCENTIDX"
+_VERSION = 1
+_HEADER = struct.Struct("<8sIIIIQqQ")
+_RECORD = struct.Struct("<QQI24s")
+_ID_SLOT = struct.Struct("<32sI")
+_TS_WIDTH = 24
+_ID_WIDTH = 32
+
+# Parse order equals file order, so an append can extend the index in place.
+_FLAG_FILE_ORDER = 1
+
+# (start, end, start_line, timestamp) -- end is where the next Entry: line
+# (or EOF) begins, so the slice includes any trailing blank lines.
+_Record = Tuple[int, int, int, Optional[str]]
+
+
+def index_path(thread_path: Path) -> Path:
+    return thread_path.parent / CACHE_DIR_NAME / ENTRY_INDEX_DIR / f"{thread_path.name}.idx"
+
+
+def _stat_tag(st: os.stat_result) -> Tuple[int, int, int]:
+    return (st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+def _encode(
+    st: os.stat_result,
+    flags: int,
+    records: List[_Record],
+    ids: List[Tuple[str, int]],
+) -> bytes:
+    out = [
+        _HEADER.pack(_MAGIC, _VERSION, flags, len(records), len(ids), *_stat_tag(st)),
+    ]
+    for start, end, start_line, ts in records:
+        out.append(_RECORD.pack(start, end, start_line, (ts or "").encode("ascii", "replace")))
+    for entry_id, pos in sorted(ids):
+        out.append(_ID_SLOT.pack(entry_id.encode("ascii"), pos))
+    return b"".join(out)
+
+
+def _decode_header(buf) -> Optional[Tuple[int, int, int, Tuple[int, int, int]]]:
+    """Return (flags, count, id_count, stat_tag) or None if ``buf`` is not a valid index."""
+    if len(buf) < _HEADER.size:
+        return None
+    magic, version, flags, count, id_count, size, mtime_ns, inode = _HEADER.unpack_from(buf, 0)
+    if magic != _MAGIC or version != _VERSION:
+        return None
+    if len(buf) != _HEADER.size + count * _RECORD.size + id_count * _ID_SLOT.size:
+        return None
+    return flags, count, id_count, (size, mtime_ns, inode)
+
+
+def _indexable(entry: ThreadEntry) -> bool:
+    if entry.timestamp and len(entry.timestamp.encode("utf-8")) > _TS_WIDTH:
+        return False
+    if entry.entry_id and len(entry.entry_id) > _ID_WIDTH:
+        return False
+    return True
+
+
+def _scan(
+    f: BinaryIO, *, offset: int = 0, line_no: int = 1
+) -> Iterator[Tuple[_Record, Optional[str]]]:
+    for start_line, start, end, lines, sizes in _iter_entry_regions(f, offset=offset, line_no=line_no):
+        entry = _build_entry(lines, sizes, index=0, start_line=start_line, start_offset=start)
+        if not _indexable(entry):
+            raise ValueError("entry cannot be indexed")
+        yield (start, end, start_line, entry.timestamp), entry.entry_id
+
+
+def _build(data: bytes, st: os.stat_result) -> Optional[bytes]:
+    """Index ``data`` (the thread contents described by ``st``)."""
+    records: List[_Record] = []
+    ids: dict[str, int] = {}
+    try:
+        for record, entry_id in _scan(io.BytesIO(data)):
+            if entry_id:
+                if entry_id in ids:
+                    continue
+                ids[entry_id] = len(records)
+            records.append(record)
+    except ValueError:
+        return None
+    order = sorted(range(len(records)), key=lambda i: _timestamp_sort_key(records[i][3]))
+    flags = _FLAG_FILE_ORDER if order == list(range(len(records))) else 0
+    position = {old: new for new, old in enumerate(order)}
+    return _encode(
+        st,
+        flags,
+        [records[i] for i in order],
+        [(entry_id, position[i]) for entry_id, i in ids.items()],
+    )
+
+
+def _store(thread_path: Path, data: bytes) -> None:
+    try:
+        cache_dir(thread_path.parent)
+        target = index_path(thread_path)
+        target.parent.mkdir(exist_ok=True)
+        atomic_write_bytes(target, data)
+    except OSError:
+        pass
+
+
+def _discard(thread_path: Path) -> None:
+    try:
+        index_path(thread_path).unlink()
+    except OSError:
+        pass
+
+
+def _read_index(thread_path: Path) -> Optional[bytes]:
+    try:
+        return index_path(thread_path).read_bytes()
+    except OSError:
+        return None
+
+
+class EntryIndex:
+    """Random access to the entries of one thread file.
+
+    Use :func:`open_entry_index` to obtain one; close it (or use it as a
+    context manager) to release the mmaps.
+    """
+
+    def __init__(self, thread_file: BinaryIO, index_buf, count: int, id_count: int) -> None:
+        self._file = thread_file
+        size = os.fstat(thread_file.fileno()).st_size
+        self._data = mmap.mmap(thread_file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._buf = index_buf
+        self.count = count
+        self._id_count = id_count
+        self._ids_base = _HEADER.size + count * _RECORD.size
+
+    def __enter__(self) -> "EntryIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self) -> None:
+        for obj in (self._data, self._buf):
+            if isinstance(obj, mmap.mmap):
+                obj.close()
+        self._file.close()
+
+    def entry(self, position: int) -> ThreadEntry:
+        """Return the entry at ``position`` (0-based, negative counts from the end)."""
+        if position < 0:
+            position += self.count
+        if not 0 <= position < self.count:
+            raise IndexError(position)
+        start, end, start_line, _ts = _RECORD.unpack_from(
+            self._buf, _HEADER.size + position * _RECORD.size
+        )
+        raw_lines = io.BytesIO(self._data[start:end]).readlines()
+        return _build_entry(
+            [_decode_line(raw) for raw in raw_lines],
+            [len(raw) for raw in raw_lines],
+            index=position,
+            start_line=start_line,
+            start_offset=start,
+        )
+
+    def entries(self, start: int = 0, stop: Optional[int] = None) -> List[ThreadEntry]:
+        """Return entries ``[start, stop)`` in parse order."""
+        stop = self.count if stop is None else min(stop, self.count)
+        return [self.entry(i) for i in range(max(start, 0), stop)]
+
+    def find(self, entry_id: str) -> Optional[int]:
+        """Return the position of ``entry_id`` or None if it is not in the thread."""
+        if not entry_id or len(entry_id) > _ID_WIDTH or not entry_id.isascii():
+            return None
+        key = entry_id.encode("ascii").ljust(_ID_WIDTH, b"\0")
+        lo, hi = 0, self._id_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            slot, pos = _ID_SLOT.unpack_from(self._buf, self._ids_base + mid * _ID_SLOT.size)
+            if slot == key:
+                return pos
+            if slot < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+
+def open_entry_index(thread_path: Path, *, build: bool = True) -> Optional[EntryIndex]:
+    """Open the entry index for ``thread_path``.
+
+    A stale or missing index is rebuilt (and stored) when ``build`` is True;
+    otherwise None is returned so the caller can take a cheaper path. None is
+    also returned if the thread does not exist or cannot be indexed.
+    """
+    try:
+        f = open(thread_path, "rb")
+    except OSError:
+        return None
+    try:
+        st = os.fstat(f.fileno())
+        buf = None
+        header = None
+        try:
+            with open(index_path(thread_path), "rb") as idx:
+                buf = mmap.mmap(idx.fileno(), 0, access=mmap.ACCESS_READ)
+            header = _decode_header(buf)
+            if header is None or header[3] != _stat_tag(st):
+                buf.close()
+                buf, header = None, None
+        except (OSError, ValueError):
+            buf = None
+        if buf is None:
+            if not build:
+                f.close()
+                return None
+            data = _build(f.read(st.st_size), st)
+            if data is None:
+                f.close()
+                return None
+            _store(thread_path, data)
+            buf, header = data, _decode_header(data)
+        _flags, count, id_count, _tag = header
+        return EntryIndex(f, buf, count, id_count)
+    except Exception:
+        f.close()
+        raise
+
+
+def note_header_patch(thread_path: Path, before: os.stat_result) -> None:
+    """Re-tag the index after an in-place header patch (no offsets moved).
+
+    ``before`` is the stat taken before the patch; the index is only kept if
+    it was fresh for that state. Callers must hold the topic lock.
+    """
+    data = _read_index(thread_path)
+    header = _decode_header(data) if data else None
+    if header is None:
+        return
+    if header[3] != _stat_tag(before):
+        _discard(thread_path)
+        return
+    try:
+        st = thread_path.stat()
+    except OSError:
+        return
+    flags, count, id_count, _tag = header
+    retagged = _HEADER.pack(_MAGIC, _VERSION, flags, count, id_count, *_stat_tag(st))
+    _store(thread_path, retagged + data[_HEADER.size:])
+
+
+def note_append(thread_path: Path, before: os.stat_result) -> None:
+    """Extend the index after entries were appended to ``thread_path``.
+
+    Only the previous last entry and the new tail are scanned. If the index
+    was not fresh for ``before`` or the new entries would not simply sort
+    after the existing ones, the index is dropped and rebuilt on next read.
+    Callers must hold the topic lock.
+    """
+    data = _read_index(thread_path)
+    header = _decode_header(data) if data else None
+    if header is None:
+        return
+    flags, count, id_count, tag = header
+    if tag != _stat_tag(before) or not flags & _FLAG_FILE_ORDER:
+        _discard(thread_path)
+        return
+
+    records: List[_Record] = []
+    for i in range(count):
+        start, end, start_line, ts = _RECORD.unpack_from(data, _HEADER.size + i * _RECORD.size)
+        records.append((start, end, start_line, ts.rstrip(b"\0").decode("ascii") or None))
+    ids_base = _HEADER.size + count * _RECORD.size
+    ids: List[Tuple[str, int]] = []
+    for i in range(id_count):
+        slot, pos = _ID_SLOT.unpack_from(data, ids_base + i * _ID_SLOT.size)
+        ids.append((slot.rstrip(b"\0").decode("ascii"), pos))
+    known = {entry_id for entry_id, _pos in ids}
+
+    offset, line_no = (records[-1][0], records[-1][2]) if records else (0, 1)
+    rescanned = records.pop() if records else None
+    last_key: Optional[Tuple[int, str]] = None
+    try:
+        with open(thread_path, "rb") as f:
+            st = os.fstat(f.fileno())
+            f.seek(offset)
+            tail = f.read(st.st_size - offset)
+        for record, entry_id in _scan(io.BytesIO(tail), offset=offset, line_no=line_no):
+            if rescanned is not None and record[0] == rescanned[0]:
+                # Previous last entry: only its end moved
+                records.append(record)
+                last_key = _timestamp_sort_key(record[3])
+                rescanned = None
+                continue
+            if entry_id:
+                if entry_id in known:
+                    continue
+                known.add(entry_id)
+                ids.append((entry_id, len(records)))
+            key = _timestamp_sort_key(record[3])
+            if last_key is not None and key < last_key:
+                raise ValueError("appended entry sorts before existing entries")
+            last_key = key
+            records.append(record)
+    except (OSError, ValueError):
+        _discard(thread_path)
+        return
+    if rescanned is not None:
+        _discard(thread_path)
+        return
+    _store(thread_path, _encode(st, _FLAG_FILE_ORDER, records, ids))
@@ -4,6 +4,7 @@ from pathlib import Path
 from datetime import datetime, timezone
 import shutil
 import os
+import tempfile
 import re
 
 
@@ -76,6 +77,49 @@ def lock_path_for_topic(topic: str, threads_dir: Path) -> Path:
     return threads_dir / f".{safe}.lock"
 
 
+CACHE_DIR_NAME = ".wc-cache"
+
+
+def ignored_dir(d: Path) -> Path:
+    """Create ``d`` with a ``.gitignore`` that ignores everything inside it."""
+    d.mkdir(parents=True, exist_ok=True)
+    ignore = d / ".gitignore"
+    if not ignore.exists():
+        ignore.write_text("*\n", encoding="utf-8")
+    return d
+
+
+def cache_dir(threads_dir: Path) -> Path:
+    """Return the local (git-ignored) cache directory under ``threads_dir``.
+
+    The directory carries its own ``.gitignore`` so derived indexes never
+    end up in thread commits, even when the sync layer stages everything.
+    """
+    return ignored_dir(threads_dir / CACHE_DIR_NAME)
+
+
+def flock_path_for_topic(topic: str, threads_dir: Path) -> Path:
+    """Path of the persistent kernel lock file for ``topic`` (see ``lock.FlockLock``)."""
+    safe = _sanitize_component(topic, default="topic")
+    return threads_dir / CACHE_DIR_NAME / "locks" / f"{safe}.lock"
+
+
+def atomic_write_bytes(p: Path, data: bytes) -> None:
+    """Write ``data`` to ``p`` via a sibling temp file and ``os.replace``."""
+    p.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=p.parent, prefix=f".{p.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, p)
+    except Exception:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
 def read_body(maybe_path: str | Path | None) -> str:
     if not maybe_path:
         return ""
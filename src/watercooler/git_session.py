@@ -0,0 +1,385 @@
+"""Long-lived git plumbing sessions for hot-path repository queries.
+
+Branch parity and config discovery ask the same small questions on every
+tool call: what does a ref point to, how far is a branch ahead of or
+behind its remote-tracking ref, are there unmerged paths. Answering each
+with ``git rev-parse`` / ``git rev-list --count`` / ``git status`` costs a
+fork/exec per question.
+
+A :class:`GitSession` keeps one ``git cat-file --batch-check`` and one
+``git cat-file --batch`` process per repository and answers over their
+pipes:
+
+- :meth:`GitSession.resolve` resolves any revision expression
+  (``origin/main``, ``main@{upstream}``, ``HEAD^{commit}``);
+- :meth:`GitSession.read_object` reads an object;
+- :meth:`GitSession.ahead_behind` counts commits on either side by walking
+  commit objects in committer-date order until both sides meet;
+- :meth:`GitSession.unmerged_paths` reads conflicted paths straight from the
+  index file (no process at all).
+
+Each query resolves refs afresh, and ``cat-file`` rescans packs when an
+object is missing, so answers follow fetches and commits made by other
+processes. Whatever a session cannot answer (an index format it does not
+read, a walk longer than ``MAX_WALK`` commits, a dead process) returns
+None and callers fall back to their git command.
+
+Sessions are per git dir and process-wide (:func:`session_for`). Setting
+``WCOOLER_GIT_SESSION=0`` disables them.
+"""
+
+from __future__ import annotations
+
+import atexit
+import heapq
+import itertools
+import os
+import struct
+import subprocess
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+MAX_WALK = 5000  # Commits an ahead/behind walk may read before giving up
+DATE_SLOP = 86400  # Seconds of commit-date skew an ahead/behind walk tolerates
+
+_LEFT = 1
+_RIGHT = 2
+_BOTH = _LEFT | _RIGHT
+
+
+class GitSession:
+    """Persistent ``cat-file`` processes answering queries for one repository."""
+
+    def __init__(self, git_dir: Union[str, Path], git: str = "git") -> None:
+        self.git_dir = Path(git_dir)
+        self._git = git
+        self._lock = threading.Lock()
+        self._procs: Dict[str, subprocess.Popen] = {}
+        self.processes_started = 0
+        self.queries = 0
+
+    def _process(self, mode: str) -> subprocess.Popen:
+        proc = self._procs.get(mode)
+        if proc is None or proc.poll() is not None:
+            proc = subprocess.Popen(
+                [self._git, f"--git-dir={self.git_dir}", "cat-file", mode],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+            self._procs[mode] = proc
+            self.processes_started += 1
+        return proc
+
+    def _send(self, mode: str, request: bytes) -> subprocess.Popen:
+        proc = self._process(mode)
+        try:
+            assert proc.stdin is not None
+            proc.stdin.write(request)
+            proc.stdin.flush()
+        except (BrokenPipeError, OSError):
+            # The process exited since the last query: restart it once
+            self._kill(mode)
+            proc = self._process(mode)
+            assert proc.stdin is not None
+            proc.stdin.write(request)
+            proc.stdin.flush()
+        return proc
+
+    def _ask(self, mode: str, name: str) -> Optional[Tuple[str, str, Optional[bytes]]]:
+        """One request/response on the ``mode`` process; None if ``name`` is missing."""
+        if not name or "\n" in name:
+            return None
+        with self._lock:
+            self.queries += 1
+            proc = self._send(mode, name.encode("utf-8") + b"\n")
+            assert proc.stdout is not None
+            header = proc.stdout.readline()
+            if not header:
+                # git gave up on the name itself (e.g. "no upstream configured")
+                self._kill(mode)
+                return None
+            fields = header.decode("utf-8", "replace").split()
+            if len(fields) != 3:  # "<name> missing" / "<name> ambiguous"
+                return None
+            sha, kind, size = fields
+            body = None
+            if mode == "--batch":
+                body = proc.stdout.read(int(size) + 1)[:-1]
+            return sha, kind, body
+
+    def resolve(self, rev: str) -> Optional[str]:
+        """The object id ``rev`` names (like ``git rev-parse --verify``), or None.
+
+        Some expressions make ``cat-file`` exit rather than report them
+        missing (``<branch>@{upstream}`` without an upstream); they also
+        return None, and the next query starts a new process.
+        """
+        try:
+            answer = self._ask("--batch-check", rev)
+        except Exception:
+            return None
+        return answer[0] if answer else None
+
+    def upstream_configured(self, branch: str) -> bool:
+        """Whether the repository config sets ``branch.<branch>.merge``.
+
+        Read in-process. Check it before resolving ``<branch>@{upstream}``,
+        which makes ``cat-file`` exit when no upstream is configured.
+        """
+        from git.config import GitConfigParser
+
+        common_dir = self.git_dir
+        try:
+            common_dir = (self.git_dir / (self.git_dir / "commondir").read_text(encoding="utf-8").strip()).resolve()
+        except OSError:
+            pass  # Not a linked worktree
+        try:
+            with GitConfigParser(str(common_dir / "config"), read_only=True) as config:
+                return config.has_option(f'branch "{branch}"', "merge")
+        except Exception:
+            return False
+
+    def read_object(self, rev: str) -> Optional[Tuple[str, bytes]]:
+        """``(type, content)`` of the object ``rev`` names, or None."""
+        try:
+            answer = self._ask("--batch", rev)
+        except Exception:
+            return None
+        if answer is None or answer[2] is None:
+            return None
+        return answer[1], answer[2]
+
+    def _commit(self, sha: str) -> Tuple[int, List[str]]:
+        """Committer time and parents of commit ``sha`` (no parents if unreadable)."""
+        obj = self.read_object(sha)
+        if obj is None or obj[0] != "commit":
+            return 0, []
+        header = obj[1].split(b"\n\n", 1)[0]
+        parents: List[str] = []
+        when = 0
+        for line in header.split(b"\n"):
+            if line.startswith(b"parent "):
+                parents.append(line[7:].decode("ascii"))
+            elif line.startswith(b"committer "):
+                try:
+                    when = int(line.rsplit(b" ", 2)[1])
+                except (IndexError, ValueError):
+                    when = 0
+        return when, parents
+
+    def ahead_behind(self, local: str, upstream: str) -> Optional[Tuple[int, int]]:
+        """Commits only on ``local`` and only on ``upstream``.
+
+        Same counts as ``git rev-list --left-right --count local...upstream``.
+        Commits are visited newest first (committer date) and marked with
+        the side(s) they are reachable from; the walk stops once every
+        pending commit is reachable from both and is ``DATE_SLOP`` older
+        than any commit reached from one side only. Like git's own date
+        slop, commit dates skewed by more than that could stop it early.
+
+        Returns:
+            ``(ahead, behind)``, or None if a side does not resolve or the
+            walk exceeds ``MAX_WALK`` commits
+        """
+        left = self.resolve(f"{local}^{{commit}}")
+        right = self.resolve(f"{upstream}^{{commit}}")
+        if left is None or right is None:
+            return None
+        if left == right:
+            return 0, 0
+
+        flags: Dict[str, int] = {}
+        commits: Dict[str, Tuple[int, List[str]]] = {}
+        queue: List[Tuple[int, int, str]] = []
+        pushed = itertools.count()  # Equal dates are visited first in, first out
+        # Queue entries per commit, and entries whose commit is one-sided
+        queued: Dict[str, int] = {}
+        one_sided_queued = 0
+
+        def mark(sha: str, side: int, read: bool = True) -> None:
+            nonlocal one_sided_queued
+            old = flags.get(sha, 0)
+            if old | side == old or (not read and sha not in commits):
+                return
+            flags[sha] = old | side
+            if sha not in commits:
+                commits[sha] = self._commit(sha)
+            if flags[sha] != _BOTH:
+                one_sided_queued += 1
+            elif old:
+                one_sided_queued -= queued.get(sha, 0)
+            queued[sha] = queued.get(sha, 0) + 1
+            heapq.heappush(queue, (-commits[sha][0], next(pushed), sha))
+
+        def pop() -> str:
+            nonlocal one_sided_queued
+            _, _, sha = heapq.heappop(queue)
+            queued[sha] -= 1
+            if flags[sha] != _BOTH:
+                one_sided_queued -= 1
+            return sha
+
+        mark(left, _LEFT)
+        mark(right, _RIGHT)
+        while one_sided_queued:
+            if len(commits) > MAX_WALK:
+                return None
+            sha = pop()
+            for parent in commits[sha][1]:
+                mark(parent, flags[sha])
+        # A commit dated before its parent (clock skew) can be passed on one
+        # side before the other side reaches it: keep walking the shared
+        # frontier until it is DATE_SLOP older than every one-sided commit
+        one_sided = [commits[sha][0] for sha, side in flags.items() if side != _BOTH]
+        if one_sided:
+            horizon = min(one_sided) - DATE_SLOP
+            while queue and -queue[0][0] >= horizon:
+                if len(commits) > MAX_WALK:
+                    return None
+                sha = pop()
+                for parent in commits[sha][1]:
+                    mark(parent, flags[sha])
+        # Commits still queued are reachable from both sides; so are the
+        # already-read commits below them
+        while queue:
+            sha = pop()
+            for parent in commits[sha][1]:
+                mark(parent, flags[sha], read=False)
+
+        ahead = sum(1 for side in flags.values() if side == _LEFT)
+        behind = sum(1 for side in flags.values() if side == _RIGHT)
+        return ahead, behind
+
+    def unmerged_paths(self) -> Optional[List[str]]:
+        """Paths with unmerged (stage 1-3) index entries, read from the index file.
+
+        Returns:
+            Sorted paths (empty if the index is missing), or None for an
+            index this reader does not handle (version 4, split index)
+        """
+        try:
+            data = (self.git_dir / "index").read_bytes()
+        except FileNotFoundError:
+            return []
+        except OSError:
+            return None
+        return _unmerged_from_index(data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"queries": self.queries, "processes_started": self.processes_started}
+
+    def _kill(self, mode: str) -> None:
+        proc = self._procs.pop(mode, None)
+        if proc is None:
+            return
+        try:
+            proc.kill()
+            proc.wait(timeout=5)
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        with self._lock:
+            for mode in list(self._procs):
+                proc = self._procs.pop(mode)
+                try:
+                    if proc.stdin is not None:
+                        proc.stdin.close()
+                    proc.wait(timeout=5)
+                except Exception:
+                    proc.kill()
+
+
+def _unmerged_from_index(data: bytes) -> Optional[List[str]]:
+    """Unmerged paths of a version 2/3 index (see gitformat-index)."""
+    if len(data) < 12 or data[:4] != b"DIRC":
+        return None
+    version, count = struct.unpack(">II", data[4:12])
+    if version not in (2, 3):
+        return None
+    pos = 12
+    unmerged = set()
+    for _ in range(count):
+        start = pos
+        (flags,) = struct.unpack(">H", data[pos + 60 : pos + 62])
+        pos += 62
+        if flags & 0x4000:  # Extended flags (version 3)
+            pos += 2
+        end = data.index(b"\0", pos)
+        if (flags >> 12) & 3:
+            unmerged.add(data[pos:end].decode("utf-8", "surrogateescape"))
+        # Entries are NUL-padded to a multiple of eight bytes
+        pos = start + ((end - start) // 8 + 1) * 8
+    # A split index keeps entries in a shared file this reader does not follow
+    while pos + 8 <= len(data) - 20:
+        signature = data[pos : pos + 4]
+        (size,) = struct.unpack(">I", data[pos + 4 : pos + 8])
+        if signature == b"link":
+            return None
+        pos += 8 + size
+    return sorted(unmerged)
+
+
+_sessions: Dict[str, GitSession] = {}
+_sessions_lock = threading.Lock()
+
+
+def sessions_enabled() -> bool:
+    return os.getenv("WCOOLER_GIT_SESSION", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def find_git_dir(path: Union[str, Path]) -> Optional[Path]:
+    """The git dir of the work tree containing ``path`` (follows ``.git`` files)."""
+    try:
+        current = Path(path).resolve()
+    except (OSError, RuntimeError):
+        return None
+    for directory in (current, *current.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            try:
+                content = dot_git.read_text(encoding="utf-8").strip()
+            except OSError:
+                return None
+            if not content.startswith("gitdir:"):
+                return None
+            return (directory / content[len("gitdir:"):].strip()).resolve()
+    return None
+
+
+def session_for(repo: Any) -> Optional[GitSession]:
+    """The process-wide session of a GitPython ``Repo`` or git dir path.
+
+    Returns None when sessions are disabled or ``repo`` has no git dir.
+    """
+    if not sessions_enabled():
+        return None
+    try:
+        git_dir = Path(getattr(repo, "git_dir", repo)).resolve()
+    except (TypeError, OSError, RuntimeError):
+        return None
+    if not git_dir.is_dir():
+        return None
+    key = str(git_dir)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _sessions[key] = GitSession(git_dir)
+        return session
+
+
+def close_sessions() -> None:
+    """Stop every session's processes (they restart on the next query)."""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+atexit.register(close_sessions)
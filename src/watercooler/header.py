@@ -1,5 +1,20 @@
 from __future__ import annotations
 
+import os
+from pathlib import Path
+
+
+# Fixed-width value slots for the mutable header fields. Values are padded
+# with trailing spaces so later updates can overwrite the line in place
+# (see ``patch_header_in_place``) instead of rewriting the whole thread.
+# The padding is only an optimisation: rendered markdown at most turns it
+# into a line break after the field, and if an editor or hook strips it the
+# next write finds the slot too narrow, rewrites the thread and pads again.
+HEADER_FIELD_WIDTHS = {"Status": 24, "Ball": 64}
+
+# Upper bound on how far into a file the header block may extend.
+_MAX_HEADER_BYTES = 8192
+
 
 def _header_split(text: str) -> tuple[str, str]:
     parts = text.split("\n\n", 1)
@@ -8,25 +23,135 @@ def _header_split(text: str) -> tuple[str, str]:
     return parts[0], parts[1]
 
 
-def _replace_header_line(block: str, key: str, value: str) -> str:
+def _format_header_line(key: str, value: str, *, fixed_width: bool = False) -> str:
+    line = f"{key}: {value}"
+    width = HEADER_FIELD_WIDTHS.get(key)
+    if fixed_width and width:
+        line = line.ljust(len(key) + 2 + width)
+    return line
+
+
+def _replace_header_line(block: str, key: str, value: str, *, fixed_width: bool = False) -> str:
     lines = block.splitlines()
     pref = f"{key}:"
     replaced = False
     for i, ln in enumerate(lines):
         if ln.lower().startswith(pref.lower()):
-            lines[i] = f"{key}: {value}"
+            lines[i] = _format_header_line(key, value, fixed_width=fixed_width)
             replaced = True
             break
     if not replaced:
-        lines.append(f"{key}: {value}")
+        lines.append(_format_header_line(key, value, fixed_width=fixed_width))
     return "\n".join(lines)
 
 
-def bump_header(text: str, *, status: str | None = None, ball: str | None = None) -> str:
+def bump_header(
+    text: str,
+    *,
+    status: str | None = None,
+    ball: str | None = None,
+    fixed_width: bool = False,
+) -> str:
+    """Update Status/Ball header lines.
+
+    With ``fixed_width=True`` the updated lines (and any existing Status/Ball
+    lines) are padded to ``HEADER_FIELD_WIDTHS``, migrating the thread to the
+    layout that ``patch_header_in_place`` can update without a rewrite.
+    """
     header, body = _header_split(text)
+    if fixed_width:
+        # Pad untouched fields too so the whole header becomes patchable
+        for key, cur in _current_header_values(header).items():
+            if key == "Status" and status is None:
+                status = cur
+            elif key == "Ball" and ball is None:
+                ball = cur
     if status is not None:
-        header = _replace_header_line(header, "Status", status)
+        header = _replace_header_line(header, "Status", status, fixed_width=fixed_width)
     if ball is not None:
-        header = _replace_header_line(header, "Ball", ball)
+        header = _replace_header_line(header, "Ball", ball, fixed_width=fixed_width)
     # Always include a separating blank line to preserve header/body structure
     return header + "\n\n" + (body or "")
+
+
+def _current_header_values(header: str) -> dict[str, str]:
+    values: dict[str, str] = {}
+    for ln in header.splitlines():
+        for key in HEADER_FIELD_WIDTHS:
+            if key not in values and ln.lower().startswith(f"{key.lower()}:"):
+                values[key] = ln.split(":", 1)[1].strip()
+    return values
+
+
+def patch_header_in_place(
+    path: Path,
+    *,
+    status: str | None = None,
+    ball: str | None = None,
+) -> bool:
+    """Overwrite Status/Ball header lines in place without rewriting the file.
+
+    Only succeeds when every requested field already has a line in the header
+    block that is wide enough for the new value (threads written with
+    ``bump_header(..., fixed_width=True)``). Returns False without touching
+    the file otherwise, so callers can fall back to a full rewrite.
+    """
+    updates = {k: v for k, v in (("Status", status), ("Ball", ball)) if v is not None}
+    if not updates:
+        return True
+    with open(path, "r+b") as f:
+        head = f.read(_MAX_HEADER_BYTES)
+        ends = [i for i in (head.find(b"\n\n"), head.find(b"\n\r\n")) if i >= 0]
+        if not ends:
+            return False
+        end = min(ends)
+        patches: list[tuple[int, bytes]] = []
+        pos = 0
+        remaining = dict(updates)
+        while pos < end and remaining:
+            nl = head.find(b"\n", pos)
+            if nl < 0 or nl > end:
+                nl = end
+            line = head[pos:nl]
+            body_len = len(line) - 1 if line.endswith(b"\r") else len(line)
+            for key in list(remaining):
+                if line[: len(key) + 1].lower() == f"{key.lower()}:".encode("ascii"):
+                    new = f"{key}: {remaining.pop(key)}".encode("utf-8")
+                    if len(new) > body_len:
+                        return False
+                    patches.append((pos, new.ljust(body_len)))
+                    break
+            pos = nl + 1
+        if remaining:
+            return False
+        for offset, data in patches:
+            f.seek(offset)
+            f.write(data)
+    return True
+
+
+def append_text(path: Path, text: str) -> int:
+    """Append ``text`` after stripping trailing whitespace from the file.
+
+    Equivalent to ``write(path, read(path).rstrip() + text)`` but only touches
+    the tail of the file: trailing whitespace is truncated and ``text`` is
+    written with a real append. Returns the byte offset ``text`` starts at.
+    """
+    ws = b" \t\r\n\x0b\x0c"
+    with open(path, "r+b") as f:
+        size = f.seek(0, os.SEEK_END)
+        cut = size
+        while cut > 0:
+            start = max(0, cut - 256)
+            f.seek(start)
+            chunk = f.read(cut - start)
+            stripped = chunk.rstrip(ws)
+            cut = start + len(stripped)
+            if stripped:
+                break
+        if cut != size:
+            f.truncate(cut)
+        f.seek(cut)
+        # Match the newline translation fs.write (text mode) applies
+        f.write(text.replace("\n", os.linesep).encode("utf-8"))
+    return cut
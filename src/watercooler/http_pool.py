@@ -0,0 +1,151 @@
+"""Shared HTTP clients for LLM and embedding services.
+
+Summaries and embeddings are many small requests to the same few servers
+(usually a local llama.cpp/Ollama). Opening an ``httpx.Client`` per request
+paid a TCP connect (and TLS handshake for remote APIs) every time; for a
+local server that was most of the request latency.
+
+``client(api_base)`` returns one long-lived, thread-safe client per API base
+with connection pooling and keep-alive. ``async_client(api_base)`` is the
+counterpart for coroutines; async clients are bound to their event loop, so
+they are kept per loop and a loop closes its own with
+``aclose_async_clients()`` before it ends. Sync clients are closed at
+process exit.
+
+Timeouts stay per request (pass ``timeout=`` to the request), so callers
+with different timeouts share a pool.
+
+Pool limits (environment):
+    WATERCOOLER_HTTP_MAX_CONNECTIONS: Connections per client (default: 20)
+    WATERCOOLER_HTTP_MAX_KEEPALIVE: Idle connections kept open (default: 10)
+    WATERCOOLER_HTTP_KEEPALIVE_EXPIRY: Seconds an idle connection is kept (default: 30)
+    WATERCOOLER_HTTP2: Negotiate HTTP/2 where the server supports it
+        (default: false; needs the ``h2`` package)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import logging
+import os
+import threading
+import weakref
+from typing import TYPE_CHECKING, Dict
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE = 10
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+_lock = threading.Lock()
+_clients: Dict[str, "httpx.Client"] = {}
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _http2_enabled() -> bool:
+    if os.environ.get("WATERCOOLER_HTTP2", "").lower() not in ("1", "true", "yes"):
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.debug("WATERCOOLER_HTTP2 is set but h2 is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+def _client_options() -> dict:
+    import httpx
+
+    options: dict = {
+        "limits": httpx.Limits(
+            max_connections=_env_int("WATERCOOLER_HTTP_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS),
+            max_keepalive_connections=_env_int("WATERCOOLER_HTTP_MAX_KEEPALIVE", DEFAULT_MAX_KEEPALIVE),
+            keepalive_expiry=_env_float("WATERCOOLER_HTTP_KEEPALIVE_EXPIRY", DEFAULT_KEEPALIVE_EXPIRY),
+        ),
+    }
+    if _http2_enabled():
+        options["http2"] = True
+    return options
+
+
+def _key(api_base: str) -> str:
+    return api_base.rstrip("/")
+
+
+def client(api_base: str) -> "httpx.Client":
+    """The shared client for ``api_base``, created on first use.
+
+    Raises:
+        ImportError: If httpx is not installed
+    """
+    import httpx
+
+    key = _key(api_base)
+    with _lock:
+        shared = _clients.get(key)
+        if shared is None or shared.is_closed:
+            shared = _clients[key] = httpx.Client(**_client_options())
+        return shared
+
+
+def async_client(api_base: str) -> "httpx.AsyncClient":
+    """The shared async client for ``api_base`` on the running event loop.
+
+    Raises:
+        ImportError: If httpx is not installed
+        RuntimeError: If called outside a running event loop
+    """
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    key = _key(api_base)
+    with _lock:
+        clients = _async_clients.setdefault(loop, {})
+        shared = clients.get(key)
+        if shared is None or shared.is_closed:
+            shared = clients[key] = httpx.AsyncClient(**_client_options())
+        return shared
+
+
+async def aclose_async_clients() -> None:
+    """Close the async clients of the running event loop."""
+    with _lock:
+        clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for shared in clients.values():
+        await shared.aclose()
+
+
+def close_all() -> None:
+    """Close all sync clients (they are recreated on next use)."""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for shared in clients:
+        try:
+            shared.close()
+        except Exception:
+            pass
+
+
+atexit.register(close_all)
@@ -3,8 +3,42 @@ from __future__ import annotations
 import getpass
 import os
 import time
+from contextlib import nullcontext
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+# Backoff bounds (seconds) between non-blocking retries of a timed flock wait
+_FLOCK_POLL_MIN = 0.001
+_FLOCK_POLL_MAX = 0.05
+
+
+def _lock_metadata() -> str:
+    try:
+        user = os.getenv("WATERCOOLER_USER") or getpass.getuser()
+    except Exception:
+        user = "unknown"
+    from .fs import utcnow_iso
+    return f"pid={os.getpid()} time={utcnow_iso()} user={user} cwd={os.getcwd()}\n"
+
+
+def _parse_lock_metadata(content: str) -> dict | None:
+    # Metadata format: pid=12345 time=2025-01-01T00:00:00Z user=alice cwd=/path
+    info = {}
+    for part in content.split():
+        if "=" in part:
+            key, value = part.split("=", 1)
+            info[key] = value
+    if "pid" in info:
+        try:
+            info["pid"] = int(info["pid"])
+        except ValueError:
+            pass
+    return info if info else None
+
 
 class AdvisoryLock:
     """Simple file-based advisory lock with TTL and timeout.
@@ -32,17 +66,7 @@ class AdvisoryLock:
     def _write_pid(self) -> None:
         """Write lock file with enhanced metadata for debugging."""
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        try:
-            user = os.getenv("WATERCOOLER_USER") or getpass.getuser()
-        except Exception:
-            user = "unknown"
-        cwd = os.getcwd()
-        from .fs import utcnow_iso
-        timestamp = utcnow_iso()
-        self.path.write_text(
-            f"pid={os.getpid()} time={timestamp} user={user} cwd={cwd}\n",
-            encoding="utf-8"
-        )
+        self.path.write_text(_lock_metadata(), encoding="utf-8")
 
     def _pid_of_lock(self) -> int | None:
         """Extract PID from lock file (supports legacy format and new metadata format)."""
@@ -70,19 +94,7 @@ class AdvisoryLock:
             content = self.path.read_text(encoding="utf-8").strip()
             if not content:
                 return None
-            # Parse metadata format: pid=12345 time=2025-01-01T00:00:00Z user=alice cwd=/path
-            info = {}
-            for part in content.split():
-                if "=" in part:
-                    key, value = part.split("=", 1)
-                    info[key] = value
-            # Convert pid to int if present
-            if "pid" in info:
-                try:
-                    info["pid"] = int(info["pid"])
-                except ValueError:
-                    pass
-            return info if info else None
+            return _parse_lock_metadata(content)
         except Exception:
             return None
 
@@ -135,3 +147,150 @@ class AdvisoryLock:
     def __exit__(self, exc_type, exc, tb):
         self.release()
         return False
+
+
+class FlockLock:
+    """Kernel-backed lock (``fcntl.flock``) with shared and exclusive modes.
+
+    Waiting without a timeout blocks in the kernel, so the waiter wakes up as
+    soon as the holder releases; a timed wait retries with a backoff capped
+    at ``_FLOCK_POLL_MAX``. Locks are released by the kernel when the
+    holding process dies, so there is no TTL or stale-lock handling. Any
+    number of shared holders may coexist; an exclusive holder excludes
+    everyone. Locks are per open file, so threads of one process exclude each
+    other too.
+
+    The lock file is never removed (unlinking a flock file races with
+    waiters); exclusive holders write the ``AdvisoryLock`` metadata line into
+    it for debugging. Not available on Windows (see ``use_kernel_locks``).
+    """
+
+    def __init__(self, path: Path, *, shared: bool = False, timeout: float | None = None):
+        if fcntl is None:
+            raise RuntimeError("fcntl.flock is not available on this platform")
+        self.path = Path(path)
+        self.shared = shared
+        self.timeout = timeout
+        self.acquired = False
+        self._fd: int | None = None
+
+    def _open(self) -> int:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        return os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+
+    def _wait(self, fd: int, op: int, deadline: float) -> bool:
+        """Retry a non-blocking ``flock`` until it succeeds or ``deadline`` passes.
+
+        ``flock`` itself has no timeout, and handing the blocking call to a
+        helper thread would leave that thread (and ``fd``) behind on every
+        timeout while the holder is wedged. Polling with a bounded backoff
+        keeps nothing alive after we give up.
+        """
+        delay = _FLOCK_POLL_MIN
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, _FLOCK_POLL_MAX)
+            try:
+                fcntl.flock(fd, op | fcntl.LOCK_NB)
+                return True
+            except BlockingIOError:
+                continue
+
+    def acquire(self) -> bool:
+        op = fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while True:
+            fd = self._open()
+            try:
+                fcntl.flock(fd, op | fcntl.LOCK_NB)
+            except BlockingIOError:
+                if deadline is None:
+                    fcntl.flock(fd, op)
+                elif not self._wait(fd, op, deadline):
+                    os.close(fd)
+                    return False
+            # The file may have been removed (e.g. ``watercooler unlock``)
+            # while we waited; a lock on an unlinked inode protects nothing.
+            try:
+                same = os.fstat(fd).st_ino == os.stat(self.path).st_ino
+            except FileNotFoundError:
+                same = False
+            if same:
+                break
+            os.close(fd)
+        if not self.shared:
+            try:
+                os.ftruncate(fd, 0)
+                os.pwrite(fd, _lock_metadata().encode("utf-8"), 0)
+            except OSError:
+                pass
+        self._fd = fd
+        self.acquired = True
+        return True
+
+    def release(self) -> None:
+        if self.acquired and self._fd is not None:
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            finally:
+                os.close(self._fd)
+                self._fd = None
+                self.acquired = False
+
+    def get_lock_info(self) -> dict | None:
+        """Metadata of the last exclusive holder (same keys as ``AdvisoryLock``)."""
+        try:
+            content = self.path.read_text(encoding="utf-8").strip()
+        except Exception:
+            return None
+        return _parse_lock_metadata(content) if content else None
+
+    def __enter__(self):
+        ok = self.acquire()
+        if not ok:
+            raise TimeoutError("Failed to acquire lock within timeout")
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+
+def use_kernel_locks() -> bool:
+    """Return True if ``FlockLock`` should be used instead of ``AdvisoryLock``.
+
+    Controlled by ``WCOOLER_LOCK_BACKEND``: ``auto`` (default; flock where
+    available), ``flock`` or ``file`` (the lock-file format, e.g. for threads
+    directories on network filesystems without working flock).
+    """
+    backend = os.getenv("WCOOLER_LOCK_BACKEND", "auto").strip().lower()
+    if backend == "file":
+        return False
+    return fcntl is not None
+
+
+def thread_lock(
+    topic: str,
+    threads_dir: Path,
+    *,
+    shared: bool = False,
+    timeout: float | None = 2,
+    ttl: int = 10,
+):
+    """Return the per-thread lock guarding reads and writes of a thread file.
+
+    Writers take it exclusively and readers shared. With the lock-file
+    fallback readers stay unlocked (a no-op context manager is returned) and
+    writers use ``AdvisoryLock`` with ``ttl``.
+    """
+    from .fs import cache_dir, flock_path_for_topic, lock_path_for_topic
+
+    if use_kernel_locks():
+        cache_dir(threads_dir)
+        return FlockLock(flock_path_for_topic(topic, threads_dir), shared=shared, timeout=timeout)
+    if shared:
+        return nullcontext()
+    return AdvisoryLock(lock_path_for_topic(topic, threads_dir), timeout=timeout, ttl=ttl, force_break=False)
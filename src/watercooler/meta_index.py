@@ -0,0 +1,220 @@
+"""Sidecar metadata index for thread listings.
+
+``list_threads`` needs the title, status, ball and last-entry info of every
+thread. Re-reading and regex-scanning each markdown file on every listing gets
+slow once a threads repo holds thousands of topics, so this module keeps those
+fields in ``.wc-cache/thread_meta.json`` together with the file's
+(size, mtime_ns, inode) at the time it was parsed.
+
+A listing only re-parses files whose stat data no longer matches their
+record. Writers (``append_entry``, ``set_status``, ``set_ball``) update the
+record in place from the text they just wrote, so the next listing does not
+even need to re-read the thread they touched.
+
+The index is a pure cache: it is never committed (see ``fs.cache_dir``), every
+failure to read or write it degrades to parsing the markdown directly, and
+concurrent writers simply race on an atomic replace (a lost update only costs
+one re-parse later).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .fs import atomic_write_bytes, cache_dir, CACHE_DIR_NAME
+from .metadata import ENTRY_RE, TITLE_RE, _header_meta, _last_entry_info, _normalize_status
+
+
+META_INDEX_NAME = "thread_meta.json"
+_INDEX_VERSION = 2
+
+
+@dataclass
+class ThreadMetaRecord:
+    """Cached listing metadata for a single thread file."""
+
+    title: str
+    status: str
+    ball: str
+    last_ts: Optional[str]
+    last_who: Optional[str]
+    size: int
+    mtime_ns: int
+    inode: int
+    # False if the thread has no "# " heading yet and ``title`` is the file
+    # stem: then the first heading of any appended text becomes the title
+    title_known: bool = True
+
+    def matches(self, st: os.stat_result) -> bool:
+        """Return True if ``st`` describes the file this record was built from."""
+        return (
+            self.size == st.st_size
+            and self.mtime_ns == st.st_mtime_ns
+            and self.inode == st.st_ino
+        )
+
+
+def index_path(threads_dir: Path) -> Path:
+    return threads_dir / CACHE_DIR_NAME / META_INDEX_NAME
+
+
+def record_from_text(p: Path, text: str, st: os.stat_result) -> ThreadMetaRecord:
+    """Build a record from thread text and the stat taken before reading it."""
+    title, status, ball = _header_meta(text, p.stem)
+    last_ts, last_who = _last_entry_info(text)
+    return ThreadMetaRecord(
+        title=title,
+        status=status,
+        ball=ball,
+        last_ts=last_ts,
+        last_who=last_who,
+        size=st.st_size,
+        mtime_ns=st.st_mtime_ns,
+        inode=st.st_ino,
+        title_known=TITLE_RE.search(text) is not None,
+    )
+
+
+def load_index(threads_dir: Path) -> Dict[str, ThreadMetaRecord]:
+    """Load the index, returning an empty mapping if missing or unreadable."""
+    try:
+        data = json.loads(index_path(threads_dir).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != _INDEX_VERSION:
+        return {}
+    records: Dict[str, ThreadMetaRecord] = {}
+    for name, raw in (data.get("threads") or {}).items():
+        try:
+            records[name] = ThreadMetaRecord(**raw)
+        except TypeError:
+            continue
+    return records
+
+
+def save_index(threads_dir: Path, records: Dict[str, ThreadMetaRecord]) -> bool:
+    """Persist the index atomically. Returns False if it could not be written."""
+    payload = {
+        "version": _INDEX_VERSION,
+        "threads": {name: asdict(rec) for name, rec in sorted(records.items())},
+    }
+    try:
+        cache_dir(threads_dir)
+        atomic_write_bytes(
+            index_path(threads_dir),
+            json.dumps(payload, separators=(",", ":")).encode("utf-8"),
+        )
+        return True
+    except OSError:
+        return False
+
+
+def update_thread(p: Path, text: str | None = None) -> Optional[ThreadMetaRecord]:
+    """Refresh the record for one thread after a write.
+
+    Callers should hold the topic lock so ``text`` (the content just written)
+    and the stat taken here describe the same file state. If ``text`` is None
+    the file is re-read.
+    """
+    threads_dir = p.parent
+    try:
+        st = p.stat()
+        if text is None:
+            text = p.read_text(encoding="utf-8")
+    except OSError:
+        return None
+    rec = record_from_text(p, text, st)
+    records = load_index(threads_dir)
+    records[p.name] = rec
+    save_index(threads_dir, records)
+    return rec
+
+
+def update_thread_fields(
+    p: Path,
+    before: os.stat_result,
+    *,
+    status: str | None = None,
+    ball: str | None = None,
+    appended: str | None = None,
+) -> Optional[ThreadMetaRecord]:
+    """Patch a record after an in-place header update and/or append.
+
+    ``before`` is the stat taken before the write. The record is only patched
+    if it was fresh for that state; otherwise it is dropped so the next
+    listing re-parses the file (never re-reading it here keeps the write path
+    independent of thread size).
+    """
+    threads_dir = p.parent
+    records = load_index(threads_dir)
+    rec = records.get(p.name)
+    fresh = rec is not None and rec.matches(before)
+    if fresh and appended is not None:
+        if not rec.title_known:
+            heading = TITLE_RE.search(appended)
+            if heading is not None:
+                rec.title, rec.title_known = heading.group("val").strip(), True
+        hit = None
+        for hit in ENTRY_RE.finditer(appended):
+            pass
+        if hit is None:
+            fresh = False
+        else:
+            rec.last_ts = hit.group("ts").strip()
+            rec.last_who = hit.group("who").strip()
+    try:
+        st = p.stat()
+    except OSError:
+        fresh = False
+    if not fresh:
+        if records.pop(p.name, None) is not None:
+            save_index(threads_dir, records)
+        return None
+    if status is not None:
+        rec.status = _normalize_status(status)
+    if ball is not None:
+        rec.ball = ball.strip()
+    rec.size, rec.mtime_ns, rec.inode = st.st_size, st.st_mtime_ns, st.st_ino
+    save_index(threads_dir, records)
+    return rec
+
+
+def scan_threads(threads_dir: Path) -> List[Tuple[Path, ThreadMetaRecord]]:
+    """Return (path, record) for every thread, re-parsing only changed files.
+
+    Records for deleted threads are pruned, and the index is only rewritten
+    when something actually changed.
+    """
+    records = load_index(threads_dir)
+    out: List[Tuple[Path, ThreadMetaRecord]] = []
+    seen: set[str] = set()
+    dirty = False
+    for p in sorted(threads_dir.glob("*.md")):
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        seen.add(p.name)
+        rec = records.get(p.name)
+        if rec is None or not rec.matches(st):
+            # Stat before reading: if the file changes underneath us the
+            # record is stored with the older stat and simply re-parsed later.
+            try:
+                text = p.read_text(encoding="utf-8")
+            except OSError:
+                continue
+            rec = record_from_text(p, text, st)
+            records[p.name] = rec
+            dirty = True
+        out.append((p, rec))
+    for name in list(records):
+        if name not in seen:
+            del records[name]
+            dirty = True
+    if dirty:
+        save_index(threads_dir, records)
+    return out
@@ -40,16 +40,35 @@ def _last_entry_who(s: str) -> str | None:
     return who.strip() if who else None
 
 
+def _last_entry_info(s: str) -> tuple[str | None, str | None]:
+    """Return (timestamp, author) of the last entry with a single scan."""
+    last = None
+    for last in ENTRY_RE.finditer(s):
+        pass
+    if last is not None:
+        return last.group("ts").strip(), last.group("who").strip()
+    return _last_entry_iso(s), _last_entry_who(s)
+
+
 def _normalize_status(status: str) -> str:
     v = status.strip().lower()
     return v
 
 
+def _header_meta(s: str, default_title: str) -> tuple[str, str, str]:
+    """Extract (title, status, ball) from thread text."""
+    m = TITLE_RE.search(s)
+    title = m.group("val").strip() if m else default_title
+    m = STAT_RE.search(s)
+    status = _normalize_status(m.group("val") if m else "open")
+    m = BALL_RE.search(s)
+    ball = m.group("val").strip() if m else "unknown"
+    return title, status, ball
+
+
 def thread_meta(p: Path) -> tuple[str, str, str, str]:
     s = p.read_text(encoding="utf-8") if p.exists() else ""
-    title = TITLE_RE.search(s).group("val").strip() if TITLE_RE.search(s) else p.stem
-    status = _normalize_status(STAT_RE.search(s).group("val") if STAT_RE.search(s) else "open")
-    ball = (BALL_RE.search(s).group("val").strip() if BALL_RE.search(s) else "unknown")
+    title, status, ball = _header_meta(s, p.stem)
     last = _last_entry_iso(s) or utcnow_iso()
     return title, status, ball, last
 
@@ -17,6 +17,8 @@ from typing import Optional
 # GitPython for in-process git operations (avoids Windows subprocess stdio hangs)
 from git import Repo, InvalidGitRepositoryError, GitCommandError
 
+from .git_session import session_for
+
 
 @dataclass(frozen=True)
 class GitInfo:
@@ -47,6 +49,34 @@ def _resolve_path(path: Path) -> Path:
         return path
 
 
+def _remote_url(repo: Repo, name: str) -> Optional[str]:
+    """First URL of remote ``name`` as ``git remote get-url`` reports it.
+
+    Read from the config in-process (``Remote.urls`` runs git), applying the
+    longest matching ``url.<base>.insteadOf`` rewrite.
+    """
+    reader = repo.config_reader()
+    section = f'remote "{name}"'
+    if not reader.has_section(section):
+        return None
+    urls = [value for key, values in reader.items_all(section) if key.lower() == "url" for value in values]
+    if not urls:
+        return None
+    url = str(urls[0])
+
+    matched, base = "", None
+    for url_section in reader.sections():
+        if not (url_section.startswith('url "') and url_section.endswith('"')):
+            continue
+        for key, values in reader.items_all(url_section):
+            if key.lower() != "insteadof":
+                continue
+            for prefix in map(str, values):
+                if url.startswith(prefix) and len(prefix) > len(matched):
+                    matched, base = prefix, url_section[5:-1]
+    return base + url[len(matched):] if base is not None else url
+
+
 def discover_git_info(code_root: Optional[Path]) -> GitInfo:
     """Discover git repository information using GitPython.
 
@@ -77,16 +107,21 @@ def discover_git_info(code_root: Optional[Path]) -> GitInfo:
             # Detached HEAD state
             branch = None
 
-        # Get short commit hash
-        try:
-            commit = repo.head.commit.hexsha[:7]
-        except (ValueError, AttributeError):
-            commit = None
+        # Get short commit hash (from the git session: GitPython would start
+        # a cat-file process for this new Repo)
+        session = session_for(repo)
+        if session is not None:
+            sha = session.resolve("HEAD^{commit}")
+            commit = sha[:7] if sha else None
+        else:
+            try:
+                commit = repo.head.commit.hexsha[:7]
+            except (ValueError, AttributeError):
+                commit = None
 
         # Get origin remote URL
         try:
-            remote_obj = repo.remote("origin")
-            remote = next(iter(remote_obj.urls), None)
+            remote = _remote_url(repo, "origin")
         except (ValueError, GitCommandError):
             remote = None
 
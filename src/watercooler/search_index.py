@@ -0,0 +1,771 @@
+"""Persistent inverted index for keyword search.
+
+``watercooler search`` and keyword ``search_graph`` both answer
+case-insensitive substring queries. Scanning every thread (or every graph
+node) per query makes latency grow with the corpus, so this module keeps a
+word-token inverted index in ``.wc-cache/search.sqlite`` and only verifies
+the documents it nominates.
+
+Documents are:
+
+* thread blocks -- runs of whole lines of a thread file, at most
+  ``BLOCK_BYTES`` long, with their byte range and first line number;
+* graph nodes -- one line of ``graph/baseline/nodes.jsonl`` (title, body,
+  summary and topic fields), with its byte range.
+
+Tokens are ``\\w+`` runs of the lower-cased text. A query is split the same
+way and every query word constrains the candidates: a word with separators
+on both sides in the query must be a whole token, a word at the start of the
+query only has to be a token suffix, one at the end a token prefix, and a
+single-word query any token infix. This nominates a superset of the real
+matches; callers then run the original substring test on the candidates, so
+results are identical to a full scan. Queries without word characters are
+not indexable and callers fall back to scanning.
+
+Thread files are tagged with their (size, mtime_ns, inode). ``append_entry``,
+``set_status`` and ``set_ball`` update the blocks they touched in place (see
+:func:`note_thread_write`); anything else shows up as a stat mismatch and the
+file is re-indexed at the next query. The graph part is tagged with the stat
+of ``nodes.jsonl`` and updated by graph sync after each write, or rebuilt on
+mismatch. Like the other ``.wc-cache`` indexes this is a pure cache: every
+failure degrades to a full scan.
+
+For graph nodes the index also keeps per-field term frequencies, per-node
+field lengths and collection statistics (node count, average field lengths),
+so keyword hits can be ranked with BM25F without reading any node that is
+not a candidate.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+import sqlite3
+from collections import Counter
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .fs import cache_dir
+from .header import _MAX_HEADER_BYTES
+
+
+SEARCH_INDEX_NAME = "search.sqlite"
+BLOCK_BYTES = 4096
+
+# Node fields matched by baseline_graph.search._matches_keyword
+GRAPH_FIELDS = ("title", "body", "summary", "topic")
+
+# BM25F parameters: per-field weights and length normalisation, shared k1
+BM25_FIELD_WEIGHTS = {"title": 3.0, "body": 1.0, "summary": 1.5, "topic": 2.0}
+BM25_FIELD_B = {"title": 0.5, "body": 0.75, "summary": 0.75, "topic": 0.3}
+BM25_K1 = 1.2
+
+_SCHEMA_VERSION = 2
+_TOKEN_RE = re.compile(r"\w+")
+_SQL_CHUNK = 500
+# Upper bound for prefix ranges (SQLite compares UTF-8 bytes, i.e. code points)
+_MAX_CHAR = "\U0010ffff"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS tokens (
+    id INTEGER PRIMARY KEY,
+    token TEXT NOT NULL UNIQUE,
+    rtoken TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tokens_rtoken ON tokens (rtoken);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    readable INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blocks (
+    id INTEGER PRIMARY KEY,
+    file INTEGER NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    first_line INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS blocks_file ON blocks (file, start);
+CREATE TABLE IF NOT EXISTS postings (
+    token INTEGER NOT NULL,
+    doc INTEGER NOT NULL,
+    PRIMARY KEY (token, doc)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc);
+CREATE TABLE IF NOT EXISTS gnodes (
+    id INTEGER PRIMARY KEY,
+    node_id TEXT,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    len_title INTEGER NOT NULL,
+    len_body INTEGER NOT NULL,
+    len_summary INTEGER NOT NULL,
+    len_topic INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS gnodes_node ON gnodes (node_id);
+CREATE TABLE IF NOT EXISTS gpostings (
+    token INTEGER NOT NULL,
+    doc INTEGER NOT NULL,
+    tf_title INTEGER NOT NULL,
+    tf_body INTEGER NOT NULL,
+    tf_summary INTEGER NOT NULL,
+    tf_topic INTEGER NOT NULL,
+    PRIMARY KEY (token, doc)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS gpostings_doc ON gpostings (doc);
+"""
+
+# (start, end, first_line)
+_Block = Tuple[int, int, int]
+StatTag = Tuple[int, int, int]
+
+
+class _OutOfStep(Exception):
+    """The graph part cannot be updated incrementally."""
+
+
+def index_path(threads_dir: Path) -> Path:
+    return cache_dir(threads_dir) / SEARCH_INDEX_NAME
+
+
+def stat_tag(st: os.stat_result) -> StatTag:
+    return (st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+# ============================================================================
+# Tokenizing
+# ============================================================================
+
+
+def _tokens(text: str) -> Set[str]:
+    out: Set[str] = set()
+    for line in text.splitlines():
+        out.update(_TOKEN_RE.findall(line.lower()))
+    return out
+
+
+def _node_postings(node: Dict[str, Any]) -> Tuple[Dict[str, List[int]], List[int]]:
+    """Per-field term frequencies and field lengths (in tokens) of ``node``.
+
+    Frequencies are lists aligned with ``GRAPH_FIELDS``.
+    """
+    postings: Dict[str, List[int]] = {}
+    lengths: List[int] = []
+    for i, name in enumerate(GRAPH_FIELDS):
+        value = node.get(name, "")
+        counts: Counter = Counter()
+        if value:
+            for line in str(value).splitlines():
+                counts.update(_TOKEN_RE.findall(line.lower()))
+        for token, tf in counts.items():
+            tfs = postings.get(token)
+            if tfs is None:
+                tfs = postings[token] = [0] * len(GRAPH_FIELDS)
+            tfs[i] = tf
+        lengths.append(sum(counts.values()))
+    return postings, lengths
+
+
+def query_terms(query: str) -> List[Tuple[str, str]]:
+    """Split ``query`` into (kind, word) constraints.
+
+    ``kind`` is "exact", "prefix", "suffix" or "infix" depending on whether
+    the word is delimited by separators inside the query. An empty list
+    means the query cannot be answered from the index.
+    """
+    q = query.lower()
+    if q.splitlines() != [q]:
+        # Empty, or spans lines (which no single line can contain)
+        return []
+    terms: List[Tuple[str, str]] = []
+    for m in _TOKEN_RE.finditer(q):
+        left, right = m.start() > 0, m.end() < len(q)
+        kind = {
+            (True, True): "exact",
+            (True, False): "prefix",
+            (False, True): "suffix",
+            (False, False): "infix",
+        }[(left, right)]
+        terms.append((kind, m.group()))
+    return terms
+
+
+def _term_sql(kind: str, word: str) -> Tuple[str, Sequence[Any]]:
+    if kind == "exact":
+        return "token = ?", (word,)
+    if kind == "prefix":
+        return "token >= ? AND token < ?", (word, word + _MAX_CHAR)
+    if kind == "suffix":
+        rev = word[::-1]
+        return "rtoken >= ? AND rtoken < ?", (rev, rev + _MAX_CHAR)
+    return "instr(token, ?) > 0", (word,)
+
+
+# ============================================================================
+# Connection / storage helpers
+# ============================================================================
+
+
+def _connect(threads_dir: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(index_path(threads_dir)), timeout=10, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != _SCHEMA_VERSION:
+            with _transaction(conn):
+                for (name,) in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"
+                ).fetchall():
+                    conn.execute(f'DROP TABLE IF EXISTS "{name}"')
+                for stmt in _SCHEMA.split(";"):
+                    if stmt.strip():
+                        conn.execute(stmt)
+                conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+    except Exception:
+        conn.close()
+        raise
+    return conn
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection) -> Iterator[None]:
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _chunks(seq: Sequence[Any]) -> Iterator[Sequence[Any]]:
+    for i in range(0, len(seq), _SQL_CHUNK):
+        yield seq[i:i + _SQL_CHUNK]
+
+
+def _token_ids(conn: sqlite3.Connection, tokens: Iterable[str]) -> Dict[str, int]:
+    words = sorted(set(tokens))
+    conn.executemany(
+        "INSERT OR IGNORE INTO tokens (token, rtoken) VALUES (?, ?)",
+        ((w, w[::-1]) for w in words),
+    )
+    ids: Dict[str, int] = {}
+    for chunk in _chunks(words):
+        marks = ",".join("?" * len(chunk))
+        ids.update(conn.execute(f"SELECT token, id FROM tokens WHERE token IN ({marks})", chunk))
+    return ids
+
+
+def _post(conn: sqlite3.Connection, docs: List[Tuple[int, Set[str]]]) -> None:
+    ids = _token_ids(conn, (t for _doc, toks in docs for t in toks))
+    conn.executemany(
+        "INSERT OR IGNORE INTO postings (token, doc) VALUES (?, ?)",
+        sorted((ids[t], doc) for doc, toks in docs for t in toks),
+    )
+
+
+def _unpost(conn: sqlite3.Connection, docs: List[int]) -> None:
+    for chunk in _chunks(docs):
+        marks = ",".join("?" * len(chunk))
+        conn.execute(f"DELETE FROM postings WHERE doc IN ({marks})", chunk)
+
+
+def _resolve_terms(conn: sqlite3.Connection, terms: List[Tuple[str, str]]) -> int:
+    """Store the token ids matching each term in the temp table ``qterms``.
+
+    Returns the number of distinct terms; term ``i`` is stored as ``term = i``.
+    """
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS qterms (term INTEGER, token INTEGER, PRIMARY KEY (term, token))")
+    conn.execute("DELETE FROM qterms")
+    unique = list(dict.fromkeys(terms))
+    for i, (kind, word) in enumerate(unique):
+        cond, args = _term_sql(kind, word)
+        conn.execute(f"INSERT INTO qterms (term, token) SELECT ?, id FROM tokens WHERE {cond}", (i, *args))
+    return len(unique)
+
+
+def _candidates(conn: sqlite3.Connection, table: str, nterms: int) -> List[int]:
+    """Documents of ``table`` holding a matching token for every resolved term."""
+    parts = [
+        f"SELECT DISTINCT doc FROM {table} WHERE token IN (SELECT token FROM qterms WHERE term = {i})"
+        for i in range(nterms)
+    ]
+    return [doc for (doc,) in conn.execute(" INTERSECT ".join(parts))]
+
+
+# ============================================================================
+# Thread files
+# ============================================================================
+
+
+def _split_blocks(data: bytes, base: int, first_line: int) -> Iterator[Tuple[_Block, str]]:
+    """Split ``data`` (file bytes from offset ``base``) at line ends.
+
+    Raises UnicodeDecodeError if the bytes are not valid UTF-8.
+    """
+    pos, line = 0, first_line
+    while pos < len(data):
+        end = pos + BLOCK_BYTES
+        if end >= len(data):
+            end = len(data)
+        else:
+            nl = data.rfind(b"\n", pos, end)
+            if nl < 0:
+                nl = data.find(b"\n", end)
+            end = len(data) if nl < 0 else nl + 1
+        text = data[pos:end].decode("utf-8")
+        yield (base + pos, base + end, line), text
+        line += len(text.splitlines())
+        pos = end
+
+
+def _drop_blocks(conn: sqlite3.Connection, file_id: int, from_offset: int = 0) -> None:
+    rows = [b for (b,) in conn.execute(
+        "SELECT id FROM blocks WHERE file = ? AND start >= ?", (file_id, from_offset)
+    )]
+    _unpost(conn, rows)
+    conn.execute("DELETE FROM blocks WHERE file = ? AND start >= ?", (file_id, from_offset))
+
+
+def _add_blocks(conn: sqlite3.Connection, file_id: int, data: bytes, base: int, first_line: int) -> None:
+    docs: List[Tuple[int, Set[str]]] = []
+    for (start, end, line), text in _split_blocks(data, base, first_line):
+        cur = conn.execute(
+            "INSERT INTO blocks (file, start, end, first_line) VALUES (?, ?, ?, ?)",
+            (file_id, start, end, line),
+        )
+        docs.append((cur.lastrowid, _tokens(text)))
+    _post(conn, docs)
+
+
+def _set_file(conn: sqlite3.Connection, name: str, tag: StatTag, readable: bool) -> int:
+    conn.execute(
+        "INSERT INTO files (name, size, mtime_ns, inode, readable) VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT (name) DO UPDATE SET size = excluded.size, mtime_ns = excluded.mtime_ns, "
+        "inode = excluded.inode, readable = excluded.readable",
+        (name, *tag, int(readable)),
+    )
+    return conn.execute("SELECT id FROM files WHERE name = ?", (name,)).fetchone()[0]
+
+
+def _index_file(conn: sqlite3.Connection, path: Path) -> bool:
+    """(Re-)index ``path``; returns False if it changed while being read."""
+    with open(path, "rb") as f:
+        st = os.fstat(f.fileno())
+        data = f.read(st.st_size)
+    if stat_tag(os.stat(path)) != stat_tag(st):
+        return False
+    with _transaction(conn):
+        file_id = _set_file(conn, path.name, stat_tag(st), True)
+        _drop_blocks(conn, file_id)
+        try:
+            _add_blocks(conn, file_id, data, 0, 1)
+        except UnicodeDecodeError:
+            # The full scan skips files it cannot decode; remember that
+            _drop_blocks(conn, file_id)
+            _set_file(conn, path.name, stat_tag(st), False)
+    return True
+
+
+def _file_row(conn: sqlite3.Connection, name: str) -> Optional[Tuple[int, StatTag, bool]]:
+    row = conn.execute(
+        "SELECT id, size, mtime_ns, inode, readable FROM files WHERE name = ?", (name,)
+    ).fetchone()
+    if row is None:
+        return None
+    return row[0], (row[1], row[2], row[3]), bool(row[4])
+
+
+def _retokenize(conn: sqlite3.Connection, f: BinaryIO, blocks: List[Tuple[int, int, int]]) -> None:
+    docs: List[Tuple[int, Set[str]]] = []
+    for block_id, start, end in blocks:
+        f.seek(start)
+        docs.append((block_id, _tokens(f.read(end - start).decode("utf-8"))))
+    _unpost(conn, [b for b, _s, _e in blocks])
+    _post(conn, docs)
+
+
+def note_thread_write(
+    thread_path: Path,
+    before: os.stat_result,
+    *,
+    appended_at: Optional[int] = None,
+) -> None:
+    """Update the index after an in-place header patch and/or append.
+
+    ``before`` is the stat taken before the write; the file's blocks are
+    only updated if they were fresh for that state (otherwise the next query
+    re-indexes the file). Header blocks are re-tokenized, and when
+    ``appended_at`` (the offset the new text was written at) is given the
+    blocks from there on are rebuilt. Callers must hold the topic lock.
+    """
+    threads_dir = thread_path.parent
+    if not index_path(threads_dir).exists():
+        return
+    try:
+        with closing(_connect(threads_dir)) as conn, _transaction(conn):
+            row = _file_row(conn, thread_path.name)
+            if row is None or row[1] != stat_tag(before) or not row[2]:
+                return
+            file_id = row[0]
+            with open(thread_path, "rb") as f:
+                st = os.fstat(f.fileno())
+                tail_start = st.st_size
+                if appended_at is not None:
+                    last = conn.execute(
+                        "SELECT start, first_line FROM blocks WHERE file = ? AND start <= ? "
+                        "ORDER BY start DESC LIMIT 1",
+                        (file_id, appended_at),
+                    ).fetchone()
+                    tail_start, first_line = last or (0, 1)
+                    _drop_blocks(conn, file_id, tail_start)
+                    f.seek(tail_start)
+                    _add_blocks(conn, file_id, f.read(st.st_size - tail_start), tail_start, first_line)
+                head = conn.execute(
+                    "SELECT id, start, end FROM blocks WHERE file = ? AND start < ? AND start < ?",
+                    (file_id, _MAX_HEADER_BYTES, tail_start),
+                ).fetchall()
+                _retokenize(conn, f, head)
+            _set_file(conn, thread_path.name, stat_tag(st), True)
+    except (OSError, sqlite3.Error, UnicodeDecodeError):
+        _forget_file(threads_dir, thread_path.name)
+
+
+def _forget_file(threads_dir: Path, name: str) -> None:
+    try:
+        with closing(_connect(threads_dir)) as conn, _transaction(conn):
+            row = _file_row(conn, name)
+            if row is not None:
+                _drop_blocks(conn, row[0])
+                conn.execute("DELETE FROM files WHERE id = ?", (row[0],))
+    except (OSError, sqlite3.Error):
+        pass
+
+
+def _refresh_threads(conn: sqlite3.Connection, paths: List[Path]) -> Set[str]:
+    """Bring the thread part up to date; return names that must be scanned directly."""
+    known = {
+        name: (file_id, (size, mtime, ino))
+        for file_id, name, size, mtime, ino in conn.execute(
+            "SELECT id, name, size, mtime_ns, inode FROM files"
+        )
+    }
+    direct: Set[str] = set()
+    for p in paths:
+        try:
+            tag = stat_tag(p.stat())
+        except OSError:
+            continue
+        row = known.pop(p.name, None)
+        if row is not None and row[1] == tag:
+            continue
+        try:
+            if not _index_file(conn, p):
+                direct.add(p.name)
+        except OSError:
+            direct.add(p.name)
+    if known:
+        with _transaction(conn):
+            for file_id, _tag in known.values():
+                _drop_blocks(conn, file_id)
+                conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+    return direct
+
+
+def _scan_lines(text: str, first_line: int, q: str, p: Path, hits: List[Tuple[Path, int, str]]) -> None:
+    for i, line in enumerate(text.splitlines(), start=first_line):
+        if q in line.lower():
+            hits.append((p, i, line))
+
+
+def search_threads(threads_dir: Path, query: str) -> Optional[List[Tuple[Path, int, str]]]:
+    """Answer ``commands.search`` from the index.
+
+    Returns the same (path, line_no, line) hits as a full scan, or None if
+    the query is not indexable or the index is unavailable.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return None
+    q = query.lower()
+    paths = sorted(threads_dir.glob("*.md"))
+    try:
+        with closing(_connect(threads_dir)) as conn:
+            direct = _refresh_threads(conn, paths)
+            docs = _candidates(conn, "postings", _resolve_terms(conn, terms))
+            regions: Dict[str, List[_Block]] = {}
+            for chunk in _chunks(docs):
+                marks = ",".join("?" * len(chunk))
+                for name, start, end, line in conn.execute(
+                    f"SELECT f.name, b.start, b.end, b.first_line FROM blocks b "
+                    f"JOIN files f ON f.id = b.file WHERE b.id IN ({marks})",
+                    chunk,
+                ):
+                    regions.setdefault(name, []).append((start, end, line))
+    except (OSError, sqlite3.Error):
+        return None
+
+    hits: List[Tuple[Path, int, str]] = []
+    for p in paths:
+        try:
+            if p.name in direct:
+                _scan_lines(p.read_text(encoding="utf-8"), 1, q, p, hits)
+                continue
+            blocks = sorted(regions.get(p.name, ()))
+            if not blocks:
+                continue
+            with open(p, "rb") as f:
+                for start, end, line in blocks:
+                    f.seek(start)
+                    _scan_lines(f.read(end - start).decode("utf-8"), line, q, p, hits)
+        except Exception:
+            continue
+    return hits
+
+
+# ============================================================================
+# Graph nodes
+# ============================================================================
+
+
+def _node_key(node: Dict[str, Any]) -> Optional[str]:
+    return node.get("id") or None
+
+
+def result_key(node: Dict[str, Any]) -> Tuple[str, str]:
+    """The (node_type, node_id) pair ``search_graph`` reports for ``node``."""
+    node_type = node.get("type") or ""
+    return node_type, (node.get("topic") if node_type == "thread" else node.get("entry_id", "")) or ""
+
+
+def _add_nodes(conn: sqlite3.Connection, nodes: List[Tuple[Dict[str, Any], int, int]]) -> None:
+    """Index ``nodes`` given as (node, offset, length)."""
+    docs: List[Tuple[int, Dict[str, List[int]]]] = []
+    for node, offset, length in nodes:
+        postings, lengths = _node_postings(node)
+        cur = conn.execute(
+            "INSERT INTO gnodes (node_id, offset, length, len_title, len_body, len_summary, len_topic) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (_node_key(node), offset, length, *lengths),
+        )
+        docs.append((cur.lastrowid, postings))
+    ids = _token_ids(conn, (t for _doc, postings in docs for t in postings))
+    rows = [(ids[t], doc, *tfs) for doc, postings in docs for t, tfs in postings.items()]
+    # Inserting in primary-key order keeps the B-tree appends sequential
+    rows.sort()
+    conn.executemany(
+        "INSERT INTO gpostings (token, doc, tf_title, tf_body, tf_summary, tf_topic) VALUES (?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+
+
+def _drop_nodes(conn: sqlite3.Connection, docs: List[int]) -> None:
+    for chunk in _chunks(docs):
+        marks = ",".join("?" * len(chunk))
+        conn.execute(f"DELETE FROM gpostings WHERE doc IN ({marks})", chunk)
+        conn.execute(f"DELETE FROM gnodes WHERE id IN ({marks})", chunk)
+
+
+def _finish_graph(conn: sqlite3.Connection, tag: StatTag) -> None:
+    """Store the collection statistics BM25 needs and the stat tag."""
+    row = conn.execute(
+        "SELECT count(*), total(len_title), total(len_body), total(len_summary), total(len_topic) FROM gnodes"
+    ).fetchone()
+    stats = {"n": row[0], "avg": [total / row[0] if row[0] else 0.0 for total in row[1:]]}
+    conn.executemany(
+        "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+        (("graph_tag", json.dumps(list(tag))), ("graph_stats", json.dumps(stats))),
+    )
+
+
+def _rebuild_graph(conn: sqlite3.Connection, f: BinaryIO, tag: StatTag) -> None:
+    with _transaction(conn):
+        conn.execute("DELETE FROM gpostings")
+        conn.execute("DELETE FROM gnodes")
+        # Bulk load without the secondary index, then build it in one pass
+        conn.execute("DROP INDEX IF EXISTS gpostings_doc")
+        f.seek(0)
+        # nodes.jsonl is an append log: index the last line of each node id
+        nodes: Dict[Any, Tuple[Dict[str, Any], int, int]] = {}
+        offset = 0
+        for raw in f:
+            if raw.strip():
+                try:
+                    node = json.loads(raw)
+                except ValueError:
+                    node = None
+                if isinstance(node, dict):
+                    key = _node_key(node) or offset
+                    nodes.pop(key, None)
+                    nodes[key] = (node, offset, len(raw))
+            offset += len(raw)
+        _add_nodes(conn, list(nodes.values()))
+        conn.execute("CREATE INDEX gpostings_doc ON gpostings (doc)")
+        _finish_graph(conn, tag)
+
+
+def _meta(conn: sqlite3.Connection, key: str) -> Any:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def _graph_tag(conn: sqlite3.Connection) -> Optional[StatTag]:
+    tag = _meta(conn, "graph_tag")
+    return tuple(tag) if tag else None  # type: ignore[return-value]
+
+
+def _bm25(conn: sqlite3.Connection, nterms: int, docs: List[int]) -> Dict[int, float]:
+    """BM25F scores of ``docs`` for the terms resolved by :func:`_resolve_terms`.
+
+    Each query word is one term; its frequency in a field is the number of
+    field tokens satisfying the word's constraint, so "auth" counts
+    "authentication" like the substring match does.
+    """
+    stats = _meta(conn, "graph_stats") or {"n": 0, "avg": [0.0] * len(GRAPH_FIELDS)}
+    n = stats["n"]
+    weights = [BM25_FIELD_WEIGHTS[f] for f in GRAPH_FIELDS]
+    bs = [BM25_FIELD_B[f] for f in GRAPH_FIELDS]
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS cand (doc INTEGER PRIMARY KEY)")
+    conn.execute("DELETE FROM cand")
+    conn.executemany("INSERT INTO cand (doc) VALUES (?)", ((d,) for d in docs))
+
+    norms: Dict[int, List[float]] = {}
+    for doc, *lengths in conn.execute(
+        "SELECT g.id, g.len_title, g.len_body, g.len_summary, g.len_topic FROM gnodes g JOIN cand c ON c.doc = g.id"
+    ):
+        norms[doc] = [
+            w / (1 - b + b * (length / avg if avg else 0.0))
+            for w, b, length, avg in zip(weights, bs, lengths, stats["avg"])
+        ]
+
+    scores: Dict[int, float] = dict.fromkeys(docs, 0.0)
+    for term in range(nterms):
+        matching = f"SELECT token FROM qterms WHERE term = {term}"
+        df = conn.execute(
+            f"SELECT count(DISTINCT doc) FROM gpostings WHERE token IN ({matching})"
+        ).fetchone()[0]
+        idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+        for doc, *tfs in conn.execute(
+            f"SELECT p.doc, sum(p.tf_title), sum(p.tf_body), sum(p.tf_summary), sum(p.tf_topic) "
+            f"FROM gpostings p JOIN cand c ON c.doc = p.doc "
+            f"WHERE p.token IN ({matching}) GROUP BY p.doc"
+        ):
+            weight = sum(tf * norm for tf, norm in zip(tfs, norms[doc]))
+            scores[doc] += idf * weight / (BM25_K1 + weight)
+    return scores
+
+
+def graph_keyword_candidates(
+    threads_dir: Path, nodes_file: Path, query: str
+) -> Optional[List[Tuple[Dict[str, Any], float]]]:
+    """Return (node, BM25F score) for nodes of ``nodes_file`` that may match ``query``.
+
+    Nodes come in file order and are a superset of the nodes
+    ``_matches_keyword`` accepts. Returns None if the query is not indexable
+    or the index is unavailable.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return None
+    try:
+        with open(nodes_file, "rb") as f, closing(_connect(threads_dir)) as conn:
+            # Reading through the open handle keeps offsets consistent with
+            # the version we indexed, even if sync replaces the file meanwhile
+            tag = stat_tag(os.fstat(f.fileno()))
+            if _graph_tag(conn) != tag:
+                _rebuild_graph(conn, f, tag)
+            nterms = _resolve_terms(conn, terms)
+            docs = _candidates(conn, "gpostings", nterms)
+            scores = _bm25(conn, nterms, docs)
+            spans = sorted(
+                (offset, length, doc)
+                for chunk in _chunks(docs)
+                for doc, offset, length in conn.execute(
+                    f"SELECT id, offset, length FROM gnodes WHERE id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+            )
+            out: List[Tuple[Dict[str, Any], float]] = []
+            for offset, length, doc in spans:
+                f.seek(offset)
+                try:
+                    out.append((json.loads(f.read(length)), scores[doc]))
+                except ValueError:
+                    continue
+            return out
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def note_graph_write(
+    threads_dir: Path,
+    before: Optional[os.stat_result],
+    nodes_file: Path,
+    layout: List[Tuple[str, int, int]],
+    changed: List[Dict[str, Any]],
+    appended: bool = False,
+) -> None:
+    """Update the graph part after ``nodes_file`` was rewritten or appended to.
+
+    ``layout`` lists (id, offset, length) for every line of the new file and
+    ``changed`` the nodes that were upserted. Only their tokens are
+    recomputed; the other nodes just move. With ``appended``, ``layout``
+    only lists the lines appended for ``changed``, which replace the
+    indexed versions of those nodes. Skipped if the index was not fresh for
+    ``before`` (it is rebuilt at the next query instead).
+    """
+    if before is None or not index_path(threads_dir).exists():
+        return
+    try:
+        with closing(_connect(threads_dir)) as conn, _transaction(conn):
+            if _graph_tag(conn) != stat_tag(before):
+                return
+            tag = stat_tag(nodes_file.stat())
+            if appended:
+                # One appended line per changed node, in order; the last wins
+                latest = {node_id: (node, offset, length) for node, (node_id, offset, length) in zip(changed, layout)}
+                latest.pop("", None)
+                stale = [
+                    doc
+                    for chunk in _chunks(list(latest))
+                    for (doc,) in conn.execute(
+                        f"SELECT id FROM gnodes WHERE node_id IN ({','.join('?' * len(chunk))})", chunk
+                    )
+                ]
+                _drop_nodes(conn, stale)
+                _add_nodes(conn, list(latest.values()))
+                _finish_graph(conn, tag)
+                return
+            rows: Dict[Optional[str], List[int]] = {}
+            for doc, node_id in conn.execute("SELECT id, node_id FROM gnodes"):
+                rows.setdefault(node_id, []).append(doc)
+            fresh = {_node_key(n): n for n in changed}
+            moves: List[Tuple[int, int, int]] = []
+            added: List[Tuple[Dict[str, Any], int, int]] = []
+            stale: List[int] = []
+            for node_id, offset, length in layout:
+                existing = rows.pop(node_id, [])
+                if node_id in fresh or len(existing) != 1:
+                    node = fresh.get(node_id)
+                    if node is None:
+                        # Unknown to the index but not upserted: cannot tokenize
+                        raise _OutOfStep(node_id)
+                    stale.extend(existing)
+                    added.append((node, offset, length))
+                else:
+                    moves.append((offset, length, existing[0]))
+            stale.extend(doc for docs in rows.values() for doc in docs)
+            _drop_nodes(conn, stale)
+            conn.executemany("UPDATE gnodes SET offset = ?, length = ? WHERE id = ?", moves)
+            _add_nodes(conn, added)
+            _finish_graph(conn, tag)
+    except (OSError, sqlite3.Error, _OutOfStep):
+        pass
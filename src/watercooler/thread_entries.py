@@ -25,13 +25,27 @@ Parser Strategy:
     - No reliance on '---' separators (which conflict with horizontal rules)
     - Works correctly even with code blocks containing '---' or 'Entry:' text
     - Entry-IDs provide unique identification for deduplication
+
+Lazy Access:
+    ``parse_thread_entries`` needs the whole text. For callers that only want
+    a few entries, ``iter_thread_entries`` streams a file forwards and
+    ``iter_thread_entries_reverse`` reads it backwards in chunks from EOF, so
+    fetching the latest entry of a multi-megabyte thread only reads its tail.
+    Both yield entries in file order (resp. reverse file order) without the
+    timestamp sort, which matches ``parse_thread_entries`` for threads written
+    by the append path. Their offsets are byte offsets into the file, whereas
+    ``parse_thread_entries`` only sees decoded text and reports character
+    offsets; the two agree for ASCII content.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
+import io
+import os
 import re
-from typing import List, Optional, Tuple
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Tuple
 
 
 # Entry: header line - the primary entry boundary marker
@@ -82,6 +96,77 @@ class ThreadEntry:
     end_offset: int
 
 
+class _FenceTracker:
+    """Forward code-fence state machine shared by the eager and lazy parsers.
+
+    Per CommonMark, a closing fence must use the same character as the
+    opening fence and be at least as long.
+    """
+
+    __slots__ = ("char", "length")
+
+    def __init__(self) -> None:
+        self.char: Optional[str] = None
+        self.length = 0
+
+    def in_code(self, stripped: str) -> bool:
+        """Feed one stripped line; return True if it is a fence or fenced content."""
+        fence_match = _CODE_FENCE_RE.match(stripped)
+        if fence_match:
+            fence = fence_match.group(1)
+            if self.char is None:
+                # Opening fence: record char and length
+                self.char = fence[0]
+                self.length = len(fence)
+            elif fence[0] == self.char and len(fence) >= self.length:
+                # Closing fence: same char and at least as long
+                self.char = None
+                self.length = 0
+            # If fence doesn't match (different char or too short), stay in code block
+            return True
+        return self.char is not None
+
+
+class _ReverseFenceTracker:
+    """Code-fence state machine for scanning lines from the end of a file.
+
+    Mirrors ``_FenceTracker`` run backwards, assuming the file does not end
+    inside an unterminated fence: the first fence seen from the end is a
+    closing fence. Read backwards a fence's role is only forced in some
+    cases: a fence of another character, or of the same character with an
+    info string and longer than the closer, is fenced content; a bare fence
+    exactly as long as the closer is its opener. Any other fence (a shorter
+    one, or one with an info string that may or may not open the block)
+    depends on lines further up, so ``ambiguous`` is set and the caller must
+    parse forwards instead.
+    """
+
+    __slots__ = ("char", "closer_len", "ambiguous")
+
+    def __init__(self) -> None:
+        self.char: Optional[str] = None
+        self.closer_len = 0
+        self.ambiguous = False
+
+    def in_code(self, stripped: str) -> bool:
+        fence_match = _CODE_FENCE_RE.match(stripped)
+        if fence_match:
+            fence = fence_match.group(1)
+            has_info = bool(stripped[len(fence):].strip())
+            if self.char is None:
+                # A fence with an info string cannot close a block
+                self.ambiguous = has_info
+                self.char = fence[0]
+                self.closer_len = len(fence)
+            elif fence[0] == self.char:
+                if not has_info and len(fence) == self.closer_len:
+                    self.char = None
+                elif not has_info or len(fence) <= self.closer_len:
+                    self.ambiguous = True
+            return True
+        return self.char is not None
+
+
 def _find_entry_line_indexes(lines: List[str]) -> List[Tuple[int, str, str]]:
     """Find all Entry: header lines, skipping those inside code blocks.
 
@@ -92,34 +177,13 @@ def _find_entry_line_indexes(lines: List[str]) -> List[Tuple[int, str, str]]:
         List of tuples: (line_index, agent, timestamp) for each Entry: line found
     """
     entry_positions: List[Tuple[int, str, str]] = []
-    in_code_block = False
-    # Store opening fence char and minimum length for proper matching
-    # Per CommonMark spec: closing fence must use same char and be at least as long
-    code_fence_char: Optional[str] = None
-    code_fence_len: int = 0
+    fences = _FenceTracker()
 
     for idx, line in enumerate(lines):
         stripped = line.strip()
 
-        # Track code fence state
-        fence_match = _CODE_FENCE_RE.match(stripped)
-        if fence_match:
-            fence = fence_match.group(1)
-            if not in_code_block:
-                # Opening fence: record char and length
-                in_code_block = True
-                code_fence_char = fence[0]
-                code_fence_len = len(fence)
-            elif fence[0] == code_fence_char and len(fence) >= code_fence_len:
-                # Closing fence: same char and at least as long
-                in_code_block = False
-                code_fence_char = None
-                code_fence_len = 0
-            # If fence doesn't match (different char or too short), stay in code block
-            continue
-
-        # Skip lines inside code blocks
-        if in_code_block:
+        # Skip fence lines and lines inside code blocks
+        if fences.in_code(stripped):
             continue
 
         # Check for Entry: header line
@@ -266,6 +330,11 @@ def _find_last_content_line(lines: List[str], start_idx: int, end_idx: int) -> i
     return start_idx
 
 
+def _timestamp_sort_key(timestamp: Optional[str]) -> Tuple[int, str]:
+    """Sort key placing entries without a timestamp last."""
+    return (0, timestamp) if timestamp else (1, "")
+
+
 def parse_thread_entries(text: str) -> List[ThreadEntry]:
     """Parse thread entries from a markdown thread file.
 
@@ -353,12 +422,7 @@ def parse_thread_entries(text: str) -> List[ThreadEntry]:
         deduplicated.append(entry)
 
     # Sort by timestamp (chronological order)
-    def sort_key(entry: ThreadEntry) -> Tuple[int, str]:
-        has_timestamp = 0 if entry.timestamp else 1
-        timestamp = entry.timestamp or ""
-        return (has_timestamp, timestamp)
-
-    sorted_entries = sorted(deduplicated, key=sort_key)
+    sorted_entries = sorted(deduplicated, key=lambda e: _timestamp_sort_key(e.timestamp))
 
     # Re-index after sorting
     result: List[ThreadEntry] = []
@@ -380,3 +444,222 @@ def parse_thread_entries(text: str) -> List[ThreadEntry]:
         ))
 
     return result
+
+
+_DEFAULT_CHUNK_SIZE = 16 * 1024
+
+
+def _build_entry(
+    lines: List[str],
+    sizes: List[int],
+    *,
+    index: int,
+    start_line: int,
+    start_offset: int,
+) -> ThreadEntry:
+    """Build a ThreadEntry from the lines of a single entry.
+
+    ``lines`` starts at the Entry: line; ``sizes`` holds each line's size in
+    bytes on disk. ``start_line`` may be negative (counted from EOF), in which
+    case ``end_line`` is too.
+    """
+    end_idx = len(lines)
+    metadata = _parse_header_metadata(lines, 0, end_idx)
+    header_text, body_text = _extract_header_and_body(lines, 0, end_idx)
+    last_content_idx = _find_last_content_line(lines, 0, end_idx)
+    return ThreadEntry(
+        index=index,
+        header=header_text,
+        body=body_text,
+        agent=metadata.agent,
+        timestamp=metadata.timestamp,
+        role=metadata.role,
+        entry_type=metadata.entry_type,
+        title=metadata.title,
+        entry_id=_extract_entry_id(lines, 0, end_idx),
+        start_line=start_line,
+        end_line=start_line + last_content_idx,
+        start_offset=start_offset,
+        end_offset=start_offset + sum(sizes[: last_content_idx + 1]),
+    )
+
+
+def _decode_line(raw: bytes) -> str:
+    # Same newline normalisation as reading the file in text mode
+    return raw.decode("utf-8", errors="replace").replace("\r\n", "\n")
+
+
+def _iter_entry_regions(
+    f: BinaryIO, *, offset: int = 0, line_no: int = 1
+) -> Iterator[Tuple[int, int, int, List[str], List[int]]]:
+    """Yield ``(start_line, start_offset, end_offset, lines, sizes)`` per entry.
+
+    ``f`` must be positioned at ``offset``, which has to be the start of the
+    file or of an Entry: line (fence state is assumed closed there).
+    ``end_offset`` is where the next Entry: line (or EOF) begins.
+    """
+    fences = _FenceTracker()
+    current: List[str] = []
+    sizes: List[int] = []
+    start_line = 0
+    start_offset = 0
+    for raw in f:
+        line = _decode_line(raw)
+        stripped = line.strip()
+        if not fences.in_code(stripped) and _ENTRY_LINE_RE.match(stripped):
+            if current:
+                yield (start_line, start_offset, offset, current, sizes)
+            current, sizes = [], []
+            start_line, start_offset = line_no, offset
+        if start_line:
+            current.append(line)
+            sizes.append(len(raw))
+        offset += len(raw)
+        line_no += 1
+    if current:
+        yield (start_line, start_offset, offset, current, sizes)
+
+
+def iter_thread_entries(path: Path) -> Iterator[ThreadEntry]:
+    """Lazily yield entries of a thread file from the start.
+
+    The file is streamed line by line and each entry is yielded as soon as
+    the next Entry: line (or EOF) is reached, so ``islice(..., n)`` only reads
+    as far as the n-th entry. Entries keep file order; ``index`` and
+    ``start_line`` are absolute. Duplicate Entry-IDs are skipped (first
+    occurrence wins), like ``parse_thread_entries``.
+    """
+    seen_ids: set[str] = set()
+    index = 0
+    with open(path, "rb") as f:
+        for start_line, start_offset, _end, lines, sizes in _iter_entry_regions(f):
+            entry = _build_entry(
+                lines, sizes, index=index, start_line=start_line, start_offset=start_offset
+            )
+            if entry.entry_id:
+                if entry.entry_id in seen_ids:
+                    continue
+                seen_ids.add(entry.entry_id)
+            index += 1
+            yield entry
+
+
+def _iter_lines_reverse(f: BinaryIO, chunk_size: int) -> Iterator[Tuple[int, bytes]]:
+    """Yield (offset, raw_line) pairs from the end of ``f`` towards the start."""
+    pos = f.seek(0, os.SEEK_END)
+    buf = b""
+    while pos > 0:
+        step = min(chunk_size, pos)
+        pos -= step
+        f.seek(pos)
+        buf = f.read(step) + buf
+        if pos > 0:
+            # Keep the (possibly partial) first line for the next chunk
+            cut = buf.find(b"\n") + 1
+            if cut == 0:
+                continue
+            head, buf = buf[:cut], buf[cut:]
+        else:
+            head = b""
+        if not buf:
+            buf = head
+            continue
+        base = pos + len(head)
+        starts = [0]
+        idx = buf.find(b"\n")
+        while idx != -1 and idx + 1 < len(buf):
+            starts.append(idx + 1)
+            idx = buf.find(b"\n", idx + 1)
+        for i in range(len(starts) - 1, -1, -1):
+            end = starts[i + 1] if i + 1 < len(starts) else len(buf)
+            yield base + starts[i], buf[starts[i]:end]
+        buf = head
+
+
+def iter_thread_entries_reverse(
+    path: Path, *, chunk_size: int = _DEFAULT_CHUNK_SIZE
+) -> Iterator[ThreadEntry]:
+    """Lazily yield entries of a thread file from the end.
+
+    Reads the file backwards in ``chunk_size`` blocks, so the cost of fetching
+    the last few entries depends on their size, not the thread's. Because
+    the prefix of the file is usually not read, positions are counted from EOF:
+    ``index`` is -1 for the last entry, -2 for the one before, and
+    ``start_line``/``end_line`` are negative line numbers (-1 is the last
+    line). Byte offsets are absolute.
+
+    Code fences are tracked backwards (see ``_ReverseFenceTracker``). Once
+    their state depends on the unread prefix, the rest of the file (up to the
+    last entry yielded) is parsed forwards instead, so results agree with
+    ``iter_thread_entries``. Duplicate Entry-IDs are not collapsed since
+    the first occurrence may lie in the unread prefix.
+    """
+    fences = _ReverseFenceTracker()
+    pending_lines: List[str] = []
+    pending_sizes: List[int] = []
+    lines_from_end = 0
+    index = 0
+    boundary: Optional[int] = None
+    boundary_lines = 0
+    with open(path, "rb") as f:
+        for offset, raw in _iter_lines_reverse(f, chunk_size):
+            lines_from_end += 1
+            line = _decode_line(raw)
+            pending_lines.append(line)
+            pending_sizes.append(len(raw))
+            stripped = line.strip()
+            in_code = fences.in_code(stripped)
+            if fences.ambiguous:
+                break
+            if in_code or not _ENTRY_LINE_RE.match(stripped):
+                continue
+            index -= 1
+            pending_lines.reverse()
+            pending_sizes.reverse()
+            yield _build_entry(
+                pending_lines,
+                pending_sizes,
+                index=index,
+                start_line=-lines_from_end,
+                start_offset=offset,
+            )
+            pending_lines, pending_sizes = [], []
+            boundary, boundary_lines = offset, lines_from_end
+        else:
+            return
+
+        # Fence state above here depends on the prefix: parse it forwards
+        if boundary is None:
+            boundary = f.seek(0, os.SEEK_END)
+        f.seek(0)
+        prefix = f.read(boundary)
+    prefix_lines = prefix.count(b"\n")
+    if prefix and not prefix.endswith(b"\n"):
+        prefix_lines += 1
+    regions = list(_iter_entry_regions(io.BytesIO(prefix)))
+    for start_line, start_offset, _end, lines, sizes in reversed(regions):
+        index -= 1
+        yield _build_entry(
+            lines,
+            sizes,
+            index=index,
+            start_line=start_line - prefix_lines - boundary_lines - 1,
+            start_offset=start_offset,
+        )
+
+
+def read_last_entries(path: Path, count: int = 1) -> List[ThreadEntry]:
+    """Return the last ``count`` entries of a thread in file order.
+
+    Only the tail of the file is read. Indexes and line numbers are negative
+    (see ``iter_thread_entries_reverse``).
+    """
+    out: List[ThreadEntry] = []
+    if count <= 0:
+        return out
+    for entry in iter_thread_entries_reverse(path):
+        out.append(entry)
+        if len(out) >= count:
+            break
+    out.reverse()
+    return out
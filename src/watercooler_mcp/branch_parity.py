@@ -18,6 +18,7 @@ import json
 import os
 import re
 import tempfile
+import threading
 import time
 import unicodedata
 from dataclasses import asdict, dataclass, field
@@ -29,8 +30,11 @@ import git
 from git import Repo
 from git.exc import GitCommandError, InvalidGitRepositoryError
 
-from watercooler.lock import AdvisoryLock
+from watercooler.fs import ignored_dir
+from watercooler.git_session import session_for
+from watercooler.lock import AdvisoryLock, FlockLock, use_kernel_locks
 
+from . import fetch_coordinator
 from .observability import log_debug
 
 
@@ -146,6 +150,8 @@ class PreflightResult:
     can_proceed: bool  # Whether operation can proceed
     blocking_reason: Optional[str] = None  # Human-readable reason if blocked
     auto_fixed: bool = False  # Whether auto-remediation was applied
+    cached: bool = False  # Answered from the preflight cache
+    timings: Dict[str, float] = field(default_factory=dict)  # Seconds per stage (cache misses)
 
 
 # State file and lock paths
@@ -367,7 +373,7 @@ def write_parity_state(threads_dir: Path, state: ParityState) -> bool:
 
 def acquire_topic_lock(
     threads_dir: Path, topic: str, timeout: int = LOCK_TIMEOUT_SECONDS
-) -> AdvisoryLock:
+) -> AdvisoryLock | FlockLock:
     """Acquire lock for a specific topic. Returns lock (caller must release).
 
     Args:
@@ -376,13 +382,19 @@ def acquire_topic_lock(
         timeout: Seconds to wait for lock acquisition (default: LOCK_TIMEOUT_SECONDS)
 
     Returns:
-        AdvisoryLock instance (caller must call release() or use as context manager)
+        FlockLock (or AdvisoryLock with the lock-file fallback, see
+        ``watercooler.lock.use_kernel_locks``); caller must call release()
+        or use it as a context manager
 
     Raises:
         TimeoutError: If lock cannot be acquired within timeout period
 
     Note:
-        The lock has a TTL of LOCK_TTL_SECONDS (60s). If a process crashes while
+        Kernel locks block until the holder releases and are dropped
+        automatically if the holder dies; the lock files persist in the
+        (git-ignored) locks directory.
+
+        The lock-file fallback has a TTL of LOCK_TTL_SECONDS (60s). If a process crashes while
         holding the lock, it will be automatically cleaned up after the TTL expires.
         This ensures stale locks from crashed processes don't block agents indefinitely.
 
@@ -395,6 +407,20 @@ def acquire_topic_lock(
     # Ensure locks directory exists
     lock_path.parent.mkdir(parents=True, exist_ok=True)
 
+    if use_kernel_locks():
+        # Persistent lock files must never be staged with thread changes
+        ignored_dir(lock_path.parent)
+        lock = FlockLock(lock_path, timeout=timeout)
+        if not lock.acquire():
+            lock_info = lock.get_lock_info() or {}
+            raise TimeoutError(
+                f"Failed to acquire lock for topic '{topic}' within {timeout}s. "
+                f"Lock held by: pid={lock_info.get('pid', 'unknown')}, "
+                f"user={lock_info.get('user', 'unknown')}, since={lock_info.get('time', 'unknown')}. "
+                "The lock is released automatically when the holder exits."
+            )
+        return lock
+
     # Quick retries for transient contention (two agents hitting simultaneously)
     # This avoids the full 30s timeout in the common case where the lock is
     # held for only a few hundred milliseconds
@@ -481,11 +507,15 @@ def _get_ahead_behind(repo: Repo, branch: str) -> tuple[int, int]:
     try:
         remote_ref = f"origin/{branch}"
         # Check if remote ref exists
-        try:
-            repo.commit(remote_ref)
-        except Exception:
+        if _resolve_commit(repo, remote_ref) is None:
             return (0, 0)  # No remote tracking
 
+        session = session_for(repo)
+        if session is not None:
+            counts = session.ahead_behind(branch, remote_ref)
+            if counts is not None:
+                return counts
+
         ahead = len(list(repo.iter_commits(f"{remote_ref}..{branch}")))
         behind = len(list(repo.iter_commits(f"{branch}..{remote_ref}")))
         return (ahead, behind)
@@ -494,26 +524,51 @@ def _get_ahead_behind(repo: Repo, branch: str) -> tuple[int, int]:
         return (0, 0)
 
 
+def _resolve_commit(repo: Repo, rev: str) -> Optional[str]:
+    """Sha of the commit ``rev`` names, or None.
+
+    Asked of the repository's git session; GitPython would start its own
+    ``cat-file`` for every new ``Repo``.
+    """
+    session = session_for(repo)
+    if session is not None:
+        return session.resolve(f"{rev}^{{commit}}")
+    try:
+        return repo.commit(rev).hexsha
+    except Exception:
+        return None
+
+
 def _find_main_branch(repo: Repo) -> Optional[str]:
     """Find the main branch name (main or master)."""
     for name in ("main", "master"):
-        try:
-            repo.commit(name)
+        if _resolve_commit(repo, name) is not None:
             return name
-        except Exception:
-            continue
     return None
 
 
-def _fetch_with_timeout(repo: Repo, timeout: int = 30) -> bool:
-    """Fetch from origin with timeout. Returns True on success."""
-    try:
-        # Use git command with timeout
-        repo.git.fetch("origin", kill_after_timeout=timeout)
-        return True
-    except Exception as e:
-        log_debug(f"[PARITY] Fetch failed: {e}")
-        return False
+def _fetch_with_timeout(
+    repo: Repo, timeout: int = 30, fresh: bool = False, probe_branch: Optional[str] = None
+) -> bool:
+    """Fetch from origin with timeout. Returns True on success.
+
+    Goes through the fetch coordinator: a fetch of the same repo that is
+    running or (unless ``fresh``) succeeded within the fetch TTL is reused.
+    With ``probe_branch``, the fetch is skipped if ``git ls-remote`` shows
+    origin's tip of that branch is already the local remote-tracking ref.
+    """
+
+    def run() -> bool:
+        try:
+            # Use git command with timeout
+            repo.git.fetch("origin", kill_after_timeout=timeout)
+            return True
+        except Exception as e:
+            log_debug(f"[PARITY] Fetch failed: {e}")
+            return False
+
+    probe = fetch_coordinator.remote_tip_probe(repo, probe_branch, timeout=timeout) if probe_branch else None
+    return fetch_coordinator.fetch(repo.git_dir, run, fresh=fresh, probe=probe)
 
 
 def _checkout_branch(repo: Repo, branch: str, create: bool = False, set_upstream: bool = True) -> bool:
@@ -690,17 +745,33 @@ def _restore_stash(repo: Repo, stash_ref: Optional[str] = None) -> bool:
         return False
 
 
+def _conflicted_paths(repo: Repo) -> List[str]:
+    """Paths with unresolved merge/rebase conflicts.
+
+    Read from the index by the repository's git session; falls back to the
+    conflict markers (UU, AA, DD, etc.) of ``git status --porcelain``.
+    """
+    session = session_for(repo)
+    if session is not None:
+        paths = session.unmerged_paths()
+        if paths is not None:
+            return paths
+
+    status = repo.git.status("--porcelain")
+    conflicted_files = []
+    for line in status.split("\n"):
+        if line and len(line) >= 2:
+            xy = line[:2]
+            if "U" in xy or xy == "AA" or xy == "DD":
+                # Extract file path (skip XY status)
+                conflicted_files.append(line[3:].strip())
+    return conflicted_files
+
+
 def _has_conflicts(repo: Repo) -> bool:
     """Check if repo has unresolved merge/rebase conflicts."""
     try:
-        status = repo.git.status("--porcelain")
-        # Check for conflict markers (UU, AA, DD, etc.)
-        for line in status.split("\n"):
-            if line and len(line) >= 2:
-                xy = line[:2]
-                if "U" in xy or xy == "AA" or xy == "DD":
-                    return True
-        return False
+        return bool(_conflicted_paths(repo))
     except GitCommandError:
         return False
 
@@ -717,17 +788,7 @@ def _has_graph_conflicts_only(repo: Repo) -> bool:
     - Any conflicts exist outside graph/baseline/
     """
     try:
-        status = repo.git.status("--porcelain")
-        conflicted_files = []
-
-        for line in status.split("\n"):
-            if line and len(line) >= 2:
-                xy = line[:2]
-                if "U" in xy or xy == "AA" or xy == "DD":
-                    # Extract file path (skip XY status)
-                    file_path = line[3:].strip()
-                    conflicted_files.append(file_path)
-
+        conflicted_files = _conflicted_paths(repo)
         if not conflicted_files:
             return False
 
@@ -752,16 +813,7 @@ def _has_thread_conflicts_only(repo: Repo) -> bool:
     - Any conflicts exist in graph/ or non-.md files
     """
     try:
-        status = repo.git.status("--porcelain")
-        conflicted_files = []
-
-        for line in status.split("\n"):
-            if line and len(line) >= 2:
-                xy = line[:2]
-                if "U" in xy or xy == "AA" or xy == "DD":
-                    file_path = line[3:].strip()
-                    conflicted_files.append(file_path)
-
+        conflicted_files = _conflicted_paths(repo)
         if not conflicted_files:
             return False
 
@@ -815,7 +867,10 @@ def merge_jsonl_content(ours_content: str, theirs_content: str) -> str:
     """Pure function to merge JSONL content by deduplicating entries by UUID.
 
     Both nodes.jsonl and edges.jsonl are additive - entries from both
-    sides can coexist. We deduplicate by UUID to handle any duplicates.
+    sides can coexist. Each side is an append log (see
+    ``watercooler.baseline_graph.jsonl_log``), so it is first resolved to
+    its last record per key (``id``/``uuid``, or source + target for edges);
+    where both sides hold a key, ours wins. The result is compacted.
 
     Args:
         ours_content: JSONL string of our version
@@ -826,24 +881,26 @@ def merge_jsonl_content(ours_content: str, theirs_content: str) -> str:
     """
     import json
 
-    seen_uuids: set[str] = set()
-    merged_lines = []
+    from watercooler.baseline_graph.jsonl_log import latest, record_key
 
-    # Process ours first, then theirs
-    for content in [ours_content, theirs_content]:
+    def records(content: str) -> list[dict]:
+        out = []
         for line in content.strip().split("\n"):
             if not line.strip():
                 continue
             try:
                 entry = json.loads(line)
-                uuid = entry.get("uuid") or entry.get("id")
-                if uuid and uuid not in seen_uuids:
-                    seen_uuids.add(uuid)
-                    merged_lines.append(json.dumps(entry))
             except json.JSONDecodeError:
                 continue
+            if isinstance(entry, dict) and record_key(entry):
+                out.append(entry)
+        return out
+
+    ours = latest(records(ours_content), keep_seq=True)
+    seen_keys = {record_key(entry) for entry in ours}
+    theirs = [e for e in latest(records(theirs_content), keep_seq=True) if record_key(e) not in seen_keys]
 
-    return "\n".join(merged_lines) + "\n"
+    return "\n".join(json.dumps(entry) for entry in ours + theirs) + "\n"
 
 
 def merge_thread_content(ours_content: str, theirs_content: str) -> Tuple[str, bool]:
@@ -1068,15 +1125,7 @@ def _auto_resolve_graph_conflicts(repo: Repo) -> bool:
         repo_path = Path(repo.working_dir)
 
         # Get conflicted files
-        status = repo.git.status("--porcelain")
-        conflicted = []
-
-        for line in status.split("\n"):
-            if line and len(line) >= 2:
-                xy = line[:2]
-                if "U" in xy or xy == "AA" or xy == "DD":
-                    file_rel = line[3:].strip()
-                    conflicted.append(file_rel)
+        conflicted = _conflicted_paths(repo)
 
         if not conflicted:
             return True  # No conflicts to resolve
@@ -1192,15 +1241,7 @@ def _auto_resolve_thread_conflicts(repo: Repo) -> bool:
         repo_path = Path(repo.working_dir)
 
         # Get conflicted files
-        status = repo.git.status("--porcelain")
-        conflicted = []
-
-        for line in status.split("\n"):
-            if line and len(line) >= 2:
-                xy = line[:2]
-                if "U" in xy or xy == "AA" or xy == "DD":
-                    file_rel = line[3:].strip()
-                    conflicted.append(file_rel)
+        conflicted = _conflicted_paths(repo)
 
         if not conflicted:
             return True  # No conflicts to resolve
@@ -1326,7 +1367,7 @@ def auto_merge_to_main(
             actions.append("Stashed uncommitted changes")
 
         # 1. Fetch latest from origin
-        if not _fetch_with_timeout(threads_repo):
+        if not _fetch_with_timeout(threads_repo, fresh=True):
             log_debug("[PARITY] auto_merge_to_main: fetch failed, proceeding anyway")
 
         # 2. Checkout main branch
@@ -1441,6 +1482,93 @@ def auto_merge_to_main(
         return (False, f"Auto-merge failed: {e}")
 
 
+class _StageTimer:
+    """Seconds spent per preflight stage, measured between marks."""
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, float] = {}
+        self._last = time.perf_counter()
+
+    def mark(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.stages[stage] = round(self.stages.get(stage, 0.0) + now - self._last, 4)
+        self._last = now
+
+
+def _repo_stamp(repo: Repo) -> Optional[tuple]:
+    """What a clean preflight verdict for ``repo`` depends on.
+
+    HEAD (branch and sha), the sha of every ``origin`` remote-tracking ref,
+    in-progress merge/rebase markers, and the mtimes of the index (conflicts
+    live there) and the config (upstream tracking). Shas come from the git
+    session, the rest from files. None if HEAD has no commit yet.
+    """
+    try:
+        head = repo.head
+        branch = None if head.is_detached else head.ref.path
+    except Exception:
+        return None
+    head_sha = _resolve_commit(repo, "HEAD")
+    if head_sha is None:
+        return None
+    try:
+        remote_refs = tuple(sorted((ref.path, _resolve_commit(repo, ref.path)) for ref in repo.remote("origin").refs))
+    except Exception:
+        remote_refs = ()
+
+    def mtime(path: Path) -> Optional[int]:
+        try:
+            return path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    git_dir = Path(repo.git_dir)
+    return (
+        branch,
+        head_sha,
+        remote_refs,
+        _is_rebase_in_progress(repo),
+        mtime(git_dir / "index"),
+        mtime(Path(repo.common_dir) / "config"),
+    )
+
+
+def _without_index(key: tuple) -> tuple:
+    """A preflight cache key without the index mtimes."""
+    return tuple(stamp[:4] + stamp[5:] if isinstance(stamp, tuple) else stamp for stamp in key)
+
+
+class _PreflightCache:
+    """Last clean preflight state per (code repo, threads repo), by repository stamp."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], Tuple[tuple, ParityState]] = {}
+
+    def get(self, pair: Tuple[str, str], key: tuple) -> Optional[ParityState]:
+        with self._lock:
+            entry = self._entries.get(pair)
+        if entry is None or entry[0] != key:
+            return None
+        return ParityState.from_dict(entry[1].to_dict())
+
+    def put(self, pair: Tuple[str, str], key: tuple, state: ParityState) -> None:
+        with self._lock:
+            self._entries[pair] = (key, ParityState.from_dict(state.to_dict()))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_preflight_cache = _PreflightCache()
+
+
+def clear_preflight_cache() -> None:
+    """Forget all cached preflight results (the next preflight runs every check)."""
+    _preflight_cache.clear()
+
+
 def run_preflight(
     code_repo_path: Path,
     threads_repo_path: Path,
@@ -1449,15 +1577,42 @@ def run_preflight(
 ) -> PreflightResult:
     """Run preflight parity checks with optional auto-remediation.
 
+    A clean result that needed no remediation is cached, keyed on the state
+    of both repositories after the fetch (see ``_repo_stamp``). While neither
+    HEAD, index, config nor remote-tracking refs change, later preflights
+    return it (``cached=True``) without running the checks again. Results
+    computed from scratch carry per-stage ``timings``.
+
     Args:
         code_repo_path: Path to code repository
         threads_repo_path: Path to threads repository
         auto_fix: If True, attempt to auto-fix issues (default True)
-        fetch_first: If True, fetch from origin before checks (default True)
+        fetch_first: If True, fetch from origin before checks (default True);
+            only a fetch started by or during this call is accepted
 
     Returns:
         PreflightResult with success status, state, and whether operation can proceed
     """
+    timer = _StageTimer()
+    result = _run_preflight_checks(code_repo_path, threads_repo_path, auto_fix, fetch_first, timer)
+    if not result.cached:
+        timer.mark("finish")
+        result.timings = timer.stages
+        log_debug(
+            "[PARITY] Preflight timings: "
+            + " ".join(f"{stage}={seconds:.3f}s" for stage, seconds in timer.stages.items())
+        )
+    return result
+
+
+def _run_preflight_checks(
+    code_repo_path: Path,
+    threads_repo_path: Path,
+    auto_fix: bool,
+    fetch_first: bool,
+    timer: _StageTimer,
+) -> PreflightResult:
+    """The checks and remediation of :func:`run_preflight`."""
     state = ParityState(last_check_at=_now_iso())
     actions_taken: List[str] = []
 
@@ -1486,6 +1641,29 @@ def run_preflight(
                 can_proceed=False,
                 blocking_reason=state.last_error,
             )
+        timer.mark("open")
+
+        # Fetch from origin (both repos) before anything is compared: the
+        # cache key includes the remote-tracking refs. Failures are reported
+        # after the local checks below.
+        code_fetch_ok = threads_fetch_ok = True
+        if fetch_first:
+            # Writes decide on remote state at least as new as themselves
+            code_fetch_ok = _fetch_with_timeout(code_repo, fresh=True)
+            threads_fetch_ok = _fetch_with_timeout(threads_repo, fresh=True)
+            timer.mark("fetch")
+
+        cache_pair = (str(Path(code_repo_path).resolve()), str(Path(threads_repo_path).resolve()))
+        code_stamp = _repo_stamp(code_repo)
+        threads_stamp = _repo_stamp(threads_repo)
+        cache_key = (auto_fix, code_stamp, threads_stamp) if code_stamp and threads_stamp else None
+        if cache_key is not None and (code_fetch_ok or threads_fetch_ok):
+            cached_state = _preflight_cache.get(cache_pair, cache_key)
+            if cached_state is not None:
+                cached_state.last_check_at = state.last_check_at
+                write_parity_state(threads_repo_path, cached_state)
+                return PreflightResult(success=True, state=cached_state, can_proceed=True, cached=True)
+        timer.mark("cache")
 
         # Check for conflicts FIRST - if a merge/rebase has conflicts, that's the primary issue
         # This must come before _is_rebase_in_progress because MERGE_HEAD exists during conflicts
@@ -1612,10 +1790,10 @@ def run_preflight(
                 blocking_reason=state.last_error,
             )
 
-        # Fetch from origin (both repos)
+        timer.mark("conflicts")
+
+        # Fetched from origin above
         if fetch_first:
-            code_fetch_ok = _fetch_with_timeout(code_repo)
-            threads_fetch_ok = _fetch_with_timeout(threads_repo)
             if not code_fetch_ok and not threads_fetch_ok:
                 state.status = ParityStatus.REMOTE_UNREACHABLE.value
                 state.last_error = "Cannot reach origin for either repository"
@@ -1886,6 +2064,8 @@ def run_preflight(
                     blocking_reason=state.last_error,
                 )
 
+        timer.mark("branches")
+
         # Remote existence check: if code on origin, threads should be too
         code_on_origin = _branch_exists_on_origin(code_repo, code_branch)
         threads_on_origin = _branch_exists_on_origin(threads_repo, code_branch)
@@ -1940,6 +2120,8 @@ def run_preflight(
             else:
                 log_debug(f"[PARITY] Warning: No upstream tracking for {code_branch}")
 
+        timer.mark("remote")
+
         # Get ahead/behind status
         code_ahead, code_behind = _get_ahead_behind(code_repo, code_branch)
         threads_ahead, threads_behind = _get_ahead_behind(threads_repo, code_branch)
@@ -1947,6 +2129,7 @@ def run_preflight(
         state.code_behind_origin = code_behind
         state.threads_ahead_origin = threads_ahead
         state.threads_behind_origin = threads_behind
+        timer.mark("ahead_behind")
 
         # Code behind origin: block (we don't mutate code repo)
         if code_behind > 0:
@@ -2218,10 +2401,19 @@ def run_preflight(
                     f"(auto_fix disabled, not pushing)"
                 )
 
+        timer.mark("sync")
+
         # All checks passed
         state.status = ParityStatus.CLEAN.value
         state.actions_taken = actions_taken
 
+        # Nothing was changed, so the same repository state gives the same answer.
+        # Stamps are taken again because git status may have refreshed an index.
+        if cache_key is not None and not actions_taken and not state.pending_push:
+            end_key = (auto_fix, _repo_stamp(code_repo), _repo_stamp(threads_repo))
+            if _without_index(end_key) == _without_index(cache_key):
+                _preflight_cache.put(cache_pair, end_key, state)
+
         # Write state file
         write_parity_state(threads_repo_path, state)
 
@@ -2284,13 +2476,14 @@ def ensure_readable(
             )
             return (True, ["Skipped sync due to unresolved conflicts - reading potentially stale data"])
 
-        # Fetch from origin (with timeout)
-        if not _fetch_with_timeout(repo):
+        # Get current branch
+        branch = _get_branch_name(repo)
+
+        # Fetch from origin (with timeout), unless its branch tip is unchanged
+        if not _fetch_with_timeout(repo, probe_branch=branch):
             log_debug("[PARITY] ensure_readable: fetch failed (proceeding with cached data)")
             return (True, actions)
 
-        # Get current branch
-        branch = _get_branch_name(repo)
         if not branch:
             log_debug("[PARITY] ensure_readable: detached HEAD (proceeding anyway)")
             return (True, actions)
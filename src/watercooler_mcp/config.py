@@ -13,6 +13,7 @@ except ImportError:  # pragma: no cover - Python <3.8 fallback
     import importlib_metadata  # type: ignore
 
 from watercooler.agents import _canonical_agent, _load_agents_registry
+from watercooler.git_session import find_git_dir, session_for
 
 from .git_sync import GitSyncManager
 from .observability import log_debug
@@ -129,10 +130,23 @@ def _discover_git(code_root: Optional[Path]) -> _GitDetails:
 
 
 def _branch_has_upstream(code_root: Optional[Path], branch: Optional[str]) -> bool:
-    """Check if branch has upstream using subprocess git calls."""
+    """Check if branch has upstream.
+
+    Asks the code repo's git session (no subprocess per call); falls back to
+    subprocess git calls when sessions are disabled.
+    """
     if code_root is None or branch is None:
         return False
 
+    git_dir = find_git_dir(code_root)
+    session = session_for(git_dir) if git_dir is not None else None
+    if session is not None:
+        return (
+            session.resolve(f"refs/heads/{branch}") is not None
+            and session.upstream_configured(branch)
+            and session.resolve(f"{branch}@{{upstream}}") is not None
+        )
+
     try:
         # Check if branch exists
         branches = _run_git(["branch", "--list", branch], code_root)
@@ -566,6 +580,7 @@ def get_sync_config() -> Dict[str, Any]:
         "max_backoff": _get_float("WATERCOOLER_SYNC_MAX_BACKOFF", sync.max_backoff),
         "interval": _get_float("WATERCOOLER_SYNC_INTERVAL", sync.interval),
         "stale_threshold": sync.stale_threshold,
+        "fetch_ttl": _get_float("WATERCOOLER_FETCH_TTL", sync.fetch_ttl),
     }
 
 
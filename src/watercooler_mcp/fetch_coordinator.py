@@ -0,0 +1,238 @@
+"""Per-repository coordination of ``git fetch origin``.
+
+Every read tool runs ``ensure_readable`` (one fetch of the threads repo) and
+every write runs ``run_preflight(fetch_first=True)`` (a fetch of both repos)
+and then ``GitSyncManager.pull`` (another fetch). An agent doing
+list -> read -> say paid three or more network round-trips within seconds.
+
+All of those fetches now go through :func:`fetch`, which per repository:
+
+- joins a fetch that is already running instead of starting a second one
+  (singleflight), and
+- skips the fetch if one started at most ``ttl`` seconds ago succeeded
+  (``mcp.sync.fetch_ttl``, env ``WATERCOOLER_FETCH_TTL``; 0 disables this).
+
+Writes pass ``fresh=True``: they only accept a fetch that started after
+they asked, so a write never decides on remote state older than itself.
+The ``pull`` that follows the write's preflight then finds that fetch
+within the TTL and does not fetch again.
+
+Reads and pulls can also pass a ``probe``: a cheap check whether a fetch
+would bring anything. :func:`remote_tip_probe` asks ``git ls-remote`` for
+the tip of one branch (one ref, no pack negotiation) and compares it with
+the local remote-tracking ref; when they match, the fetch is skipped. For
+a threads repo that rarely changes between agent calls this replaces most
+fetches. The last tip seen per branch is kept in the stats.
+
+Counters per repository are reported by ``watercooler_health``.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+DEFAULT_TTL = 10.0
+
+
+@dataclass
+class _Flight:
+    """A fetch in progress."""
+
+    started: float
+    ok: bool = False
+
+
+@dataclass
+class _RepoFetches:
+    """Fetch state and counters of one repository."""
+
+    flight: Optional[_Flight] = None
+    last_success: Optional[float] = None  # Start time of the last successful fetch
+    remote_tips: Dict[str, str] = field(default_factory=dict)  # branch -> last tip seen by a probe
+    fetched: int = 0
+    skipped: int = 0
+    joined: int = 0
+    probed: int = 0  # Fetches a probe found unnecessary
+    failed: int = 0
+
+
+class FetchCoordinator:
+    """Deduplicates and rate-limits fetches per repository."""
+
+    def __init__(self, ttl: Optional[float] = None) -> None:
+        self._ttl = ttl
+        self._cond = threading.Condition()
+        self._repos: Dict[str, _RepoFetches] = {}
+
+    @property
+    def ttl(self) -> float:
+        if self._ttl is None:
+            self._ttl = _configured_ttl()
+        return self._ttl
+
+    def fetch(
+        self,
+        repo_path: Union[str, Path],
+        run: Callable[[], bool],
+        *,
+        fresh: bool = False,
+        probe: Optional[Callable[[], bool]] = None,
+    ) -> bool:
+        """Run ``run`` (a fetch returning success) unless it can be skipped or joined.
+
+        Args:
+            repo_path: Repository (its git dir or work tree) the fetch is for
+            run: Performs the fetch; returns True on success
+            fresh: Only accept a fetch started after this call (writes)
+            probe: Returns True if the remote has nothing to fetch; then
+                ``run`` is skipped (errors count as "fetch")
+
+        Returns:
+            Whether the fetch this call relied on succeeded
+        """
+        key = str(Path(repo_path).resolve())
+        requested = time.monotonic()
+        with self._cond:
+            repo = self._repos.setdefault(key, _RepoFetches())
+            while True:
+                flight = repo.flight
+                if flight is None:
+                    if (
+                        not fresh
+                        and repo.last_success is not None
+                        and requested - repo.last_success <= self.ttl
+                    ):
+                        repo.skipped += 1
+                        return True
+                    break
+                joinable = not fresh or flight.started >= requested
+                while repo.flight is flight:
+                    self._cond.wait()
+                if joinable:
+                    repo.joined += 1
+                    return flight.ok
+                # A write arrived while an older fetch ran: fetch again
+            flight = repo.flight = _Flight(started=time.monotonic())
+
+        ok = unchanged = False
+        try:
+            if probe is not None:
+                try:
+                    unchanged = bool(probe())
+                except Exception:
+                    unchanged = False
+            ok = unchanged or bool(run())
+        finally:
+            with self._cond:
+                flight.ok = ok
+                repo.flight = None
+                if unchanged:
+                    repo.probed += 1
+                elif ok:
+                    repo.fetched += 1
+                else:
+                    repo.failed += 1
+                if ok:
+                    repo.last_success = flight.started
+                self._cond.notify_all()
+        return ok
+
+    def record_remote_tip(self, repo_path: Union[str, Path], branch: str, sha: str) -> None:
+        with self._cond:
+            repo = self._repos.setdefault(str(Path(repo_path).resolve()), _RepoFetches())
+            repo.remote_tips[branch] = sha
+
+    def invalidate(self, repo_path: Union[str, Path]) -> None:
+        """Forget the last fetch of ``repo_path`` (the next one runs)."""
+        with self._cond:
+            repo = self._repos.get(str(Path(repo_path).resolve()))
+            if repo is not None:
+                repo.last_success = None
+
+    def stats(self) -> Dict[str, dict]:
+        """Counters per repository, and the age of its last successful fetch."""
+        now = time.monotonic()
+        with self._cond:
+            return {
+                key: {
+                    "fetched": repo.fetched,
+                    "skipped": repo.skipped,
+                    "joined": repo.joined,
+                    "probed": repo.probed,
+                    "failed": repo.failed,
+                    "remote_tips": dict(repo.remote_tips),
+                    "in_flight": repo.flight is not None,
+                    "last_fetch_age": round(now - repo.last_success, 1) if repo.last_success is not None else None,
+                }
+                for key, repo in self._repos.items()
+            }
+
+
+def _configured_ttl() -> float:
+    try:
+        # Late import: config imports the git modules that import this one
+        from .config import get_sync_config
+
+        return max(0.0, float(get_sync_config().get("fetch_ttl", DEFAULT_TTL)))
+    except Exception:
+        try:
+            return max(0.0, float(os.getenv("WATERCOOLER_FETCH_TTL", DEFAULT_TTL)))
+        except ValueError:
+            return DEFAULT_TTL
+
+
+_coordinator = FetchCoordinator()
+
+
+def get_fetch_coordinator() -> FetchCoordinator:
+    """The process-wide fetch coordinator."""
+    return _coordinator
+
+
+def fetch(
+    repo_path: Union[str, Path],
+    run: Callable[[], bool],
+    *,
+    fresh: bool = False,
+    probe: Optional[Callable[[], bool]] = None,
+) -> bool:
+    """``FetchCoordinator.fetch`` on the process-wide coordinator."""
+    return _coordinator.fetch(repo_path, run, fresh=fresh, probe=probe)
+
+
+def remote_tip_probe(
+    repo: Any,
+    branch: Optional[str],
+    remote: str = "origin",
+    env: Optional[Dict[str, str]] = None,
+    timeout: int = 15,
+) -> Callable[[], bool]:
+    """Probe for :func:`fetch`: True if ``remote``'s ``branch`` tip is already local.
+
+    Compares ``git ls-remote <remote> refs/heads/<branch>`` with
+    ``refs/remotes/<remote>/<branch>`` of the GitPython ``repo``. A branch
+    missing on either side reports a change, so the fetch runs.
+    """
+
+    def probe() -> bool:
+        if not branch:
+            return False
+        kwargs: Dict[str, Any] = {"kill_after_timeout": timeout}
+        if env:
+            kwargs["env"] = env
+        listed = repo.git.ls_remote(remote, f"refs/heads/{branch}", **kwargs).split()
+        if not listed:
+            return False
+        _coordinator.record_remote_tip(repo.git_dir, branch, listed[0])
+        try:
+            local = repo.git.rev_parse("--verify", "--quiet", f"refs/remotes/{remote}/{branch}")
+        except Exception:
+            return False
+        return local.strip() == listed[0]
+
+    return probe
@@ -14,6 +14,7 @@ from a background worker that batches git operations.
 """
 
 import atexit
+from contextlib import nullcontext
 import json
 import os
 import re
@@ -25,7 +26,7 @@ import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Callable, Optional, TypeVar, List, Dict, Any
+from typing import Callable, ContextManager, Optional, TypeVar, List, Dict, Any, Iterable, Union
 import sys
 import hashlib
 
@@ -39,7 +40,9 @@ except ImportError:
 
 # GitPython for in-process git operations (avoids subprocess stdio issues on Windows)
 import git
-from git import Repo, GitCommandError, InvalidGitRepositoryError
+from git import Repo, GitCommandError, InvalidGitRepositoryError, PushInfo
+
+from . import fetch_coordinator
 
 # Unified logging (replaces old _diag system)
 from .observability import log_debug, log_action, log_warning, log_error
@@ -975,13 +978,17 @@ class GitSyncManager:
             # but log the error for debugging
             self._log(f"Warning: Failed to install git hooks: {e}")
 
-    def pull(self) -> bool:
+    def pull(self, *, fresh: bool = False) -> bool:
         """Pull latest changes from remote with rebase.
 
         Uses --rebase --autostash to:
         - Replay local commits on top of remote changes
         - Automatically stash and re-apply local modifications
 
+        Args:
+            fresh: Do not reuse a fetch from within the fetch TTL (e.g. after
+                a rejected push, which means origin has commits we lack)
+
         Returns:
             True if pull succeeded, False if rebase failed
 
@@ -1013,11 +1020,16 @@ class GitSyncManager:
         self._log("Pulling with rebase and autostash")
         try:
             repo = self._repo
-            log_debug("GIT_OP_START: fetch origin")
-            with git.Git().custom_environment(**self._env):
-                # Fetch first
-                repo.remote('origin').fetch()
-            log_debug("GIT_OP_END: fetch origin")
+            # Fetch first, unless a fetch of this repo (e.g. the preflight
+            # of this write) is running or recent enough to reuse, or
+            # ls-remote shows the branch tip on origin is already local
+            probe = fetch_coordinator.remote_tip_probe(repo, self._current_branch(repo), env=self._env)
+            if fetch_coordinator.fetch(
+                repo.git_dir, lambda: self._fetch_origin(repo), fresh=fresh, probe=probe
+            ):
+                if not self._behind_upstream(repo):
+                    self._log("Already up to date with upstream")
+                    return True
             log_debug("GIT_OP_START: pull --rebase --autostash")
             with git.Git().custom_environment(**self._env):
                 # Pull with rebase
@@ -1106,13 +1118,55 @@ class GitSyncManager:
             self._last_pull_error = f"Unexpected error during pull: {e}"
             return False
 
-    def commit_local(self, message: str) -> bool:
+    def _fetch_origin(self, repo: Repo) -> bool:
+        """Fetch origin; True on success (errors surface from the pull that follows)."""
+        log_debug("GIT_OP_START: fetch origin")
+        try:
+            with git.Git().custom_environment(**self._env):
+                repo.remote('origin').fetch()
+        except GitCommandError as e:
+            log_debug(f"GIT_OP_FAIL: fetch origin: {e}")
+            return False
+        log_debug("GIT_OP_END: fetch origin")
+        return True
+
+    @staticmethod
+    def _current_branch(repo: Repo) -> Optional[str]:
+        try:
+            return repo.active_branch.name
+        except (TypeError, ValueError):
+            return None  # Detached HEAD
+
+    def _behind_upstream(self, repo: Repo) -> bool:
+        """Whether the upstream of the current branch has commits HEAD lacks.
+
+        True when that cannot be determined (no upstream, detached HEAD), so
+        the caller falls back to a full pull.
+        """
+        try:
+            return int(repo.git.rev_list("--count", "HEAD..@{upstream}")) > 0
+        except (GitCommandError, ValueError):
+            return True
+
+    def commit_local(
+        self,
+        message: str,
+        paths: Optional[Iterable[Union[str, Path]]] = None,
+    ) -> bool:
         """Commit staged changes locally without pushing (GitPython, no subprocess).
 
+        With ``paths`` (files or directories, absolute or relative to the
+        work tree) only those are staged and committed, and whether there is
+        anything to commit is decided from the index diff of those paths, so
+        neither step walks the rest of the tree. Without ``paths`` all
+        changes are staged (``git add -A``).
+
         Returns True if a commit was created, False if there were no staged changes.
         Raises GitSyncError if git commit fails.
         """
         self._log(f"Committing: {message[:60]}...")
+        if paths is not None:
+            return self._commit_paths(message, paths)
         try:
             repo = self._repo
             log_debug("GIT_OP_START: add -A")
@@ -1138,11 +1192,87 @@ class GitSyncManager:
             raise GitSyncError(f"Failed to commit: {e}") from e
         return True
 
+    def _pathspecs(self, repo: Repo, paths: Iterable[Union[str, Path]]) -> List[str]:
+        """Work-tree-relative pathspecs for ``paths``.
+
+        Paths outside the work tree are dropped, as are missing paths git
+        does not track (``git add`` would reject them); missing tracked
+        paths stay so their removal is staged.
+        """
+        root = Path(repo.working_tree_dir).resolve()
+        present: List[str] = []
+        missing: List[str] = []
+        for path in paths:
+            path = Path(path)
+            absolute = (path if path.is_absolute() else root / path).resolve()
+            try:
+                rel = absolute.relative_to(root).as_posix()
+            except ValueError:
+                log_debug(f"[COMMIT] Ignoring path outside {root}: {path}")
+                continue
+            target = present if absolute.exists() else missing
+            if rel not in target:
+                target.append(rel)
+        if missing:
+            tracked = repo.git.ls_files("-z", "--", *missing).split("\0")
+            present.extend(
+                rel for rel in missing
+                if any(name == rel or name.startswith(rel + "/") for name in tracked if name)
+            )
+        return present
+
+    def _commit_paths(self, message: str, paths: Iterable[Union[str, Path]]) -> bool:
+        try:
+            repo = self._repo
+            specs = self._pathspecs(repo, paths)
+            if not specs:
+                self._log("No changes to commit")
+                return False
+
+            log_debug(f"GIT_OP_START: add -A -- {len(specs)} path(s)")
+            with git.Git().custom_environment(**self._env):
+                repo.git.add("-A", "--", *specs)
+                # Index against HEAD only: no work tree walk
+                staged = [
+                    name
+                    for name in repo.git.diff("--cached", "--name-only", "--no-renames", "-z").split("\0")
+                    if name
+                ]
+            changed = [
+                name for name in staged
+                if any(spec == "." or name == spec or name.startswith(spec + "/") for spec in specs)
+            ]
+            log_debug(f"GIT_OP_END: add -A ({len(changed)} changed)")
+
+            if not changed:
+                self._log("No changes to commit")
+                return False
+
+            # Changes staged outside the paths stay out of this commit. Only
+            # then pass the paths: `commit --only` rebuilds a temporary index.
+            only = changed if len(changed) < len(staged) else []
+            log_debug(f"GIT_OP_START: commit -m '{message[:40]}'")
+            with git.Git().custom_environment(**self._env):
+                if only:
+                    repo.git.commit("-m", message, "--", *only, env=self._env)
+                else:
+                    repo.git.commit("-m", message, env=self._env)
+            log_debug("GIT_OP_END: commit")
+            self._log("Commit completed successfully")
+        except GitCommandError as e:
+            raise GitSyncError(f"Failed to commit: {e}") from e
+        except Exception as e:
+            raise GitSyncError(f"Failed to commit: {e}") from e
+        return True
+
     def commit_graph_changes(
         self,
-        topic: str,
+        topic: Optional[str] = None,
         entry_id: Optional[str] = None,
         max_retries: int = 5,
+        *,
+        message: Optional[str] = None,
+        push: bool = True,
     ) -> bool:
         """Commit and push graph files (Phase 2 of Two-Phase Commit).
 
@@ -1154,6 +1284,10 @@ class GitSyncManager:
             topic: Thread topic for commit message
             entry_id: Optional entry ID for commit message
             max_retries: Max push retry attempts
+            message: Commit message (overrides the one built from topic/entry_id,
+                e.g. for a batch covering several topics)
+            push: Push after committing (False: the caller pushes, e.g. with
+                :meth:`push_current_branch` outside its git lock)
 
         Returns:
             True if commit+push succeeded or no changes, False on failure
@@ -1184,10 +1318,8 @@ class GitSyncManager:
             log_debug("GIT_OP_END: add graph/baseline/")
 
             # Build commit message
-            if entry_id:
-                message = f"graph: sync {topic}/{entry_id}"
-            else:
-                message = f"graph: sync {topic}"
+            if message is None:
+                message = f"graph: sync {topic}/{entry_id}" if entry_id else f"graph: sync {topic}"
 
             # Commit
             log_debug(f"GIT_OP_START: commit -m '{message}'")
@@ -1195,6 +1327,8 @@ class GitSyncManager:
                 repo.git.commit("-m", message, env=self._env)
             log_debug("GIT_OP_END: commit")
             self._log(f"[GRAPH-COMMIT] Committed graph changes: {message}")
+            if not push:
+                return True
 
             # Push with retry
             from watercooler_mcp.branch_parity import push_after_commit
@@ -1230,7 +1364,9 @@ class GitSyncManager:
         self,
         commit_msg: str,
         max_retries: int = 5,
-    ) -> None:
+        *,
+        push: bool = True,
+    ) -> bool:
         """Commit and push graph files, blocking until confirmed.
 
         Unlike commit_graph_changes(), this method raises on failure instead
@@ -1240,6 +1376,10 @@ class GitSyncManager:
         Args:
             commit_msg: Commit message for graph changes
             max_retries: Max push retry attempts
+            push: Push after committing (False: the caller pushes)
+
+        Returns:
+            True if a commit was created, False if there were no graph changes
 
         Raises:
             GitSyncError: If commit or push fails after retries
@@ -1251,7 +1391,7 @@ class GitSyncManager:
             # Check if graph directory exists
             if not graph_path.exists():
                 log_debug("[GRAPH-COMMIT-SYNC] No graph/baseline directory, skipping")
-                return
+                return False
 
             # Check for changes in graph files
             with git.Git().custom_environment(**self._env):
@@ -1259,7 +1399,7 @@ class GitSyncManager:
 
             if not status_output.strip():
                 log_debug("[GRAPH-COMMIT-SYNC] No graph changes to commit")
-                return
+                return False
 
             # Stage only graph files
             with git.Git().custom_environment(**self._env):
@@ -1270,6 +1410,8 @@ class GitSyncManager:
             with git.Git().custom_environment(**self._env):
                 repo.git.commit("-m", commit_msg, env=self._env)
             self._log(f"[GRAPH-COMMIT-SYNC] Committed: {commit_msg}")
+            if not push:
+                return True
 
             # Push with retry (BLOCKING)
             from watercooler_mcp.branch_parity import push_after_commit
@@ -1289,18 +1431,57 @@ class GitSyncManager:
                 )
 
             self._log("[GRAPH-COMMIT-SYNC] Graph changes pushed successfully")
+            return True
 
         except GitCommandError as e:
             # No changes to commit is not an error
             if "nothing to commit" in str(e).lower():
                 log_debug("[GRAPH-COMMIT-SYNC] Nothing to commit")
-                return
+                return False
             raise GitSyncError(f"Graph commit failed: {e}") from e
         except GitSyncError:
             raise  # Re-raise our own errors
         except Exception as e:
             raise GitSyncError(f"Graph commit failed: {e}") from e
 
+    def push_current_branch(
+        self,
+        max_retries: int = 5,
+        *,
+        lock: Optional[ContextManager[Any]] = None,
+    ) -> tuple[bool, Optional[str]]:
+        """Push the current branch to origin, taking ``lock`` only if needed.
+
+        ``lock`` is the caller's lock around work tree changes (the graph
+        queue's ``git_lock``). A plain push only updates the remote, so it
+        runs without the lock and writes do not wait on the network. Only a
+        rejected push, retried after ``pull --rebase`` (push_after_commit),
+        takes it.
+
+        Returns:
+            (success, error message)
+        """
+        if not self._remote_allowed:
+            return (True, None)
+        repo = self._repo
+        branch_name = self._current_branch(repo) or "main"
+        try:
+            log_debug(f"GIT_OP_START: push origin {branch_name}")
+            with git.Git().custom_environment(**self._env):
+                repo.git.push("origin", branch_name, env=self._env)
+            log_debug("GIT_OP_END: push")
+            return (True, None)
+        except GitCommandError as e:
+            error_text = str(e).lower()
+            if "rejected" not in error_text and "non-fast-forward" not in error_text:
+                return (False, f"Push failed: {e}")
+
+        from watercooler_mcp.branch_parity import push_after_commit
+
+        log_debug("[PUSH] Rejected, rebasing onto origin before retrying")
+        with lock if lock is not None else nullcontext():
+            return push_after_commit(self.local_path, branch_name, max_retries=max_retries)
+
     def push_pending(self, max_retries: int = 5) -> bool:
         """Push local commits to the remote with retry logic."""
         self._last_push_error = None
@@ -1326,7 +1507,15 @@ class GitSyncManager:
                 repo = self._repo
                 log_debug(f"GIT_OP_START: push (attempt {attempt+1})")
                 with git.Git().custom_environment(**self._env):
-                    repo.remote('origin').push(env=self._env)
+                    infos = repo.remote('origin').push(env=self._env)
+                # GitPython reports a rejected push in the flags, not by raising
+                rejected = [
+                    info.summary.strip()
+                    for info in infos
+                    if info.flags & (PushInfo.ERROR | PushInfo.REJECTED | PushInfo.REMOTE_REJECTED)
+                ]
+                if rejected:
+                    raise GitCommandError("git push", 1, stderr="rejected: " + "; ".join(rejected))
                 log_debug(f"GIT_OP_END: push (attempt {attempt+1})")
                 self._log("Push completed successfully")
                 return True
@@ -1365,7 +1554,9 @@ class GitSyncManager:
                 if attempt < max_retries - 1:
                     # Push rejected - pull and retry
                     self._log("Push rejected, pulling before retry")
-                    if not self.pull():
+                    # The rejection means origin moved: a fetch reused from
+                    # before it would leave us behind for every retry
+                    if not self.pull(fresh=True):
                         # Pull failed (rebase conflict or no upstream yet)
                         # Give one more chance on next loop iteration
                         pass
@@ -1467,6 +1658,7 @@ class GitSyncManager:
         topic: Optional[str] = None,
         entry_id: Optional[str] = None,
         priority_flush: bool = False,
+        paths: Optional[Iterable[Union[str, Path]]] = None,
     ) -> T:
         """Execute operation with git synchronization.
 
@@ -1475,6 +1667,10 @@ class GitSyncManager:
         operation is executed immediately, the commit is recorded locally, and
         a background worker pushes it to the remote (flushing immediately for
         priority operations such as ball hand-offs).
+
+        ``paths`` are the files the operation changes; only those are
+        committed (see :meth:`commit_local`). It is read after the operation
+        runs, so the operation may still add to a list passed here.
         """
         # Auto-sync branches before any write operation
         self._ensure_branch_sync()
@@ -1483,6 +1679,7 @@ class GitSyncManager:
             return self._with_sync_sync(
                 operation,
                 commit_message,
+                paths=paths,
             )
 
         return self._with_sync_async(
@@ -1491,9 +1688,16 @@ class GitSyncManager:
             topic=topic,
             entry_id=entry_id,
             priority_flush=priority_flush,
+            paths=paths,
         )
 
-    def _with_sync_sync(self, operation: Callable[[], T], commit_message: str) -> T:
+    def _with_sync_sync(
+        self,
+        operation: Callable[[], T],
+        commit_message: str,
+        *,
+        paths: Optional[Iterable[Union[str, Path]]] = None,
+    ) -> T:
         if not self.pull():
             detail = self._last_pull_error or "unknown error"
             raise GitPullError(
@@ -1503,7 +1707,7 @@ class GitSyncManager:
         result = operation()
 
         # Commit locally first
-        committed = self.commit_local(commit_message)
+        committed = self.commit_local(commit_message, paths)
         if not committed:
             # No changes to commit, operation succeeded
             return result
@@ -1557,14 +1761,15 @@ class GitSyncManager:
         topic: Optional[str],
         entry_id: Optional[str],
         priority_flush: bool,
+        paths: Optional[Iterable[Union[str, Path]]] = None,
     ) -> T:
         if self._async is None:
-            return self._with_sync_sync(operation, commit_message)
+            return self._with_sync_sync(operation, commit_message, paths=paths)
 
         self._ensure_local_repo_ready()
         result = operation()
 
-        committed = self.commit_local(commit_message)
+        committed = self.commit_local(commit_message, paths)
         if committed:
             self._async.enqueue_commit(
                 commit_message=commit_message,
@@ -3057,7 +3262,8 @@ class _AsyncSyncCoordinator:
         pull_time = time.time()
         self._set_syncing(True)
         try:
-            if not self._manager.pull():
+            # About to push: pull against the remote as it is now
+            if not self._manager.pull(fresh=True):
                 return False
             self._record_pull_success(pull_time)
             if not self._manager.push_pending(max_retries=self._max_sync_retries):
@@ -0,0 +1,388 @@
+"""Background graph sync for MCP writes.
+
+After a write, the baseline graph has to catch up: entry summaries and
+embeddings (LLM and embedding service calls), graph log appends, the
+manifest and sync state, and a graph commit + push. Running that inline
+made every write wait on LLM latency and a second network round-trip.
+
+Writes now only enqueue (topic, entry_id) on the ``GraphSyncQueue`` of their
+threads repo. A worker thread lets a burst of writes settle for
+``BATCH_WINDOW`` seconds, coalesces the pending entries per topic and syncs
+them together: one ``prepare_graph_sync`` (one embedding request for the
+whole batch), one graph write and one graph commit.
+
+The queue is persisted to ``.wc-cache/graph_sync_queue.jsonl`` (git-ignored)
+and only trimmed once a batch is applied, so entries still pending when the
+server exits are synced after the next start. Graph upserts are idempotent,
+so replaying a batch that was interrupted is harmless.
+
+Topics of a failed batch go back into the queue and are retried after a
+backoff (``RETRY_BASE`` doubling up to ``RETRY_MAX`` seconds). A topic that
+fails ``MAX_ATTEMPTS`` batches in a row is parked: it stays in the queue
+file, but is only retried after the next write to it or a restart. Topics
+whose thread file no longer exists are dropped.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from watercooler.fs import cache_dir, thread_path
+
+from .observability import log_debug, log_warning
+
+QUEUE_NAME = "graph_sync_queue.jsonl"
+BATCH_WINDOW = 0.5
+RETRY_BASE = 2.0
+RETRY_MAX = 300.0
+MAX_ATTEMPTS = 5
+
+_queues: Dict[str, "GraphSyncQueue"] = {}
+_queues_lock = threading.Lock()
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def queue_path(threads_dir: Path) -> Path:
+    return cache_dir(threads_dir) / QUEUE_NAME
+
+
+def _read_queue_file(path: Path) -> "OrderedDict[str, List[Optional[str]]]":
+    pending: "OrderedDict[str, List[Optional[str]]]" = OrderedDict()
+    if not path.exists():
+        return pending
+    with path.open("r", encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                item = json.loads(line)
+            except ValueError:
+                continue  # Torn last line of an interrupted append
+            if isinstance(item, dict) and item.get("topic"):
+                _coalesce(pending, item["topic"], item.get("entry_id"))
+    return pending
+
+
+def _coalesce(pending: "OrderedDict[str, List[Optional[str]]]", topic: str, entry_id: Optional[str]) -> None:
+    entry_ids = pending.setdefault(topic, [])
+    if entry_id not in entry_ids:
+        entry_ids.append(entry_id)
+
+
+def _merge(
+    first: "OrderedDict[str, List[Optional[str]]]", then: "OrderedDict[str, List[Optional[str]]]"
+) -> "OrderedDict[str, List[Optional[str]]]":
+    merged: "OrderedDict[str, List[Optional[str]]]" = OrderedDict()
+    for pending in (first, then):
+        for topic, entry_ids in pending.items():
+            for entry_id in entry_ids:
+                _coalesce(merged, topic, entry_id)
+    return merged
+
+
+class GraphSyncQueue:
+    """Durable queue + worker thread syncing written entries to the graph."""
+
+    def __init__(self, threads_dir: Path, manager: Any, *, batch_window: float = BATCH_WINDOW) -> None:
+        self.threads_dir = threads_dir
+        self._manager = manager
+        self._batch_window = batch_window
+        self._queue_file = queue_path(threads_dir)
+
+        # Held around git operations on the threads repo (writes and graph
+        # commits) so the worker never writes graph files mid-pull
+        self.git_lock = threading.RLock()
+
+        self._lock = threading.RLock()
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._idle = threading.Condition(self._lock)
+
+        self._pending: "OrderedDict[str, List[Optional[str]]]" = OrderedDict()
+        self._in_flight: "OrderedDict[str, List[Optional[str]]]" = OrderedDict()
+        # Failed too often: kept on disk, retried after a new write or restart
+        self._parked: "OrderedDict[str, List[Optional[str]]]" = OrderedDict()
+        self._attempts: Dict[str, int] = {}  # topic -> consecutive failed batches
+        self._failed_batches = 0  # consecutive, for the backoff
+        self._retry_at: Optional[float] = None
+        self._batches = 0
+        self._last_batch_at: Optional[str] = None
+        self._last_batch_size = 0
+        self._last_error: Optional[str] = None
+
+        try:
+            self._pending = _read_queue_file(self._queue_file)
+        except OSError as exc:
+            log_warning(f"[GRAPH-QUEUE] Failed to load queue: {exc}")
+
+        self._worker = threading.Thread(
+            target=self._worker_loop,
+            name=f"watercooler-graph-sync-{id(self)}",
+            daemon=True,
+        )
+        self._worker.start()
+        atexit.register(self.shutdown)
+
+        # Sync entries left over from a previous run
+        if self._pending:
+            self._wake_event.set()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def enqueue(self, topic: str, entry_id: Optional[str]) -> None:
+        """Queue ``entry_id`` of ``topic`` (None: its latest entry) for graph sync."""
+        with self._lock:
+            parked = self._parked.pop(topic, None)
+            if parked is not None:
+                self._attempts.pop(topic, None)
+                for parked_id in parked:
+                    _coalesce(self._pending, topic, parked_id)
+            _coalesce(self._pending, topic, entry_id)
+            try:
+                self._queue_file.parent.mkdir(parents=True, exist_ok=True)
+                with self._queue_file.open("a", encoding="utf-8") as fh:
+                    fh.write(json.dumps({"topic": topic, "entry_id": entry_id, "queued_at": _now_iso()}) + "\n")
+            except OSError as exc:
+                log_warning(f"[GRAPH-QUEUE] Failed to persist queue entry: {exc}")
+        self._wake_event.set()
+
+    def depth(self) -> int:
+        """Number of entries waiting for (or in) graph sync."""
+        with self._lock:
+            return sum(len(ids) for ids in self._pending.values()) + sum(
+                len(ids) for ids in self._in_flight.values()
+            )
+
+    def flush(self, timeout: float = 60.0) -> bool:
+        """Block until every entry queued so far is synced.
+
+        False on timeout, or if entries were parked after failing.
+        """
+        deadline = time.time() + timeout
+        self._wake_event.set()
+        with self._idle:
+            while self._pending or self._in_flight:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._idle.wait(timeout=min(remaining, 0.5))
+            return not self._parked
+
+    def status(self) -> dict:
+        with self._lock:
+            topics = list(OrderedDict.fromkeys([*self._in_flight, *self._pending]))
+            return {
+                "mode": "background",
+                "depth": self.depth(),
+                "pending_topics": topics,
+                "syncing": bool(self._in_flight),
+                "batches": self._batches,
+                "last_batch_at": self._last_batch_at,
+                "last_batch_size": self._last_batch_size,
+                "last_error": self._last_error,
+                "retry_in_seconds": self._retry_delay(),
+                "parked_topics": list(self._parked),
+            }
+
+    def shutdown(self) -> None:
+        if self._stop_event.is_set():
+            return
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._worker.is_alive():
+            # Let a running batch finish; anything else stays queued on disk
+            self._worker.join(timeout=5.0)
+
+    # ------------------------------------------------------------------
+    # Worker loop
+    # ------------------------------------------------------------------
+
+    def _retry_delay(self) -> Optional[float]:
+        """Seconds until a failed batch may be retried (None: no retry scheduled)."""
+        with self._lock:
+            if self._retry_at is None:
+                return None
+            return max(0.0, round(self._retry_at - time.monotonic(), 1))
+
+    def _worker_loop(self) -> None:
+        while not self._stop_event.is_set():
+            self._wake_event.wait(self._retry_delay())
+            self._wake_event.clear()
+            # Let a burst of writes settle so it is synced as one batch
+            if self._stop_event.wait(self._batch_window):
+                break
+            # Back off after a failed batch (failures tend to be the remote
+            # or the embedding service, not the entries)
+            delay = self._retry_delay()
+            if delay and self._stop_event.wait(delay):
+                break
+            try:
+                self._process_once()
+            except Exception as exc:  # pragma: no cover - defensive logging
+                log_warning(f"[GRAPH-QUEUE] Worker error: {exc}")
+
+    def _process_once(self) -> None:
+        with self._lock:
+            if not self._pending:
+                return
+            self._in_flight, self._pending = self._pending, OrderedDict()
+            batch = OrderedDict((topic, list(ids)) for topic, ids in self._in_flight.items())
+
+        size = sum(len(ids) for ids in batch.values())
+        failed: List[str] = list(batch)
+        error: Optional[str] = None
+        try:
+            failed, error = self._sync(batch)
+        except Exception as exc:
+            error = str(exc)
+        finally:
+            with self._lock:
+                self._in_flight = OrderedDict()
+                self._requeue_locked(batch, failed)
+                self._rewrite_queue_locked()
+                self._batches += 1
+                self._last_batch_at = _now_iso()
+                self._last_batch_size = size
+                self._last_error = error
+                self._idle.notify_all()
+        if error:
+            log_warning(f"[GRAPH-QUEUE] Graph sync batch failed: {error}")
+
+    def _requeue_locked(self, batch: "OrderedDict[str, List[Optional[str]]]", failed: List[str]) -> None:
+        """Put the ``failed`` topics of ``batch`` back in front of the queue."""
+        for topic in batch:
+            if topic not in failed:
+                self._attempts.pop(topic, None)
+        if not failed:
+            self._failed_batches = 0
+            self._retry_at = None
+            return
+
+        retry: "OrderedDict[str, List[Optional[str]]]" = OrderedDict()
+        for topic in failed:
+            if not thread_path(topic, self.threads_dir).exists():
+                log_warning(f"[GRAPH-QUEUE] Dropping {topic} from the queue: thread file is gone")
+                self._attempts.pop(topic, None)
+                continue
+            attempts = self._attempts[topic] = self._attempts.get(topic, 0) + 1
+            if attempts >= MAX_ATTEMPTS:
+                log_warning(f"[GRAPH-QUEUE] Parking {topic} after {attempts} failed graph syncs")
+                self._parked = _merge(self._parked, OrderedDict([(topic, batch[topic])]))
+            else:
+                retry[topic] = batch[topic]
+        self._pending = _merge(retry, self._pending)
+        self._failed_batches += 1
+        if self._pending:
+            delay = min(RETRY_BASE * 2 ** (self._failed_batches - 1), RETRY_MAX)
+            self._retry_at = time.monotonic() + delay
+        else:
+            self._retry_at = None
+
+    def _sync(self, batch: "OrderedDict[str, List[Optional[str]]]") -> Tuple[List[str], Optional[str]]:
+        """Sync ``batch``; returns the topics that failed and the error."""
+        from watercooler.baseline_graph.sync import apply_graph_sync, prepare_graph_sync
+        from watercooler_mcp.config import get_watercooler_config
+
+        graph_config = get_watercooler_config().mcp.graph
+        log_debug(f"[GRAPH-QUEUE] Syncing {dict(batch)}")
+
+        # Summaries and embeddings run outside the git lock, so writes
+        # are not held up by the LLM
+        prepared = prepare_graph_sync(
+            self.threads_dir,
+            batch,
+            generate_summaries=graph_config.generate_summaries,
+            generate_embeddings=graph_config.generate_embeddings,
+        )
+        commit = False
+        with self.git_lock:
+            results = apply_graph_sync(self.threads_dir, prepared)
+            log_debug(f"[GRAPH-QUEUE] Sync results: {results}")
+            # Commit graph files to keep the working tree clean, so they
+            # do not block future preflight pulls
+            commit = any(results.values()) and self._manager is not None
+            if commit and not self._manager.commit_graph_changes(
+                message=_commit_message(batch, results), push=False
+            ):
+                # Replaying the upserts is harmless; it retries the commit
+                return list(batch), "graph commit failed"
+        if commit:
+            # Outside the git lock: writes do not wait on the push (only a
+            # rejected push, which rebases, takes the lock)
+            pushed, push_error = self._manager.push_current_branch(lock=self.git_lock)
+            if not pushed:
+                # The replay finds nothing to commit and pushes again
+                return list(batch), f"graph push failed: {push_error}"
+        failed = [topic for topic in batch if not results.get(topic)]
+        return failed, (f"graph sync failed for: {', '.join(failed)}" if failed else None)
+
+    # ------------------------------------------------------------------
+    # Queue persistence
+    # ------------------------------------------------------------------
+
+    def _rewrite_queue_locked(self) -> None:
+        queued = _merge(self._pending, self._parked)
+        try:
+            if not queued:
+                self._queue_file.unlink(missing_ok=True)
+                return
+            tmp = self._queue_file.with_suffix(".tmp")
+            with tmp.open("w", encoding="utf-8") as fh:
+                for topic, entry_ids in queued.items():
+                    for entry_id in entry_ids:
+                        fh.write(json.dumps({"topic": topic, "entry_id": entry_id}) + "\n")
+            tmp.replace(self._queue_file)
+        except OSError as exc:
+            log_warning(f"[GRAPH-QUEUE] Failed to rewrite queue: {exc}")
+
+
+def _commit_message(batch: "OrderedDict[str, List[Optional[str]]]", results: Dict[str, bool]) -> str:
+    synced = [topic for topic in batch if results.get(topic)]
+    if len(synced) == 1:
+        entry_ids = [entry_id for entry_id in batch[synced[0]] if entry_id]
+        if len(entry_ids) == 1:
+            return f"graph: sync {synced[0]}/{entry_ids[0]}"
+        return f"graph: sync {synced[0]}"
+    return f"graph: sync {len(synced)} topics\n\n" + "\n".join(f"- {topic}" for topic in synced)
+
+
+def get_graph_sync_queue(threads_dir: Path, manager: Any) -> GraphSyncQueue:
+    """The graph sync queue of ``threads_dir``, started on first use."""
+    key = str(Path(threads_dir).resolve())
+    with _queues_lock:
+        queue = _queues.get(key)
+        if queue is None:
+            queue = _queues[key] = GraphSyncQueue(Path(threads_dir), manager)
+        return queue
+
+
+def running_queue(threads_dir: Path) -> Optional[GraphSyncQueue]:
+    """The graph sync queue of ``threads_dir`` if it was started in this process."""
+    return _queues.get(str(Path(threads_dir).resolve()))
+
+
+def queue_status(threads_dir: Path) -> dict:
+    """Graph sync queue status for ``threads_dir`` (from disk if no worker runs here)."""
+    queue = running_queue(threads_dir)
+    if queue is not None:
+        return queue.status()
+    try:
+        pending = _read_queue_file(queue_path(threads_dir))
+    except OSError:
+        pending = OrderedDict()
+    return {
+        "mode": "idle",
+        "depth": sum(len(ids) for ids in pending.values()),
+        "pending_topics": list(pending),
+        "syncing": False,
+    }
@@ -22,7 +22,8 @@ import os
 import re
 import time
 from pathlib import Path
-from typing import Callable, TypeVar, Optional, Dict, List
+from contextlib import ExitStack, contextmanager, nullcontext
+from typing import Callable, Iterator, TypeVar, Optional, Dict, List
 
 # Third-party imports
 from fastmcp import FastMCP, Context
@@ -33,6 +34,8 @@ from git import Repo, InvalidGitRepositoryError, GitCommandError
 
 # Local application imports
 from watercooler import commands, fs
+from watercooler.entry_index import EntryIndex, open_entry_index
+from watercooler.lock import thread_lock
 from watercooler.metadata import thread_meta
 from watercooler.thread_entries import ThreadEntry, parse_thread_entries
 from watercooler.baseline_graph.reader import (
@@ -55,6 +58,7 @@ from .config import (
 )
 from .git_sync import (
     GitPushError,
+    GitSyncError,
     BranchPairingError,
     BranchMismatch,
     BranchPairingResult,
@@ -573,38 +577,125 @@ def _load_thread_entries(topic: str, context: ThreadContext) -> tuple[str | None
     """Load and parse thread entries from disk.
 
     Thread Safety Note:
-        This function performs unlocked reads. This is safe because:
-        - Write operations (say, ack, handoff) use AdvisoryLock for serialization
-        - Reads may see partially written entries, but won't corrupt existing ones
-        - Thread entry boundaries (---) ensure partial writes don't break parsing
-        - File system guarantees atomic writes at the block level
-        - MCP tool calls are typically infrequent enough that read/write races are rare
-
-    For high-concurrency scenarios, consider adding shared/exclusive locking
-    or caching with mtime-based invalidation.
+        Reads hold the shared per-thread lock (see ``_thread_read_lock``)
+        while writers (say, ack, handoff) hold it exclusively, so a read
+        never sees a half-written entry. With the lock-file fallback
+        (``WCOOLER_LOCK_BACKEND=file``) reads stay unlocked as before.
     """
     threads_dir = context.threads_dir
     thread_path = fs.thread_path(topic, threads_dir)
 
     if not thread_path.exists():
-        if threads_dir.exists():
-            available_list = sorted(p.stem for p in threads_dir.glob("*.md"))
-            if len(available_list) > 10:
-                available = ", ".join(available_list[:10]) + f" (and {len(available_list) - 10} more)"
-            else:
-                available = ", ".join(available_list) if available_list else "none"
-        else:
-            available = "none"
-        return (
-            f"Error: Thread '{topic}' not found in {threads_dir}\n\nAvailable threads: {available}",
-            [],
-        )
+        return (_thread_not_found_error(topic, threads_dir), [])
 
-    content = fs.read_body(thread_path)
+    with _thread_read_lock(topic, threads_dir):
+        content = fs.read_body(thread_path)
     entries = parse_thread_entries(content)
     return (None, entries)
 
 
+_READ_LOCK_TIMEOUT = 5
+
+
+@contextmanager
+def _thread_read_lock(topic: str, threads_dir: Path) -> Iterator[None]:
+    """Hold the shared per-thread lock while reading a thread file.
+
+    Readers never fail on lock contention: if a writer holds the lock for
+    longer than ``_READ_LOCK_TIMEOUT`` the read proceeds unlocked.
+    """
+    if not fs.thread_path(topic, threads_dir).exists():
+        yield
+        return
+    lock = thread_lock(topic, threads_dir, shared=True, timeout=_READ_LOCK_TIMEOUT)
+    try:
+        lock.__enter__()
+    except (TimeoutError, OSError) as e:
+        log_debug(f"[LOCK] Reading {topic} without shared lock: {e}")
+        yield
+        return
+    try:
+        yield
+    finally:
+        lock.__exit__(None, None, None)
+
+
+def _thread_not_found_error(topic: str, threads_dir: Path) -> str:
+    if threads_dir.exists():
+        available_list = sorted(p.stem for p in threads_dir.glob("*.md"))
+        if len(available_list) > 10:
+            available = ", ".join(available_list[:10]) + f" (and {len(available_list) - 10} more)"
+        else:
+            available = ", ".join(available_list) if available_list else "none"
+    else:
+        available = "none"
+    return f"Error: Thread '{topic}' not found in {threads_dir}\n\nAvailable threads: {available}"
+
+
+def _open_entry_index(topic: str, context: ThreadContext) -> EntryIndex | None:
+    """Open the entry offset index for ``topic`` (None if unavailable).
+
+    Markdown is the source of truth and the index is validated against the
+    thread file's stat, so indexed reads bypass the graph like the tail path.
+    """
+    thread_path = fs.thread_path(topic, context.threads_dir)
+    if not thread_path.exists():
+        return None
+    try:
+        return open_entry_index(thread_path)
+    except Exception as e:
+        log_debug(f"[ENTRY_INDEX] Failed to open index for {topic}: {e}")
+        return None
+
+
+def _select_indexed_entry(
+    idx: EntryIndex,
+    topic: str,
+    index: int | None,
+    entry_id: str | None,
+) -> tuple[str | None, ThreadEntry | None]:
+    """Resolve ``index``/``entry_id`` against an entry index (see ``_select_listed_entry``)."""
+    selected: ThreadEntry | None = None
+    if index is not None:
+        if index < 0:
+            index += idx.count
+        if index < 0 or index >= idx.count:
+            return (f"Error: index {index} out of range (entries={idx.count}).", None)
+        selected = idx.entry(index)
+    if entry_id is not None:
+        position = idx.find(entry_id)
+        if position is None:
+            return (f"Error: entry_id '{entry_id}' not found in thread '{topic}'.", None)
+        if selected is not None and position != selected.index:
+            return ("Error: index and entry_id refer to different entries.", None)
+        selected = idx.entry(position)
+    return (None, selected)
+
+
+def _select_listed_entry(
+    entries: list[ThreadEntry],
+    topic: str,
+    index: int | None,
+    entry_id: str | None,
+) -> tuple[str | None, ThreadEntry | None]:
+    """Resolve ``index``/``entry_id`` against fully loaded entries."""
+    selected: ThreadEntry | None = None
+    if index is not None:
+        if index < 0:
+            index += len(entries)
+        if index < 0 or index >= len(entries):
+            return (f"Error: index {index} out of range (entries={len(entries)}).", None)
+        selected = entries[index]
+    if entry_id is not None:
+        matching = next((entry for entry in entries if entry.entry_id == entry_id), None)
+        if matching is None:
+            return (f"Error: entry_id '{entry_id}' not found in thread '{topic}'.", None)
+        if selected is not None and matching.index != selected.index:
+            return ("Error: index and entry_id refer to different entries.", None)
+        selected = matching
+    return (None, selected)
+
+
 def _entry_header_payload(entry: ThreadEntry) -> Dict[str, object]:
     return {
         "index": entry.index,
@@ -906,6 +997,49 @@ def _build_commit_footers(
     return footers
 
 
+def _graph_sync_in_background() -> bool:
+    """Whether post-write graph sync goes through the background queue."""
+    try:
+        from .config import get_watercooler_config
+
+        return get_watercooler_config().mcp.graph.background_sync
+    except Exception:
+        return True
+
+
+def _graph_single_commit() -> tuple[bool, bool]:
+    """Whether writes stage their graph upsert in their own commit, and
+    whether LLM summaries/embeddings for it follow in a later sync."""
+    try:
+        from .config import get_watercooler_config
+
+        graph_config = get_watercooler_config().mcp.graph
+        return graph_config.single_commit, graph_config.generate_summaries or graph_config.generate_embeddings
+    except Exception:
+        return True, False
+
+
+def _stage_graph_upsert(threads_dir: Path, topic: str, entry_id: str | None, enrich: bool) -> bool:
+    """Write the graph upsert of a write without calling any service.
+
+    Runs inside the write operation, so the graph files are committed (and
+    pushed) together with the thread. With ``enrich`` the entry is flagged
+    for the enriching sync that follows.
+    """
+    try:
+        from watercooler.baseline_graph.sync import sync_entry_to_graph
+
+        return sync_entry_to_graph(
+            threads_dir=threads_dir,
+            topic=topic,
+            entry_id=entry_id,
+            deferred_enrichment=enrich,
+        )
+    except Exception as graph_err:
+        log_warning(f"[GRAPH] Staging graph upsert failed (non-blocking): {graph_err}")
+        return False
+
+
 def run_with_sync(
     context: ThreadContext,
     commit_title: str,
@@ -966,17 +1100,55 @@ def run_with_sync(
         )
         commit_message = commit_title if not footers else f"{commit_title}\n\n" + "\n".join(footers)
 
-        # Execute operation with git sync (pull → operation → commit → push)
-        result = sync.with_sync(
-            operation,
-            commit_message,
-            topic=topic,
-            entry_id=entry_id,
-            priority_flush=priority_flush,
-        )
+        # Graph sync runs on the background queue unless configured inline
+        graph_queue = None
+        if topic and context.threads_dir and _graph_sync_in_background():
+            from .graph_queue import get_graph_sync_queue
+
+            graph_queue = get_graph_sync_queue(context.threads_dir, sync)
 
-        # Sync to baseline graph (non-blocking - failures don't stop the write)
+        # Single-commit mode: the graph upsert is written right after the
+        # thread, so it lands in the same commit and push
+        single_commit, enrich = _graph_single_commit()
+        staged = False
+        write: Callable[[], T] = operation
+        # Files the write touches: only these are staged and committed
+        changed_paths: list[Path] | None = None
         if topic and context.threads_dir:
+            changed_paths = [fs.thread_path(topic, context.threads_dir)]
+        if topic and context.threads_dir and single_commit:
+            threads_dir, staged_topic = context.threads_dir, topic
+
+            def write_and_stage() -> T:
+                nonlocal staged
+                result = operation()
+                staged = _stage_graph_upsert(threads_dir, staged_topic, entry_id, enrich)
+                if staged and changed_paths is not None:
+                    changed_paths.append(threads_dir / "graph" / "baseline")
+                return result
+
+            write = write_and_stage
+
+        # Execute operation with git sync (pull → operation → commit → push),
+        # never while the graph sync worker is writing or committing
+        with graph_queue.git_lock if graph_queue else nullcontext():
+            result = sync.with_sync(
+                write,
+                commit_message,
+                topic=topic,
+                entry_id=entry_id,
+                priority_flush=priority_flush,
+                paths=changed_paths,
+            )
+
+        # Sync to baseline graph (non-blocking - failures don't stop the write).
+        # A staged upsert only needs a sync if it is waiting for enrichment.
+        if staged and not enrich:
+            log_debug(f"[GRAPH] Graph upsert for {topic}/{entry_id} committed with the write")
+        elif graph_queue is not None:
+            graph_queue.enqueue(topic, entry_id)
+            log_debug(f"[GRAPH] Queued graph sync for {topic}/{entry_id} (depth {graph_queue.depth()})")
+        elif topic and context.threads_dir:
             log_warning(f"[GRAPH] Attempting graph sync for {topic}/{entry_id}")
             try:
                 from watercooler.baseline_graph.sync import sync_entry_to_graph
@@ -1071,12 +1243,27 @@ def run_with_graph_sync(
         if preflight_result.auto_fixed:
             log_debug(f"[GRAPH-SYNC] Preflight auto-fixed: {preflight_result.state.actions_taken}")
 
-    # 2. Execute operation
-    result = operation()
+    # Do not interleave with the background graph sync worker
+    graph_queue = None
+    if context.threads_dir:
+        from .graph_queue import running_queue
+
+        graph_queue = running_queue(context.threads_dir)
+
+    committed = False
+    with graph_queue.git_lock if graph_queue else nullcontext():
+        # 2. Execute operation
+        result = operation()
 
-    # 3. Commit and push graph files (blocking)
-    if sync and context.threads_dir:
-        sync.commit_graph_changes_sync(commit_msg)
+        # 3. Commit graph files
+        if sync and context.threads_dir:
+            committed = sync.commit_graph_changes_sync(commit_msg, push=False)
+
+    # 4. Push (blocking), outside the lock unless it has to rebase
+    if committed:
+        pushed, push_error = sync.push_current_branch(lock=graph_queue.git_lock if graph_queue else None)
+        if not pushed:
+            raise GitSyncError(f"Graph push failed: {push_error}")
 
     return result
 
@@ -1267,6 +1454,25 @@ def health(ctx: Context, code_path: str = "") -> str:
         except Exception as e:
             status_lines.append(f"\nGraph Services: Error - {e}")
 
+        # Fetches skipped (recent fetch reused), joined (concurrent fetch) or
+        # probed (ls-remote showed nothing new)
+        try:
+            from .fetch_coordinator import get_fetch_coordinator
+
+            coordinator = get_fetch_coordinator()
+            fetch_stats = coordinator.stats()
+            if fetch_stats:
+                status_lines.extend(["", f"Remote Fetches (reuse window {coordinator.ttl:g}s):"])
+                for repo_path, stats in fetch_stats.items():
+                    age = stats["last_fetch_age"]
+                    status_lines.append(
+                        f"  {repo_path}: {stats['fetched']} fetched, {stats['skipped']} skipped, "
+                        f"{stats['joined']} joined, {stats['probed']} unchanged on origin, {stats['failed']} failed"
+                        + (f" (last {age:g}s ago)" if age is not None else "")
+                    )
+        except Exception as e:
+            status_lines.append(f"\nRemote Fetches: Error - {e}")
+
         # Add branch parity health if code and threads repos are available
         if context.code_root and context.threads_dir:
             try:
@@ -1836,7 +2042,11 @@ def get_thread_entry(
     format: str = "json",
     code_path: str = "",
 ) -> ToolResult:
-    """Return a single thread entry (header + body)."""
+    """Return a single thread entry (header + body).
+
+    A negative ``index`` counts from the end (-1 is the latest entry); the
+    response always carries the resolved non-negative index.
+    """
 
     fmt_error, resolved_format = _resolve_format(format, default="json")
     if fmt_error:
@@ -1855,25 +2065,23 @@ def get_thread_entry(
         log_debug(f"get_thread_entry read sync: {sync_actions}")
 
     _refresh_threads(context)
-    load_error, entries = _load_thread_entries_graph_first(topic, context)
+
+    entry_count: int | None = None
+    with _thread_read_lock(topic, context.threads_dir):
+        idx = _open_entry_index(topic, context)
+        if idx is not None:
+            with idx:
+                load_error, selected = _select_indexed_entry(idx, topic, index, entry_id)
+                entry_count = idx.count
+    if idx is None:
+        load_error, entries = _load_thread_entries_graph_first(topic, context)
+        selected = None
+        if not load_error:
+            entry_count = len(entries)
+            load_error, selected = _select_listed_entry(entries, topic, index, entry_id)
     if load_error:
         return ToolResult(content=[TextContent(type="text", text=load_error)])
 
-    selected: ThreadEntry | None = None
-
-    if index is not None:
-        if index < 0 or index >= len(entries):
-            return ToolResult(content=[TextContent(type="text", text=f"Error: index {index} out of range (entries={len(entries)}).")])
-        selected = entries[index]
-
-    if entry_id is not None:
-        matching = next((entry for entry in entries if entry.entry_id == entry_id), None)
-        if matching is None:
-            return ToolResult(content=[TextContent(type="text", text=f"Error: entry_id '{entry_id}' not found in thread '{topic}'.")])
-        if selected is not None and matching.index != selected.index:
-            return ToolResult(content=[TextContent(type="text", text="Error: index and entry_id refer to different entries.")])
-        selected = matching
-
     if selected is None:
         return ToolResult(content=[TextContent(type="text", text="Error: failed to resolve the requested entry.")])
 
@@ -1883,7 +2091,7 @@ def get_thread_entry(
 
     payload = {
         "topic": topic,
-        "entry_count": len(entries),
+        "entry_count": entry_count,
         "index": selected.index,
         "entry": _entry_full_payload(selected),
     }
@@ -1928,20 +2136,34 @@ def get_thread_entry_range(
         log_debug(f"get_thread_entry_range read sync: {sync_actions}")
 
     _refresh_threads(context)
-    load_error, entries = _load_thread_entries_graph_first(topic, context)
-    if load_error:
-        return ToolResult(content=[TextContent(type="text", text=load_error)])
-
-    total = len(entries)
-    if start_index >= total and total > 0:
-        return ToolResult(content=[TextContent(type="text", text=f"Error: start_index {start_index} out of range (entries={total}).")])
-
-    last_index = total - 1 if total else -1
-    effective_end = last_index if end_index is None else min(end_index, last_index)
-    if effective_end < start_index and total:
-        return ToolResult(content=[TextContent(type="text", text="Error: computed end index is before start index.")])
-
-    selected_entries = entries[start_index : effective_end + 1] if total else []
+    with ExitStack() as stack:
+        stack.enter_context(_thread_read_lock(topic, context.threads_dir))
+        idx = _open_entry_index(topic, context)
+        if idx is None:
+            stack.close()  # the fallback loader takes its own read lock
+            load_error, entries = _load_thread_entries_graph_first(topic, context)
+            if load_error:
+                return ToolResult(content=[TextContent(type="text", text=load_error)])
+            total = len(entries)
+        else:
+            stack.enter_context(idx)
+            total = idx.count
+
+        if start_index >= total and total > 0:
+            return ToolResult(content=[TextContent(type="text", text=f"Error: start_index {start_index} out of range (entries={total}).")])
+
+        last_index = total - 1 if total else -1
+        effective_end = last_index if end_index is None else min(end_index, last_index)
+        if effective_end < start_index and total:
+            return ToolResult(content=[TextContent(type="text", text="Error: computed end index is before start index.")])
+
+        if not total:
+            selected_entries = []
+        elif idx is not None:
+            # Decode only the requested slice of the thread
+            selected_entries = idx.entries(start_index, effective_end + 1)
+        else:
+            selected_entries = entries[start_index : effective_end + 1]
 
     # Track entry access for all entries in range (non-blocking)
     if context.threads_dir:
@@ -2691,6 +2913,7 @@ def search_graph_tool(
     combine: str = "AND",
     include_threads: bool = True,
     include_entries: bool = True,
+    exact: bool = False,
 ) -> str:
     """Unified search across threads and entries in the baseline graph.
 
@@ -2715,6 +2938,8 @@ def search_graph_tool(
         combine: How to combine filters - "AND" or "OR" (default: AND).
         include_threads: Include thread nodes in results (default: True).
         include_entries: Include entry nodes in results (default: True).
+        exact: Score every embedded node in semantic search, even on graphs
+            large enough for the approximate index (default: False).
 
     Returns:
         JSON with search results including matched nodes and metadata.
@@ -2761,6 +2986,7 @@ def search_graph_tool(
             combine=combine.upper() if combine.upper() in ("AND", "OR") else "AND",
             include_threads=include_threads,
             include_entries=include_entries,
+            exact=exact,
         )
 
         # Execute search
@@ -2821,6 +3047,7 @@ def find_similar_entries_tool(
     limit: int = 5,
     similarity_threshold: float = 0.5,
     use_embeddings: bool = True,
+    exact: bool = False,
 ) -> str:
     """Find entries similar to a given entry using embedding similarity.
 
@@ -2833,6 +3060,8 @@ def find_similar_entries_tool(
         limit: Maximum number of similar entries to return (default: 5).
         similarity_threshold: Minimum cosine similarity (0.0-1.0, default: 0.5).
         use_embeddings: Try to use embedding similarity (default: True).
+        exact: Score every embedded entry, even on graphs large enough for
+            the approximate index (default: False).
 
     Returns:
         JSON with similar entries and their similarity scores.
@@ -2869,6 +3098,7 @@ def find_similar_entries_tool(
             limit=limit,
             use_embeddings=use_embeddings,
             similarity_threshold=similarity_threshold,
+            exact=exact,
         )
 
         # Format results
@@ -2909,6 +3139,7 @@ def graph_health_tool(
     - Stale threads (need sync)
     - Error threads (sync failed)
     - Pending threads (sync in progress)
+    - Graph sync queue depth (entries written but not yet synced)
 
     Use this to diagnose graph sync issues before running reconcile.
 
@@ -2921,6 +3152,7 @@ def graph_health_tool(
     try:
         from watercooler.baseline_graph.sync import check_graph_health
         from watercooler.baseline_graph.reader import is_graph_available
+        from .graph_queue import queue_status
 
         error, context = _require_context(code_path)
         if error:
@@ -2938,6 +3170,8 @@ def graph_health_tool(
         # Get health report
         health = check_graph_health(threads_dir)
 
+        sync_queue = queue_status(threads_dir)
+
         output = {
             "graph_available": graph_available,
             "healthy": health.healthy,
@@ -2947,6 +3181,7 @@ def graph_health_tool(
             "error_threads": health.error_threads,
             "pending_threads": health.pending_threads,
             "error_details": health.error_details,
+            "sync_queue": sync_queue,
             "recommendations": [],
         }
 
@@ -2963,6 +3198,10 @@ def graph_health_tool(
             output["recommendations"].append(
                 f"{health.error_threads} threads have sync errors. Check error_details and run reconcile."
             )
+        if sync_queue["depth"]:
+            output["recommendations"].append(
+                f"{sync_queue['depth']} entries are queued for graph sync; results may lag until the queue drains."
+            )
 
         return json.dumps(output, indent=2)
 
@@ -4841,6 +5080,23 @@ def _ensure_ollama_running():
         log_debug(f"Ollama auto-start check failed: {e}")
 
 
+def _enable_graph_cache():
+    """Serve graph reads from memory for the lifetime of the server process."""
+    try:
+        from .config import get_watercooler_config
+        from watercooler.baseline_graph import embedding_codec, embedding_index, graph_cache
+
+        graph_config = get_watercooler_config().mcp.graph
+        if graph_config.memory_cache:
+            graph_cache.enable(max_body_bytes=graph_config.memory_cache_mb << 20)
+        embedding_codec.set_encoding(graph_config.embedding_encoding)
+        embedding_index.configure_ann(
+            graph_config.ann_enabled, graph_config.ann_min_rows, graph_config.ann_nprobe
+        )
+    except Exception as e:
+        log_debug(f"Graph cache setup failed: {e}")
+
+
 def main():
     """Entry point for watercooler-mcp command."""
     # Check for first-run and suggest config initialization
@@ -4849,6 +5105,9 @@ def main():
     # Auto-start Ollama if graph features are enabled
     _ensure_ollama_running()
 
+    # Long-running process: keep a parsed snapshot of the graph in memory
+    _enable_graph_cache()
+
     # Get transport configuration from unified config system
     from .config import get_mcp_transport_config
 
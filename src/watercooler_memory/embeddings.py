@@ -16,6 +16,8 @@ import warnings
 from dataclasses import dataclass
 from typing import Optional
 
+from watercooler import http_pool
+
 from .cache import EmbeddingCache
 
 # Try to import httpx for API calls
@@ -209,19 +211,20 @@ def _embed_batch(
 
     for attempt in range(config.max_retries):
         try:
-            with httpx.Client(timeout=config.timeout) as client:
-                response = client.post(url, json=payload, headers=headers)
-                response.raise_for_status()
+            response = http_pool.client(config.api_base).post(
+                url, json=payload, headers=headers, timeout=config.timeout
+            )
+            response.raise_for_status()
 
-                data = response.json()
+            data = response.json()
 
-                # OpenAI-compatible format: {"data": [{"embedding": [...]}]}
-                if "data" not in data:
-                    raise EmbeddingError(f"Unexpected response format: {data}")
+            # OpenAI-compatible format: {"data": [{"embedding": [...]}]}
+            if "data" not in data:
+                raise EmbeddingError(f"Unexpected response format: {data}")
 
-                # Sort by index to ensure correct order
-                sorted_data = sorted(data["data"], key=lambda x: x.get("index", 0))
-                return [item["embedding"] for item in sorted_data]
+            # Sort by index to ensure correct order
+            sorted_data = sorted(data["data"], key=lambda x: x.get("index", 0))
+            return [item["embedding"] for item in sorted_data]
 
         except httpx.HTTPStatusError as e:
             last_error = EmbeddingError(
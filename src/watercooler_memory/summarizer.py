@@ -16,6 +16,8 @@ import warnings
 from dataclasses import dataclass
 from typing import Optional
 
+from watercooler import http_pool
+
 from .cache import SummaryCache, ThreadSummaryCache
 
 # Try to import httpx for API calls
@@ -168,23 +170,24 @@ def _call_llm(
 
     for attempt in range(config.max_retries):
         try:
-            with httpx.Client(timeout=config.timeout) as client:
-                response = client.post(url, json=payload, headers=headers)
-                response.raise_for_status()
+            response = http_pool.client(config.api_base).post(
+                url, json=payload, headers=headers, timeout=config.timeout
+            )
+            response.raise_for_status()
 
-                data = response.json()
+            data = response.json()
 
-                # OpenAI-compatible format
-                if "choices" not in data or not data["choices"]:
-                    raise SummarizerError(f"Unexpected response format: {data}")
+            # OpenAI-compatible format
+            if "choices" not in data or not data["choices"]:
+                raise SummarizerError(f"Unexpected response format: {data}")
 
-                message = data["choices"][0].get("message", {})
-                content = message.get("content", "")
+            message = data["choices"][0].get("message", {})
+            content = message.get("content", "")
 
-                if not content:
-                    raise SummarizerError("Empty response from LLM")
+            if not content:
+                raise SummarizerError("Empty response from LLM")
 
-                return content.strip()
+            return content.strip()
 
         except httpx.HTTPStatusError as e:
             last_error = SummarizerError(
@@ -390,22 +393,23 @@ async def _call_llm_async(
 
     for attempt in range(config.max_retries):
         try:
-            async with httpx.AsyncClient(timeout=config.timeout) as client:
-                response = await client.post(url, json=payload, headers=headers)
-                response.raise_for_status()
+            response = await http_pool.async_client(config.api_base).post(
+                url, json=payload, headers=headers, timeout=config.timeout
+            )
+            response.raise_for_status()
 
-                data = response.json()
+            data = response.json()
 
-                if "choices" not in data or not data["choices"]:
-                    raise SummarizerError(f"Unexpected response format: {data}")
+            if "choices" not in data or not data["choices"]:
+                raise SummarizerError(f"Unexpected response format: {data}")
 
-                message = data["choices"][0].get("message", {})
-                content = message.get("content", "")
+            message = data["choices"][0].get("message", {})
+            content = message.get("content", "")
 
-                if not content:
-                    raise SummarizerError("Empty response from LLM")
+            if not content:
+                raise SummarizerError("Empty response from LLM")
 
-                return content.strip()
+            return content.strip()
 
         except httpx.HTTPStatusError as e:
             last_error = SummarizerError(
@@ -560,6 +564,11 @@ def summarize_entries_concurrent(
     Returns:
         List of summaries (same order as input).
     """
-    return asyncio.run(
-        summarize_entries_batch_async(entries, config, progress_callback)
-    )
+    async def run() -> list[str]:
+        try:
+            return await summarize_entries_batch_async(entries, config, progress_callback)
+        finally:
+            # The pooled async clients belong to this event loop
+            await http_pool.aclose_async_clients()
+
+    return asyncio.run(run())
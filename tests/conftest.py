@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import json
 import os
 import sys
+import threading
 from pathlib import Path
+from typing import Iterable, Optional, Union
 
 import pytest
 
@@ -25,3 +28,118 @@ def anyio_backend():
     """
     return "asyncio"
 
+
+
+def _write_graph(threads_dir: Path, nodes: Iterable[dict]) -> Path:
+    graph_dir = threads_dir / "graph" / "baseline"
+    graph_dir.mkdir(parents=True, exist_ok=True)
+    nodes_file = graph_dir / "nodes.jsonl"
+    nodes_file.write_text("".join(json.dumps(n) + "\n" for n in nodes), encoding="utf-8")
+    return nodes_file
+
+
+class GraphBuilder:
+    """Baseline graph thread/entry nodes; ``embedding`` is set on every entry if given."""
+
+    def __init__(self, embedding: Optional[list[float]] = None):
+        self.embedding = embedding
+
+    def thread(self, topic: str, status: str = "OPEN") -> dict:
+        return {"id": f"thread:{topic}", "type": "thread", "topic": topic, "title": topic, "status": status,
+                "last_updated": f"2025-01-0{len(topic) % 9 + 1}T00:00:00Z"}
+
+    def entry(self, topic: str, i: int, body: str = "text") -> dict:
+        node = {"id": f"entry:{topic}-{i}", "type": "entry", "entry_id": f"{topic}-{i}", "thread_topic": topic,
+                "index": i, "title": f"{topic} {i}", "body": body, "timestamp": f"2025-01-01T00:0{i}:00Z"}
+        if self.embedding is not None:
+            node["embedding"] = self.embedding
+        return node
+
+    def write(self, threads_dir: Path, *, body: str = "text", extra: Iterable[dict] = ()) -> Path:
+        """Write threads alpha, beta (closed) and gamma with five entries each.
+
+        ``body`` is formatted with ``topic`` and ``i`` per entry.
+        """
+        nodes = []
+        for t, topic in enumerate(["alpha", "beta", "gamma"]):
+            nodes.append(self.thread(topic, "OPEN" if t != 1 else "CLOSED"))
+            nodes.extend(self.entry(topic, i, body.format(topic=topic, i=i)) for i in range(5))
+        nodes.extend(extra)
+        return _write_graph(threads_dir, nodes)
+
+
+@pytest.fixture
+def graph_builder():
+    """The :class:`GraphBuilder` class, for tests that build baseline graphs."""
+    return GraphBuilder
+
+
+@pytest.fixture
+def write_graph():
+    """Write nodes to ``graph/baseline/nodes.jsonl`` under a threads dir and return that file."""
+    return _write_graph
+
+
+def _write_thread(threads_dir: Path, topic: str, entries: Iterable[tuple[str, str]]) -> Path:
+    text = f"# {topic} — Thread\nStatus: OPEN\nBall: Claude (user)\nTopic: {topic}\nCreated: 2025-01-01T00:00:00Z\n"
+    for n, (entry_id, body) in enumerate(entries, 1):
+        text += (
+            f"\n---\nEntry: Claude (user) 2025-01-01T0{n}:00:00Z\nRole: implementer\nType: Note\n"
+            f"Title: {topic} {n}\n\n{body}\n<!-- Entry-ID: {entry_id} -->\n"
+        )
+    path = threads_dir / f"{topic}.md"
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def write_thread():
+    """Write ``<topic>.md`` with an OPEN header and one Note per ``(entry_id, body)``, titled ``<topic> <n>``."""
+    return _write_thread
+
+
+class MockEmbeddingServer:
+    """OpenAI-style ``/embeddings`` endpoint served to the pooled HTTP clients.
+
+    ``requests`` records each request's ``input`` and ``texts`` every text embedded. A
+    text embeds as ``embed(index_in_request, text)``; requests containing one of
+    ``fail_texts`` get a 500. Results come back in reverse index order.
+    """
+
+    def __init__(self):
+        self.requests: list[Union[str, list[str]]] = []
+        self.texts: list[str] = []
+        self.fail_texts: set[str] = set()
+        self.embed = lambda i, text: [float(len(text))]
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self._lock:
+            self.requests.clear()
+            self.texts.clear()
+
+    def handle(self, request):
+        import httpx
+
+        inputs = json.loads(request.content)["input"]
+        texts = inputs if isinstance(inputs, list) else [inputs]
+        with self._lock:
+            self.requests.append(inputs)
+            self.texts.extend(texts)
+        if self.fail_texts.intersection(texts):
+            return httpx.Response(500)
+        data = [{"index": i, "embedding": self.embed(i, t)} for i, t in enumerate(texts)]
+        return httpx.Response(200, json={"data": list(reversed(data))})
+
+
+@pytest.fixture
+def mock_embedding_server(monkeypatch):
+    """Route every pooled HTTP client to a fresh :class:`MockEmbeddingServer`."""
+    httpx = pytest.importorskip("httpx")
+    from watercooler import http_pool
+
+    server = MockEmbeddingServer()
+    http_pool.close_all()
+    monkeypatch.setattr(http_pool, "_client_options", lambda: {"transport": httpx.MockTransport(server.handle)})
+    yield server
+    http_pool.close_all()
@@ -0,0 +1,72 @@
+"""Tests for the append-only graph log (nodes.jsonl / edges.jsonl)."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from watercooler.baseline_graph import jsonl_log
+from watercooler.baseline_graph.export import load_edges, load_nodes
+
+
+def _lines(path: Path) -> list[dict]:
+    return [json.loads(ln) for ln in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_append_returns_layout_and_latest_wins(tmp_path: Path):
+    log = tmp_path / "nodes.jsonl"
+    jsonl_log.append(log, [{"id": "a", "v": 1}, {"id": "b", "v": 1}])
+    layout = jsonl_log.append(log, [{"id": "a", "v": 2}])
+
+    data = log.read_bytes()
+    (key, offset, length), = layout
+    assert key == "a"
+    assert json.loads(data[offset:offset + length]) == {"id": "a", "v": 2, "_seq": 3}
+    assert [r["_seq"] for r in _lines(log)] == [1, 2, 3]
+
+    # The last record per key wins and takes the position of that record
+    assert jsonl_log.read_latest(log) == [{"id": "b", "v": 1}, {"id": "a", "v": 2}]
+    assert list(load_nodes(log)) == jsonl_log.read_latest(log)
+
+
+def test_edges_are_keyed_by_endpoints(tmp_path: Path):
+    log = tmp_path / "edges.jsonl"
+    edge = {"source": "entry:A", "target": "entry:B", "type": "followed_by"}
+    jsonl_log.append(log, [edge, {"source": "thread:t", "target": "entry:B", "type": "contains"}])
+    jsonl_log.append(log, [edge])
+    assert [e["source"] for e in load_edges(log)] == ["thread:t", "entry:A"]
+
+
+def test_append_to_legacy_and_torn_files(tmp_path: Path):
+    log = tmp_path / "nodes.jsonl"
+    # Pre-log file without _seq, with a torn last line
+    log.write_text('{"id": "a", "v": 1}\n{"id": "b", "v"', encoding="utf-8")
+    jsonl_log.append(log, [{"id": "b", "v": 2}])
+    assert jsonl_log.read_latest(log) == [{"id": "a", "v": 1}, {"id": "b", "v": 2}]
+    jsonl_log.append(log, [{"id": "c", "v": 1}])
+    last = log.read_text(encoding="utf-8").splitlines()[-1]
+    assert json.loads(last)["_seq"] == 2
+
+
+def test_compact_keeps_live_records(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(jsonl_log, "COMPACT_MIN_BYTES", 0)
+    log = tmp_path / "graph" / "nodes.jsonl"
+    jsonl_log.append(log, [{"id": f"n{i}", "v": 0} for i in range(4)])
+    assert not jsonl_log.needs_compaction(tmp_path, log)  # records the base size
+
+    for v in range(1, 4):
+        jsonl_log.append(log, [{"id": "n1", "v": v}])
+    assert not jsonl_log.needs_compaction(tmp_path, log)
+    jsonl_log.append(log, [{"id": "n2", "v": 1}, {"id": "n3", "v": 1}])
+    assert jsonl_log.needs_compaction(tmp_path, log)
+
+    before = jsonl_log.read_latest(log)
+    layout = jsonl_log.compact(log, tmp_path)
+    assert jsonl_log.read_latest(log) == before
+    assert [r["_seq"] for r in _lines(log)] == [1, 7, 8, 9]
+    data = log.read_bytes()
+    assert [json.loads(data[o:o + n])["id"] for _key, o, n in layout] == [key for key, _o, _n in layout]
+    assert not jsonl_log.needs_compaction(tmp_path, log)
+
+    jsonl_log.append(log, [{"id": "n0", "v": 1}])
+    assert _lines(log)[-1]["_seq"] == 10
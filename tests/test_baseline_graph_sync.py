@@ -14,11 +14,11 @@ from watercooler.baseline_graph.sync import (
     EmbeddingConfig,
     GraphHealthReport,
     GraphSyncState,
-    _atomic_append_jsonl,
     _atomic_write_json,
     check_graph_health,
     generate_embedding,
     get_graph_sync_state,
+    get_previous_thread_state,
     is_embedding_available,
     reconcile_graph,
     record_graph_sync_error,
@@ -26,7 +26,9 @@ from watercooler.baseline_graph.sync import (
     sync_entry_to_graph,
     sync_thread_to_graph,
 )
+from watercooler.baseline_graph import jsonl_log
 from watercooler.baseline_graph.parser import ParsedThread, ParsedEntry
+from watercooler.baseline_graph.reader import _load_edges, _load_nodes
 from watercooler.baseline_graph.summarizer import (
     SummarizerConfig,
     is_llm_service_available,
@@ -114,47 +116,39 @@ def test_atomic_write_json_overwrites(tmp_path: Path):
     assert loaded == {"new": "data"}
 
 
-def test_atomic_append_jsonl_creates_file(tmp_path: Path):
-    """Test atomic JSONL append creates file correctly."""
-    target = tmp_path / "test.jsonl"
-    items = [{"id": "1", "value": "a"}, {"id": "2", "value": "b"}]
-
-    _atomic_append_jsonl(target, items)
-
-    assert target.exists()
-    lines = target.read_text(encoding="utf-8").strip().split("\n")
-    assert len(lines) == 2
-    assert json.loads(lines[0])["id"] == "1"
-    assert json.loads(lines[1])["id"] == "2"
-
-
-def test_atomic_append_jsonl_deduplicates(tmp_path: Path):
-    """Test atomic JSONL append deduplicates by ID."""
-    target = tmp_path / "test.jsonl"
-
-    # First write
-    _atomic_append_jsonl(target, [{"id": "1", "value": "a"}])
-
-    # Second write with same ID (should update)
-    _atomic_append_jsonl(target, [{"id": "1", "value": "updated"}])
+def test_sync_appends_to_graph_log(threads_dir: Path, sample_thread: Path):
+    """Repeated syncs append new node versions; readers see the latest."""
+    sync_thread_to_graph(threads_dir, "test-topic")
+    nodes_file = threads_dir / "graph" / "baseline" / "nodes.jsonl"
+    before = nodes_file.read_bytes()
 
-    lines = target.read_text(encoding="utf-8").strip().split("\n")
-    assert len(lines) == 1
-    assert json.loads(lines[0])["value"] == "updated"
+    sync_entry_to_graph(threads_dir, "test-topic")
 
+    after = nodes_file.read_bytes()
+    assert after.startswith(before)
+    appended = [json.loads(ln) for ln in after[len(before):].decode("utf-8").splitlines()]
+    assert {n["type"] for n in appended} == {"thread", "entry"}
+    assert [n["_seq"] for n in appended] == [4, 5]
+    assert get_previous_thread_state(threads_dir, "test-topic")[0] == 2
+    assert len(list(_load_nodes(nodes_file.parent))) == 3
 
-def test_atomic_append_jsonl_merges_new(tmp_path: Path):
-    """Test atomic JSONL append merges new items."""
-    target = tmp_path / "test.jsonl"
 
-    # First write
-    _atomic_append_jsonl(target, [{"id": "1", "value": "a"}])
+def test_sync_compacts_graph_log(threads_dir: Path, sample_thread: Path, monkeypatch):
+    """The log is rewritten once it has doubled since the last compaction."""
+    monkeypatch.setattr(jsonl_log, "COMPACT_MIN_BYTES", 0)
+    sync_thread_to_graph(threads_dir, "test-topic")
+    nodes_file = threads_dir / "graph" / "baseline" / "nodes.jsonl"
 
-    # Second write with new ID
-    _atomic_append_jsonl(target, [{"id": "2", "value": "b"}])
+    sizes = []
+    for _ in range(4):
+        sync_entry_to_graph(threads_dir, "test-topic")
+        sizes.append(len(nodes_file.read_text(encoding="utf-8").splitlines()))
 
-    lines = target.read_text(encoding="utf-8").strip().split("\n")
-    assert len(lines) == 2
+    # 3 lines, +2 per sync, compacted back to 3 once twice the base size
+    assert sizes == [5, 3, 5, 3]
+    nodes = [json.loads(ln) for ln in nodes_file.read_text(encoding="utf-8").splitlines()]
+    assert len({n["id"] for n in nodes}) == 3
+    assert nodes[-1]["_seq"] == 11
 
 
 # ============================================================================
@@ -269,6 +263,26 @@ def test_sync_entry_with_specific_entry_id(threads_dir: Path, sample_thread: Pat
     assert success
 
 
+def test_sync_entry_locates_entry_without_full_parse(threads_dir: Path, sample_thread: Path):
+    """Entry sync uses the entry offset index instead of parsing the thread."""
+    with patch(
+        "watercooler.baseline_graph.sync.parse_thread_file",
+        side_effect=AssertionError("full parse"),
+    ):
+        assert sync_entry_to_graph(threads_dir, "test-topic")
+
+    graph_dir = threads_dir / "graph" / "baseline"
+    nodes = list(_load_nodes(graph_dir))
+    thread_node = next(n for n in nodes if n["type"] == "thread")
+    assert thread_node["entry_count"] == 2
+    edges = list(_load_edges(graph_dir))
+    assert {
+        "source": "entry:01TEST00000000000000000001",
+        "target": "entry:01TEST00000000000000000002",
+        "type": "followed_by",
+    } in edges
+
+
 # ============================================================================
 # Thread Sync Tests
 # ============================================================================
@@ -405,8 +419,11 @@ def test_sync_failure_does_not_block(threads_dir: Path, sample_thread: Path):
     # Create graph dir
     (threads_dir / "graph" / "baseline").mkdir(parents=True)
 
-    # Mock parse_thread_file to raise
+    # Mock both parse paths (indexed and full) to raise
     with patch(
+        "watercooler.baseline_graph.sync.parse_thread_entry",
+        side_effect=Exception("Parse failed"),
+    ), patch(
         "watercooler.baseline_graph.sync.parse_thread_file",
         side_effect=Exception("Parse failed"),
     ):
@@ -0,0 +1,60 @@
+"""Tests for batched embedding generation in the baseline graph pipeline."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from watercooler.baseline_graph.pipeline.config import EmbeddingConfig, LLMConfig, PipelineConfig
+from watercooler.baseline_graph.pipeline.runner import BaselineGraphRunner, _embedding_batches
+
+
+def _entry(text: str):
+    return SimpleNamespace(summary=text, body=text, embedding=None)
+
+
+@pytest.fixture
+def server(mock_embedding_server):
+    mock_embedding_server.fail_texts.add("bad")
+    return mock_embedding_server
+
+
+def _runner(tmp_path: Path, **embedding) -> BaselineGraphRunner:
+    config = PipelineConfig(
+        threads_dir=tmp_path,
+        llm=LLMConfig(),
+        embedding=EmbeddingConfig(api_base="http://embed.test/v1", **embedding),
+    )
+    return BaselineGraphRunner(config, auto_server=False)
+
+
+def test_batches_respect_count_and_token_budget():
+    entries = [_entry("x" * 40) for _ in range(5)] + [_entry("y" * 400)]
+    sizes = [len(b) for b in _embedding_batches(entries, max_items=2, max_tokens=1000)]
+    assert sizes == [2, 2, 2]
+    sizes = [len(b) for b in _embedding_batches(entries, max_items=10, max_tokens=30)]
+    assert sizes == [2, 2, 1, 1]
+
+
+def test_embeddings_are_sent_in_batches(tmp_path: Path, server):
+    entries = [_entry("e" * n) for n in range(1, 8)]
+    runner = _runner(tmp_path, batch_size=3)
+    generated = runner._generate_embeddings([SimpleNamespace(topic="t", entries=entries)])
+
+    assert generated == 7
+    assert [e.embedding for e in entries] == [[float(n)] for n in range(1, 8)]
+    assert sorted(len(r) for r in server.requests) == [1, 3, 3]
+
+
+def test_only_failed_batches_are_retried_per_entry(tmp_path: Path, server):
+    entries = [_entry(t) for t in ["a", "b", "bad", "cc", "ddd"]]
+    runner = _runner(tmp_path, batch_size=2, max_concurrent=1)
+    generated = runner._generate_embeddings([SimpleNamespace(topic="t", entries=entries)])
+
+    assert generated == 4
+    assert [e.embedding for e in entries] == [[1.0], [1.0], None, [2.0], [3.0]]
+    assert server.requests == [["a", "b"], ["bad", "cc"], "bad", "cc", ["ddd"]]
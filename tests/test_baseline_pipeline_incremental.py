@@ -0,0 +1,101 @@
+"""Tests for content-hash incremental rebuilds of the baseline graph pipeline."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from watercooler.baseline_graph import export
+from watercooler.baseline_graph.pipeline.config import EmbeddingConfig, LLMConfig, PipelineConfig
+from watercooler.baseline_graph.pipeline.runner import BaselineGraphRunner
+
+
+def _entries(topic: str, count: int, edits: dict[int, str] | None = None) -> list[tuple[str, str]]:
+    return [
+        (f"01{topic[0].upper()}".ljust(25, "0") + str(n), (edits or {}).get(n, f"Body of {topic} {n}."))
+        for n in range(1, count + 1)
+    ]
+
+
+@pytest.fixture
+def env(tmp_path: Path, monkeypatch, write_thread, mock_embedding_server):
+    threads = tmp_path / "threads"
+    threads.mkdir()
+    write_thread(threads, "alpha", _entries("alpha", 5))
+    write_thread(threads, "beta", _entries("beta", 2))
+    mock_embedding_server.embed = lambda i, text: [0.5, float(i)]
+
+    built: list = []
+    entry_to_node = export.entry_to_node
+    monkeypatch.setattr(export, "entry_to_node", lambda entry, topic: built.append(entry.entry_id) or entry_to_node(entry, topic))
+
+    def run(**options):
+        mock_embedding_server.clear()
+        built.clear()
+        config = PipelineConfig(
+            threads_dir=threads, llm=LLMConfig(), embedding=EmbeddingConfig(api_base="http://embed.test/v1"),
+            extractive_only=True, incremental=True, **options,
+        )
+        result = BaselineGraphRunner(config, auto_server=False).run()
+        assert result.success, result.error
+        nodes = {n["id"]: n for n in map(json.loads, (config.output_dir / "nodes.jsonl").read_text().splitlines())}
+        return nodes
+
+    return threads, run, mock_embedding_server.texts, built
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_touched_threads_are_not_reprocessed(env, streaming: bool):
+    threads, run, embedded, built = env
+    first = run(streaming=streaming)
+    assert len(embedded) == 7
+
+    for path in threads.glob("*.md"):
+        os.utime(path, (path.stat().st_atime, path.stat().st_mtime + 10))
+    second = run(streaming=streaming)
+
+    assert embedded == [] and built == []
+    assert second == first
+    assert not (threads / "graph" / "baseline" / "nodes.jsonl.prev").exists()
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_only_changed_entries_are_reprocessed(env, write_thread, streaming: bool):
+    threads, run, embedded, built = env
+    first = run(streaming=streaming)
+
+    write_thread(threads, "alpha", _entries("alpha", 6, {2: "Edited body."}))
+    second = run(streaming=streaming)
+
+    # Entry 5 gained the separator before entry 6: same content, new node
+    assert len(embedded) == 2
+    assert sorted(built) == [f"01A0000000000000000000000{n}" for n in (2, 5, 6)]
+    assert second["entry:01A00000000000000000000002"]["body"].startswith("Edited body.")
+    assert second["entry:01A00000000000000000000005"]["embedding"] == first["entry:01A00000000000000000000005"]["embedding"]
+    for n in (1, 3, 4):
+        assert second[f"entry:01A0000000000000000000000{n}"] == first[f"entry:01A0000000000000000000000{n}"]
+    assert len(second) == len(first) + 1
+
+
+def test_copied_nodes_follow_encoding_and_drop_log_seq(env):
+    threads, run, embedded, built = env
+    first = run()
+    nodes_file = threads / "graph" / "baseline" / "nodes.jsonl"
+    # Graph sync appends records carrying a log sequence number
+    lines = [json.dumps({**json.loads(line), "_seq": 7}) for line in nodes_file.read_text().splitlines()]
+    nodes_file.write_text("\n".join(lines) + "\n")
+
+    second = run(embedding_encoding="f16")
+
+    assert embedded == [] and built == []
+    assert second.keys() == first.keys()
+    for node_id, node in second.items():
+        assert "_seq" not in node
+        if node_id.startswith("entry:"):
+            assert node["embedding"].startswith("f16:")
+            assert {**node, "embedding": None} == {**first[node_id], "embedding": None}
@@ -0,0 +1,110 @@
+"""Tests for the baseline graph pipeline state and its embedding store."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from watercooler.baseline_graph.pipeline import state as pipeline_state
+from watercooler.baseline_graph.pipeline.state import CachedEmbedding, PipelineState
+
+
+def _save_loaded(state: PipelineState, path: Path) -> PipelineState:
+    state.save(path)
+    return PipelineState.load(path)
+
+
+def _stores(directory: Path) -> list:
+    return sorted(p.name for p in directory.glob("state_embeddings.*.bin"))
+
+
+def test_embeddings_round_trip_through_store(tmp_path: Path):
+    path = tmp_path / "state.json"
+    state = PipelineState()
+    state.update_thread("alpha", 1.0, 2, entry_embeddings={"a1": [0.5, 1.0, 2.0], "a2": [0.25, -1.0, 0.0]})
+    state.update_thread("beta", 1.0, 1, entry_embeddings={"b1": [1.0, 1.0, 1.0]})
+
+    loaded = _save_loaded(state, path)
+    data = json.loads(path.read_text())
+    assert data["embeddings"] == {"file": "state_embeddings.0.bin", "dim": 3, "dtype": "float32", "rows": 3, "generation": 0}
+    assert all(thread["entry_embeddings"] == {} for thread in data["threads"].values())
+    assert (tmp_path / "state_embeddings.0.bin").stat().st_size == 3 * 3 * 4
+    assert loaded.get_cached_entry_embedding("alpha", "a2") == [0.25, -1.0, 0.0]
+    assert loaded.get_cached_entry_embedding("beta", "b1") == [1.0, 1.0, 1.0]
+    assert loaded.get_cached_entry_embedding("beta", "a1") is None
+
+
+def test_reused_embeddings_are_not_appended_again(tmp_path: Path):
+    path = tmp_path / "state.json"
+    state = PipelineState()
+    state.update_thread("alpha", 1.0, 1, entry_embeddings={"a1": [0.5, 1.0]})
+    loaded = _save_loaded(state, path)
+
+    cached = loaded.get_cached_entry_embedding("alpha", "a1")
+    assert isinstance(cached, CachedEmbedding)
+    loaded.update_thread("alpha", 2.0, 2, entry_embeddings={"a1": cached, "a2": [2.0, 3.0]})
+    reloaded = _save_loaded(loaded, path)
+
+    assert reloaded.embeddings.rows == 2
+    assert reloaded.threads["alpha"].entry_embedding_rows == {"a1": 0, "a2": 1}
+    assert reloaded.get_cached_entry_embedding("alpha", "a2") == [2.0, 3.0]
+
+
+def test_inline_embeddings_of_old_state_are_migrated(tmp_path: Path):
+    path = tmp_path / "state.json"
+    path.write_text(json.dumps({
+        "version": "1.0",
+        "last_run": "2025-01-01T00:00:00Z",
+        "threads": {"alpha": {"topic": "alpha", "mtime": 1.0, "entry_count": 1,
+                              "entry_embeddings": {"a1": [0.5, 1.5]}}},
+    }))
+
+    state = PipelineState.load(path)
+    assert state.get_cached_entry_embedding("alpha", "a1") == [0.5, 1.5]
+    migrated = _save_loaded(state, path)
+    assert json.loads(path.read_text())["threads"]["alpha"]["entry_embeddings"] == {}
+    assert migrated.get_cached_entry_embedding("alpha", "a1") == [0.5, 1.5]
+
+
+def test_unsaved_tail_rows_are_ignored(tmp_path: Path):
+    path = tmp_path / "state.json"
+    state = PipelineState()
+    state.update_thread("alpha", 1.0, 1, entry_embeddings={"a1": [0.5, 1.0]})
+    state.save(path)
+    with open(tmp_path / "state_embeddings.0.bin", "ab") as f:
+        f.write(b"\0" * 12)  # Append whose state.json was never written
+
+    loaded = PipelineState.load(path)
+    loaded.update_thread("alpha", 2.0, 1, entry_embeddings={"a2": [4.0, 8.0]})
+    reloaded = _save_loaded(loaded, path)
+    assert reloaded.threads["alpha"].entry_embedding_rows == {"a2": 1}
+    assert reloaded.get_cached_entry_embedding("alpha", "a2") == [4.0, 8.0]
+    assert (tmp_path / "state_embeddings.0.bin").stat().st_size == 2 * 2 * 4
+
+
+def test_store_is_compacted_into_new_generation(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(pipeline_state, "COMPACT_MIN_ROWS", 2)
+    path = tmp_path / "state.json"
+    state = PipelineState()
+    state.update_thread("alpha", 1.0, 1, entry_embeddings={f"a{i}": [float(i), 0.0] for i in range(4)})
+    state.update_thread("beta", 1.0, 1, entry_embeddings={"b1": [9.0, 9.0]})
+    loaded = _save_loaded(state, path)
+
+    loaded.remove_deleted_threads({"beta"})
+    compacted = _save_loaded(loaded, path)
+    assert _stores(tmp_path) == ["state_embeddings.1.bin"]
+    assert compacted.embeddings.rows == 1
+    assert compacted.get_cached_entry_embedding("beta", "b1") == [9.0, 9.0]
+
+
+def test_dtype_change_rewrites_store(tmp_path: Path):
+    path = tmp_path / "state.json"
+    state = PipelineState()
+    state.update_thread("alpha", 1.0, 1, entry_embeddings={"a1": [0.5, 1.0]})
+    loaded = _save_loaded(state, path)
+
+    loaded.embedding_dtype = "float16"
+    half = _save_loaded(loaded, path)
+    assert half.embeddings.dtype == "float16"
+    assert (tmp_path / "state_embeddings.1.bin").stat().st_size == 2 * 2
+    assert half.get_cached_entry_embedding("alpha", "a1") == [0.5, 1.0]
@@ -0,0 +1,72 @@
+"""Tests for the streaming mode of the baseline graph pipeline."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from watercooler.baseline_graph.pipeline.config import EmbeddingConfig, LLMConfig, PipelineConfig
+from watercooler.baseline_graph.pipeline.runner import BaselineGraphRunner
+
+
+def _entry_id(t: int, n: int) -> str:
+    return f"01T{t:02d}".ljust(25, "0") + str(n)
+
+
+@pytest.fixture
+def threads_dir(tmp_path: Path, write_thread, mock_embedding_server) -> Path:
+    threads = tmp_path / "threads"
+    threads.mkdir()
+    for t in range(6):
+        topic = f"topic-{t:02d}"
+        entries = []
+        for n in range(1, 2 + t % 3):
+            ref = f" See thread:topic-{(t + 1) % 6:02d} and {_entry_id((t + 2) % 6, 1)}." if n == 1 else ""
+            entries.append((_entry_id(t, n), f"Body of {topic} entry {n}.{ref}"))
+        write_thread(threads, topic, entries)
+    return threads
+
+
+def _run(threads_dir: Path, output: str, **options):
+    config = PipelineConfig(
+        threads_dir=threads_dir,
+        output_dir=threads_dir.parent / output,
+        llm=LLMConfig(),
+        embedding=EmbeddingConfig(api_base="http://embed.test/v1", batch_size=2),
+        extractive_only=True,
+        **options,
+    )
+    result = BaselineGraphRunner(config, auto_server=False).run()
+    assert result.success, result.error
+    lines = {name: sorted((config.output_dir / name).read_text().splitlines()) for name in ("nodes.jsonl", "edges.jsonl")}
+    return result, lines
+
+
+def test_streaming_writes_the_same_graph(threads_dir: Path):
+    phased, phased_lines = _run(threads_dir, "phased")
+    streamed, streamed_lines = _run(threads_dir, "streamed", streaming=True, queue_depth=1)
+
+    assert streamed_lines == phased_lines
+    assert any('"references"' in line for line in streamed_lines["edges.jsonl"])
+    assert (streamed.threads_processed, streamed.entries_processed) == (6, 12)
+    assert (streamed.nodes_created, streamed.edges_created) == (phased.nodes_created, phased.edges_created)
+    assert streamed.embeddings_generated == phased.embeddings_generated == 12
+    manifest = json.loads((threads_dir.parent / "streamed" / "manifest.json").read_text())
+    assert manifest["nodes_written"] == streamed.nodes_created
+
+
+def test_streaming_surfaces_stage_errors(threads_dir: Path, monkeypatch):
+    def fail(self, entries):
+        raise RuntimeError("embedding server exploded")
+
+    monkeypatch.setattr(BaselineGraphRunner, "_embed_entries", fail)
+    config = PipelineConfig(
+        threads_dir=threads_dir, llm=LLMConfig(), embedding=EmbeddingConfig(), extractive_only=True, streaming=True
+    )
+    result = BaselineGraphRunner(config, auto_server=False).run()
+    assert not result.success
+    assert result.error == "embedding server exploded"
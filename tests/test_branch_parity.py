@@ -939,6 +939,54 @@ def test_preflight_threads_ahead_no_auto_fix(repos_with_remotes: tuple[Path, Pat
     assert ahead == 1  # Still ahead
 
 
+def test_preflight_reuses_clean_result_until_repo_state_changes(
+    repos_with_remotes: tuple[Path, Path, Path, Path],
+) -> None:
+    """Test preflight answers from its cache while HEADs, index and remote refs are unchanged."""
+    code_path, threads_path, code_bare, threads_bare = repos_with_remotes
+
+    first = run_preflight(code_repo_path=code_path, threads_repo_path=threads_path)
+    assert first.success is True
+    assert first.cached is False
+    assert {"open", "fetch", "conflicts", "ahead_behind"} <= set(first.timings)
+
+    cached = run_preflight(code_repo_path=code_path, threads_repo_path=threads_path)
+    assert cached.cached is True
+    assert cached.can_proceed is True
+    assert cached.state.status == ParityStatus.CLEAN.value
+    assert cached.state.code_branch == "main"
+    assert cached.timings == {}
+    assert run_preflight(code_repo_path=code_path, threads_repo_path=threads_path, auto_fix=False).cached is False
+
+    # Another clone moves origin ahead: the fetch changes the remote-tracking ref
+    other = Repo.clone_from(str(code_bare), str(code_path.parent / "code-other"), branch="main")
+    (Path(other.working_tree_dir) / "new.txt").write_text("new\n")
+    other.index.add(["new.txt"])
+    other.index.commit("Upstream change", author=Actor("Test", "test@example.com"))
+    other.git.push("origin", "HEAD:main")
+
+    behind = run_preflight(code_repo_path=code_path, threads_repo_path=threads_path)
+    assert behind.cached is False
+    assert behind.can_proceed is False
+    assert behind.state.status == ParityStatus.CODE_BEHIND_ORIGIN.value
+
+
+def test_preflight_does_not_cache_remediation(repos_with_remotes: tuple[Path, Path, Path, Path]) -> None:
+    """Test a preflight that pushed is not replayed; the next one checks again."""
+    code_path, threads_path, code_bare, threads_bare = repos_with_remotes
+
+    threads = Repo(threads_path)
+    (threads_path / "thread.md").write_text("# Thread\n")
+    threads.index.add(["thread.md"])
+    threads.index.commit("Add thread", author=Actor("Test", "test@example.com"))
+
+    pushed = run_preflight(code_repo_path=code_path, threads_repo_path=threads_path, fetch_first=False)
+    assert pushed.auto_fixed is True
+    again = run_preflight(code_repo_path=code_path, threads_repo_path=threads_path, fetch_first=False)
+    assert again.cached is False
+    assert again.auto_fixed is False
+
+
 # =============================================================================
 # Inverse Main Protection Tests
 # =============================================================================
@@ -2141,6 +2189,22 @@ def test_merge_jsonl_content_handles_id_field() -> None:
     assert ids == {"edge1", "edge2"}
 
 
+def test_merge_jsonl_content_resolves_graph_logs() -> None:
+    """Test merge_jsonl_content takes the latest record of each side's log."""
+    ours = (
+        '{"id":"n1","v":1,"_seq":1}\n{"id":"n2","v":1,"_seq":2}\n{"id":"n1","v":2,"_seq":3}\n'
+        '{"source":"n1","target":"n2","type":"followed_by","_seq":4}\n'
+    )
+    theirs = '{"id":"n3","v":1,"_seq":1}\n{"id":"n2","v":5,"_seq":2}\n{"id":"n3","v":2,"_seq":3}\n'
+
+    result = merge_jsonl_content(ours, theirs)
+    lines = [json.loads(line) for line in result.strip().split("\n")]
+
+    assert [(e.get("id"), e.get("v")) for e in lines] == [("n2", 1), ("n1", 2), (None, None), ("n3", 2)]
+    # Edges are keyed by their endpoints rather than dropped
+    assert lines[2]["source"] == "n1"
+
+
 def test_merge_jsonl_content_handles_empty_lines() -> None:
     """Test merge_jsonl_content handles empty lines gracefully."""
     ours = '{"uuid":"node1","name":"A"}\n\n\n'
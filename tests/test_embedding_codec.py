@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from watercooler.baseline_graph import embedding_codec, embedding_index, search
+from watercooler.baseline_graph.search import SearchQuery, search_graph
+from watercooler.baseline_graph.sync import migrate_embeddings
+
+
+def _vec(rng: random.Random, dim: int = 32) -> list[float]:
+    return [rng.uniform(-1, 1) for _ in range(dim)]
+
+
+@pytest.mark.parametrize("encoding, tolerance", [("json", 0.0), ("f16", 1e-3), ("i8", 1e-2)])
+def test_encode_decode_round_trip(encoding: str, tolerance: float):
+    vector = _vec(random.Random(1))
+    encoded = embedding_codec.encode(vector, encoding)
+    assert embedding_codec.encoding_of(encoded) == encoding
+    decoded = embedding_codec.decode(json.loads(json.dumps(encoded)))
+    assert decoded == pytest.approx(vector, abs=tolerance)
+    if encoding != "json":
+        assert len(json.dumps(encoded)) < len(json.dumps(vector)) / 3
+
+
+def test_decode_rejects_malformed_values():
+    assert embedding_codec.decode(None) is None
+    assert embedding_codec.decode([]) is None
+    assert embedding_codec.decode("f16:not base64!") is None
+    assert embedding_codec.decode("i8:x:AAAA") is None
+    assert embedding_codec.decode("bf16:AAAA") is None
+    with pytest.raises(ValueError):
+        embedding_codec.set_encoding("f64")
+
+
+def test_nodes_are_written_with_process_encoding(monkeypatch):
+    from watercooler.baseline_graph.export import entry_to_node
+    from watercooler.baseline_graph.parser import ParsedEntry
+
+    monkeypatch.setattr(embedding_codec, "_encoding", "f16")
+    entry = ParsedEntry(
+        index=0, agent="Claude", role="pm", entry_type="Note", title="t", timestamp="2025-01-01T00:00:00Z", body="b",
+        summary="", entry_id="E0",
+    )
+    entry.embedding = [0.5, -0.25]
+    node = entry_to_node(entry, "topic")
+    assert node["embedding"].startswith("f16:")
+    assert embedding_codec.decode(node["embedding"]) == [0.5, -0.25]
+
+
+def test_migrate_embeddings_keeps_search_ranking(tmp_path: Path, monkeypatch):
+    rng = random.Random(5)
+    nodes = [
+        {"id": f"entry:E{i}", "type": "entry", "entry_id": f"E{i}", "title": f"Entry {i}", "embedding": _vec(rng)}
+        for i in range(50)
+    ]
+    nodes_file = tmp_path / "graph" / "baseline" / "nodes.jsonl"
+    nodes_file.parent.mkdir(parents=True)
+    nodes_file.write_text("".join(json.dumps(n) + "\n" for n in nodes), encoding="utf-8")
+    query_vector = _vec(rng)
+    monkeypatch.setattr(search, "_get_query_embedding", lambda q: query_vector)
+    monkeypatch.setattr(embedding_index, "np", None)
+    query = SearchQuery(query="anything", semantic=True, semantic_threshold=0.1, limit=5)
+    before = [r.node_id for r in search_graph(tmp_path, query).results]
+    size = nodes_file.stat().st_size
+
+    assert migrate_embeddings(tmp_path, "f16") == 50
+    assert nodes_file.stat().st_size < size / 2
+    assert all(json.loads(line)["embedding"].startswith("f16:") for line in nodes_file.read_text().splitlines())
+    assert [r.node_id for r in search_graph(tmp_path, query).results] == before
+    assert migrate_embeddings(tmp_path, "f16") == 0
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from watercooler.baseline_graph import embedding_index, search, sync
+from watercooler.baseline_graph.search import SearchQuery, find_similar_entries, search_graph
+
+
+def _vec(rng: random.Random, dim: int = 8) -> list[float]:
+    return [rng.uniform(-1, 1) for _ in range(dim)]
+
+
+def _entry(i: int, embedding: list[float] | None, role: str = "pm") -> dict:
+    node = {"id": f"entry:E{i}", "type": "entry", "entry_id": f"E{i}", "title": f"Entry {i}", "role": role}
+    if embedding is not None:
+        node["embedding"] = embedding
+    return node
+
+
+def _ranked(results) -> list[tuple[str, float]]:
+    return [(r.node_id, round(r.score, 4)) for r in results.results]
+
+
+@pytest.fixture
+def graph(tmp_path: Path, monkeypatch, write_graph):
+    rng = random.Random(3)
+    nodes = [_entry(i, _vec(rng) if i % 7 else None, role="pm" if i % 2 else "dev") for i in range(200)]
+    nodes.append({"id": "thread:t", "type": "thread", "topic": "t", "title": "T", "embedding": _vec(rng)})
+    nodes_file = write_graph(tmp_path, nodes)
+    query = _vec(rng)
+    monkeypatch.setattr(search, "_get_query_embedding", lambda q: query)
+    return tmp_path, nodes_file
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"limit": 10, "semantic_threshold": 0.2},
+        {"limit": 5, "semantic_threshold": 0.2, "role": "dev"},
+        {"limit": 500, "semantic_threshold": -1.0, "include_threads": False},
+        {"limit": 10, "semantic_threshold": 0.9, "role": "dev", "combine": "OR"},
+    ],
+)
+def test_semantic_search_matches_scalar_path(graph, monkeypatch, kwargs):
+    threads_dir, _nodes_file = graph
+    query = SearchQuery(query="anything", semantic=True, **kwargs)
+
+    fast = search_graph(threads_dir, query)
+    monkeypatch.setattr(embedding_index, "np", None)
+    slow = search_graph(threads_dir, query)
+
+    assert fast.count > 0
+    assert _ranked(fast) == _ranked(slow)
+    if query.combine == "AND":
+        assert fast.total_scanned < slow.total_scanned
+
+
+def test_find_similar_entries_matches_scalar_path(graph, monkeypatch):
+    threads_dir, _nodes_file = graph
+    fast = find_similar_entries(threads_dir, "E3", limit=8, similarity_threshold=0.0)
+    monkeypatch.setattr(embedding_index, "np", None)
+    slow = find_similar_entries(threads_dir, "E3", limit=8, similarity_threshold=0.0)
+    assert [e.entry_id for e in fast] == [e.entry_id for e in slow]
+    assert "E3" not in [e.entry_id for e in fast]
+
+
+def test_sync_writes_update_matrix_in_place(graph, monkeypatch):
+    threads_dir, nodes_file = graph
+    query = SearchQuery(query="anything", semantic=True, semantic_threshold=-1.0, limit=1000)
+    search_graph(threads_dir, query)
+
+    rebuilds: list[int] = []
+    orig = embedding_index._rebuild
+    monkeypatch.setattr(embedding_index, "_rebuild", lambda *a: rebuilds.append(1) or orig(*a))
+    target = search._get_query_embedding("anything")
+    new_nodes = [_entry(1000 + i, _vec(random.Random(i))) for i in range(100)]
+    sync._write_nodes(threads_dir, nodes_file, new_nodes + [_entry(7, target), _entry(1, None)])
+
+    results = search_graph(threads_dir, query)
+    assert rebuilds == []
+    assert results.results[0].node_id == "E7"
+    assert results.results[0].score == pytest.approx(1.0, abs=1e-5)
+    assert "E1" not in [r.node_id for r in results.results]
+
+    fast = _ranked(results)
+    monkeypatch.setattr(embedding_index, "np", None)
+    assert fast == _ranked(search_graph(threads_dir, query))
+
+
+def _clustered(rng: random.Random, centers: list[list[float]], n: int, start: int = 0) -> list[dict]:
+    return [
+        _entry(start + i, [c + rng.gauss(0, 0.05) for c in centers[i % len(centers)]])
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def small_ann():
+    embedding_index.configure_ann(min_rows=100, nprobe=4)
+    yield
+    embedding_index.configure_ann()
+
+
+def test_ivf_index_built_queried_and_updated(tmp_path: Path, small_ann, write_graph):
+    rng = random.Random(5)
+    centers = [_vec(rng, 16) for _ in range(8)]
+    nodes_file = write_graph(tmp_path, _clustered(rng, centers, 400))
+
+    assert embedding_index.build(tmp_path, nodes_file)
+    matrix = embedding_index.load(tmp_path, nodes_file)
+    assert matrix.ivf is not None and len(matrix.ivf.centroids) == 20
+
+    query = [c + rng.gauss(0, 0.05) for c in centers[0]]
+    approx = matrix.scores(query)
+    exact = matrix.scores(query, exact=True)
+    assert np.isinf(approx).sum() > len(matrix) // 2
+    assert embedding_index.top_k(approx, 10, 0.0) == embedding_index.top_k(exact, 10, 0.0)
+
+    # Sync assigns new rows to their nearest list without retraining
+    sync._write_nodes(tmp_path, nodes_file, _clustered(rng, centers, 10, start=1000))
+    matrix = embedding_index.load(tmp_path, nodes_file)
+    assert matrix.ivf.trained == 400 and len(matrix.ivf.lists) == 410
+    new_rows = [matrix.row(f"entry:E{1000 + i}") for i in range(10)]
+    nearest = np.argmax(np.asarray(matrix.vectors[new_rows]) @ matrix.ivf.centroids.T, axis=1)
+    assert matrix.ivf.lists[new_rows].tolist() == nearest.tolist()
+
+    # ... until the index has doubled since training
+    sync._write_nodes(tmp_path, nodes_file, _clustered(rng, centers, 400, start=2000))
+    matrix = embedding_index.load(tmp_path, nodes_file)
+    assert matrix.ivf.trained == 810 and len(matrix.ivf.centroids) == 28
+
+
+def test_exact_and_disabled_ann_score_every_row(tmp_path: Path, monkeypatch, small_ann, write_graph):
+    rng = random.Random(9)
+    centers = [_vec(rng, 16) for _ in range(8)]
+    nodes_file = write_graph(tmp_path, _clustered(rng, centers, 400))
+    assert embedding_index.build(tmp_path, nodes_file)
+    query_vec = [c + rng.gauss(0, 0.3) for c in centers[0]]
+    monkeypatch.setattr(search, "_get_query_embedding", lambda q: query_vec)
+    query = SearchQuery(query="anything", semantic=True, semantic_threshold=-1.0, limit=50, exact=True)
+
+    exact = search_graph(tmp_path, query)
+    similar = find_similar_entries(tmp_path, "E0", limit=50, similarity_threshold=-1.0, exact=True)
+    approx = search_graph(tmp_path, SearchQuery(query="anything", semantic=True, semantic_threshold=-1.0, limit=400))
+    assert approx.count < 400  # Only the probed lists
+
+    embedding_index.configure_ann(enabled=False)
+    assert embedding_index.build(tmp_path, nodes_file)
+    assert embedding_index.load(tmp_path, nodes_file).ivf is None
+    assert _ranked(search_graph(tmp_path, query)) == _ranked(exact)
+
+    monkeypatch.setattr(embedding_index, "np", None)
+    assert _ranked(search_graph(tmp_path, query)) == _ranked(exact)
+    slow = find_similar_entries(tmp_path, "E0", limit=50, similarity_threshold=-1.0)
+    assert [e.entry_id for e in slow] == [e.entry_id for e in similar]
+
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from watercooler import commands, entry_index
+from watercooler.thread_entries import parse_thread_entries
+
+
+def _say(tmp_path: Path, n: int, **kw) -> None:
+    commands.say(
+        "alpha",
+        threads_dir=tmp_path,
+        agent="Claude",
+        role="pm",
+        title=f"t{n}",
+        body=f"body {n}\n```\nEntry: Fake (x) 2020-01-01T00:00:00Z\n```",
+        entry_id=f"01ENTRY{n:03d}",
+        **kw,
+    )
+
+
+def _fields(e):
+    return (e.index, e.entry_id, e.header, e.body, e.start_line, e.end_line)
+
+
+def test_index_matches_eager_parser(tmp_path: Path):
+    for n in range(4):
+        _say(tmp_path, n)
+    p = tmp_path / "alpha.md"
+    eager = parse_thread_entries(p.read_text(encoding="utf-8"))
+
+    with entry_index.open_entry_index(p) as idx:
+        assert idx.count == len(eager) == 4
+        assert [_fields(e) for e in idx.entries()] == [_fields(e) for e in eager]
+        assert idx.find("01ENTRY002") == 2
+        assert idx.find("missing") is None
+        assert idx.entry(-1).entry_id == "01ENTRY003"
+        data = p.read_bytes()
+        e = idx.entry(1)
+        assert data[e.start_offset:e.end_offset].decode("utf-8").startswith("Entry: Claude")
+    assert entry_index.index_path(p).exists()
+
+
+def test_writers_keep_index_fresh_without_rebuild(tmp_path: Path, monkeypatch):
+    _say(tmp_path, 0)
+    p = tmp_path / "alpha.md"
+    entry_index.open_entry_index(p).close()
+
+    calls: list[int] = []
+    orig = entry_index._build
+    monkeypatch.setattr(entry_index, "_build", lambda data, st: calls.append(1) or orig(data, st))
+
+    _say(tmp_path, 1)
+    commands.set_status("alpha", threads_dir=tmp_path, status="in-review")
+    commands.set_ball("alpha", threads_dir=tmp_path, ball="codex")
+    _say(tmp_path, 2)
+
+    idx = entry_index.open_entry_index(p, build=False)
+    assert idx is not None
+    with idx:
+        eager = parse_thread_entries(p.read_text(encoding="utf-8"))
+        assert [_fields(e) for e in idx.entries()] == [_fields(e) for e in eager]
+        assert idx.find("01ENTRY002") == 2
+    assert calls == []
+
+
+def test_external_edit_triggers_rebuild(tmp_path: Path):
+    for n in range(2):
+        _say(tmp_path, n)
+    p = tmp_path / "alpha.md"
+    entry_index.open_entry_index(p).close()
+
+    text = p.read_text(encoding="utf-8").replace("body 0", "body zero, edited")
+    p.write_text(text, encoding="utf-8")
+    assert entry_index.open_entry_index(p, build=False) is None
+    with entry_index.open_entry_index(p) as idx:
+        assert idx.entry(0).body.startswith("body zero, edited")
+        assert idx.entry(1).entry_id == "01ENTRY001"
+
+
+def test_out_of_order_append_follows_parse_order(tmp_path: Path):
+    p = tmp_path / "alpha.md"
+    commands.init_thread("alpha", threads_dir=tmp_path)
+    entry_index.open_entry_index(p).close()
+    before = p.stat()
+    with open(p, "a", encoding="utf-8") as f:
+        for ts, eid in (("2025-01-02T00:00:00Z", "LATE"), ("2025-01-01T00:00:00Z", "EARLY")):
+            f.write(f"\n---\nEntry: Claude {ts}\nTitle: {eid}\n\nbody\n<!-- Entry-ID: {eid} -->\n")
+    entry_index.note_append(p, before)
+
+    with entry_index.open_entry_index(p) as idx:
+        assert [e.entry_id for e in idx.entries()] == ["EARLY", "LATE"]
+        assert idx.find("LATE") == 1
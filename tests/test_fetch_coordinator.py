@@ -0,0 +1,127 @@
+"""Tests for per-repository fetch coordination."""
+
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+from git import Repo
+
+from watercooler_mcp.fetch_coordinator import FetchCoordinator, get_fetch_coordinator, remote_tip_probe
+
+
+class _Fetch:
+    def __init__(self, delay: float = 0.0, ok: bool = True) -> None:
+        self.calls = 0
+        self.delay = delay
+        self.ok = ok
+        self.started = threading.Event()
+
+    def __call__(self) -> bool:
+        self.calls += 1
+        self.started.set()
+        time.sleep(self.delay)
+        return self.ok
+
+
+def test_recent_fetch_is_reused_until_ttl(tmp_path: Path):
+    coordinator = FetchCoordinator(ttl=0.2)
+    run = _Fetch()
+
+    assert coordinator.fetch(tmp_path, run)
+    assert coordinator.fetch(tmp_path, run)
+    assert run.calls == 1
+    time.sleep(0.25)
+    assert coordinator.fetch(tmp_path, run)
+    assert run.calls == 2
+
+    stats = coordinator.stats()[str(tmp_path.resolve())]
+    assert (stats["fetched"], stats["skipped"], stats["joined"]) == (2, 1, 0)
+
+
+def test_failed_fetch_is_not_reused(tmp_path: Path):
+    coordinator = FetchCoordinator(ttl=60)
+    failing = _Fetch(ok=False)
+    assert not coordinator.fetch(tmp_path, failing)
+    assert not coordinator.fetch(tmp_path, failing)
+    assert failing.calls == 2
+    assert coordinator.stats()[str(tmp_path.resolve())]["failed"] == 2
+
+
+def test_concurrent_fetches_are_joined(tmp_path: Path):
+    coordinator = FetchCoordinator(ttl=0)
+    run = _Fetch(delay=0.3)
+    results: list[bool] = []
+
+    first = threading.Thread(target=lambda: results.append(coordinator.fetch(tmp_path, run)))
+    first.start()
+    assert run.started.wait(5)
+    others = [threading.Thread(target=lambda: results.append(coordinator.fetch(tmp_path, run))) for _ in range(4)]
+    for thread in others:
+        thread.start()
+    for thread in [first, *others]:
+        thread.join(5)
+
+    assert results == [True] * 5
+    assert run.calls == 1
+    assert coordinator.stats()[str(tmp_path.resolve())]["joined"] == 4
+
+
+def test_fresh_fetch_ignores_ttl_and_older_flights(tmp_path: Path):
+    coordinator = FetchCoordinator(ttl=60)
+    run = _Fetch(delay=0.2)
+    assert coordinator.fetch(tmp_path, run)
+    assert coordinator.fetch(tmp_path, run, fresh=True)
+    assert run.calls == 2
+
+    reader = threading.Thread(target=lambda: coordinator.fetch(tmp_path, run, fresh=True))
+    run.started.clear()
+    reader.start()
+    assert run.started.wait(5)
+    # Asked for after the running fetch started: waits for it, then fetches again
+    assert coordinator.fetch(tmp_path, run, fresh=True)
+    reader.join(5)
+    assert run.calls == 4
+    # A read within the TTL of those reuses them
+    assert coordinator.fetch(tmp_path, run)
+    assert run.calls == 4
+
+
+def test_probe_skips_fetch_when_remote_unchanged(tmp_path: Path):
+    coordinator = FetchCoordinator(ttl=0)
+    run = _Fetch()
+    assert coordinator.fetch(tmp_path, run, probe=lambda: True)
+    assert run.calls == 0
+    assert coordinator.fetch(tmp_path, run, probe=lambda: False)
+    assert coordinator.fetch(tmp_path, run, probe=lambda: 1 / 0)
+    assert run.calls == 2
+    stats = coordinator.stats()[str(tmp_path.resolve())]
+    assert (stats["probed"], stats["fetched"]) == (1, 2)
+
+
+def _commit(repo: Repo, name: str) -> str:
+    path = Path(repo.working_tree_dir) / name
+    path.write_text(name, encoding="utf-8")
+    repo.index.add([name])
+    return repo.index.commit(name).hexsha
+
+
+def test_remote_tip_probe_compares_ls_remote_with_tracking_ref(tmp_path: Path):
+    remote = Repo.init(tmp_path / "remote.git", bare=True)
+    seed = Repo.init(tmp_path / "seed", initial_branch="main")
+    _commit(seed, "a")
+    seed.create_remote("origin", remote.git_dir).push("main:main")
+
+    clone = Repo.clone_from(remote.git_dir, tmp_path / "clone")
+    probe = remote_tip_probe(clone, "main")
+    assert probe()
+    assert not remote_tip_probe(clone, "missing")()
+    assert not remote_tip_probe(clone, None)()
+
+    tip = _commit(seed, "b")
+    seed.remote("origin").push("main:main")
+    assert not probe()
+    assert get_fetch_coordinator().stats()[str(Path(clone.git_dir).resolve())]["remote_tips"] == {"main": tip}
+    clone.remote("origin").fetch()
+    assert probe()
@@ -0,0 +1,134 @@
+"""Tests for persistent git plumbing sessions."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from git import Actor, Repo
+
+from watercooler import git_session
+from watercooler.git_session import GitSession, find_git_dir, session_for
+from watercooler.path_resolver import discover_git_info
+from watercooler_mcp.config import _branch_has_upstream
+
+_AUTHOR = Actor("Test", "test@example.com")
+
+
+def _commit(repo: Repo, name: str, content: str | None = None) -> str:
+    path = Path(repo.working_tree_dir) / name
+    path.write_text(content if content is not None else name, encoding="utf-8")
+    repo.index.add([name])
+    return repo.index.commit(name, author=_AUTHOR, committer=_AUTHOR).hexsha
+
+
+@pytest.fixture
+def clone(tmp_path: Path) -> Repo:
+    remote = Repo.init(tmp_path / "remote.git", bare=True, initial_branch="main")
+    repo = Repo.clone_from(remote.git_dir, tmp_path / "clone")
+    with repo.config_writer() as config:
+        config.set_value("user", "name", _AUTHOR.name)
+        config.set_value("user", "email", _AUTHOR.email)
+    repo.git.checkout("-b", "main")
+    _commit(repo, "a.md")
+    repo.git.push("-u", "origin", "main")
+    yield repo
+    git_session.close_sessions()
+
+
+def _rev_list_counts(repo: Repo, local: str, upstream: str) -> tuple[int, int]:
+    ahead, behind = repo.git.rev_list("--left-right", "--count", f"{local}...{upstream}").split()
+    return int(ahead), int(behind)
+
+
+def test_resolve_follows_new_commits_and_survives_fatal_names(clone: Repo):
+    session = GitSession(clone.git_dir)
+    try:
+        assert session.resolve("HEAD") == clone.head.commit.hexsha
+        assert session.resolve("refs/heads/missing") is None
+        # No upstream configured: cat-file exits instead of answering
+        clone.git.checkout("-b", "local-only")
+        assert session.resolve("local-only@{upstream}") is None
+        tip = _commit(clone, "b.md")
+        assert session.resolve("local-only") == tip
+        assert session.read_object("HEAD")[0] == "commit"
+        assert session.stats()["processes_started"] == 3
+    finally:
+        session.close()
+
+
+def test_ahead_behind_matches_rev_list(clone: Repo, tmp_path: Path):
+    other = Repo.clone_from(str(tmp_path / "remote.git"), tmp_path / "other", branch="main")
+    for i in range(3):
+        _commit(other, f"remote-{i}.md")
+    other.git.push("origin", "main")
+    clone.git.fetch("origin")
+    for i in range(2):
+        _commit(clone, f"local-{i}.md")
+
+    session = session_for(clone)
+    assert session.ahead_behind("main", "origin/main") == (2, 3) == _rev_list_counts(clone, "main", "origin/main")
+
+    clone.git.merge("origin/main", "--no-edit")
+    _commit(clone, "after-merge.md")
+    expected = _rev_list_counts(clone, "main", "origin/main")
+    assert session.ahead_behind("main", "origin/main") == expected == (4, 0)
+    assert session.ahead_behind("main", "origin/missing") is None
+
+
+def test_ahead_behind_matches_rev_list_on_merge_heavy_history(clone: Repo, tmp_path: Path):
+    other = Repo.clone_from(str(tmp_path / "remote.git"), tmp_path / "other", branch="main")
+    with other.config_writer() as config:
+        config.set_value("user", "name", _AUTHOR.name)
+        config.set_value("user", "email", _AUTHOR.email)
+    for repo, side in ((clone, "local"), (other, "remote")):
+        for b in range(4):
+            repo.git.checkout("-b", f"{side}-{b}", "main")
+            for i in range(3):
+                _commit(repo, f"{side}-{b}-{i}.md")
+        repo.git.checkout("main")
+        for b in range(4):
+            repo.git.merge(f"{side}-{b}", "--no-ff", "--no-edit")
+    other.git.push("origin", "main")
+    clone.git.fetch("origin")
+
+    expected = _rev_list_counts(clone, "main", "origin/main")
+    assert session_for(clone).ahead_behind("main", "origin/main") == expected == (16, 16)
+
+
+def test_ahead_behind_gives_up_past_walk_limit(clone: Repo, monkeypatch):
+    for i in range(5):
+        _commit(clone, f"local-{i}.md")
+    monkeypatch.setattr(git_session, "MAX_WALK", 3)
+    assert session_for(clone).ahead_behind("main", "origin/main") is None
+
+
+def test_unmerged_paths_reads_conflicts_from_index(clone: Repo):
+    session = session_for(clone)
+    assert session.unmerged_paths() == []
+
+    clone.git.checkout("-b", "side")
+    _commit(clone, "a.md", "side\n")
+    clone.git.checkout("main")
+    _commit(clone, "a.md", "main\n")
+    with pytest.raises(Exception):
+        clone.git.merge("side")
+    assert session.unmerged_paths() == ["a.md"]
+
+    clone.git.update_index("--index-version", "4")
+    assert session.unmerged_paths() is None
+
+
+def test_callers_agree_with_and_without_sessions(clone: Repo, monkeypatch):
+    root = Path(clone.working_tree_dir)
+    clone.git.checkout("-b", "unpublished")
+    assert find_git_dir(root / "sub") == Path(clone.git_dir)
+
+    results = []
+    for enabled in ("1", "0"):
+        monkeypatch.setenv("WCOOLER_GIT_SESSION", enabled)
+        info = discover_git_info(root)
+        results.append((info, _branch_has_upstream(root, "main"), _branch_has_upstream(root, "unpublished")))
+    assert results[0] == results[1]
+    assert results[0][0].commit == clone.head.commit.hexsha[:7]
+    assert results[0][1:] == (True, False)
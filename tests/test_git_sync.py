@@ -1146,7 +1146,7 @@ def test_sync_write_no_commit_skips_push(tmp_path, monkeypatch):
         push_called.append(True)
         return (True, None)
 
-    def mock_commit_local(message):
+    def mock_commit_local(message, paths=None):
         # Simulate no changes to commit
         return False
 
@@ -1161,3 +1161,104 @@ def test_sync_write_no_commit_skips_push(tmp_path, monkeypatch):
     assert result == "no changes"
     # push_after_commit should NOT be called if no commit was made
     assert len(push_called) == 0
+
+
+def test_commit_local_with_paths_commits_only_those_paths(tmp_path):
+    remote = tmp_path / "remote.git"
+    seed_remote_with_main(remote)
+
+    mgr = GitSyncManager(
+        repo_url=remote.as_posix(),
+        local_path=tmp_path / "threads",
+        ssh_key_path=None,
+    )
+    root = mgr.local_path
+    graph = root / "graph" / "baseline"
+    graph.mkdir(parents=True)
+    touch(root / "topic.md", "entry\n")
+    touch(graph / "nodes.jsonl", "{}\n")
+    touch(root / "unrelated.md", "draft\n")
+    touch(root / "staged.md", "staged\n")
+    mgr._repo.index.add(["staged.md"])
+    paths = [root / "topic.md", graph, root / "missing.md", tmp_path / "outside.md"]
+
+    assert mgr.commit_local("write", paths) is True
+    head = mgr._repo.head.commit
+    assert sorted(d.b_path for d in head.diff(head.parents[0])) == ["graph/baseline/nodes.jsonl", "topic.md"]
+    assert "unrelated.md" in mgr._repo.untracked_files
+    assert [d.a_path for d in mgr._repo.index.diff("HEAD")] == ["staged.md"]
+
+    # Unchanged paths: nothing to commit, other changes stay uncommitted
+    assert mgr.commit_local("again", paths) is False
+    assert mgr._repo.head.commit == head
+
+    (root / "topic.md").unlink()
+    assert mgr.commit_local("remove", ["topic.md"]) is True
+    assert "topic.md" not in mgr._repo.head.commit.tree
+
+
+def test_push_pending_retry_pulls_past_fetch_ttl(tmp_path, monkeypatch):
+    from watercooler_mcp.fetch_coordinator import get_fetch_coordinator
+
+    remote = tmp_path / "remote.git"
+    seed_remote_with_main(remote)
+    monkeypatch.setattr(get_fetch_coordinator(), "_ttl", 60.0)
+
+    mgr = GitSyncManager(
+        repo_url=remote.as_posix(),
+        local_path=tmp_path / "threads",
+        ssh_key_path=None,
+    )
+    assert mgr.pull() is True  # Fetch reused by pulls within the TTL
+
+    other = Repo.clone_from(remote.as_posix(), tmp_path / "other", branch="main")
+    touch(tmp_path / "other" / "theirs.md", "theirs\n")
+    other.index.add(["theirs.md"])
+    other.index.commit("theirs")
+    other.remotes.origin.push("main:main")
+
+    touch(mgr.local_path / "ours.md", "ours\n")
+    assert mgr.commit_local("ours") is True
+    # Rejected push: the retry fetches again instead of reusing the TTL
+    assert mgr.push_pending(max_retries=2) is True
+
+    remote_log = Repo(remote).git.log("--format=%s", "main").splitlines()
+    assert remote_log[:2] == ["ours", "theirs"]
+
+
+def test_push_current_branch_takes_lock_only_to_rebase(tmp_path):
+    remote = tmp_path / "remote.git"
+    seed_remote_with_main(remote)
+
+    mgr = GitSyncManager(
+        repo_url=remote.as_posix(),
+        local_path=tmp_path / "threads",
+        ssh_key_path=None,
+    )
+
+    class _Lock:
+        entered = 0
+
+        def __enter__(self):
+            self.entered += 1
+
+        def __exit__(self, *exc):
+            return False
+
+    lock = _Lock()
+    touch(mgr.local_path / "graph.md", "one\n")
+    assert mgr.commit_local("one") is True
+    assert mgr.push_current_branch(lock=lock) == (True, None)
+    assert lock.entered == 0
+
+    other = Repo.clone_from(remote.as_posix(), tmp_path / "other", branch="main")
+    touch(tmp_path / "other" / "theirs.md", "theirs\n")
+    other.index.add(["theirs.md"])
+    other.index.commit("theirs")
+    other.remotes.origin.push("main:main")
+
+    touch(mgr.local_path / "graph.md", "two\n")
+    assert mgr.commit_local("two") is True
+    assert mgr.push_current_branch(lock=lock) == (True, None)
+    assert lock.entered == 1
+    assert Repo(remote).git.log("--format=%s", "main").splitlines()[:3] == ["two", "theirs", "one"]
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from watercooler.baseline_graph import graph_cache, graph_store, jsonl_log, reader, sync
+from watercooler.baseline_graph.search import SearchQuery, search_graph
+
+
+@pytest.fixture
+def nodes(graph_builder):
+    return graph_builder(embedding=[0.1, 0.2])
+
+
+@pytest.fixture
+def graph(tmp_path: Path, nodes):
+    nodes.write(tmp_path, body="body {topic} {i}")
+    graph_cache.enable()
+    yield tmp_path
+    graph_cache.disable()
+
+
+def _reads(threads_dir: Path):
+    return (
+        reader.list_threads_from_graph(threads_dir),
+        reader.read_thread_from_graph(threads_dir, "beta"),
+        reader.read_thread_from_graph(threads_dir, "missing"),
+        reader.get_entry_from_graph(threads_dir, "gamma", entry_id="gamma-3"),
+        reader.get_entry_from_graph(threads_dir, "gamma", entry_id="nope", index=2),
+        reader.get_entry_from_graph(threads_dir, "alpha", entry_id="gamma-3"),
+        reader.get_entries_range_from_graph(threads_dir, "alpha", 1, 3),
+        reader.get_entries_range_from_graph(threads_dir, "alpha", 2),
+    )
+
+
+def _no_store(monkeypatch):
+    monkeypatch.setattr(graph_store, "_select", lambda *a: pytest.fail("read went to the graph store"))
+
+
+def test_reader_lookups_served_from_memory(graph: Path, monkeypatch):
+    graph_cache.disable()
+    scanned = _reads(graph)
+    graph_cache.enable()
+    _no_store(monkeypatch)
+    assert _reads(graph) == scanned
+    assert _reads(graph)[3].body == "body gamma 3"
+
+
+def test_search_candidates_served_from_memory(graph: Path, monkeypatch):
+    query = SearchQuery(limit=100, thread_topic="beta")
+    graph_cache.disable()
+    scanned = search_graph(graph, query)
+    graph_cache.enable()
+    _no_store(monkeypatch)
+    cached = search_graph(graph, query)
+    assert [r.node_id for r in cached.results] == [r.node_id for r in scanned.results]
+    assert cached.count == 6
+
+
+def test_sync_writes_patch_snapshot(graph: Path, nodes, monkeypatch):
+    nodes_file = graph / "graph" / "baseline" / "nodes.jsonl"
+    assert reader.read_thread_from_graph(graph, "beta")
+
+    reads: list[int] = []
+    orig = graph_cache._read
+    monkeypatch.setattr(graph_cache, "_read", lambda *a: reads.append(1) or orig(*a))
+    sync._write_nodes(graph, nodes_file, [nodes.thread("beta", "OPEN"), nodes.entry("beta", 5), nodes.entry("beta", 1, "edited")])
+    thread, entries = reader.read_thread_from_graph(graph, "beta")
+    assert thread.status == "OPEN"
+    assert [e.index for e in entries] == [0, 1, 2, 3, 4, 5]
+    assert entries[1].body == "edited"
+
+    monkeypatch.setattr(jsonl_log, "COMPACT_MIN_BYTES", 0)
+    monkeypatch.setattr(jsonl_log, "COMPACT_GROWTH", 0.0)
+    sync._write_nodes(graph, nodes_file, [nodes.entry("gamma", 0, "compacted")])
+    assert len(nodes_file.read_text().splitlines()) == 19
+    assert reader.get_entry_from_graph(graph, "gamma", index=0).body == "compacted"
+    assert reader.get_entry_from_graph(graph, "beta", entry_id="beta-1").body == "edited"
+    assert reads == []
+
+
+def test_external_change_is_picked_up(graph: Path, nodes):
+    nodes_file = graph / "graph" / "baseline" / "nodes.jsonl"
+    assert reader.get_entry_from_graph(graph, "alpha", index=0).body == "body alpha 0"
+    with open(nodes_file, "a", encoding="utf-8") as f:
+        f.write(json.dumps(nodes.entry("alpha", 0, "changed elsewhere")) + "\n")
+    assert reader.get_entry_from_graph(graph, "alpha", index=0).body == "changed elsewhere"
+
+
+def test_evicted_bodies_are_reread(graph: Path):
+    graph_cache.enable(max_body_bytes=20)
+    assert graph_cache._body_bytes <= 20
+    entries = reader.get_entries_range_from_graph(graph, "alpha")
+    assert [e.body for e in entries] == [f"body alpha {i}" for i in range(5)]
+    assert graph_cache._body_bytes <= 20
+
+
+def test_disabled_cache_is_not_consulted(graph: Path):
+    graph_cache.disable()
+    nodes_file = graph / "graph" / "baseline" / "nodes.jsonl"
+    assert graph_cache.find_nodes(graph, nodes_file, node_type="thread") is None
+    assert len(reader.list_threads_from_graph(graph, open_only=None)) == 3
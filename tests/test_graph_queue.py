@@ -0,0 +1,236 @@
+"""Tests for the background graph sync queue."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from watercooler.baseline_graph import sync as graph_sync
+from watercooler.baseline_graph.reader import _load_nodes, read_thread_from_graph
+from watercooler.baseline_graph.sync import get_graph_sync_state, sync_entries_to_graph
+from watercooler.config_schema import GraphConfig
+from watercooler_mcp import graph_queue
+from watercooler_mcp.graph_queue import GraphSyncQueue, queue_path, queue_status
+
+
+def _entry_id(topic: str, n: int) -> str:
+    return f"01{topic[0].upper()}".ljust(25, "0") + str(n)
+
+
+def _entry(topic: str, n: int) -> str:
+    return f"""
+---
+Entry: Claude (user) 2025-01-01T0{n}:00:00Z
+Role: implementer
+Type: Note
+Title: {topic} {n}
+
+Body of {topic} {n}.
+<!-- Entry-ID: {_entry_id(topic, n)} -->
+"""
+
+
+def _write_thread(threads_dir: Path, topic: str, entries: int) -> None:
+    header = f"# {topic} — Thread\nStatus: OPEN\nBall: Claude (user)\nTopic: {topic}\nCreated: 2025-01-01T00:00:00Z\n"
+    body = "".join(_entry(topic, n) for n in range(1, entries + 1))
+    (threads_dir / f"{topic}.md").write_text(header + body, encoding="utf-8")
+
+
+class _Manager:
+    def __init__(self) -> None:
+        self.messages: list[str] = []
+        self.pushes = 0
+
+    def commit_graph_changes(self, topic=None, entry_id=None, max_retries=5, *, message=None, push=True) -> bool:
+        self.messages.append(message)
+        return True
+
+    def push_current_branch(self, max_retries=5, *, lock=None):
+        self.pushes += 1
+        return (True, None)
+
+
+@pytest.fixture
+def threads_dir(tmp_path: Path, monkeypatch) -> Path:
+    threads = tmp_path / "threads"
+    threads.mkdir()
+    _write_thread(threads, "alpha", 3)
+    _write_thread(threads, "beta", 2)
+    config = SimpleNamespace(mcp=SimpleNamespace(graph=GraphConfig()))
+    monkeypatch.setattr("watercooler_mcp.config.get_watercooler_config", lambda *a, **k: config)
+    return threads
+
+
+def test_sync_entries_to_graph_writes_batch_once(threads_dir: Path, monkeypatch):
+    writes: list[int] = []
+    orig = graph_sync._write_nodes
+    monkeypatch.setattr(graph_sync, "_write_nodes", lambda *a: writes.append(1) or orig(*a))
+
+    results = sync_entries_to_graph(
+        threads_dir,
+        {"alpha": [_entry_id("alpha", 2), _entry_id("alpha", 3)], "beta": [None], "gone": [None]},
+    )
+
+    assert results == {"alpha": True, "beta": True, "gone": False}
+    assert writes == [1]
+    thread, entries = read_thread_from_graph(threads_dir, "alpha")
+    assert [e.index for e in entries] == [1, 2]
+    assert get_graph_sync_state(threads_dir, "alpha").entries_synced == 2
+    assert get_graph_sync_state(threads_dir, "beta").last_synced_entry_id == _entry_id("beta", 2)
+
+
+def test_sync_entries_to_graph_batches_embeddings(threads_dir: Path, monkeypatch):
+    batches: list[list[str]] = []
+    monkeypatch.setattr(graph_sync, "is_embedding_available", lambda config=None: True)
+    monkeypatch.setattr(
+        graph_sync,
+        "generate_embedding_batch",
+        lambda texts, config=None: batches.append(texts) or [[0.5, 0.5]] * len(texts),
+    )
+
+    sync_entries_to_graph(threads_dir, {"alpha": [None], "beta": [None]}, generate_embeddings=True)
+
+    assert len(batches) == 1 and len(batches[0]) == 2
+    embedded = [n for n in _load_nodes(threads_dir / "graph" / "baseline") if n.get("embedding")]
+    assert len(embedded) == 2
+
+
+def test_deferred_enrichment_is_staged_then_replaced(threads_dir: Path, monkeypatch):
+    monkeypatch.setattr(graph_sync, "_available_summarizer", lambda: pytest.fail("staging called the LLM"))
+    monkeypatch.setattr(graph_sync, "_available_embedder", lambda: pytest.fail("staging called the embedder"))
+    entry_id = _entry_id("alpha", 3)
+
+    sync_entries_to_graph(threads_dir, {"alpha": [entry_id]}, True, True, deferred_enrichment=True)
+    staged = next(n for n in _load_nodes(threads_dir / "graph" / "baseline") if n.get("entry_id") == entry_id)
+    assert staged["enrichment"] == graph_sync.ENRICHMENT_PENDING
+    assert staged["summary"].startswith("Body of alpha 3.")
+    assert "embedding" not in staged
+
+    monkeypatch.setattr(graph_sync, "_available_embedder", lambda: object())
+    monkeypatch.setattr(graph_sync, "generate_embedding_batch", lambda texts, config=None: [[0.5, 0.5]] * len(texts))
+    sync_entries_to_graph(threads_dir, {"alpha": [entry_id]}, generate_embeddings=True)
+    enriched = next(n for n in _load_nodes(threads_dir / "graph" / "baseline") if n.get("entry_id") == entry_id)
+    assert "enrichment" not in enriched
+    assert enriched["embedding"] == [0.5, 0.5]
+
+
+def test_queue_coalesces_burst_into_one_commit(threads_dir: Path):
+    manager = _Manager()
+    queue = GraphSyncQueue(threads_dir, manager, batch_window=0.2)
+    try:
+        queue.enqueue("alpha", _entry_id("alpha", 1))
+        queue.enqueue("alpha", _entry_id("alpha", 2))
+        queue.enqueue("alpha", _entry_id("alpha", 2))
+        queue.enqueue("beta", _entry_id("beta", 1))
+        assert queue.depth() == 3
+        assert queue.flush(timeout=10)
+    finally:
+        queue.shutdown()
+
+    status = queue.status()
+    assert status["depth"] == 0
+    assert status["batches"] == 1 and status["last_batch_size"] == 3
+    assert status["last_error"] is None
+    assert manager.messages == ["graph: sync 2 topics\n\n- alpha\n- beta"]
+    assert not queue_path(threads_dir).exists()
+    assert read_thread_from_graph(threads_dir, "beta")
+
+
+def test_queue_resumes_persisted_entries(threads_dir: Path, monkeypatch):
+    path = queue_path(threads_dir)
+    path.write_text(
+        json.dumps({"topic": "beta", "entry_id": _entry_id("beta", 2)}) + "\n" + '{"topic": "al',
+        encoding="utf-8",
+    )
+    assert queue_status(threads_dir) == {
+        "mode": "idle", "depth": 1, "pending_topics": ["beta"], "syncing": False,
+    }
+
+    manager = _Manager()
+    monkeypatch.setattr(graph_queue, "_queues", {})
+    queue = graph_queue.get_graph_sync_queue(threads_dir, manager)
+    try:
+        assert queue.flush(timeout=10)
+        assert queue_status(threads_dir)["mode"] == "background"
+    finally:
+        queue.shutdown()
+    assert manager.messages == [f"graph: sync beta/{_entry_id('beta', 2)}"]
+
+
+def test_failed_batch_stays_queued_and_is_retried(threads_dir: Path, monkeypatch):
+    monkeypatch.setattr(graph_queue, "RETRY_BASE", 0.5)
+    monkeypatch.setattr(graph_queue, "MAX_ATTEMPTS", 2)
+    manager = _Manager()
+    queue = GraphSyncQueue(threads_dir, manager, batch_window=0.05)
+    real_sync = queue._sync
+
+    def failing_sync(batch):
+        raise RuntimeError("embedding service down")
+
+    queue._sync = failing_sync
+    try:
+        queue.enqueue("alpha", _entry_id("alpha", 1))
+        queue.enqueue("gone", None)
+        deadline = time.time() + 5
+        while queue.status()["batches"] < 1 and time.time() < deadline:
+            time.sleep(0.01)
+
+        # Back in the queue, in memory and on disk, waiting for the retry
+        assert queue.status()["pending_topics"] == ["alpha"]
+        assert [json.loads(line)["topic"] for line in queue_path(threads_dir).read_text().splitlines()] == ["alpha"]
+        assert not queue.flush(timeout=10)
+
+        # Retried once, then parked; the thread that no longer exists is dropped
+        status = queue.status()
+        assert status["batches"] == 2 and "embedding service down" in status["last_error"]
+        assert status["pending_topics"] == [] and status["parked_topics"] == ["alpha"]
+        queued = [json.loads(line) for line in queue_path(threads_dir).read_text().splitlines()]
+        assert queued == [{"topic": "alpha", "entry_id": _entry_id("alpha", 1)}]
+
+        # A new write to the topic retries the parked entries with it
+        queue._sync = real_sync
+        queue.enqueue("alpha", _entry_id("alpha", 2))
+        assert queue.flush(timeout=10)
+    finally:
+        queue.shutdown()
+    assert manager.messages == ["graph: sync alpha"]
+    assert queue.status()["parked_topics"] == []
+    assert not queue_path(threads_dir).exists()
+
+
+def test_worker_pushes_outside_git_lock(threads_dir: Path):
+    class _Pusher(_Manager):
+        def __init__(self) -> None:
+            super().__init__()
+            self.lock_free_during_push: list[bool] = []
+
+        def push_current_branch(self, max_retries=5, *, lock=None):
+            # A write on another thread can take the lock while we push
+            taken = []
+
+            def write() -> None:
+                if lock.acquire(blocking=False):
+                    taken.append(True)
+                    lock.release()
+
+            probe = threading.Thread(target=write)
+            probe.start()
+            probe.join()
+            self.lock_free_during_push.append(taken == [True])
+            return super().push_current_branch(max_retries, lock=lock)
+
+    manager = _Pusher()
+    queue = GraphSyncQueue(threads_dir, manager, batch_window=0.05)
+    try:
+        queue.enqueue("alpha", None)
+        assert queue.flush(timeout=10)
+    finally:
+        queue.shutdown()
+    assert manager.pushes == 1
+    assert manager.lock_free_during_push == [True]
+
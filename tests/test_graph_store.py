@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from watercooler.baseline_graph import graph_store, reader, sync
+from watercooler.baseline_graph.search import SearchQuery, search_graph
+
+
+@pytest.fixture
+def nodes(graph_builder):
+    return graph_builder()
+
+
+@pytest.fixture
+def graph(tmp_path: Path, nodes) -> Path:
+    nodes.write(tmp_path, extra=[{"id": "other:x", "type": "other", "topic": "alpha"}])
+    return tmp_path
+
+
+def _reads(threads_dir: Path):
+    return (
+        reader.list_threads_from_graph(threads_dir),
+        reader.list_threads_from_graph(threads_dir, open_only=False),
+        reader.read_thread_from_graph(threads_dir, "beta"),
+        reader.read_thread_from_graph(threads_dir, "missing"),
+        reader.get_entry_from_graph(threads_dir, "gamma", entry_id="gamma-3"),
+        reader.get_entry_from_graph(threads_dir, "gamma", entry_id="nope", index=2),
+        reader.get_entry_from_graph(threads_dir, "gamma", index=4),
+        reader.get_entries_range_from_graph(threads_dir, "alpha", 1, 3),
+        reader.get_entries_range_from_graph(threads_dir, "alpha", 2),
+    )
+
+
+def test_reader_lookups_match_scan(graph: Path, monkeypatch):
+    stored = _reads(graph)
+    assert graph_store.store_path(graph).exists()
+    monkeypatch.setattr(graph_store, "_select", lambda *a: None)
+    assert stored == _reads(graph)
+    assert [e.index for e in stored[7]] == [1, 2, 3]
+    assert stored[5].entry_id == "gamma-2"
+
+
+def test_store_reads_only_matching_nodes(graph: Path):
+    nodes_file = graph / "graph" / "baseline" / "nodes.jsonl"
+    found = graph_store.find_nodes(graph, nodes_file, node_type="entry", thread_topic="beta", min_index=3)
+    assert [n["entry_id"] for n in found] == ["beta-3", "beta-4"]
+    assert graph_store.find_nodes(graph, nodes_file, entry_id="alpha-0")[0]["title"] == "alpha 0"
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"thread_topic": "beta"},
+        {"thread_topic": "beta", "include_entries": False},
+        {"include_entries": False, "thread_status": "closed"},
+        {"thread_topic": "alpha", "query": "text"},
+    ],
+)
+def test_search_candidates_match_scan(graph: Path, monkeypatch, kwargs):
+    query = SearchQuery(limit=100, **kwargs)
+    stored = search_graph(graph, query)
+    monkeypatch.setattr(graph_store, "_select", lambda *a: None)
+    scanned = search_graph(graph, query)
+    assert [r.node_id for r in stored.results] == [r.node_id for r in scanned.results]
+    assert stored.count > 0
+    assert stored.total_scanned <= scanned.total_scanned
+
+
+def test_sync_writes_update_store_in_place(graph: Path, nodes, monkeypatch):
+    nodes_file = graph / "graph" / "baseline" / "nodes.jsonl"
+    assert reader.read_thread_from_graph(graph, "beta")
+
+    rebuilds: list[int] = []
+    orig = graph_store._rebuild
+    monkeypatch.setattr(graph_store, "_rebuild", lambda *a: rebuilds.append(1) or orig(*a))
+    sync._write_nodes(graph, nodes_file, [nodes.thread("beta", "OPEN"), nodes.entry("beta", 5), nodes.entry("beta", 1, "edited")])
+
+    thread, entries = reader.read_thread_from_graph(graph, "beta")
+    assert rebuilds == []
+    assert thread.status == "OPEN"
+    assert [e.index for e in entries] == [0, 1, 2, 3, 4, 5]
+    assert entries[1].body == "edited"
+    assert {t.topic for t in reader.list_threads_from_graph(graph, open_only=False)} == set()
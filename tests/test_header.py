@@ -1,6 +1,14 @@
 from __future__ import annotations
 
-from watercooler.header import _header_split, _replace_header_line, bump_header
+from watercooler.header import (
+    HEADER_FIELD_WIDTHS,
+    _header_split,
+    _replace_header_line,
+    append_text,
+    bump_header,
+    patch_header_in_place,
+)
+from watercooler.metadata import BALL_RE, STAT_RE
 
 
 def test_header_split_and_replace():
@@ -17,3 +25,41 @@ def test_bump_header():
     assert "Status: done" in out
     assert "Ball: claude" in out
 
+
+
+def test_bump_header_fixed_width_pads_existing_fields():
+    text = "Status: open\nBall: codex\n\nBody"
+    out = bump_header(text, status="done", fixed_width=True)
+    status_line, ball_line = out.split("\n\n")[0].splitlines()
+    assert status_line.rstrip() == "Status: done"
+    assert ball_line.rstrip() == "Ball: codex"
+    assert len(status_line) == len("Status: ") + HEADER_FIELD_WIDTHS["Status"]
+    assert len(ball_line) == len("Ball: ") + HEADER_FIELD_WIDTHS["Ball"]
+
+
+def test_patch_header_in_place(tmp_path):
+    p = tmp_path / "t.md"
+    p.write_text(bump_header("# T\nStatus: OPEN\nBall: codex\n\nBody\n", fixed_width=True), encoding="utf-8")
+    size = p.stat().st_size
+    assert patch_header_in_place(p, status="IN_REVIEW", ball="Claude (alice)") is True
+    text = p.read_text(encoding="utf-8")
+    assert p.stat().st_size == size
+    assert STAT_RE.search(text).group("val").strip() == "IN_REVIEW"
+    assert BALL_RE.search(text).group("val").strip() == "Claude (alice)"
+    assert text.endswith("\n\nBody\n")
+
+
+def test_patch_header_in_place_requires_fixed_width_layout(tmp_path):
+    p = tmp_path / "t.md"
+    original = "# T\nStatus: OPEN\nBall: codex\n\nBody\n"
+    p.write_text(original, encoding="utf-8")
+    assert patch_header_in_place(p, ball="a much longer ball owner") is False
+    assert p.read_text(encoding="utf-8") == original
+
+
+def test_append_text_matches_rstrip_concat(tmp_path):
+    p = tmp_path / "t.md"
+    original = "# T\n\nEntry body\n\n  \n"
+    p.write_text(original, encoding="utf-8")
+    append_text(p, "\n\nnext\n")
+    assert p.read_text(encoding="utf-8") == original.rstrip() + "\n\nnext\n"
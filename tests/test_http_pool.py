@@ -0,0 +1,62 @@
+"""Tests for the shared HTTP client pool."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from watercooler import http_pool
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pool():
+    http_pool.close_all()
+    yield
+    http_pool.close_all()
+
+
+def test_client_is_shared_per_api_base():
+    client = http_pool.client("http://localhost:8080/v1")
+    assert http_pool.client("http://localhost:8080/v1/") is client
+    assert http_pool.client("http://localhost:11434/v1") is not client
+
+
+def test_closed_clients_are_recreated():
+    client = http_pool.client("http://localhost:8080/v1")
+    http_pool.close_all()
+    assert client.is_closed
+    assert http_pool.client("http://localhost:8080/v1") is not client
+
+
+def test_pool_limits_from_env(monkeypatch):
+    monkeypatch.setenv("WATERCOOLER_HTTP_MAX_CONNECTIONS", "3")
+    monkeypatch.setenv("WATERCOOLER_HTTP_MAX_KEEPALIVE", "bogus")
+    limits = http_pool._client_options()["limits"]
+    assert limits.max_connections == 3
+    assert limits.max_keepalive_connections == http_pool.DEFAULT_MAX_KEEPALIVE
+
+
+def test_async_clients_are_per_event_loop():
+    async def use() -> httpx.AsyncClient:
+        client = http_pool.async_client("http://localhost:8080/v1")
+        assert http_pool.async_client("http://localhost:8080/v1") is client
+        await http_pool.aclose_async_clients()
+        return client
+
+    first = asyncio.run(use())
+    second = asyncio.run(use())
+    assert first is not second
+    assert first.is_closed and second.is_closed
+
+
+def test_requests_reuse_the_pooled_client(mock_embedding_server):
+    from watercooler.baseline_graph import sync
+
+    config = sync.EmbeddingConfig(api_base="http://embed.test/v1")
+    assert sync.generate_embedding("a", config) == [1.0]
+    assert sync.generate_embedding("b", config) == [1.0]
+    assert mock_embedding_server.requests == ["a", "b"]
+    assert list(http_pool._clients) == ["http://embed.test/v1"]
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import os
+import subprocess
+import sys
+import threading
 import time
 from pathlib import Path
 
-from watercooler.lock import AdvisoryLock
+import pytest
+
+from watercooler.lock import AdvisoryLock, FlockLock, thread_lock
 
 
 def test_lock_acquire_release(tmp_path: Path):
@@ -28,3 +34,86 @@ def test_lock_timeout_then_force_break(tmp_path: Path):
     finally:
         l1.release()
 
+
+
+requires_flock = pytest.mark.skipif(sys.platform == "win32", reason="fcntl.flock is POSIX-only")
+
+
+@requires_flock
+def test_flock_shared_and_exclusive(tmp_path: Path):
+    p = tmp_path / "t.lock"
+    r1 = FlockLock(p, shared=True, timeout=0)
+    r2 = FlockLock(p, shared=True, timeout=0)
+    assert r1.acquire() and r2.acquire()
+    try:
+        assert FlockLock(p, timeout=0).acquire() is False
+        assert FlockLock(p, timeout=0.2).acquire() is False
+    finally:
+        r1.release()
+        r2.release()
+
+    with FlockLock(p, timeout=0) as w:
+        assert w.get_lock_info()["pid"] == os.getpid()
+        assert FlockLock(p, shared=True, timeout=0).acquire() is False
+    # Lock file persists; only the kernel lock is dropped
+    assert p.exists()
+    with FlockLock(p, shared=True, timeout=0):
+        pass
+
+
+@requires_flock
+def test_flock_waiter_wakes_on_release(tmp_path: Path):
+    p = tmp_path / "t.lock"
+    holder = FlockLock(p)
+    holder.acquire()
+    threading.Timer(0.2, holder.release).start()
+    start = time.monotonic()
+    with FlockLock(p, timeout=5):
+        waited = time.monotonic() - start
+    assert 0.15 < waited < 2
+
+
+@requires_flock
+def test_flock_timeouts_leave_no_waiters_behind(tmp_path: Path):
+    p = tmp_path / "t.lock"
+    fd_dir = Path("/proc/self/fd")
+    with FlockLock(p):
+        threads = threading.active_count()
+        fds = len(os.listdir(fd_dir)) if fd_dir.exists() else None
+        for _ in range(20):
+            assert FlockLock(p, timeout=0.01).acquire() is False
+        assert threading.active_count() == threads
+        if fds is not None:
+            assert len(os.listdir(fd_dir)) == fds
+
+
+@requires_flock
+def test_flock_released_when_holder_dies(tmp_path: Path):
+    p = tmp_path / "t.lock"
+    code = (
+        "import sys, time; from pathlib import Path; from watercooler.lock import FlockLock; "
+        f"l = FlockLock(Path({str(p)!r})); l.acquire(); print('held', flush=True); time.sleep(60)"
+    )
+    proc = subprocess.Popen([sys.executable, "-c", code], stdout=subprocess.PIPE, text=True)
+    try:
+        assert proc.stdout.readline().strip() == "held"
+        assert FlockLock(p, timeout=0).acquire() is False
+        proc.kill()
+        proc.wait()
+        with FlockLock(p, timeout=5):
+            pass
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+
+
+@requires_flock
+def test_thread_lock_backend_selection(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("WCOOLER_LOCK_BACKEND", "file")
+    assert isinstance(thread_lock("topic", tmp_path), AdvisoryLock)
+    with thread_lock("topic", tmp_path, shared=True):
+        pass
+    monkeypatch.setenv("WCOOLER_LOCK_BACKEND", "auto")
+    lock = thread_lock("topic", tmp_path)
+    assert isinstance(lock, FlockLock)
+    assert lock.path.parent.parent.name == ".wc-cache"
@@ -104,6 +104,29 @@ def test_get_thread_entry_by_index(patched_context):
     assert entry["markdown"].startswith("Entry: Codex (caleb)")
 
 
+def test_get_thread_entry_negative_index(patched_context):
+    result = server.get_thread_entry.fn(topic="entry-access-tools", index=-1, code_path=".")
+    payload = _extract_payload(result)
+
+    assert payload["index"] == 1
+    assert payload["entry_count"] == 2
+    assert payload["entry"]["entry_id"] == "01KA0PYSR7X43QQ61H1BCR3S2S"
+    assert payload == _extract_payload(server.get_thread_entry.fn(topic="entry-access-tools", index=1, code_path="."))
+
+    result = server.get_thread_entry.fn(topic="entry-access-tools", index=-3, code_path=".")
+    assert "out of range" in _extract_text(result)
+
+
+def test_get_thread_entry_negative_index_with_nested_fences(patched_context):
+    # A 4-backtick block quoting a fence with an info string in the last entry
+    text = patched_context.read_text(encoding="utf-8").replace("Another body line", "````\n```python\n````")
+    patched_context.write_text(text, encoding="utf-8")
+
+    payload = _extract_payload(server.get_thread_entry.fn(topic="entry-access-tools", index=-2, code_path="."))
+    assert (payload["index"], payload["entry_count"]) == (0, 2)
+    assert payload["entry"]["entry_id"] == "01KA0PK97G9Q6AB0B17896Y1EB"
+
+
 def test_get_thread_entry_by_id(patched_context):
     result = server.get_thread_entry.fn(
         topic="entry-access-tools",
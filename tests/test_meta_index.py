@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+from watercooler import commands, meta_index
+
+
+def _say(tmp_path: Path, topic: str, agent: str, **kw) -> None:
+    commands.say(topic, threads_dir=tmp_path, agent=agent, role="implementer", title="t", body="b", **kw)
+
+
+def test_listing_builds_index_and_ignores_it_in_git(tmp_path: Path):
+    commands.init_thread("alpha", threads_dir=tmp_path)
+    rows = commands.list_threads(threads_dir=tmp_path)
+    assert [r[4].name for r in rows] == ["alpha.md"]
+
+    records = meta_index.load_index(tmp_path)
+    assert "alpha.md" in records
+    gitignore = tmp_path / ".wc-cache" / ".gitignore"
+    assert gitignore.read_text(encoding="utf-8").strip() == "*"
+
+
+def test_writers_update_index_in_place(tmp_path: Path):
+    _say(tmp_path, "alpha", "Claude")
+    rec = meta_index.load_index(tmp_path)["alpha.md"]
+    assert rec.last_who and rec.last_who.startswith("Claude")
+    assert rec.matches((tmp_path / "alpha.md").stat())
+
+    commands.set_status("alpha", threads_dir=tmp_path, status="in-review")
+    rec = meta_index.load_index(tmp_path)["alpha.md"]
+    assert rec.status == "in-review"
+    assert rec.matches((tmp_path / "alpha.md").stat())
+
+    commands.set_ball("alpha", threads_dir=tmp_path, ball="codex")
+    assert meta_index.load_index(tmp_path)["alpha.md"].ball == "codex"
+
+
+def test_unchanged_files_are_not_reread(tmp_path: Path, monkeypatch):
+    for t in ("alpha", "beta"):
+        commands.init_thread(t, threads_dir=tmp_path)
+    commands.list_threads(threads_dir=tmp_path)
+
+    calls: list[str] = []
+    orig = meta_index.record_from_text
+
+    def spy(p, text, st):
+        calls.append(p.name)
+        return orig(p, text, st)
+
+    monkeypatch.setattr(meta_index, "record_from_text", spy)
+    commands.list_threads(threads_dir=tmp_path)
+    assert calls == []
+
+    # External edit (e.g. git pull) is picked up via stat mismatch
+    p = tmp_path / "beta.md"
+    p.write_text(p.read_text(encoding="utf-8").replace("Status: OPEN", "Status: CLOSED"), encoding="utf-8")
+    rows = commands.list_threads(threads_dir=tmp_path, open_only=None)
+    assert calls == ["beta.md"]
+    assert {r[4].name: r[1] for r in rows}["beta.md"] == "closed"
+
+
+def test_deleted_threads_are_pruned(tmp_path: Path):
+    for t in ("alpha", "beta"):
+        commands.init_thread(t, threads_dir=tmp_path)
+    commands.list_threads(threads_dir=tmp_path)
+    (tmp_path / "alpha.md").unlink()
+    rows = commands.list_threads(threads_dir=tmp_path)
+    assert [r[4].name for r in rows] == ["beta.md"]
+    assert set(meta_index.load_index(tmp_path)) == {"beta.md"}
+
+
+def test_corrupt_index_falls_back_to_parsing(tmp_path: Path):
+    _say(tmp_path, "alpha", "Claude")
+    meta_index.index_path(tmp_path).write_text("{not json", encoding="utf-8")
+    rows = commands.list_threads(threads_dir=tmp_path)
+    assert len(rows) == 1
+    assert "alpha.md" in meta_index.load_index(tmp_path)
+
+
+def test_fast_append_matches_full_rewrite(tmp_path: Path):
+    fast_dir, slow_dir = tmp_path / "fast", tmp_path / "slow"
+    commands.init_thread("alpha", threads_dir=fast_dir)
+    # Legacy (unpadded) header forces the full-rewrite path once
+    slow_dir.mkdir()
+    legacy = (fast_dir / "alpha.md").read_text(encoding="utf-8")
+    legacy = "\n".join(ln.rstrip() for ln in legacy.split("\n"))
+    (slow_dir / "alpha.md").write_text(legacy, encoding="utf-8")
+
+    for d in (fast_dir, slow_dir):
+        commands.say("alpha", threads_dir=d, agent="Claude", role="pm", title="t", body="b", entry_id="01ABC")
+    fast = (fast_dir / "alpha.md").read_text(encoding="utf-8")
+    slow = (slow_dir / "alpha.md").read_text(encoding="utf-8")
+    ts = re.compile(r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\dZ")
+    assert ts.sub("TS", fast) == ts.sub("TS", slow)
+
+    # The migrated thread now takes the fast path too
+    commands.say("alpha", threads_dir=slow_dir, agent="Codex", role="pm", title="t2", body="b2")
+    rec = meta_index.load_index(slow_dir)["alpha.md"]
+    assert rec.matches((slow_dir / "alpha.md").stat())
+    assert rec.last_who.startswith("Codex")
+
+
+def test_fast_paths_keep_records_of_stem_titled_threads(tmp_path: Path, monkeypatch):
+    # A one-word topic without a template: the title equals the file stem
+    monkeypatch.setattr(commands, "load_template", lambda *a: (_ for _ in ()).throw(FileNotFoundError()))
+    commands.init_thread("alpha", threads_dir=tmp_path)
+    assert meta_index.load_index(tmp_path)["alpha.md"].title == "alpha"
+
+    commands.set_status("alpha", threads_dir=tmp_path, status="in-review")
+    commands.set_ball("alpha", threads_dir=tmp_path, ball="codex")
+    rec = meta_index.load_index(tmp_path)["alpha.md"]
+    assert (rec.status, rec.ball) == ("in-review", "codex")
+    assert rec.matches((tmp_path / "alpha.md").stat())
+
+
+def test_appended_heading_sets_unknown_title(tmp_path: Path):
+    p = tmp_path / "alpha.md"
+    commands.init_thread("alpha", threads_dir=tmp_path)
+    # Header without a "# " title line: the title falls back to the stem
+    p.write_text(re.sub(r"(?m)^#.*\n", "", p.read_text(encoding="utf-8")), encoding="utf-8")
+    commands.list_threads(threads_dir=tmp_path)
+    assert not meta_index.load_index(tmp_path)["alpha.md"].title_known
+
+    commands.say("alpha", threads_dir=tmp_path, agent="Claude", role="pm", title="t", body="# Kickoff\n\nb")
+    rec = meta_index.load_index(tmp_path)["alpha.md"]
+    assert rec.matches(p.stat())
+    assert (rec.title, rec.title_known) == ("Kickoff", True)
+    assert meta_index.record_from_text(p, p.read_text(encoding="utf-8"), p.stat()) == rec
+
+
+def test_fallback_entries_migrate_to_in_place_appends(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(commands, "load_template", lambda *a: (_ for _ in ()).throw(FileNotFoundError()))
+    commands.init_thread("alpha", threads_dir=tmp_path)
+    p = tmp_path / "alpha.md"
+    # Legacy (unpadded) header
+    p.write_text("\n".join(ln.rstrip() for ln in p.read_text(encoding="utf-8").split("\n")), encoding="utf-8")
+    rewrites: list[Path] = []
+    monkeypatch.setattr(commands, "write", lambda path, text: rewrites.append(path) or p.write_text(text, encoding="utf-8"))
+
+    commands.append_entry("alpha", threads_dir=tmp_path, agent="Claude", role="pm", title="t", body="one")
+    commands.append_entry("alpha", threads_dir=tmp_path, agent="Codex", role="pm", title="t", body="two",
+                          status="in-review", ball="Claude")
+
+    assert rewrites == [p]
+    text = p.read_text(encoding="utf-8")
+    assert "Status: in-review" in text and "one" in text and text.endswith("two\n")
+    rec = meta_index.load_index(tmp_path)["alpha.md"]
+    assert rec.matches(p.stat())
+    assert (rec.status, rec.ball) == ("in-review", "Claude")
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from watercooler import commands, search_index
+from watercooler.baseline_graph import sync
+from watercooler.baseline_graph.search import SearchQuery, search_graph
+
+
+def _scan(threads_dir: Path, query: str):
+    q = query.lower()
+    return [
+        (p, i, line)
+        for p in sorted(threads_dir.glob("*.md"))
+        for i, line in enumerate(p.read_text(encoding="utf-8").splitlines(), start=1)
+        if q in line.lower()
+    ]
+
+
+def _say(tmp_path: Path, topic: str, body: str) -> None:
+    commands.say(topic, threads_dir=tmp_path, agent="Claude", role="pm", title="Auth notes", body=body)
+
+
+QUERIES = ["auth", "UTH", "token refresh", "-flow", "Σας", "Status:", "ball: co", "---", "zzz"]
+
+
+def test_query_terms():
+    assert search_index.query_terms("auth") == [("infix", "auth")]
+    assert search_index.query_terms("oauth flow") == [("suffix", "oauth"), ("prefix", "flow")]
+    assert search_index.query_terms("a b c") == [("suffix", "a"), ("exact", "b"), ("prefix", "c")]
+    assert search_index.query_terms("---") == []
+    assert search_index.query_terms("a\nb") == []
+
+
+def test_search_matches_full_scan(tmp_path: Path):
+    for n in range(3):
+        _say(tmp_path, "alpha", f"OAuth-flow {n}\n\nToken refresh ΣΑΣ\n" + "filler line\n" * 400)
+        _say(tmp_path, "beta", f"nothing here {n}")
+    for q in QUERIES:
+        assert commands.search(threads_dir=tmp_path, query=q) == _scan(tmp_path, q), q
+    assert search_index.index_path(tmp_path).exists()
+
+
+def test_writers_update_index_without_rescan(tmp_path: Path, monkeypatch):
+    _say(tmp_path, "alpha", "first")
+    commands.search(threads_dir=tmp_path, query="first")
+
+    calls: list[str] = []
+    orig = search_index._index_file
+    monkeypatch.setattr(search_index, "_index_file", lambda conn, p: calls.append(p.name) or orig(conn, p))
+
+    _say(tmp_path, "alpha", "second auth entry\n" + "x\n" * 3000)
+    commands.set_status("alpha", threads_dir=tmp_path, status="in-review")
+    commands.set_ball("alpha", threads_dir=tmp_path, ball="codex")
+    for q in QUERIES + ["second", "in-review", "codex"]:
+        assert commands.search(threads_dir=tmp_path, query=q) == _scan(tmp_path, q), q
+    assert calls == []
+
+    # External edits are picked up via stat mismatch
+    p = tmp_path / "alpha.md"
+    p.write_text(p.read_text(encoding="utf-8").replace("second", "edited"), encoding="utf-8")
+    assert commands.search(threads_dir=tmp_path, query="edited") == _scan(tmp_path, "edited")
+    assert commands.search(threads_dir=tmp_path, query="second") == []
+    assert calls == ["alpha.md"]
+
+
+def _entry(i: int, body: str) -> dict:
+    return {"id": f"entry:E{i}", "type": "entry", "entry_id": f"E{i}", "title": f"Entry {i}", "body": body}
+
+
+def _ids(results) -> list[str]:
+    return [r.node_id for r in results.results]
+
+
+def test_graph_keyword_search_scans_only_candidates(tmp_path: Path, monkeypatch, write_graph):
+    nodes = [_entry(i, "JWT authentication" if i % 10 == 0 else "unrelated") for i in range(50)]
+    nodes_file = write_graph(tmp_path, nodes)
+    query = SearchQuery(query="authentication", limit=100)
+
+    indexed = search_graph(tmp_path, query)
+    monkeypatch.setattr(search_index, "graph_keyword_candidates", lambda *a: None)
+    full = search_graph(tmp_path, query)
+    monkeypatch.undo()
+
+    assert _ids(indexed) == _ids(full) == ["E0", "E10", "E20", "E30", "E40"]
+    assert full.total_scanned == 50
+    assert indexed.total_scanned == 5
+
+    # OR mode cannot be narrowed by the keyword alone
+    assert search_graph(tmp_path, SearchQuery(query="authentication", combine="OR")).total_scanned == 50
+
+    # Sync writes update the index in place
+    rebuilds: list[int] = []
+    orig = search_index._rebuild_graph
+    monkeypatch.setattr(search_index, "_rebuild_graph", lambda *a: rebuilds.append(1) or orig(*a))
+    sync._write_nodes(tmp_path, nodes_file, [_entry(1, "authentication now"), _entry(10, "changed")])
+    results = search_graph(tmp_path, query)
+    # Upserts are appended to the log, so E1 now sits at the end of the file
+    assert _ids(results) == ["E0", "E20", "E30", "E40", "E1"]
+    assert rebuilds == []
+    monkeypatch.setattr(search_index, "graph_keyword_candidates", lambda *a: None)
+    assert _ids(search_graph(tmp_path, query)) == _ids(results)
+
+
+def test_graph_keyword_results_are_ranked_by_bm25(tmp_path: Path, write_graph):
+    filler = " ".join(f"word{i}" for i in range(200))
+    nodes = [
+        _entry(0, f"mentions caching once {filler}"),
+        {**_entry(1, "caching layer design"), "title": "Caching plan"},
+        _entry(2, "caching layer design"),
+        _entry(3, "no match here"),
+    ]
+    write_graph(tmp_path, nodes)
+
+    results = search_graph(tmp_path, SearchQuery(query="caching", limit=10))
+    assert _ids(results) == ["E1", "E2", "E0"]
+    scores = [r.score for r in results.results]
+    assert scores[0] > scores[1] > scores[2] > 0
+
+    # Nodes that only pass the other OR filters rank below keyword hits
+    results = search_graph(tmp_path, SearchQuery(query="caching", agent="nobody", combine="OR"))
+    assert _ids(results) == ["E1", "E2", "E0"]
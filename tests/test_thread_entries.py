@@ -175,3 +175,133 @@ def test_parse_thread_entries_handles_tilde_fences() -> None:
     entries = parse_thread_entries(text)
     assert len(entries) == 1
     assert entries[0].agent == "RealAgent (user)"
+
+
+def _lazy_fixture_paths(tmp_path) -> list:
+    from pathlib import Path
+
+    fixture = Path(__file__).parent / "fixtures" / "threads" / "unified-branch-parity-protocol.md"
+    nested = tmp_path / "nested.md"
+    nested.write_text(
+        _sample_thread()
+        + dedent(
+            """\
+
+            ---
+            Entry: Claude (caleb) 2025-01-01T00:03:00Z
+            Role: critic
+            Type: Note
+            Title: Fences — ünïcode
+
+            ````markdown
+            ```
+            Entry: FakeEntry (fake) 2025-01-01T00:00:00Z
+            ```
+            ````
+            ```python
+            Entry: FakeAgent (fake) 2025-01-01T00:00:00Z
+            ```
+            ~~~
+            Entry: FakeAgent (fake) 2025-01-01T00:00:00Z
+            ~~~
+            <!-- Entry-ID: 01ABCDEF1234567890ABCDEFGK -->
+            """
+        ),
+        encoding="utf-8",
+    )
+    return [fixture, nested]
+
+
+def test_iter_thread_entries_matches_eager_parser(tmp_path) -> None:
+    from watercooler.thread_entries import iter_thread_entries
+
+    for path in _lazy_fixture_paths(tmp_path):
+        data = path.read_bytes()
+        lazy = list(iter_thread_entries(path))
+        eager = parse_thread_entries(path.read_text(encoding="utf-8"))
+        assert len(lazy) == len(eager)
+        for a, b in zip(lazy, eager):
+            assert (a.index, a.start_line, a.end_line) == (b.index, b.start_line, b.end_line)
+            assert (a.entry_id, a.agent, a.title, a.header, a.body) == (
+                b.entry_id, b.agent, b.title, b.header, b.body,
+            )
+            # Lazy offsets are byte offsets into the file
+            segment = data[a.start_offset:a.end_offset].decode("utf-8")
+            assert segment.rstrip() == path.read_text(encoding="utf-8")[b.start_offset:b.end_offset].rstrip()
+
+
+def test_reverse_iteration_matches_eager_parser(tmp_path) -> None:
+    from watercooler.thread_entries import iter_thread_entries_reverse
+
+    for path in _lazy_fixture_paths(tmp_path):
+        data = path.read_bytes()
+        eager = parse_thread_entries(path.read_text(encoding="utf-8"))
+        # Small chunks exercise lines that straddle chunk boundaries
+        lazy = list(iter_thread_entries_reverse(path, chunk_size=64))
+        lazy.reverse()
+        assert len(lazy) == len(eager)
+        for i, (a, b) in enumerate(zip(lazy, eager)):
+            assert a.index == i - len(eager)
+            assert (a.entry_id, a.agent, a.title, a.header, a.body) == (
+                b.entry_id, b.agent, b.title, b.header, b.body,
+            )
+            assert data[a.start_offset:a.end_offset].decode("utf-8").startswith("Entry:")
+            assert data[a.start_offset:a.end_offset].rstrip().endswith(b.body.rstrip().encode("utf-8")[-20:])
+
+
+def test_reverse_iteration_parses_forwards_when_fences_are_ambiguous(tmp_path) -> None:
+    from watercooler.thread_entries import read_last_entries
+
+    path = tmp_path / "fenced.md"
+    text = "# fenced — Thread\nStatus: OPEN\n"
+    for n, title in enumerate(["one", "two", "three"], 1):
+        text += f"\n---\nEntry: Claude (user) 2025-01-01T0{n}:00:00Z\nRole: pm\nType: Note\nTitle: {title}\n\nbody\n"
+    # A 4-backtick block quoting a fence with an info string is valid CommonMark
+    text += "````\n```python\n````\n"
+    path.write_text(text, encoding="utf-8")
+
+    assert [e.title for e in parse_thread_entries(text)] == ["one", "two", "three"]
+    last = read_last_entries(path, 3)
+    assert [e.title for e in last] == ["one", "two", "three"]
+    assert [e.index for e in last] == [-3, -2, -1]
+    total_lines = text.count("\n")
+    eager = parse_thread_entries(text)
+    assert [e.start_line - total_lines - 1 for e in eager] == [e.start_line for e in last]
+
+
+def test_read_last_entries_only_reads_tail(tmp_path, monkeypatch) -> None:
+    import builtins
+
+    from watercooler.thread_entries import read_last_entries
+
+    path = tmp_path / "big.md"
+    filler = "filler line\n" * 50_000
+    path.write_text(_sample_thread() + filler + _sample_thread().split("---", 1)[1], encoding="utf-8")
+
+    bytes_read = 0
+    real_open = builtins.open
+
+    class CountingFile:
+        def __init__(self, f):
+            self._f = f
+
+        def read(self, n=-1):
+            nonlocal bytes_read
+            data = self._f.read(n)
+            bytes_read += len(data)
+            return data
+
+        def __getattr__(self, name):
+            return getattr(self._f, name)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return self._f.__exit__(*exc)
+
+    monkeypatch.setattr(builtins, "open", lambda *a, **kw: CountingFile(real_open(*a, **kw)))
+    (last,) = read_last_entries(path)
+    assert last.title == "Second Entry"
+    assert last.index == -1
+    assert bytes_read < 64 * 1024 < path.stat().st_size